@@ -1,2 +1,6 @@
 from .transcription_job_input import TranslationLanguage, TranscriptionJobInput
-from .transcription_request import TranscriptionRequest
\ No newline at end of file
+from .transcription_request import TranscriptionRequest
+from .transcription_timing_report import TranscriptionTimingReport
+from .directory_upload_result import DirectoryUploadResult, FileUploadResult
+from .upload_progress import UploadProgress
+from .multipart_upload import MultipartUpload
@@ -0,0 +1,113 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+from .utils.json_map import JsonMap
+from .utils.base_model import BaseModel
+from .file_operation_response import FileOperationResponse
+
+
+@JsonMap({})
+class FileUploadResult(BaseModel):
+    """Outcome of the upload of one file of a directory
+
+    :param path: The local path of the file
+    :type path: str
+    :param size: The size of the file in bytes
+    :type size: int
+    :param duration: Time spent uploading the file, in seconds
+    :type duration: float
+    :param response: The response of the upload, None if it failed
+    :type response: Optional[FileOperationResponse]
+    :param error: The error that made the upload fail, None if it succeeded
+    :type error: Optional[Exception]
+    """
+
+    def __init__(
+        self,
+        path: str,
+        size: int = 0,
+        duration: float = 0.0,
+        response: Optional[FileOperationResponse] = None,
+        error: Optional[Exception] = None,
+        **kwargs,
+    ):
+        self.path = path
+        self.size = size
+        self.duration = duration
+        self.response = response
+        self.error = error
+        self._kwargs = kwargs
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the file was uploaded"""
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the FileUploadResult to a dictionary
+
+        :return: Dictionary representation of this instance
+        :rtype: Dict[str, Any]
+        """
+        return {
+            "path": self.path,
+            "size": self.size,
+            "duration": self.duration,
+            "url": self.response.url if self.response is not None else None,
+            "error": str(self.error) if self.error is not None else None,
+        }
+
+
+@JsonMap({})
+class DirectoryUploadResult(BaseModel):
+    """Outcome of the upload of a directory, returned by upload_directory
+
+    :param files: The results of the files, in completion order
+    :type files: List[FileUploadResult]
+    :param elapsed: Duration of the whole upload, in seconds
+    :type elapsed: float
+    """
+
+    def __init__(
+        self,
+        files: Optional[List[FileUploadResult]] = None,
+        elapsed: float = 0.0,
+        **kwargs,
+    ):
+        self.files = files if files is not None else []
+        self.elapsed = elapsed
+        self._kwargs = kwargs
+
+    @property
+    def succeeded(self) -> List[FileUploadResult]:
+        """The results of the uploaded files"""
+        return [result for result in self.files if result.succeeded]
+
+    @property
+    def failed(self) -> List[FileUploadResult]:
+        """The results of the files that could not be uploaded"""
+        return [result for result in self.files if not result.succeeded]
+
+    @property
+    def uploaded_bytes(self) -> int:
+        """The size of the uploaded files in bytes"""
+        return sum(result.size for result in self.succeeded)
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """The upload throughput in bytes per second, None if nothing was uploaded"""
+        if not self.uploaded_bytes or self.elapsed <= 0:
+            return None
+        return self.uploaded_bytes / self.elapsed
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the DirectoryUploadResult to a dictionary
+
+        :return: Dictionary representation of this instance
+        :rtype: Dict[str, Any]
+        """
+        return {
+            "files": [result.to_dict() for result in self.files],
+            "elapsed": self.elapsed,
+            "uploaded_bytes": self.uploaded_bytes,
+            "throughput": self.throughput,
+        }
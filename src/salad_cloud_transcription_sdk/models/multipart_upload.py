@@ -0,0 +1,46 @@
+from __future__ import annotations
+from typing import Any, Dict
+from .utils.json_map import JsonMap
+from .utils.base_model import BaseModel
+
+
+@JsonMap({})
+class MultipartUpload(BaseModel):
+    """A multipart upload started in storage and not yet completed or aborted
+
+    :param organization_name: The organization the file is uploaded to
+    :type organization_name: str
+    :param filename: The name of the file in storage
+    :type filename: str
+    :param upload_id: The ID of the upload
+    :type upload_id: str
+    :param created_at: When the upload was created, in seconds since the epoch
+    :type created_at: float
+    """
+
+    def __init__(
+        self,
+        organization_name: str,
+        filename: str,
+        upload_id: str,
+        created_at: float,
+        **kwargs,
+    ):
+        self.organization_name = organization_name
+        self.filename = filename
+        self.upload_id = upload_id
+        self.created_at = created_at
+        self._kwargs = kwargs
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the MultipartUpload to a dictionary
+
+        :return: Dictionary representation of this instance
+        :rtype: Dict[str, Any]
+        """
+        return {
+            "organization_name": self.organization_name,
+            "filename": self.filename,
+            "upload_id": self.upload_id,
+            "created_at": self.created_at,
+        }
@@ -0,0 +1,157 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, Dict, Optional
+from .utils.json_map import JsonMap
+from .utils.base_model import BaseModel
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    """Parses an ISO 8601 timestamp returned by the API
+
+    :param value: The timestamp
+    :type value: Any
+    :return: The parsed timestamp, or None if it is missing or invalid
+    :rtype: Optional[datetime]
+    """
+    if not isinstance(value, str) or not value:
+        return None
+
+    value = value.replace("Z", "+00:00")
+    # fromisoformat only accepts 3 or 6 fractional digits before Python 3.11
+    if "." in value:
+        head, _, tail = value.partition(".")
+        digits = len(tail) - len(tail.lstrip("0123456789"))
+        fraction = (tail[:digits] + "000000")[:6]
+        value = f"{head}.{fraction}{tail[digits:]}"
+
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+@JsonMap({})
+class TranscriptionTimingReport(BaseModel):
+    """Breakdown of where the time of a transcribe call went, attached to the returned job
+    when transcribe is called with timing_report=True. Durations are in seconds,
+    values that could not be measured are None.
+
+    :param validation_time: Time spent validating the arguments
+    :type validation_time: float
+    :param upload_time: Time spent resolving the source, including the upload of local files
+    :type upload_time: float
+    :param upload_bytes: Size of the uploaded file, 0 when the source is a URL
+    :type upload_bytes: int
+    :param create_job_time: Latency of the job creation request
+    :type create_job_time: float
+    :param poll_count: Number of job status requests sent while polling
+    :type poll_count: int
+    :param polling_time: Time spent polling for the job completion
+    :type polling_time: float
+    :param decode_time: Time spent converting the job output
+    :type decode_time: float
+    :param total_time: Duration of the whole transcribe call
+    :type total_time: float
+    :param queue_time: Time between the creation and the start of the job, from its events
+    :type queue_time: Optional[float]
+    :param execution_time: Time between the start and the end of the job, from its events
+    :type execution_time: Optional[float]
+    :param processing_time: Processing time reported in the job output
+    :type processing_time: Optional[float]
+    """
+
+    def __init__(
+        self,
+        validation_time: float = 0.0,
+        upload_time: float = 0.0,
+        upload_bytes: int = 0,
+        create_job_time: float = 0.0,
+        poll_count: int = 0,
+        polling_time: float = 0.0,
+        decode_time: float = 0.0,
+        total_time: float = 0.0,
+        queue_time: Optional[float] = None,
+        execution_time: Optional[float] = None,
+        processing_time: Optional[float] = None,
+        **kwargs,
+    ):
+        self.validation_time = validation_time
+        self.upload_time = upload_time
+        self.upload_bytes = upload_bytes
+        self.create_job_time = create_job_time
+        self.poll_count = poll_count
+        self.polling_time = polling_time
+        self.decode_time = decode_time
+        self.total_time = total_time
+        self.queue_time = queue_time
+        self.execution_time = execution_time
+        self.processing_time = processing_time
+        self._kwargs = kwargs
+
+    @property
+    def upload_throughput(self) -> Optional[float]:
+        """The upload throughput in bytes per second, None if nothing was uploaded"""
+        if not self.upload_bytes or self.upload_time <= 0:
+            return None
+        return self.upload_bytes / self.upload_time
+
+    def set_job_timings(self, job: Any) -> TranscriptionTimingReport:
+        """Derives the queue, execution and processing times from a job
+
+        :param job: The inference endpoint job, with its events and output
+        :type job: InferenceEndpointJob
+        :return: The report
+        :rtype: TranscriptionTimingReport
+        """
+        event_times = {}
+        for event in getattr(job, "events", None) or []:
+            action = getattr(event, "action", None)
+            action = getattr(action, "value", action)
+            event_time = _parse_time(getattr(event, "time", None))
+            if action is not None and event_time is not None:
+                event_times.setdefault(str(action), event_time)
+
+        created = event_times.get("created") or _parse_time(
+            getattr(job, "create_time", None)
+        )
+        started = event_times.get("started")
+        finished = next(
+            (
+                event_times[action]
+                for action in ("succeeded", "failed", "cancelled")
+                if action in event_times
+            ),
+            None,
+        )
+
+        if created is not None and started is not None:
+            self.queue_time = (started - created).total_seconds()
+        if started is not None and finished is not None:
+            self.execution_time = (finished - started).total_seconds()
+
+        processing_time = getattr(getattr(job, "output", None), "processing_time", None)
+        if isinstance(processing_time, (int, float)):
+            self.processing_time = float(processing_time)
+
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the TranscriptionTimingReport to a dictionary
+
+        :return: Dictionary representation of this instance
+        :rtype: Dict[str, Any]
+        """
+        return {
+            "validation_time": self.validation_time,
+            "upload_time": self.upload_time,
+            "upload_bytes": self.upload_bytes,
+            "upload_throughput": self.upload_throughput,
+            "create_job_time": self.create_job_time,
+            "poll_count": self.poll_count,
+            "polling_time": self.polling_time,
+            "queue_time": self.queue_time,
+            "execution_time": self.execution_time,
+            "processing_time": self.processing_time,
+            "decode_time": self.decode_time,
+            "total_time": self.total_time,
+        }
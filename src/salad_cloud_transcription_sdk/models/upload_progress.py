@@ -0,0 +1,90 @@
+from __future__ import annotations
+from typing import Any, Dict, Optional
+from .utils.json_map import JsonMap
+from .utils.base_model import BaseModel
+
+
+@JsonMap({})
+class UploadProgress(BaseModel):
+    """Progress of an upload, reported to upload progress callbacks
+
+    :param filename: The name of the uploaded file
+    :type filename: str
+    :param bytes_sent: The bytes of the file sent so far, including the parts in flight
+    :type bytes_sent: int
+    :param total_bytes: The size of the file in bytes, None for streams of unknown size
+    :type total_bytes: Optional[int]
+    :param parts_completed: The amount of parts uploaded
+    :type parts_completed: int
+    :param total_parts: The amount of parts of the upload, None for streams of unknown size
+    :type total_parts: Optional[int]
+    :param throughput: The throughput over the last seconds in bytes per second, 0 when the upload stalls
+    :type throughput: Optional[float]
+    :param average_throughput: The throughput since the start of the upload in bytes per second
+    :type average_throughput: Optional[float]
+    :param eta: The estimated time left in seconds, None when it cannot be estimated
+    :type eta: Optional[float]
+    :param elapsed: Time since the start of the upload, in seconds
+    :type elapsed: float
+    :param done: Whether the upload ended, this is the last progress reported for it
+    :type done: bool
+    :param failed: Whether the upload ended with an error
+    :type failed: bool
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        bytes_sent: int = 0,
+        total_bytes: Optional[int] = None,
+        parts_completed: int = 0,
+        total_parts: Optional[int] = None,
+        throughput: Optional[float] = None,
+        average_throughput: Optional[float] = None,
+        eta: Optional[float] = None,
+        elapsed: float = 0.0,
+        done: bool = False,
+        failed: bool = False,
+        **kwargs,
+    ):
+        self.filename = filename
+        self.bytes_sent = bytes_sent
+        self.total_bytes = total_bytes
+        self.parts_completed = parts_completed
+        self.total_parts = total_parts
+        self.throughput = throughput
+        self.average_throughput = average_throughput
+        self.eta = eta
+        self.elapsed = elapsed
+        self.done = done
+        self.failed = failed
+        self._kwargs = kwargs
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """The share of the file sent, between 0 and 1, None for streams of unknown size"""
+        if self.total_bytes is None:
+            return None
+        if self.total_bytes == 0:
+            return 1.0
+        return min(1.0, self.bytes_sent / self.total_bytes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the UploadProgress to a dictionary
+
+        :return: Dictionary representation of this instance
+        :rtype: Dict[str, Any]
+        """
+        return {
+            "filename": self.filename,
+            "bytes_sent": self.bytes_sent,
+            "total_bytes": self.total_bytes,
+            "parts_completed": self.parts_completed,
+            "total_parts": self.total_parts,
+            "throughput": self.throughput,
+            "average_throughput": self.average_throughput,
+            "eta": self.eta,
+            "elapsed": self.elapsed,
+            "done": self.done,
+            "failed": self.failed,
+        }
@@ -1,3 +1,5 @@
+import asyncio
+
 from typing import Generator, Optional, Tuple
 from ...transport.request import Request
 from ...transport.response import Response
@@ -30,6 +32,20 @@ def handle(
         """
         raise NotImplementedError()
 
+    async def handle_async(
+        self, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Process the given request from a coroutine and return a response or an error.
+        By default the request is handled in a worker thread, through the rest of the chain.
+        Handlers that can wait without blocking override this method.
+
+        :param Request request: The request to handle.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        """
+        return await asyncio.to_thread(self.handle, request)
+
     def stream(
         self, request: Request
     ) -> Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]:
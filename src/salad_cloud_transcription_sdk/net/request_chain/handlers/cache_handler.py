@@ -0,0 +1,462 @@
+import hashlib
+import json
+import os
+import re
+import threading
+
+from collections import OrderedDict
+from datetime import timedelta
+from time import time
+from typing import BinaryIO, Callable, Dict, Generator, Optional, Tuple
+from requests import Response as RequestsResponse
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from .base_handler import BaseHandler
+from ...transport.request import Request
+from ...transport.response import Response
+from ...transport.request_error import RequestError
+
+TERMINAL_JOB_STATUSES = frozenset({"succeeded", "failed", "cancelled"})
+
+_CONDITIONAL_HEADERS = frozenset({"if-none-match", "if-modified-since"})
+
+
+def is_terminal_job(response: Response) -> bool:
+    """
+    Check whether a response holds an inference job that reached a terminal state.
+    Such jobs never change again, so their responses can be cached without revalidation.
+
+    :param Response response: The response to check.
+    :return: True if the response body is a finished job, False otherwise.
+    :rtype: bool
+    """
+    body = response.body
+    return (
+        isinstance(body, dict)
+        and "id" in body
+        and str(body.get("status", "")).lower() in TERMINAL_JOB_STATUSES
+    )
+
+
+class CacheEntry:
+    """
+    A cached response with the metadata needed to serve or revalidate it.
+
+    :ivar Response response: The cached response.
+    :ivar Optional[float] expires_at: The epoch time until which the response is fresh, None if it must be revalidated.
+    :ivar Optional[str] etag: The ETag validator sent by the server.
+    :ivar Optional[str] last_modified: The Last-Modified validator sent by the server.
+    :ivar bool pinned: Whether the response never changes and is served without revalidation.
+    """
+
+    def __init__(
+        self,
+        response: Response,
+        expires_at: Optional[float],
+        etag: Optional[str],
+        last_modified: Optional[str],
+        pinned: bool = False,
+    ):
+        self.response = response
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.pinned = pinned
+
+    def is_fresh(self) -> bool:
+        """
+        Check whether the entry can be served without contacting the server.
+
+        :return: True if the entry is pinned or not expired yet, False otherwise.
+        :rtype: bool
+        """
+        return self.pinned or (self.expires_at is not None and self.expires_at > time())
+
+    def can_revalidate(self) -> bool:
+        """
+        Check whether the server sent a validator for a conditional request.
+
+        :return: True if an ETag or a Last-Modified date is known, False otherwise.
+        :rtype: bool
+        """
+        return self.etag is not None or self.last_modified is not None
+
+
+class CacheStore:
+    """
+    The storage used by the cache handler.
+    This class must be implemented by all cache stores.
+    """
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Get a cached entry.
+
+        :param str key: The cache key.
+        :return: The entry, or None if nothing is cached for the key.
+        :rtype: Optional[CacheEntry]
+        """
+        raise NotImplementedError()
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """
+        Store an entry.
+
+        :param str key: The cache key.
+        :param CacheEntry entry: The entry to store.
+        """
+        raise NotImplementedError()
+
+    def delete(self, key: str) -> None:
+        """
+        Remove an entry if it exists.
+
+        :param str key: The cache key.
+        """
+        raise NotImplementedError()
+
+
+class MemoryCacheStore(CacheStore):
+    """
+    A bounded in-memory store evicting the least recently used entries.
+
+    :ivar int max_entries: The maximum amount of entries kept.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize a new instance of MemoryCacheStore.
+
+        :param int max_entries: The maximum amount of entries kept.
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class DiskCacheStore(CacheStore):
+    """
+    A bounded store keeping one file per entry in a local directory, so cached
+    responses survive restarts and are shared by processes using the same directory.
+    The least recently used files are removed once the store is full.
+    Each file holds a JSON line with the status, the headers and the validators of the
+    response, followed by its raw body. Nothing read back is ever executed, so a file
+    written by someone else can at worst be a wrong response.
+
+    :ivar str directory: The directory holding the cache files.
+    :ivar int max_entries: The maximum amount of entries kept.
+    """
+
+    _SUFFIX = ".cache"
+
+    def __init__(self, directory: str, max_entries: int = 4096):
+        """
+        Initialize a new instance of DiskCacheStore.
+
+        :param str directory: The directory holding the cache files. Created if missing.
+        :param int max_entries: The maximum amount of entries kept.
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as file:
+                entry = self._read_entry(file)
+            os.utime(path)
+            return entry
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return None
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        path = self._get_path(key)
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporary_path, "wb") as file:
+                self._write_entry(file, entry)
+            os.replace(temporary_path, path)
+        except (OSError, ValueError, TypeError, AttributeError):
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+            return
+
+        self._evict()
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._get_path(key))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _write_entry(file: BinaryIO, entry: CacheEntry) -> None:
+        """
+        Write an entry as a JSON line of metadata followed by the raw body.
+
+        :param BinaryIO file: The file to write to.
+        :param CacheEntry entry: The entry to write.
+        """
+        response = entry.response
+        metadata = {
+            "status": response.status,
+            "headers": {
+                str(name): str(value) for name, value in response.headers.items()
+            },
+            "elapsed": response.elapsed,
+            "expires_at": entry.expires_at,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "pinned": entry.pinned,
+        }
+        file.write(json.dumps(metadata).encode("utf-8") + b"\n")
+        file.write(response.content)
+
+    @staticmethod
+    def _read_entry(file: BinaryIO) -> CacheEntry:
+        """
+        Read an entry written by _write_entry.
+
+        :param BinaryIO file: The file to read from.
+        :return: The entry.
+        :rtype: CacheEntry
+        :raises ValueError: If the file does not hold a valid entry.
+        """
+        metadata = json.loads(file.readline())
+        headers = metadata["headers"]
+        if not isinstance(metadata["status"], int) or not isinstance(headers, dict):
+            raise ValueError("Invalid cache entry.")
+
+        response = RequestsResponse()
+        response.status_code = metadata["status"]
+        response.headers = CaseInsensitiveDict(
+            {str(name): str(value) for name, value in headers.items()}
+        )
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.elapsed = timedelta(seconds=float(metadata["elapsed"]))
+        response._content = file.read()
+        response._content_consumed = True
+
+        expires_at = metadata["expires_at"]
+        return CacheEntry(
+            Response(response),
+            float(expires_at) if expires_at is not None else None,
+            metadata["etag"],
+            metadata["last_modified"],
+            bool(metadata["pinned"]),
+        )
+
+    def _evict(self) -> None:
+        """
+        Remove the least recently used files above the maximum amount of entries.
+        """
+        try:
+            files = [
+                entry
+                for entry in os.scandir(self.directory)
+                if entry.name.endswith(self._SUFFIX)
+            ]
+        except OSError:
+            return
+
+        if len(files) <= self.max_entries:
+            return
+
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[: len(files) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def _get_path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, digest + self._SUFFIX)
+
+
+class CacheHandler(BaseHandler):
+    """
+    Handler caching GET responses.
+    Responses are stored according to their Cache-Control header and revalidated with
+    If-None-Match / If-Modified-Since once stale. Responses matching the pin predicate,
+    by default inference jobs in a terminal state, are served without revalidation.
+
+    :ivar CacheStore _store: The store holding the cached responses.
+    :ivar Callable[[Response], bool] _pin: Decides which responses never change.
+    """
+
+    def __init__(
+        self,
+        store: Optional[CacheStore] = None,
+        pin: Optional[Callable[[Response], bool]] = is_terminal_job,
+    ):
+        """
+        Initialize a new instance of CacheHandler.
+
+        :param Optional[CacheStore] store: The store holding the cached responses. Defaults to a MemoryCacheStore.
+        :param Optional[Callable[[Response], bool]] pin: Decides which responses never change. None pins nothing.
+        """
+        super().__init__()
+        self._store = store or MemoryCacheStore()
+        self._pin = pin
+
+    def handle(
+        self, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Serve the request from the cache, revalidate the cached response or send the request.
+
+        :param Request request: The request to send.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        if (request.method or "").upper() != "GET" or request.body:
+            return self._next_handler.handle(request)
+
+        key = self._get_key(request)
+        entry = self._store.get(key)
+        if entry is not None and entry.is_fresh():
+            return entry.response, None
+
+        if entry is not None and entry.can_revalidate():
+            request.set_headers(self._get_conditional_headers(request, entry))
+
+        response, error = self._next_handler.handle(request)
+        if error is not None:
+            return response, error
+
+        if response.status == 304 and entry is not None:
+            refreshed = self._create_entry(entry.response, response.headers)
+            if refreshed is not None:
+                self._store.set(key, refreshed)
+            return entry.response, None
+
+        new_entry = self._create_entry(response, response.headers)
+        if new_entry is not None:
+            self._store.set(key, new_entry)
+        elif entry is not None:
+            self._store.delete(key)
+
+        return response, None
+
+    def stream(
+        self, request: Request
+    ) -> Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]:
+        """
+        Stream the request. Streams are never cached.
+
+        :param Request request: The request to stream.
+        :return: The response and any error that occurred.
+        :rtype: Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        yield from self._next_handler.stream(request)
+
+    def _create_entry(
+        self, response: Response, headers: Dict[str, str]
+    ) -> Optional[CacheEntry]:
+        """
+        Build a cache entry for a response, or None if it must not be cached.
+
+        :param Response response: The response to cache.
+        :param Dict[str, str] headers: The headers describing the freshness of the response.
+        :return: The cache entry, or None if the response is not cacheable.
+        :rtype: Optional[CacheEntry]
+        """
+        if response.status != 200 and response.status != 304:
+            return None
+
+        directives = self._parse_cache_control(headers.get("Cache-Control", ""))
+        if "no-store" in directives:
+            return None
+
+        pinned = self._pin is not None and self._pin(response)
+        etag = headers.get("ETag") or response.headers.get("ETag")
+        last_modified = headers.get("Last-Modified") or response.headers.get(
+            "Last-Modified"
+        )
+
+        expires_at = None
+        if "no-cache" not in directives:
+            max_age = directives.get("s-maxage") or directives.get("max-age")
+            if max_age is not None and max_age.isdigit():
+                expires_at = time() + int(max_age)
+
+        if not pinned and expires_at is None and etag is None and last_modified is None:
+            return None
+
+        return CacheEntry(response, expires_at, etag, last_modified, pinned)
+
+    def _get_conditional_headers(self, request: Request, entry: CacheEntry) -> dict:
+        """
+        Get the request headers extended with the validators of a cached entry.
+
+        :param Request request: The request to revalidate.
+        :param CacheEntry entry: The cached entry.
+        :return: A copy of the request headers with the conditional headers set.
+        :rtype: dict
+        """
+        headers = dict(request.headers or {})
+        if entry.etag is not None:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified is not None:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def _parse_cache_control(self, value: str) -> Dict[str, Optional[str]]:
+        """
+        Parse a Cache-Control header into its directives.
+
+        :param str value: The header value.
+        :return: The directives mapped to their argument, or None for directives without one.
+        :rtype: Dict[str, Optional[str]]
+        """
+        directives = {}
+        for part in value.split(","):
+            match = re.match(r'\s*([\w-]+)\s*(?:=\s*"?([^"]*)"?)?\s*$', part)
+            if match:
+                directives[match.group(1).lower()] = match.group(2)
+        return directives
+
+    def _get_key(self, request: Request) -> str:
+        """
+        Get the cache key of a request, made of its URL and its headers, including authentication.
+
+        :param Request request: The request.
+        :return: The cache key.
+        :rtype: str
+        """
+        headers = sorted(
+            (k.lower(), str(v))
+            for k, v in (request.headers or {}).items()
+            if k.lower() not in _CONDITIONAL_HEADERS
+        )
+        return repr((request.url, headers))
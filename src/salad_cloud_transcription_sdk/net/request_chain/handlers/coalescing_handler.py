@@ -0,0 +1,213 @@
+import threading
+
+from time import monotonic
+from typing import Dict, Generator, Hashable, Optional, Tuple
+from .base_handler import BaseHandler
+from ...transport.request import Request
+from ...transport.response import Response
+from ...transport.request_error import DeadlineExceededError, RequestError
+
+
+class _InFlightCall:
+    """
+    A request currently being sent on behalf of every caller waiting for it.
+
+    :ivar threading.Event done: Set once the result is available.
+    :ivar Optional[Response] response: The shared response.
+    :ivar Optional[RequestError] error: The shared error.
+    :ivar Optional[BaseException] exception: An unexpected exception raised while sending.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Optional[Response] = None
+        self.error: Optional[RequestError] = None
+        self.exception: Optional[BaseException] = None
+
+
+class CoalescingHandler(BaseHandler):
+    """
+    Handler sharing one in-flight call between identical concurrent GET requests.
+    Requests are identical when their URL and headers, including authentication, match.
+    The first caller sends the request and every caller arriving before it completes
+    receives the same parsed response. Successful results can optionally be reused
+    for a short time after the call completed.
+
+    :ivar float _result_ttl_in_seconds: How long a completed result is reused, 0 to disable.
+    :ivar int _max_results: The maximum amount of completed results kept.
+    """
+
+    def __init__(self, result_ttl_in_milliseconds: int = 0, max_results: int = 1024):
+        """
+        Initialize a new instance of CoalescingHandler.
+
+        :param int result_ttl_in_milliseconds: How long a completed result is reused, 0 to disable.
+        :param int max_results: The maximum amount of completed results kept.
+        """
+        super().__init__()
+        self._result_ttl_in_seconds = result_ttl_in_milliseconds / 1000
+        self._max_results = max_results
+        self._in_flight: Dict[Hashable, _InFlightCall] = {}
+        self._results: Dict[Hashable, Tuple[float, Response]] = {}
+        self._lock = threading.Lock()
+
+    def handle(
+        self, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Send the request, or wait for an identical request that is already in flight.
+
+        :param Request request: The request to send.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        if (request.method or "").upper() != "GET" or request.body:
+            return self._next_handler.handle(request)
+
+        key = self._get_key(request)
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                expires_at, response = result
+                if expires_at > monotonic():
+                    return response, None
+                del self._results[key]
+
+            call = self._in_flight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _InFlightCall()
+                self._in_flight[key] = call
+
+        if is_leader:
+            return self._lead(key, call, request)
+
+        return self._follow(call, request)
+
+    async def handle_async(
+        self, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Send the request from a coroutine. Only GET requests, which are coalesced by
+        waiting on other threads, are handled in a worker thread.
+
+        :param Request request: The request to send.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        if (request.method or "").upper() != "GET" or request.body:
+            return await self._next_handler.handle_async(request)
+
+        return await super().handle_async(request)
+
+    def stream(
+        self, request: Request
+    ) -> Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]:
+        """
+        Stream the request. Streams are never coalesced.
+
+        :param Request request: The request to stream.
+        :return: The response and any error that occurred.
+        :rtype: Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        yield from self._next_handler.stream(request)
+
+    def _lead(
+        self, key: Hashable, call: _InFlightCall, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Send the request and publish the result to the waiting callers.
+
+        :param Hashable key: The key identifying the request.
+        :param _InFlightCall call: The shared call.
+        :param Request request: The request to send.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        """
+        try:
+            call.response, call.error = self._next_handler.handle(request)
+            return call.response, call.error
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if (
+                    self._result_ttl_in_seconds > 0
+                    and call.response is not None
+                    and call.error is None
+                ):
+                    self._store_result(key, call.response)
+            call.done.set()
+
+    def _follow(
+        self, call: _InFlightCall, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Wait for the result of an identical request sent by another caller. When the
+        other caller gave up because its own deadline passed, the request is sent again
+        for this caller if its deadline allows it.
+
+        :param _InFlightCall call: The shared call.
+        :param Request request: The request of this caller.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        """
+        timeout = request.deadline.remaining() if request.deadline else None
+        if not call.done.wait(timeout):
+            return None, DeadlineExceededError()
+
+        if isinstance(call.exception, DeadlineExceededError) or isinstance(
+            call.error, DeadlineExceededError
+        ):
+            if request.deadline is None or not request.deadline.expired():
+                return self._next_handler.handle(request)
+
+        if call.exception is not None:
+            raise call.exception
+
+        return call.response, call.error
+
+    def _store_result(self, key: Hashable, response: Response) -> None:
+        """
+        Keep a completed result for reuse. Must be called with the lock held.
+
+        :param Hashable key: The key identifying the request.
+        :param Response response: The response to keep.
+        """
+        now = monotonic()
+        if len(self._results) >= self._max_results:
+            for expired_key in [
+                k for k, (expires_at, _) in self._results.items() if expires_at <= now
+            ]:
+                del self._results[expired_key]
+        if len(self._results) >= self._max_results:
+            del self._results[next(iter(self._results))]
+
+        self._results[key] = (now + self._result_ttl_in_seconds, response)
+
+    def _get_key(self, request: Request) -> Hashable:
+        """
+        Get the key identifying identical requests.
+
+        :param Request request: The request.
+        :return: The key made of the URL and the headers of the request.
+        :rtype: Hashable
+        """
+        headers = request.headers or {}
+        return request.url, tuple(
+            sorted((k.lower(), str(v)) for k, v in headers.items())
+        )
@@ -0,0 +1,364 @@
+import asyncio
+import re
+import threading
+
+from collections import deque
+from time import monotonic
+from typing import Callable, Dict, Generator, Optional, Tuple
+from urllib.parse import urlparse
+from .base_handler import BaseHandler
+from ...transport.request import Request
+from ...transport.response import Response
+from ...transport.request_error import DeadlineExceededError, RequestError
+
+
+class EndpointClass:
+    """
+    The classes of endpoints whose concurrency is controlled independently.
+    """
+
+    S4_UPLOAD = "s4_upload"
+    S4_SIGN = "s4_sign"
+    JOB_CREATE = "job_create"
+    JOB_READ = "job_read"
+    OTHER = "other"
+
+
+# The range of intervals coroutines poll a full limiter at, in seconds
+ASYNC_POLL_INTERVAL = 0.005
+MAX_ASYNC_POLL_INTERVAL = 0.1
+
+_JOBS_PATTERN = re.compile(r"/inference-endpoints/[^/]+/jobs(/[^/]+)?/?$")
+
+
+def classify_request(request: Request) -> str:
+    """
+    Get the endpoint class of a request.
+
+    :param Request request: The request.
+    :return: One of the EndpointClass values.
+    :rtype: str
+    """
+    method = (request.method or "").upper()
+    path = urlparse(request.url or "").path
+
+    if "/file_tokens/" in path:
+        return EndpointClass.S4_SIGN
+    if method == "PUT" and ("/files/" in path or "/file_parts/" in path):
+        return EndpointClass.S4_UPLOAD
+    if _JOBS_PATTERN.search(path):
+        if method == "POST":
+            return EndpointClass.JOB_CREATE
+        if method == "GET":
+            return EndpointClass.JOB_READ
+    return EndpointClass.OTHER
+
+
+class AimdLimiter:
+    """
+    A concurrency limit adjusted with additive increase / multiplicative decrease.
+    Each successful call grows the limit by 1/limit, i.e. by one per full window of calls.
+    A throttled, timed out or failing call, or recent calls much slower than the base
+    latency, multiply the limit by the backoff ratio, at most once per observed round trip.
+    The base latency is a low percentile of a window of recent successful calls, so a
+    single fast reply does not lower it and it follows lasting changes of the latency.
+
+    :ivar float limit: The current concurrency limit.
+    :ivar int min_limit: The lower bound of the limit.
+    :ivar int max_limit: The upper bound of the limit.
+    :ivar float backoff_ratio: The factor applied to the limit on congestion.
+    :ivar Optional[float] latency_tolerance: A median latency of the recent calls above this multiple of the base latency counts as congestion. None ignores latency.
+    :ivar int latency_window: The amount of successful calls the base latency is computed from.
+    """
+
+    # The percentile of the window taken as the base latency
+    BASE_LATENCY_PERCENTILE = 0.1
+    # The amount of latest calls whose median is compared to the base latency
+    RECENT_CALLS = 10
+    # The amount of calls observed before latency is judged
+    MIN_CALLS = 20
+
+    def __init__(
+        self,
+        initial_limit: int = 16,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: Optional[float] = 3.0,
+        latency_window: int = 100,
+    ):
+        """
+        Initialize a new instance of AimdLimiter.
+
+        :param int initial_limit: The initial concurrency limit.
+        :param int min_limit: The lower bound of the limit.
+        :param int max_limit: The upper bound of the limit.
+        :param float backoff_ratio: The factor applied to the limit on congestion.
+        :param Optional[float] latency_tolerance: A median latency of the recent calls above this multiple of the base latency counts as congestion. None ignores latency.
+        :param int latency_window: The amount of successful calls the base latency is computed from.
+        """
+        if not 0 < backoff_ratio < 1:
+            raise ValueError("The backoff ratio must be between 0 and 1.")
+        if latency_window < self.MIN_CALLS:
+            raise ValueError(
+                f"The latency window must hold at least {self.MIN_CALLS} calls."
+            )
+
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.latency_window = latency_window
+        self._in_flight = 0
+        self._latencies: "deque[float]" = deque(maxlen=latency_window)
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        """The amount of calls currently holding a slot."""
+        with self._condition:
+            return self._in_flight
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a free slot.
+
+        :param Optional[float] timeout: The maximum time to wait in seconds, None to wait indefinitely.
+        :return: True if a slot was acquired, False if the timeout expired.
+        :rtype: bool
+        """
+        with self._condition:
+            acquired = self._condition.wait_for(
+                lambda: self._in_flight < int(self.limit), timeout
+            )
+            if acquired:
+                self._in_flight += 1
+            return acquired
+
+    def release(self, latency_in_seconds: float, congested: Optional[bool]) -> None:
+        """
+        Free a slot and adjust the limit from the outcome of the call.
+
+        :param float latency_in_seconds: The duration of the call.
+        :param Optional[bool] congested: True for a congestion signal, False for a success, None to leave the limit unchanged.
+        """
+        with self._condition:
+            self._in_flight -= 1
+
+            if congested is False and self.latency_tolerance is not None:
+                self._latencies.append(latency_in_seconds)
+                if self._is_slow():
+                    congested = True
+
+            if congested:
+                now = monotonic()
+                if now - self._last_decrease >= latency_in_seconds:
+                    self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+                    self._last_decrease = now
+            elif congested is False:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+            self._condition.notify_all()
+
+    def _is_slow(self) -> bool:
+        """
+        Check whether the recent calls are much slower than the base latency. Must be
+        called with the lock held.
+
+        :return: True if the median latency of the recent calls exceeds the tolerance.
+        :rtype: bool
+        """
+        if len(self._latencies) < self.MIN_CALLS:
+            return False
+
+        window = sorted(self._latencies)
+        base = window[int((len(window) - 1) * self.BASE_LATENCY_PERCENTILE)]
+        recent = sorted(list(self._latencies)[-self.RECENT_CALLS :])
+        return recent[len(recent) // 2] > base * self.latency_tolerance
+
+
+class ConcurrencyLimiters:
+    """
+    The AIMD limiters of every endpoint class, created on first use.
+    One instance is shared by all services of the process unless a service is given its own.
+
+    :ivar Callable[[str], AimdLimiter] _factory: Creates the limiter of an endpoint class.
+    """
+
+    def __init__(self, factory: Optional[Callable[[str], AimdLimiter]] = None):
+        """
+        Initialize a new instance of ConcurrencyLimiters.
+
+        :param Optional[Callable[[str], AimdLimiter]] factory: Creates the limiter of an endpoint class. Defaults to create_default_limiter.
+        """
+        self._factory = factory or create_default_limiter
+        self._limiters: Dict[str, AimdLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint_class: str) -> AimdLimiter:
+        """
+        Get the limiter of an endpoint class.
+
+        :param str endpoint_class: One of the EndpointClass values.
+        :return: The limiter.
+        :rtype: AimdLimiter
+        """
+        with self._lock:
+            limiter = self._limiters.get(endpoint_class)
+            if limiter is None:
+                limiter = self._factory(endpoint_class)
+                self._limiters[endpoint_class] = limiter
+            return limiter
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Get the current limit and in-flight calls of every endpoint class.
+
+        :return: The state of the limiters by endpoint class.
+        :rtype: Dict[str, dict]
+        """
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {
+            endpoint_class: {"limit": limiter.limit, "in_flight": limiter.in_flight}
+            for endpoint_class, limiter in limiters.items()
+        }
+
+
+def create_default_limiter(endpoint_class: str) -> AimdLimiter:
+    """
+    Create the default limiter of an endpoint class.
+    Upload latency depends on the part size, and job read latency on the size of the
+    job output, so only errors and throttling adjust their concurrency.
+
+    :param str endpoint_class: One of the EndpointClass values.
+    :return: The limiter.
+    :rtype: AimdLimiter
+    """
+    if endpoint_class == EndpointClass.S4_UPLOAD:
+        return AimdLimiter(initial_limit=8, max_limit=64, latency_tolerance=None)
+    if endpoint_class == EndpointClass.JOB_CREATE:
+        return AimdLimiter(initial_limit=8, max_limit=128)
+    if endpoint_class == EndpointClass.JOB_READ:
+        return AimdLimiter(latency_tolerance=None)
+    return AimdLimiter()
+
+
+default_concurrency_limiters = ConcurrencyLimiters()
+
+
+class ConcurrencyHandler(BaseHandler):
+    """
+    Handler limiting the amount of concurrent calls per endpoint class.
+    Each attempt holds a slot of the limiter of its endpoint class, and the limit
+    adapts to the observed latency, throttling and errors.
+
+    :ivar ConcurrencyLimiters _limiters: The limiters of every endpoint class.
+    """
+
+    CONGESTION_STATUSES = frozenset({429, 502, 503, 504})
+
+    def __init__(self, limiters: Optional[ConcurrencyLimiters] = None):
+        """
+        Initialize a new instance of ConcurrencyHandler.
+
+        :param Optional[ConcurrencyLimiters] limiters: The limiters to use. Defaults to the limiters shared by the process.
+        """
+        super().__init__()
+        self._limiters = limiters or default_concurrency_limiters
+
+    def handle(
+        self, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Wait for a slot of the endpoint class, then send the request.
+
+        :param Request request: The request to send.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        limiter = self._limiters.get(classify_request(request))
+        timeout = request.deadline.remaining() if request.deadline else None
+        if not limiter.acquire(timeout):
+            return None, DeadlineExceededError()
+
+        start = monotonic()
+        congested = None
+        try:
+            response, error = self._next_handler.handle(request)
+            congested = self._is_congested(error)
+            return response, error
+        finally:
+            limiter.release(monotonic() - start, congested)
+
+    async def handle_async(
+        self, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Wait for a slot of the endpoint class without blocking the event loop, then send the request.
+
+        :param Request request: The request to send.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        limiter = self._limiters.get(classify_request(request))
+        # Slots are shared with threads, so they are polled rather than awaited
+        delay = ASYNC_POLL_INTERVAL
+        while not limiter.acquire(0):
+            if request.deadline is not None and request.deadline.expired():
+                return None, DeadlineExceededError()
+            await asyncio.sleep(
+                delay if request.deadline is None else request.deadline.cap(delay)
+            )
+            delay = min(delay * 2, MAX_ASYNC_POLL_INTERVAL)
+
+        start = monotonic()
+        congested = None
+        try:
+            response, error = await self._next_handler.handle_async(request)
+            congested = self._is_congested(error)
+            return response, error
+        finally:
+            limiter.release(monotonic() - start, congested)
+
+    def stream(
+        self, request: Request
+    ) -> Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]:
+        """
+        Stream the request. Streams are long-lived and do not take a slot.
+
+        :param Request request: The request to stream.
+        :return: The response and any error that occurred.
+        :rtype: Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        yield from self._next_handler.stream(request)
+
+    def _is_congested(self, error: Optional[RequestError]) -> Optional[bool]:
+        """
+        Translate the outcome of a call into a congestion signal.
+
+        :param Optional[RequestError] error: The error of the call, if any.
+        :return: True for throttling, timeouts and overload errors, False for success, None for other errors.
+        :rtype: Optional[bool]
+        """
+        if error is None:
+            return False
+        if isinstance(error, DeadlineExceededError):
+            return None
+        if not error.is_http_error or error.status in self.CONGESTION_STATUSES:
+            return True
+        return None
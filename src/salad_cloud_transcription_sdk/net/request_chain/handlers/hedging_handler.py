@@ -0,0 +1,322 @@
+import contextvars
+import math
+import threading
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from time import monotonic
+from typing import Deque, Generator, Iterable, Optional, Tuple
+from .base_handler import BaseHandler
+from .retry_handler import RetryBudget
+from ...transport.request import Request
+from ...transport.response import Response
+from ...transport.request_error import RequestError
+
+
+class HedgingPolicy:
+    """
+    Configuration describing when a second, hedged attempt of a request is sent.
+
+    :ivar float percentile: The latency percentile after which the hedged attempt is sent.
+    :ivar int min_samples: The amount of observed latencies required before hedging starts.
+    :ivar int window_size: The amount of recent latencies the percentile is computed from.
+    :ivar int min_delay_in_milliseconds: The lower bound for the hedging delay in milliseconds.
+    :ivar FrozenSet[str] methods: The HTTP methods that may be hedged.
+    :ivar int max_workers: The size of the thread pool running the attempts.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        window_size: int = 200,
+        min_delay_in_milliseconds: int = 10,
+        methods: Iterable[str] = ("GET",),
+        max_workers: int = 16,
+    ):
+        """
+        Initialize a new instance of HedgingPolicy.
+
+        :param float percentile: The latency percentile after which the hedged attempt is sent.
+        :param int min_samples: The amount of observed latencies required before hedging starts.
+        :param int window_size: The amount of recent latencies the percentile is computed from.
+        :param int min_delay_in_milliseconds: The lower bound for the hedging delay in milliseconds.
+        :param Iterable[str] methods: The HTTP methods that may be hedged. Only idempotent methods should be listed.
+        :param int max_workers: The size of the thread pool running the attempts.
+        """
+        if not 0 < percentile < 100:
+            raise ValueError("The hedging percentile must be between 0 and 100.")
+
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window_size = window_size
+        self.min_delay_in_milliseconds = min_delay_in_milliseconds
+        self.methods = frozenset(method.upper() for method in methods)
+        self.max_workers = max_workers
+
+
+class LatencyTracker:
+    """
+    Thread-safe sliding window of observed request latencies.
+
+    :ivar int window_size: The amount of latencies kept.
+    """
+
+    def __init__(self, window_size: int = 200):
+        """
+        Initialize a new instance of LatencyTracker.
+
+        :param int window_size: The amount of latencies kept.
+        """
+        self.window_size = window_size
+        self._samples: Deque[float] = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def record(self, latency_in_seconds: float) -> None:
+        """
+        Add an observed latency.
+
+        :param float latency_in_seconds: The latency in seconds.
+        """
+        with self._lock:
+            self._samples.append(latency_in_seconds)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Get a percentile of the observed latencies using the nearest-rank method.
+
+        :param float percentile: The percentile, between 0 and 100.
+        :return: The latency in seconds, or None if nothing was observed yet.
+        :rtype: Optional[float]
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+
+        if not samples:
+            return None
+
+        rank = max(1, math.ceil(percentile / 100 * len(samples)))
+        return samples[rank - 1]
+
+
+class HedgingHandler(BaseHandler):
+    """
+    Handler sending a second attempt of slow idempotent requests.
+    When the first attempt has not answered within the configured latency percentile, the request
+    is sent again and whichever attempt completes first wins. The pending attempt is cancelled if it
+    has not started yet, otherwise its result is discarded. Each hedged attempt withdraws a token
+    from the retry budget, so hedging stops when the service is overloaded. The delay counts from
+    the start of the first attempt, and requests are sent without hedging while the attempts fill
+    the thread pool, so time spent queued is never mistaken for a slow answer. Each attempt sends
+    its own copy of the request.
+
+    :ivar HedgingPolicy _policy: The policy deciding when to hedge.
+    :ivar RetryBudget _budget: The budget hedged attempts are withdrawn from.
+    :ivar LatencyTracker _tracker: The observed latencies.
+    """
+
+    def __init__(
+        self,
+        policy: Optional[HedgingPolicy] = None,
+        budget: Optional[RetryBudget] = None,
+        tracker: Optional[LatencyTracker] = None,
+    ):
+        """
+        Initialize a new instance of HedgingHandler.
+
+        :param Optional[HedgingPolicy] policy: The hedging policy. Defaults to HedgingPolicy().
+        :param Optional[RetryBudget] budget: The budget hedged attempts are withdrawn from.
+        :param Optional[LatencyTracker] tracker: The latency tracker. Defaults to a tracker private to this handler.
+        """
+        super().__init__()
+        self._policy = policy or HedgingPolicy()
+        self._budget = budget or RetryBudget()
+        self._tracker = tracker or LatencyTracker(self._policy.window_size)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._busy_workers = 0
+        self._closed = False
+
+    def handle(
+        self, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Send the request, hedging it with a second attempt when the first one is slow.
+
+        :param Request request: The request to send.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        delay = self._get_hedge_delay(request)
+        if delay is None or not self._reserve_worker():
+            return self._send(request)
+
+        executor = self._get_executor()
+        started = threading.Event()
+        first = self._submit(executor, request.copy(), started)
+        if first is None:
+            return self._send(request)
+        started.wait()
+        done, _ = wait([first], timeout=delay)
+        if done or not self._reserve_worker():
+            return first.result()
+        if not self._budget.try_acquire():
+            self._release_worker()
+            return first.result()
+
+        second = self._submit(executor, request.copy())
+        if second is None:
+            return first.result()
+        done, pending = wait([first, second], return_when=FIRST_COMPLETED)
+
+        # Both attempts may be done already: prefer any successful answer over an error
+        for attempt in (first, second):
+            if attempt in done and attempt.result()[1] is None:
+                (second if attempt is first else first).cancel()
+                return attempt.result()
+
+        if pending:
+            # Wait for the other attempt rather than returning the first error
+            return pending.pop().result()
+        return first.result()
+
+    def close(self) -> None:
+        """
+        Stop hedging and release the thread pool once the running attempts end.
+        Requests still handled afterwards are sent without hedging.
+        """
+        with self._executor_lock:
+            self._closed = True
+            executor = self._executor
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def stream(
+        self, request: Request
+    ) -> Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]:
+        """
+        Stream the request. Streams are never hedged.
+
+        :param Request request: The request to stream.
+        :return: The response and any error that occurred.
+        :rtype: Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        yield from self._next_handler.stream(request)
+
+    def _get_hedge_delay(self, request: Request) -> Optional[float]:
+        """
+        Get how long to wait for the first attempt before hedging.
+
+        :param Request request: The request to send.
+        :return: The delay in seconds, or None if the request must not be hedged.
+        :rtype: Optional[float]
+        """
+        if (request.method or "").upper() not in self._policy.methods:
+            return None
+
+        if len(self._tracker) < self._policy.min_samples:
+            return None
+
+        latency = self._tracker.percentile(self._policy.percentile)
+        delay = max(latency, self._policy.min_delay_in_milliseconds / 1000)
+        if request.deadline is not None and delay >= request.deadline.remaining():
+            return None
+
+        return delay
+
+    def _send(
+        self, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Send one attempt and record its latency.
+
+        :param Request request: The request to send.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        """
+        start = monotonic()
+        response, error = self._next_handler.handle(request)
+        if error is None:
+            self._tracker.record(monotonic() - start)
+
+        return response, error
+
+    def _submit(
+        self,
+        executor: ThreadPoolExecutor,
+        request: Request,
+        started: Optional[threading.Event] = None,
+    ) -> Optional[Future]:
+        """
+        Run one attempt on the executor, keeping the caller's context variables.
+        The attempt must hold a worker reserved with _reserve_worker, released when it ends.
+
+        :param ThreadPoolExecutor executor: The executor running the attempt.
+        :param Request request: The request to send.
+        :param Optional[threading.Event] started: An event set when the attempt starts.
+        :return: The future of the attempt, None if the handler was closed meanwhile.
+        :rtype: Optional[Future]
+        """
+
+        def attempt() -> Tuple[Optional[Response], Optional[RequestError]]:
+            if started is not None:
+                started.set()
+            return self._send(request)
+
+        context = contextvars.copy_context()
+        try:
+            future = executor.submit(context.run, attempt)
+        except RuntimeError:
+            # The handler was closed, and its thread pool shut down
+            self._release_worker()
+            return None
+        # Released when the attempt ends, or when it is cancelled before starting
+        future.add_done_callback(lambda _: self._release_worker())
+        return future
+
+    def _reserve_worker(self) -> bool:
+        """
+        Reserve a worker of the thread pool for an attempt, if one is free.
+
+        :return: True if a worker was reserved, False if the pool is saturated.
+        :rtype: bool
+        """
+        with self._executor_lock:
+            if self._closed or self._busy_workers >= self._policy.max_workers:
+                return False
+            self._busy_workers += 1
+            return True
+
+    def _release_worker(self) -> None:
+        """
+        Release a worker reserved for an attempt.
+        """
+        with self._executor_lock:
+            self._busy_workers -= 1
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Get the thread pool running the attempts, creating it on first use.
+
+        :return: The thread pool.
+        :rtype: ThreadPoolExecutor
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._policy.max_workers,
+                    thread_name_prefix="salad-hedging",
+                )
+            return self._executor
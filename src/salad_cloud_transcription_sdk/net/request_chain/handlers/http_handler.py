@@ -1,11 +1,26 @@
+import asyncio
 import requests
 
 from requests.exceptions import Timeout
-from typing import Generator, Optional, Tuple
+from requests.utils import default_headers
+from typing import Callable, Generator, Iterator, Optional, Tuple, Union
 from .base_handler import BaseHandler
 from ...transport.request import Request
 from ...transport.response import Response
-from ...transport.request_error import RequestError
+from ...transport.request_error import DeadlineExceededError, RequestError
+from ...transport.file_part import FilePart
+from ...transport.multipart_body import MultipartBody
+from ...transport.compression import ACCEPT_ENCODING, compress_json
+from ...transport.transports import (
+    AsyncTransport,
+    ThreadedAsyncTransport,
+    Transport,
+    create_async_transport,
+    default_transport,
+)
+from ...utils.bandwidth_limiter import BandwidthLimiter, BandwidthPriority
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
 
 
 class HttpHandler(BaseHandler):
@@ -13,15 +28,59 @@ class HttpHandler(BaseHandler):
     Handler for making HTTP requests.
     This handler sends the request to the specified URL and returns the response.
 
-    :ivar int _timeout_in_seconds: The timeout for the HTTP request in seconds.
+    :ivar int _timeout_in_seconds: The read timeout for the HTTP request in seconds.
+    :ivar int _connect_timeout_in_seconds: The connect timeout for the HTTP request in seconds.
+    :ivar Optional[int] _compression_threshold: The minimum size in bytes of JSON bodies sent gzip-compressed, None to never compress.
+    :ivar Optional[int] _spill_threshold: The maximum size in bytes of response bodies kept in memory, None to never spill to disk.
+    :ivar Transport _transport: The backend sending the requests.
+    :ivar AsyncTransport _async_transport: The backend sending the requests of coroutines.
+    :ivar Optional[BandwidthLimiter] _bandwidth_limiter: The limiter throttling upload bodies, None to never throttle them.
+    :ivar BandwidthPriority _bandwidth_priority: The priority class of the upload bodies.
     """
 
-    def __init__(self, timeout=60000):
+    def __init__(
+        self,
+        timeout=60000,
+        connect_timeout=None,
+        compression_threshold=None,
+        spill_threshold=None,
+        transport: Optional[Transport] = None,
+        bandwidth_limiter: Optional[BandwidthLimiter] = None,
+        bandwidth_priority: Union[
+            BandwidthPriority, str
+        ] = BandwidthPriority.INTERACTIVE,
+        async_transport: Optional[AsyncTransport] = None,
+    ):
         """
         Initialize a new instance of HttpHandler.
+
+        :param int timeout: The read timeout in milliseconds.
+        :param Optional[int] connect_timeout: The connect timeout in milliseconds. Defaults to the read timeout.
+        :param Optional[int] compression_threshold: The minimum size in bytes of JSON bodies sent gzip-compressed, None to never compress.
+        :param Optional[int] spill_threshold: The maximum size in bytes of response bodies kept in memory, None to never spill to disk.
+        :param Optional[Transport] transport: The backend sending the requests, the default requests session if None.
+        :param Optional[BandwidthLimiter] bandwidth_limiter: The limiter throttling upload bodies, None to never throttle them.
+        :param Union[BandwidthPriority, str] bandwidth_priority: The priority class of the upload bodies.
+        :param Optional[AsyncTransport] async_transport: The backend sending the requests of coroutines. If None, httpx when it is installed and the transport is the default one, otherwise the transport run in worker threads.
         """
         super().__init__()
         self._timeout_in_seconds = timeout / 1000
+        self._connect_timeout_in_seconds = (
+            connect_timeout / 1000
+            if connect_timeout is not None
+            else self._timeout_in_seconds
+        )
+        self._compression_threshold = compression_threshold
+        self._spill_threshold = spill_threshold
+        self._transport = transport if transport is not None else default_transport
+        self._bandwidth_limiter = bandwidth_limiter
+        self._bandwidth_priority = BandwidthPriority(bandwidth_priority)
+        if async_transport is not None:
+            self._async_transport = async_transport
+        elif self._transport is default_transport:
+            self._async_transport = create_async_transport()
+        else:
+            self._async_transport = ThreadedAsyncTransport(self._transport)
 
     def handle(
         self, request: Request
@@ -33,43 +92,79 @@ def handle(
         :return: The response and any error that occurred.
         :rtype: Tuple[Optional[Response], Optional[RequestError]]
         """
+        if request.deadline is not None and request.deadline.expired():
+            return None, DeadlineExceededError()
+
         try:
-            request_args = self._get_request_data(request)
-
-            result = requests.request(
-                request.method,
-                request.url,
-                headers=request.headers,
-                timeout=self._timeout_in_seconds,
-                **request_args,
+            # The timeout is taken after preparing, which may read a file part from disk
+            prepared = self._prepare(request)
+            timeout = self._get_timeout(request)
+            if timeout is None:
+                return None, DeadlineExceededError()
+
+            result = self._transport.send(
+                prepared, timeout, stream=self._spill_threshold is not None
+            )
+            return self._get_result(
+                request, Response(result, spill_threshold=self._spill_threshold)
             )
-            response = Response(result)
+        except Timeout:
+            if request.deadline is not None and request.deadline.expired():
+                return None, DeadlineExceededError()
+            return None, RequestError("Request timed out")
 
-            if response.status >= 400:
-                return None, RequestError(
-                    message=f"{response.status} error in request to: {request.url}",
-                    status=response.status,
-                    response=response,
-                )
+    async def handle_async(
+        self, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Send the request with the async transport and return the response.
+
+        :param Request request: The request to send.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        """
+        if request.deadline is not None and request.deadline.expired():
+            return None, DeadlineExceededError()
+
+        try:
+            if self._has_upload_body(request):
+                # Files are read from disk and uploads copied while the body is encoded
+                prepared = await asyncio.to_thread(self._prepare, request)
+            else:
+                prepared = self._prepare(request)
+            timeout = self._get_timeout(request)
+            if timeout is None:
+                return None, DeadlineExceededError()
+
+            result = await self._async_transport.send(prepared, timeout)
+            if self._spill_threshold is None:
+                return self._get_result(request, Response(result))
 
-            return response, None
+            # Bodies past the threshold are written to a temporary file, off the event loop
+            response = await asyncio.to_thread(
+                Response, result, spill_threshold=self._spill_threshold
+            )
+            return self._get_result(request, response)
         except Timeout:
+            if request.deadline is not None and request.deadline.expired():
+                return None, DeadlineExceededError()
             return None, RequestError("Request timed out")
 
     def stream(
         self, request: Request
     ) -> Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]:
+        if request.deadline is not None and request.deadline.expired():
+            yield None, DeadlineExceededError()
+            return
+
         try:
-            request_args = self._get_request_data(request)
-
-            result = requests.request(
-                request.method,
-                request.url,
-                headers=request.headers,
-                timeout=self._timeout_in_seconds,
-                stream=True,
-                **request_args,
-            )
+            prepared = self._prepare(request)
+            timeout = self._get_timeout(request)
+            if timeout is None:
+                yield None, DeadlineExceededError()
+                return
+
+            result = self._transport.send(prepared, timeout, stream=True)
 
             if result.status_code >= 400:
                 response = Response(result)
@@ -83,22 +178,178 @@ def stream(
                 )
 
             else:
-                for chunk in result.iter_content(chunk_size=8192):
-                    for response in Response.from_chunk(result, chunk):
-                        yield response, None
+                for response in Response.from_stream(result):
+                    yield response, None
 
         except Timeout:
-            yield None, RequestError("Request timed out")
+            if request.deadline is not None and request.deadline.expired():
+                yield None, DeadlineExceededError()
+            else:
+                yield None, RequestError("Request timed out")
+
+    def _get_result(
+        self, request: Request, response: Response
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Turn error responses into errors.
+
+        :param Request request: The request that was sent.
+        :param Response response: The response.
+        :return: The response, or the error if its status is 400 or higher.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        """
+        if response.status >= 400:
+            return None, RequestError(
+                message=f"{response.status} error in request to: {request.url}",
+                status=response.status,
+                response=response,
+            )
 
-    def _get_request_data(self, request: Request) -> dict:
+        return response, None
+
+    def _has_upload_body(self, request: Request) -> bool:
+        """
+        Check whether the body of the request holds uploaded data, slow to encode.
+
+        :param Request request: The request object.
+        :return: True if the body is or holds a FilePart or bytes.
+        :rtype: bool
+        """
+        body = request.body
+        if isinstance(body, (FilePart, bytes)):
+            return True
+        return isinstance(body, dict) and any(
+            isinstance(value, (FilePart, bytes)) for value in body.values()
+        )
+
+    def _prepare(self, request: Request) -> requests.PreparedRequest:
+        """
+        Encode the request for the transport.
+
+        :param Request request: The request object.
+        :return: The request with its headers and body encoded.
+        :rtype: requests.PreparedRequest
+        """
+        # The same defaults as requests.request, such as the User-Agent
+        headers = default_headers()
+        headers.update(self._get_headers(request))
+        content_type = headers.get("Content-Type", "")
+        # The body is encoded into a copy of the headers, so that retries encode it again the same way
+        request_args = self._get_request_data(request, headers)
+
+        prepared = requests.Request(
+            request.method, request.url, headers=headers, **request_args
+        ).prepare()
+
+        # Upload bodies are streamed in chunks, their Content-Length is kept
+        if isinstance(prepared.body, MultipartBody) or (
+            isinstance(prepared.body, bytes)
+            and "application/octet-stream" in content_type
+        ):
+            prepared.body = self._stream_upload_body(prepared.body, request)
+
+        return prepared
+
+    def _stream_upload_body(
+        self, body: Union[bytes, MultipartBody], request: Request
+    ) -> Union[bytes, Iterator[bytes]]:
+        """
+        Stream an upload body in chunks, throttled by the bandwidth limiter and followed by
+        the upload progress function of the request, when either is set. Multipart bodies
+        are always streamed, so their files are not copied into the encoded body.
+
+        :param Union[bytes, MultipartBody] body: The encoded body, or the multipart body.
+        :param Request request: The request object.
+        :return: The body, or its chunks.
+        :rtype: Union[bytes, Iterator[bytes]]
+        """
+        limiter = self._bandwidth_limiter
+        if limiter is not None and limiter.limited:
+            chunks = limiter.throttle(
+                (
+                    body.chunks(limiter.chunk_size)
+                    if isinstance(body, MultipartBody)
+                    else body
+                ),
+                self._bandwidth_priority,
+            )
+        elif isinstance(body, MultipartBody):
+            chunks = body.chunks(UPLOAD_CHUNK_SIZE)
+        elif request.upload_progress is not None:
+            chunks = (
+                body[offset : offset + UPLOAD_CHUNK_SIZE]
+                for offset in range(0, len(body), UPLOAD_CHUNK_SIZE)
+            )
+        else:
+            return body
+
+        if request.upload_progress is None:
+            return chunks
+        return self._follow_upload(chunks, len(body), request.upload_progress)
+
+    def _follow_upload(
+        self,
+        chunks: Iterator[bytes],
+        size: int,
+        upload_progress: Callable[[int, int], None],
+    ) -> Generator[bytes, None, None]:
+        """
+        Report the bytes of a body sent after each chunk is taken by the transport.
+
+        :param Iterator[bytes] chunks: The chunks of the body.
+        :param int size: The size of the body in bytes.
+        :param Callable[[int, int], None] upload_progress: The function called with the bytes sent and the size of the body.
+        :return: The chunks.
+        :rtype: Generator[bytes, None, None]
+        """
+        sent = 0
+        upload_progress(sent, size)
+        for chunk in chunks:
+            yield chunk
+            sent += len(chunk)
+            upload_progress(sent, size)
+
+    def _get_timeout(self, request: Request) -> Optional[Tuple[float, float]]:
+        """
+        Get the connect and read timeouts for the request, limited by its deadline.
+
+        :param Request request: The request object.
+        :return: The connect and read timeouts in seconds, None if the deadline left no time.
+        :rtype: Optional[Tuple[float, float]]
+        """
+        if request.deadline is None:
+            return self._connect_timeout_in_seconds, self._timeout_in_seconds
+
+        timeout = (
+            request.deadline.cap(self._connect_timeout_in_seconds),
+            request.deadline.cap(self._timeout_in_seconds),
+        )
+        if min(timeout) <= 0:
+            return None
+        return timeout
+
+    def _get_headers(self, request: Request) -> dict:
+        """
+        Get the request headers, negotiating the response encodings supported by the installed decoders.
+
+        :param Request request: The request object.
+        :return: The headers to send.
+        :rtype: dict
+        """
+        headers = dict(request.headers or {})
+        if not any(key.lower() == "accept-encoding" for key in headers):
+            headers["Accept-Encoding"] = ACCEPT_ENCODING
+        return headers
+
+    def _get_request_data(self, request: Request, headers: dict) -> dict:
         """
         Get the request arguments based on the request headers and data.
 
         :param Request request: The request object.
+        :param dict headers: The headers to send, updated for the encoding of the body.
         :return: The request arguments.
         :rtype: dict
         """
-        headers = request.headers or {}
         data = request.body or {}
         content_type = headers.get("Content-Type", "application/json")
 
@@ -106,20 +357,35 @@ def _get_request_data(self, request: Request) -> dict:
             return {}
 
         if "application/octet-stream" in content_type:
+            if isinstance(data, FilePart):
+                return {"data": data.read()}
             return {"data": data}
 
         if content_type.startswith("application/") and "json" in content_type:
+            if self._compression_threshold is not None:
+                compressed = compress_json(data, self._compression_threshold)
+                if compressed is not None:
+                    headers["Content-Encoding"] = "gzip"
+                    return {"data": compressed}
             return {"json": data}
 
         if "multipart/form-data" in content_type:
-            headers.pop("Content-Type", None)
             files, form_data = {}, {}
             for key, value in data.items():
-                if isinstance(value, bytes):
+                if isinstance(value, FilePart):
+                    files[key] = value.read()
+                elif isinstance(value, bytes):
                     files[key] = value
                 else:
                     form_data[key] = value
-            return {"files": files, "data": form_data}
+            if not files:
+                headers.pop("Content-Type", None)
+                return {"data": form_data}
+
+            # The body is streamed from the files, requests would copy them into it
+            body = MultipartBody(form_data, files)
+            headers["Content-Type"] = body.content_type
+            return {"data": body}
 
         if "application/x-www-form-urlencoded" in content_type:
             form_data = {}
@@ -0,0 +1,543 @@
+import bisect
+import threading
+
+from time import monotonic, time
+from typing import Callable, Dict, Generator, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+from .base_handler import BaseHandler
+from ...transport.request import Request
+from ...transport.response import Response
+from ...transport.request_error import RequestError
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+class RequestRecord:
+    """
+    The timing and size of one attempt of a request.
+
+    :ivar str endpoint: The endpoint template, e.g. /organizations/{organization_name}/files/{filename}.
+    :ivar str method: The HTTP method.
+    :ivar int status: The HTTP status, -1 if no response was received.
+    :ivar int attempt: The attempt number, starting at 1.
+    :ivar int bytes_sent: The size of the request body.
+    :ivar int bytes_received: The size of the response body.
+    :ivar Optional[float] time_to_first_byte: The time until the response headers were received in seconds.
+    :ivar float duration: The total duration of the attempt in seconds.
+    :ivar float started_at: The epoch time at which the attempt started.
+    :ivar Optional[str] error: The error message if the attempt failed.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        method: str,
+        status: int,
+        attempt: int,
+        bytes_sent: int,
+        bytes_received: int,
+        time_to_first_byte: Optional[float],
+        duration: float,
+        started_at: float,
+        error: Optional[str] = None,
+    ):
+        self.endpoint = endpoint
+        self.method = method
+        self.status = status
+        self.attempt = attempt
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.time_to_first_byte = time_to_first_byte
+        self.duration = duration
+        self.started_at = started_at
+        self.error = error
+
+    def __str__(self) -> str:
+        return (
+            f"RequestRecord(endpoint={self.endpoint}, method={self.method}, status={self.status}, "
+            f"attempt={self.attempt}, duration={self.duration:.3f}s)"
+        )
+
+
+class InstrumentationSink:
+    """
+    The destination of request records.
+    This class must be implemented by all instrumentation sinks.
+    """
+
+    def record(self, record: RequestRecord) -> None:
+        """
+        Receive the record of one attempt.
+
+        :param RequestRecord record: The record.
+        """
+        raise NotImplementedError()
+
+
+class CallbackSink(InstrumentationSink):
+    """
+    A sink passing every record to a callback.
+    """
+
+    def __init__(self, callback: Callable[[RequestRecord], None]):
+        """
+        Initialize a new instance of CallbackSink.
+
+        :param Callable[[RequestRecord], None] callback: Called with every record.
+        """
+        self._callback = callback
+
+    def record(self, record: RequestRecord) -> None:
+        self._callback(record)
+
+
+class Histogram:
+    """
+    A cumulative histogram of observed values.
+
+    :ivar Sequence[float] buckets: The upper bounds of the buckets, in increasing order.
+    :ivar List[int] counts: The amount of values falling in each bucket, the last one counting values above all bounds.
+    :ivar int count: The amount of observed values.
+    :ivar float sum: The sum of the observed values.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Add a value to the histogram.
+
+        :param float value: The value.
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile from the buckets, using the upper bound of the bucket it falls in.
+
+        :param float q: The quantile, between 0 and 1.
+        :return: The estimate, or None if nothing was observed.
+        :rtype: Optional[float]
+        """
+        if self.count == 0:
+            return None
+
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank and count > 0:
+                return (
+                    self.buckets[index] if index < len(self.buckets) else float("inf")
+                )
+        return float("inf")
+
+
+class _EndpointStats:
+    """
+    The aggregated records of one endpoint, method and status.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.duration = Histogram(buckets)
+        self.time_to_first_byte = Histogram(buckets)
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+
+
+class HistogramSink(InstrumentationSink):
+    """
+    A sink aggregating the records in memory, per endpoint template, method and status.
+
+    :ivar Sequence[float] buckets: The upper bounds in seconds of the duration buckets.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialize a new instance of HistogramSink.
+
+        :param Sequence[float] buckets: The upper bounds in seconds of the duration buckets.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._stats: Dict[Tuple[str, str, int], _EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, record: RequestRecord) -> None:
+        key = (record.endpoint, record.method, record.status)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = _EndpointStats(self.buckets)
+                self._stats[key] = stats
+
+            stats.duration.observe(record.duration)
+            if record.time_to_first_byte is not None:
+                stats.time_to_first_byte.observe(record.time_to_first_byte)
+            stats.bytes_sent += record.bytes_sent
+            stats.bytes_received += record.bytes_received
+            if record.attempt > 1:
+                stats.retries += 1
+
+    def snapshot(self) -> List[dict]:
+        """
+        Get a summary of the aggregated records.
+
+        :return: One entry per endpoint template, method and status with counts, byte totals and duration quantiles.
+        :rtype: List[dict]
+        """
+        with self._lock:
+            return [
+                {
+                    "endpoint": endpoint,
+                    "method": method,
+                    "status": status,
+                    "count": stats.duration.count,
+                    "retries": stats.retries,
+                    "bytes_sent": stats.bytes_sent,
+                    "bytes_received": stats.bytes_received,
+                    "duration_sum": stats.duration.sum,
+                    "duration_p50": stats.duration.quantile(0.5),
+                    "duration_p99": stats.duration.quantile(0.99),
+                    "time_to_first_byte_p50": stats.time_to_first_byte.quantile(0.5),
+                }
+                for (endpoint, method, status), stats in self._stats.items()
+            ]
+
+
+class PrometheusSink(HistogramSink):
+    """
+    A histogram sink rendering its aggregates in the Prometheus text exposition format,
+    e.g. to be served on a /metrics endpoint of the application.
+
+    :ivar str prefix: The prefix of the metric names.
+    """
+
+    def __init__(
+        self, buckets: Sequence[float] = DEFAULT_BUCKETS, prefix: str = "salad_sdk"
+    ):
+        """
+        Initialize a new instance of PrometheusSink.
+
+        :param Sequence[float] buckets: The upper bounds in seconds of the duration buckets.
+        :param str prefix: The prefix of the metric names.
+        """
+        super().__init__(buckets)
+        self.prefix = prefix
+
+    def render(self) -> str:
+        """
+        Render the aggregated records.
+
+        :return: The metrics in the Prometheus text exposition format.
+        :rtype: str
+        """
+        with self._lock:
+            stats = [
+                (self._get_labels(key), value) for key, value in self._stats.items()
+            ]
+
+        lines = []
+        for name, help_text, attribute in (
+            (
+                "http_request_duration_seconds",
+                "Duration of HTTP request attempts.",
+                "duration",
+            ),
+            (
+                "http_time_to_first_byte_seconds",
+                "Time until the response headers of HTTP request attempts were received.",
+                "time_to_first_byte",
+            ),
+        ):
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for labels, value in stats:
+                histogram = getattr(value, attribute)
+                cumulative = 0
+                for bound, count in zip(
+                    self.buckets + (float("inf"),), histogram.counts
+                ):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+
+        for name, help_text, attribute in (
+            (
+                "http_request_bytes_sent_total",
+                "Bytes sent in request bodies.",
+                "bytes_sent",
+            ),
+            (
+                "http_response_bytes_received_total",
+                "Bytes received in response bodies.",
+                "bytes_received",
+            ),
+            ("http_request_retries_total", "Retried request attempts.", "retries"),
+        ):
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for labels, value in stats:
+                lines.append(f"{metric}{{{labels}}} {getattr(value, attribute)}")
+
+        return "\n".join(lines) + "\n"
+
+    def _get_labels(self, key: Tuple[str, str, int]) -> str:
+        """
+        Format the labels of an aggregate.
+
+        :param Tuple[str, str, int] key: The endpoint template, method and status.
+        :return: The labels, escaped for the exposition format.
+        :rtype: str
+        """
+        endpoint, method, status = key
+        endpoint = endpoint.replace("\\", "\\\\").replace('"', '\\"')
+        return f'endpoint="{endpoint}",method="{method}",status="{status}"'
+
+
+class Instrumentation:
+    """
+    The sinks receiving the request records of the services using it.
+    One instance is shared by all services of the process unless a service is given its own.
+    """
+
+    def __init__(self, sinks: Optional[List[InstrumentationSink]] = None):
+        """
+        Initialize a new instance of Instrumentation.
+
+        :param Optional[List[InstrumentationSink]] sinks: The initial sinks.
+        """
+        self._sinks: Tuple[InstrumentationSink, ...] = tuple(sinks or [])
+        self._lock = threading.Lock()
+
+    @property
+    def sinks(self) -> Tuple[InstrumentationSink, ...]:
+        """The registered sinks."""
+        return self._sinks
+
+    def add_sink(self, sink: InstrumentationSink) -> InstrumentationSink:
+        """
+        Register a sink.
+
+        :param InstrumentationSink sink: The sink.
+        :return: The sink, for chaining.
+        :rtype: InstrumentationSink
+        """
+        with self._lock:
+            self._sinks = self._sinks + (sink,)
+        return sink
+
+    def remove_sink(self, sink: InstrumentationSink) -> None:
+        """
+        Unregister a sink if it is registered.
+
+        :param InstrumentationSink sink: The sink.
+        """
+        with self._lock:
+            self._sinks = tuple(s for s in self._sinks if s is not sink)
+
+    def emit(self, record: RequestRecord) -> None:
+        """
+        Pass a record to every sink. A failing sink never fails the request.
+
+        :param RequestRecord record: The record.
+        """
+        for sink in self._sinks:
+            try:
+                sink.record(record)
+            except Exception:
+                pass
+
+
+default_instrumentation = Instrumentation()
+
+
+class InstrumentationHandler(BaseHandler):
+    """
+    Handler recording the timing and size of every attempt and passing it to the
+    sinks of an instrumentation. Nothing is measured while no sink is registered.
+
+    :ivar Instrumentation _instrumentation: The instrumentation receiving the records.
+    """
+
+    def __init__(self, instrumentation: Optional[Instrumentation] = None):
+        """
+        Initialize a new instance of InstrumentationHandler.
+
+        :param Optional[Instrumentation] instrumentation: The instrumentation receiving the records. Defaults to the one shared by the process.
+        """
+        super().__init__()
+        self._instrumentation = instrumentation or default_instrumentation
+
+    def handle(
+        self, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Send the request and record its timing.
+
+        :param Request request: The request to send.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        if not self._instrumentation.sinks:
+            return self._next_handler.handle(request)
+
+        started_at = time()
+        start = monotonic()
+        response, error = self._next_handler.handle(request)
+        self._record(request, response, error, started_at, monotonic() - start)
+
+        return response, error
+
+    async def handle_async(
+        self, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Send the request from a coroutine and record its timing.
+
+        :param Request request: The request to send.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        if not self._instrumentation.sinks:
+            return await self._next_handler.handle_async(request)
+
+        started_at = time()
+        start = monotonic()
+        response, error = await self._next_handler.handle_async(request)
+        self._record(request, response, error, started_at, monotonic() - start)
+
+        return response, error
+
+    def _record(
+        self,
+        request: Request,
+        response: Optional[Response],
+        error: Optional[RequestError],
+        started_at: float,
+        duration: float,
+    ) -> None:
+        """
+        Emit the record of a request.
+
+        :param Request request: The request that was sent.
+        :param Optional[Response] response: The response.
+        :param Optional[RequestError] error: The error that occurred.
+        :param float started_at: The time the request started, in seconds since the epoch.
+        :param float duration: The duration of the request in seconds.
+        """
+        measured = (
+            response if response is not None else getattr(error, "response", None)
+        )
+        self._instrumentation.emit(
+            RequestRecord(
+                endpoint=self._get_endpoint(request),
+                method=(request.method or "").upper(),
+                status=measured.status if measured is not None else -1,
+                attempt=request.attempt,
+                bytes_sent=measured.bytes_sent if measured is not None else 0,
+                bytes_received=measured.bytes_received if measured is not None else 0,
+                time_to_first_byte=measured.elapsed if measured is not None else None,
+                duration=duration,
+                started_at=started_at,
+                error=str(error) if error is not None else None,
+            )
+        )
+
+    def stream(
+        self, request: Request
+    ) -> Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]:
+        """
+        Stream the request and record its timing once the stream ends.
+
+        :param Request request: The request to stream.
+        :return: The response and any error that occurred.
+        :rtype: Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        if not self._instrumentation.sinks:
+            yield from self._next_handler.stream(request)
+            return
+
+        started_at = time()
+        start = monotonic()
+        time_to_first_byte = None
+        status = -1
+        bytes_sent = 0
+        bytes_received = 0
+        last_error = None
+        try:
+            for response, error in self._next_handler.stream(request):
+                if time_to_first_byte is None:
+                    time_to_first_byte = monotonic() - start
+                measured = (
+                    response
+                    if response is not None
+                    else getattr(error, "response", None)
+                )
+                if measured is not None:
+                    status = measured.status
+                    bytes_sent = measured.bytes_sent
+                    bytes_received += measured.bytes_received
+                last_error = error
+                yield response, error
+        finally:
+            self._instrumentation.emit(
+                RequestRecord(
+                    endpoint=self._get_endpoint(request),
+                    method=(request.method or "").upper(),
+                    status=status,
+                    attempt=request.attempt,
+                    bytes_sent=bytes_sent,
+                    bytes_received=bytes_received,
+                    time_to_first_byte=time_to_first_byte,
+                    duration=monotonic() - start,
+                    started_at=started_at,
+                    error=str(last_error) if last_error is not None else None,
+                )
+            )
+
+    def _get_endpoint(self, request: Request) -> str:
+        """
+        Get the endpoint template of a request, without the base URL.
+
+        :param Request request: The request.
+        :return: The path of the endpoint template, or of the URL if the request has no template.
+        :rtype: str
+        """
+        return urlparse(request.endpoint_template or request.url or "").path
@@ -0,0 +1,321 @@
+import json
+import os
+import re
+import threading
+
+from time import sleep, time
+from typing import Dict, Generator, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+from .base_handler import BaseHandler
+from ...transport.request import Request
+from ...transport.response import Response
+from ...transport.request_error import DeadlineExceededError, RequestError
+from ...utils.token_bucket import TokenBucket, refill, reserve
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+_ORGANIZATION_PATTERN = re.compile(r"/organizations/([^/?#]+)")
+
+
+class RateLimit:
+    """
+    A request rate ceiling applied to every host, or to every organization of a host.
+
+    :ivar float requests_per_second: The sustained request rate.
+    :ivar float burst: The amount of requests that may be sent at once after an idle period.
+    :ivar str scope: Either RateLimit.HOST or RateLimit.ORGANIZATION.
+    """
+
+    HOST = "host"
+    ORGANIZATION = "organization"
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        burst: Optional[float] = None,
+        scope: str = HOST,
+    ):
+        """
+        Initialize a new instance of RateLimit.
+
+        :param float requests_per_second: The sustained request rate.
+        :param Optional[float] burst: The amount of requests that may be sent at once. Defaults to one second of requests.
+        :param str scope: Either RateLimit.HOST or RateLimit.ORGANIZATION.
+        """
+        if requests_per_second <= 0:
+            raise ValueError("The request rate must be greater than 0.")
+        if scope not in (self.HOST, self.ORGANIZATION):
+            raise ValueError(
+                f"Rate limit scope must be one of {[self.HOST, self.ORGANIZATION]}"
+            )
+
+        self.requests_per_second = requests_per_second
+        self.burst = burst if burst is not None else max(1.0, requests_per_second)
+        self.scope = scope
+
+    def get_key(self, request: Request) -> Optional[str]:
+        """
+        Get the bucket a request is counted in.
+
+        :param Request request: The request.
+        :return: The bucket key, or None if the limit does not apply to the request.
+        :rtype: Optional[str]
+        """
+        parsed_url = urlparse(request.url or "")
+        if self.scope == self.HOST:
+            return f"host:{parsed_url.netloc}"
+
+        match = _ORGANIZATION_PATTERN.search(parsed_url.path)
+        if match is None:
+            return None
+        return f"organization:{parsed_url.netloc}:{match.group(1)}"
+
+
+class RateLimitBackend:
+    """
+    The storage holding the token buckets of the rate limiter.
+    This class must be implemented by all rate limit backends.
+    """
+
+    def reserve(self, reservations: Iterable[Tuple[str, RateLimit]]) -> float:
+        """
+        Take one token from each of the given buckets.
+
+        :param Iterable[Tuple[str, RateLimit]] reservations: The bucket keys with the limit that applies to them.
+        :return: The time in seconds the caller must wait before sending the request.
+        :rtype: float
+        """
+        raise NotImplementedError()
+
+    def refund(self, reservations: Iterable[Tuple[str, RateLimit]]) -> None:
+        """
+        Give back the tokens of a reservation whose request was not sent.
+        Backends that cannot give tokens back keep them taken.
+
+        :param Iterable[Tuple[str, RateLimit]] reservations: The bucket keys with the limit that applies to them.
+        """
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    A backend keeping the buckets in memory, shared by all threads of the process.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, reservations: Iterable[Tuple[str, RateLimit]]) -> float:
+        wait = 0.0
+        for key, limit in reservations:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = TokenBucket(limit.requests_per_second, limit.burst)
+                    self._buckets[key] = bucket
+            wait = max(wait, bucket.reserve())
+        return wait
+
+    def refund(self, reservations: Iterable[Tuple[str, RateLimit]]) -> None:
+        for key, _ in reservations:
+            with self._lock:
+                bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.refund()
+
+
+class FileRateLimitBackend(RateLimitBackend):
+    """
+    A backend keeping the buckets in a local file, so every process on the node
+    using the same file shares one combined request rate. Updates are serialized
+    with an exclusive lock on the file.
+
+    :ivar str path: The path of the state file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize a new instance of FileRateLimitBackend.
+
+        :param str path: The path of the state file. Created if missing.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def reserve(self, reservations: Iterable[Tuple[str, RateLimit]]) -> float:
+        return self._update(reservations, 1)
+
+    def refund(self, reservations: Iterable[Tuple[str, RateLimit]]) -> None:
+        self._update(reservations, -1)
+
+    def _update(
+        self, reservations: Iterable[Tuple[str, RateLimit]], amount: float
+    ) -> float:
+        """
+        Take tokens from, or give tokens back to, the buckets kept in the file.
+
+        :param Iterable[Tuple[str, RateLimit]] reservations: The bucket keys with the limit that applies to them.
+        :param float amount: The amount of tokens to take, negative to give them back.
+        :return: The time in seconds the caller must wait before sending the request.
+        :rtype: float
+        """
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                self._lock_file(fd)
+                try:
+                    state = self._read_state(fd)
+                    now = time()
+                    wait = 0.0
+                    for key, limit in reservations:
+                        tokens, updated_at = state.get(key, (limit.burst, now))
+                        tokens = refill(
+                            tokens,
+                            updated_at,
+                            now,
+                            limit.requests_per_second,
+                            limit.burst,
+                        )
+                        tokens, key_wait = reserve(
+                            tokens, amount, limit.requests_per_second
+                        )
+                        state[key] = (min(tokens, limit.burst), now)
+                        wait = max(wait, key_wait)
+                    self._write_state(fd, state)
+                    return wait
+                finally:
+                    self._unlock_file(fd)
+            finally:
+                os.close(fd)
+
+    def _read_state(self, fd: int) -> Dict[str, Tuple[float, float]]:
+        os.lseek(fd, 0, os.SEEK_SET)
+        content = b""
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+            content += chunk
+
+        try:
+            return {k: tuple(v) for k, v in json.loads(content or b"{}").items()}
+        except (ValueError, TypeError, AttributeError):
+            return {}
+
+    def _write_state(self, fd: int, state: Dict[str, Tuple[float, float]]) -> None:
+        content = json.dumps(state).encode()
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, content)
+        os.ftruncate(fd, len(content))
+
+    def _lock_file(self, fd: int) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:  # pragma: no cover - Windows
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(self, fd: int) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:  # pragma: no cover - Windows
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class RateLimitHandler(BaseHandler):
+    """
+    Handler delaying requests so they stay under client-side rate limits.
+    Every attempt, including retries, takes a token from the bucket of its host
+    and of its organization before it is sent.
+
+    :ivar List[RateLimit] _limits: The limits to apply.
+    :ivar RateLimitBackend _backend: The backend holding the buckets.
+    """
+
+    def __init__(
+        self,
+        limits: List[RateLimit],
+        backend: Optional[RateLimitBackend] = None,
+    ):
+        """
+        Initialize a new instance of RateLimitHandler.
+
+        :param List[RateLimit] limits: The limits to apply.
+        :param Optional[RateLimitBackend] backend: The backend holding the buckets. Defaults to a MemoryRateLimitBackend.
+        """
+        super().__init__()
+        self._limits = limits
+        self._backend = backend or MemoryRateLimitBackend()
+
+    def handle(
+        self, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Wait for the rate limits to allow the request, then send it.
+
+        :param Request request: The request to send.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        if not self._wait(request):
+            return None, DeadlineExceededError()
+
+        return self._next_handler.handle(request)
+
+    def stream(
+        self, request: Request
+    ) -> Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]:
+        """
+        Wait for the rate limits to allow the request, then stream it.
+
+        :param Request request: The request to stream.
+        :return: The response and any error that occurred.
+        :rtype: Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        if not self._wait(request):
+            yield None, DeadlineExceededError()
+            return
+
+        yield from self._next_handler.stream(request)
+
+    def _wait(self, request: Request) -> bool:
+        """
+        Reserve the tokens of the request and sleep until they are available.
+
+        :param Request request: The request to send.
+        :return: False if the wait would outlast the deadline of the request, True otherwise.
+        :rtype: bool
+        """
+        reservations = []
+        for limit in self._limits:
+            key = limit.get_key(request)
+            if key is not None:
+                reservations.append((key, limit))
+
+        if not reservations:
+            return True
+
+        wait = self._backend.reserve(reservations)
+        if request.deadline is not None and wait >= request.deadline.remaining():
+            # The request is not sent, so it must not count against the limits
+            self._backend.refund(reservations)
+            return False
+
+        if wait > 0:
+            sleep(wait)
+        return True
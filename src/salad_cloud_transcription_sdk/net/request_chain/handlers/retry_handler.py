@@ -1,6 +1,10 @@
+import asyncio
 import random
+import threading
 
-from typing import Generator, Optional, Tuple
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, FrozenSet, Generator, Iterable, Optional, Tuple
 from time import sleep
 from .base_handler import BaseHandler
 from ...transport.request import Request
@@ -8,28 +12,239 @@
 from ...transport.request_error import RequestError
 
 
+class RetryPolicy:
+    """
+    Configuration describing when and how failed requests are retried.
+
+    :ivar int max_attempts: The maximum number of retry attempts.
+    :ivar int delay_in_milliseconds: The base delay of the exponential backoff in milliseconds.
+    :ivar int max_delay_in_milliseconds: The upper bound for a single backoff delay in milliseconds.
+    :ivar FrozenSet[int] retryable_statuses: Status codes that are retried in addition to 5xx responses.
+    :ivar FrozenSet[str] idempotent_methods: HTTP methods that are safe to retry.
+    :ivar bool respect_retry_after: Whether the Retry-After response header is honored.
+    :ivar int max_retry_after_in_milliseconds: Retry-After values above this limit are not waited for.
+    """
+
+    DEFAULT_RETRYABLE_STATUSES = frozenset({408, 429})
+    DEFAULT_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        delay_in_milliseconds: int = 150,
+        max_delay_in_milliseconds: int = 10000,
+        retryable_statuses: Optional[Iterable[int]] = None,
+        idempotent_methods: Optional[Iterable[str]] = None,
+        respect_retry_after: bool = True,
+        max_retry_after_in_milliseconds: int = 60000,
+    ):
+        """
+        Initialize a new instance of RetryPolicy.
+
+        :param int max_attempts: The maximum number of retry attempts.
+        :param int delay_in_milliseconds: The base delay of the exponential backoff in milliseconds.
+        :param int max_delay_in_milliseconds: The upper bound for a single backoff delay in milliseconds.
+        :param Optional[Iterable[int]] retryable_statuses: Status codes retried in addition to 5xx responses.
+        :param Optional[Iterable[str]] idempotent_methods: HTTP methods that are safe to retry.
+        :param bool respect_retry_after: Whether the Retry-After response header is honored.
+        :param int max_retry_after_in_milliseconds: Retry-After values above this limit are not waited for.
+        """
+        self.max_attempts = max_attempts
+        self.delay_in_milliseconds = delay_in_milliseconds
+        self.max_delay_in_milliseconds = max_delay_in_milliseconds
+        self.retryable_statuses: FrozenSet[int] = (
+            frozenset(retryable_statuses)
+            if retryable_statuses is not None
+            else self.DEFAULT_RETRYABLE_STATUSES
+        )
+        self.idempotent_methods: FrozenSet[str] = (
+            frozenset(method.upper() for method in idempotent_methods)
+            if idempotent_methods is not None
+            else self.DEFAULT_IDEMPOTENT_METHODS
+        )
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after_in_milliseconds = max_retry_after_in_milliseconds
+
+    def is_retryable_status(self, status: int) -> bool:
+        """
+        Check whether a response status is worth retrying.
+
+        :param int status: The status code of the failed response.
+        :return: True if the status is retryable, False otherwise.
+        :rtype: bool
+        """
+        return status in self.retryable_statuses or status >= 500
+
+    def is_retryable_method(self, method: Optional[str], status: int) -> bool:
+        """
+        Check whether a request with the given method may be sent again.
+        A 429 response means the server rejected the request without processing it,
+        so it is retried for every method.
+
+        :param Optional[str] method: The HTTP method of the request.
+        :param int status: The status code of the failed response.
+        :return: True if the request may be retried, False otherwise.
+        :rtype: bool
+        """
+        if status == 429:
+            return True
+        return (method or "").upper() in self.idempotent_methods
+
+
+class RetryBudget:
+    """
+    A token bucket that caps retries relative to successful requests.
+    Every retry withdraws one token and every successful request deposits ``token_ratio`` tokens,
+    so during an outage retries stop once the bucket is empty instead of multiplying the load.
+    A single budget is shared by all handlers of one client.
+
+    :ivar float max_tokens: The capacity of the bucket.
+    :ivar float token_ratio: The amount of tokens deposited for each successful request.
+    """
+
+    def __init__(self, max_tokens: float = 10.0, token_ratio: float = 0.1):
+        """
+        Initialize a new instance of RetryBudget.
+
+        :param float max_tokens: The capacity of the bucket.
+        :param float token_ratio: The amount of tokens deposited for each successful request.
+        """
+        self.max_tokens = max_tokens
+        self.token_ratio = token_ratio
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """The amount of tokens currently available."""
+        with self._lock:
+            return self._tokens
+
+    def try_acquire(self) -> bool:
+        """
+        Withdraw a token for a retry.
+
+        :return: True if a token was available, False if the budget is exhausted.
+        :rtype: bool
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def record_success(self) -> None:
+        """
+        Deposit tokens for a successful request.
+        """
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.token_ratio)
+
+
+class RetryMetrics:
+    """
+    Thread-safe counters describing the retries performed by a client.
+
+    :ivar int requests: The number of requests handled.
+    :ivar int retries: The number of retries sent.
+    :ivar int budget_exhausted: The number of retries skipped because the retry budget was empty.
+    :ivar float total_delay_in_seconds: The total time spent waiting between attempts.
+    :ivar Dict[int, int] retries_by_status: The number of retries per response status.
+    """
+
+    def __init__(self):
+        """
+        Initialize a new instance of RetryMetrics.
+        """
+        self.requests = 0
+        self.retries = 0
+        self.budget_exhausted = 0
+        self.total_delay_in_seconds = 0.0
+        self.retries_by_status: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        """
+        Count a request entering the retry handler.
+        """
+        with self._lock:
+            self.requests += 1
+
+    def record_retry(self, status: int, delay_in_seconds: float) -> None:
+        """
+        Count a retry and the delay that preceded it.
+
+        :param int status: The status code that caused the retry.
+        :param float delay_in_seconds: The delay before the retry in seconds.
+        """
+        with self._lock:
+            self.retries += 1
+            self.total_delay_in_seconds += delay_in_seconds
+            self.retries_by_status[status] = self.retries_by_status.get(status, 0) + 1
+
+    def record_budget_exhausted(self) -> None:
+        """
+        Count a retry that was skipped because the budget was empty.
+        """
+        with self._lock:
+            self.budget_exhausted += 1
+
+    def snapshot(self) -> dict:
+        """
+        Get a consistent copy of the counters.
+
+        :return: The current counters.
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "budget_exhausted": self.budget_exhausted,
+                "total_delay_in_seconds": self.total_delay_in_seconds,
+                "retries_by_status": dict(self.retries_by_status),
+            }
+
+
 class RetryHandler(BaseHandler):
     """
     Handler for retrying requests.
-    Retries the request if the previous handler in the chain returned an error or a response with a status code of 500 or higher.
+    Retries idempotent requests that failed with a status code of 408, 429 or 500 and higher,
+    waiting for the delay requested by the Retry-After header when present.
 
-    :ivar int _max_attempts: The maximum number of retry attempts.
-    :ivar int _delay_in_milliseconds: The delay between retry attempts in milliseconds.
+    :ivar RetryPolicy _policy: The policy deciding which requests are retried.
+    :ivar RetryBudget _budget: The budget limiting the amount of retries.
+    :ivar RetryMetrics _metrics: The counters updated by the handler.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        policy: Optional[RetryPolicy] = None,
+        budget: Optional[RetryBudget] = None,
+        metrics: Optional[RetryMetrics] = None,
+    ):
         """
         Initialize a new instance of RetryHandler.
+
+        :param Optional[RetryPolicy] policy: The retry policy. Defaults to RetryPolicy().
+        :param Optional[RetryBudget] budget: The retry budget. Defaults to a budget private to this handler.
+        :param Optional[RetryMetrics] metrics: The metrics to update. Defaults to metrics private to this handler.
         """
         super().__init__()
-        self._max_attempts = 3
-        self._delay_in_milliseconds = 150
+        self._policy = policy or RetryPolicy()
+        self._budget = budget or RetryBudget()
+        self._metrics = metrics or RetryMetrics()
+
+    @property
+    def metrics(self) -> RetryMetrics:
+        """The counters updated by the handler."""
+        return self._metrics
 
     def handle(
         self, request: Request
     ) -> Tuple[Optional[Response], Optional[RequestError]]:
         """
-        Retry the request if the response has a status code greater or equal to 500 or equal to 408 (timeout).
+        Retry the request if the response has a retryable status code and the retry budget allows it.
 
         :param Request request: The request to retry.
         :return: The response and any error that occurred.
@@ -39,13 +254,54 @@ def handle(
         if self._next_handler is None:
             raise RequestError("Handler chain is incomplete")
 
-        response, error = self._next_handler.handle(request)
+        self._metrics.record_request()
+        response, error = self._next_handler.handle(request.set_attempt(1))
 
         try_count = 0
-        while try_count < self._max_attempts and self._should_retry(error):
-            self._delay(try_count)
-            response, error = self._next_handler.handle(request)
+        delay = self._get_retry_delay(request, error, try_count)
+        while delay is not None:
+            self._delay(delay, error)
             try_count += 1
+            response, error = self._next_handler.handle(
+                request.set_attempt(try_count + 1)
+            )
+            delay = self._get_retry_delay(request, error, try_count)
+
+        if error is None:
+            self._budget.record_success()
+
+        return response, error
+
+    async def handle_async(
+        self, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Retry the request like handle does, waiting between attempts without blocking the event loop.
+
+        :param Request request: The request to retry.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        self._metrics.record_request()
+        response, error = await self._next_handler.handle_async(request.set_attempt(1))
+
+        try_count = 0
+        delay = self._get_retry_delay(request, error, try_count)
+        while delay is not None:
+            self._metrics.record_retry(error.status, delay)
+            await asyncio.sleep(delay)
+            try_count += 1
+            response, error = await self._next_handler.handle_async(
+                request.set_attempt(try_count + 1)
+            )
+            delay = self._get_retry_delay(request, error, try_count)
+
+        if error is None:
+            self._budget.record_success()
 
         return response, error
 
@@ -53,7 +309,7 @@ def stream(
         self, request: Request
     ) -> Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]:
         """
-        Retry the request if the response has a status code greater or equal to 500 or equal to 408 (timeout).
+        Retry the request if the stream fails before yielding any data with a retryable status code.
 
         :param Request request: The request to retry.
         :return: The response and any error that occurred.
@@ -63,38 +319,124 @@ def stream(
         if self._next_handler is None:
             raise RequestError("Handler chain is incomplete")
 
+        self._metrics.record_request()
+        try_count = 0
+        while True:
+            stream = self._next_handler.stream(request.set_attempt(try_count + 1))
+            first = next(stream, None)
+            if first is None:
+                return
+
+            _, error = first
+            delay = self._get_retry_delay(request, error, try_count)
+            if delay is not None:
+                self._delay(delay, error)
+                try_count += 1
+                continue
+
+            if error is None:
+                self._budget.record_success()
+
+            yield first
+            yield from stream
+            return
+
+    def _delay(self, delay: float, error: RequestError) -> None:
+        """
+        Sleep before the next attempt and record the retry.
+
+        :param float delay: The delay in seconds.
+        :param RequestError error: The error that caused the retry.
+        """
+        self._metrics.record_retry(error.status, delay)
+        sleep(delay)
+
+    def _get_delay(self, try_count: int, error: RequestError) -> float:
+        """
+        Compute the delay before the next attempt in seconds.
+        Uses exponential backoff with jitter, extended to the Retry-After value when the server sent one.
+
+        :param int try_count: The number of retries already sent.
+        :param RequestError error: The error that caused the retry.
+        :return: The delay in seconds.
+        :rtype: float
+        """
+        jitter = random.uniform(0.5, 1.5)
+        delay = min(
+            self._policy.delay_in_milliseconds * (2**try_count) * jitter,
+            self._policy.max_delay_in_milliseconds,
+        )
+
+        retry_after = self._get_retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after * 1000)
+
+        return delay / 1000
+
+    def _get_retry_after(self, error: RequestError) -> Optional[float]:
+        """
+        Parse the Retry-After header of the failed response.
+
+        :param RequestError error: The error that caused the retry.
+        :return: The delay requested by the server in seconds, or None if there is none.
+        :rtype: Optional[float]
+        """
+        if not self._policy.respect_retry_after or error.response is None:
+            return None
+
+        value = error.response.headers.get("Retry-After")
+        if not value:
+            return None
+
         try:
-            try_count = 0
-            stream = self._next_handler.stream(request)
-            while True:
-                response, error = next(stream)
-                if try_count < self._max_attempts and self._should_retry(error):
-                    self._delay(try_count)
-                    try_count += 1
-                    stream = self._next_handler.stream(request)  # Retry the request
-                elif try_count >= self._max_attempts:
-                    yield response, error
-                    break
-                else:
-                    yield response, error
-
-        except StopIteration:
+            return max(0.0, float(value))
+        except ValueError:
             pass
 
-    def _delay(self, try_count: int) -> None:
-        jitter = random.uniform(0.5, 1.5)
-        delay = self._delay_in_milliseconds * (2**try_count) * jitter / 1000
-        sleep(delay)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
 
-    def _should_retry(self, error: Optional[RequestError]) -> bool:
+    def _get_retry_delay(
+        self, request: Request, error: Optional[RequestError], try_count: int
+    ) -> Optional[float]:
         """
-        Determine whether the request should be retried.
+        Determine whether the request should be retried and how long to wait before doing so.
+        A retry is skipped when the wait would outlast the deadline of the request.
 
-        :param Optional[Response] response: The response from the previous handler.
-        :param Optional[RequestError] error: The error from the previous handler.
-        :return: True if the request should be retried, False otherwise.
-        :rtype: bool
+        :param Request request: The request that was sent.
+        :param Optional[RequestError] error: The error from the next handler.
+        :param int try_count: The number of retries already sent.
+        :return: The delay in seconds, or None if the request should not be retried.
+        :rtype: Optional[float]
         """
-        if not error:
-            return False
-        return error.status == 408 or error.status >= 500
+        if not error or try_count >= self._policy.max_attempts:
+            return None
+
+        if not self._policy.is_retryable_status(error.status):
+            return None
+
+        if not self._policy.is_retryable_method(request.method, error.status):
+            return None
+
+        retry_after = self._get_retry_after(error)
+        if (
+            retry_after is not None
+            and retry_after * 1000 > self._policy.max_retry_after_in_milliseconds
+        ):
+            return None
+
+        delay = self._get_delay(try_count, error)
+        if request.deadline is not None and delay >= request.deadline.remaining():
+            return None
+
+        if not self._budget.try_acquire():
+            self._metrics.record_budget_exhausted()
+            return None
+
+        return delay
@@ -0,0 +1,146 @@
+from typing import Generator, Optional, Tuple
+from urllib.parse import urlparse
+from .base_handler import BaseHandler
+from ...tracing.tracer import Span, SpanKind, SpanStatus, Tracer, use_span
+from ...transport.request import Request
+from ...transport.response import Response
+from ...transport.request_error import RequestError
+
+
+class TracingHandler(BaseHandler):
+    """
+    Handler recording a client span for every attempt, child of the active span,
+    and propagating it to the server with a W3C traceparent header.
+
+    :ivar Tracer _tracer: The tracer creating the spans.
+    """
+
+    def __init__(self, tracer: Tracer):
+        """
+        Initialize a new instance of TracingHandler.
+
+        :param Tracer tracer: The tracer creating the spans.
+        """
+        super().__init__()
+        self._tracer = tracer
+
+    def handle(
+        self, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Send the request within a client span.
+
+        :param Request request: The request to send.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        span = self._start_span(request)
+        try:
+            with use_span(span):
+                response, error = self._next_handler.handle(request)
+            self._finish_span(span, response, error)
+            return response, error
+        except BaseException as e:
+            span.set_status(SpanStatus.ERROR, f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            span.end()
+
+    async def handle_async(
+        self, request: Request
+    ) -> Tuple[Optional[Response], Optional[RequestError]]:
+        """
+        Send the request from a coroutine within a client span.
+
+        :param Request request: The request to send.
+        :return: The response and any error that occurred.
+        :rtype: Tuple[Optional[Response], Optional[RequestError]]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        span = self._start_span(request)
+        try:
+            with use_span(span):
+                response, error = await self._next_handler.handle_async(request)
+            self._finish_span(span, response, error)
+            return response, error
+        except BaseException as e:
+            span.set_status(SpanStatus.ERROR, f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            span.end()
+
+    def stream(
+        self, request: Request
+    ) -> Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]:
+        """
+        Stream the request within a client span, ended with the stream.
+
+        :param Request request: The request to stream.
+        :return: The response and any error that occurred.
+        :rtype: Generator[Tuple[Optional[Response], Optional[RequestError]], None, None]
+        :raises RequestError: If the handler chain is incomplete.
+        """
+        if self._next_handler is None:
+            raise RequestError("Handler chain is incomplete")
+
+        span = self._start_span(request)
+        try:
+            for response, error in self._next_handler.stream(request):
+                self._finish_span(span, response, error)
+                yield response, error
+        finally:
+            span.end()
+
+    def _start_span(self, request: Request) -> Span:
+        """
+        Start the span of an attempt and inject it in the request headers.
+
+        :param Request request: The request to send.
+        :return: The started span.
+        :rtype: Span
+        """
+        method = (request.method or "").upper()
+        template = urlparse(request.endpoint_template or request.url or "").path
+        span = self._tracer.create_span(
+            f"{method} {template}",
+            SpanKind.CLIENT,
+            {
+                "http.request.method": method,
+                "url.full": request.url or "",
+                "url.template": template,
+                "http.request.resend_count": request.attempt - 1,
+            },
+        )
+
+        headers = dict(request.headers or {})
+        headers["traceparent"] = span.traceparent
+        request.set_headers(headers)
+        return span
+
+    def _finish_span(
+        self,
+        span: Span,
+        response: Optional[Response],
+        error: Optional[RequestError],
+    ) -> None:
+        """
+        Record the outcome of the attempt on its span.
+
+        :param Span span: The span of the attempt.
+        :param Optional[Response] response: The response, if any.
+        :param Optional[RequestError] error: The error, if any.
+        """
+        answered = (
+            response if response is not None else getattr(error, "response", None)
+        )
+        if answered is not None:
+            span.set_attribute("http.response.status_code", answered.status)
+        if error is not None:
+            span.set_status(SpanStatus.ERROR, str(error))
@@ -1,6 +1,7 @@
 from typing import Generator, Optional
 from .handlers.base_handler import BaseHandler
 from ..transport.request import Request
+from ..transport.request_error import RequestError
 from ..transport.response import Response
 
 
@@ -50,7 +51,26 @@ def send(self, request: Request) -> Response:
             response, error = self._head.handle(request)
 
             if error is not None:
-                raise error
+                raise self._map_error(request, error)
+
+            return response
+        else:
+            raise RuntimeError("RequestChain is empty")
+
+    async def send_async(self, request: Request) -> Response:
+        """
+        Send the request through the chain of handlers from a coroutine.
+
+        :param Request request: The request to send.
+        :return: The response from the request.
+        :rtype: Response
+        :raises RuntimeError: If the RequestChain is empty.
+        """
+        if self._head is not None:
+            response, error = await self._head.handle_async(request)
+
+            if error is not None:
+                raise self._map_error(request, error)
 
             return response
         else:
@@ -69,8 +89,33 @@ def stream(self, request: Request) -> Generator[Response, None, None]:
             stream = self._head.stream(request)
             for response, error in stream:
                 if error is not None:
-                    raise error
+                    raise self._map_error(request, error)
 
                 yield response
         else:
             raise RuntimeError("RequestChain is empty")
+
+    def _map_error(self, request: Request, error: Exception) -> Exception:
+        """
+        Turn an error response into the error class the request declares for its status.
+        The handlers see the RequestError, so they retry and adapt on its status.
+
+        :param Request request: The request that was sent.
+        :param Exception error: The error returned by the chain.
+        :return: The declared error built from the body of the response, or the error.
+        :rtype: Exception
+        """
+        if not isinstance(error, RequestError) or error.response is None:
+            return error
+
+        response = error.response
+        error_model_class = request.errors.get(response.status)
+        if error_model_class is None or not isinstance(response.body, dict):
+            return error
+
+        mapped = error_model_class(**response.body)
+        if "message" not in response.body:
+            mapped.message = f"{response.status} error in request to: {request.url}"
+        mapped.status = response.status
+        mapped.response = response
+        return mapped
@@ -0,0 +1,10 @@
+from .tracer import (
+    SpanKind,
+    SpanStatus,
+    Span,
+    SpanExporter,
+    Tracer,
+    current_span,
+    use_span,
+)
+from .exporter import FileSpanExporter, span_to_otlp
@@ -0,0 +1,106 @@
+import json
+import os
+import threading
+
+from typing import Any, List
+from .tracer import Span, SpanExporter
+
+_SCOPE_NAME = "salad_cloud_transcription_sdk"
+
+
+def _to_otlp_value(value: Any) -> dict:
+    """
+    Convert an attribute value to its OTLP JSON representation.
+
+    :param Any value: The attribute value.
+    :return: The OTLP AnyValue.
+    :rtype: dict
+    """
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def span_to_otlp(span: Span) -> dict:
+    """
+    Convert a span to its OTLP JSON representation.
+
+    :param Span span: The ended span.
+    :return: The OTLP Span.
+    :rtype: dict
+    """
+    otlp_span = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_time),
+        "endTimeUnixNano": str(span.end_time),
+        "attributes": [
+            {"key": key, "value": _to_otlp_value(value)}
+            for key, value in span.attributes.items()
+        ],
+        "status": {"code": span.status},
+    }
+    if span.parent_span_id is not None:
+        otlp_span["parentSpanId"] = span.parent_span_id
+    if span.status_message is not None:
+        otlp_span["status"]["message"] = span.status_message
+    return otlp_span
+
+
+class FileSpanExporter(SpanExporter):
+    """
+    An exporter appending spans to a local file, one OTLP JSON export request per line.
+    The file can be replayed to an OpenTelemetry collector or inspected directly.
+
+    :ivar str path: The path of the file.
+    :ivar str service_name: The name of the traced service, exported as a resource attribute.
+    """
+
+    def __init__(self, path: str, service_name: str = "salad-cloud-transcription-sdk"):
+        """
+        Initialize a new instance of FileSpanExporter.
+
+        :param str path: The path of the file. Created if missing.
+        :param str service_name: The name of the traced service, exported as a resource attribute.
+        """
+        self.path = path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: List[Span]) -> None:
+        if not spans:
+            return
+
+        line = json.dumps(
+            {
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": [
+                                {
+                                    "key": "service.name",
+                                    "value": {"stringValue": self.service_name},
+                                }
+                            ]
+                        },
+                        "scopeSpans": [
+                            {
+                                "scope": {"name": _SCOPE_NAME},
+                                "spans": [span_to_otlp(span) for span in spans],
+                            }
+                        ],
+                    }
+                ]
+            }
+        )
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(line + "\n")
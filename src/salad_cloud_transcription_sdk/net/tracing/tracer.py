@@ -0,0 +1,245 @@
+import random
+import secrets
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import time_ns
+from typing import Any, Dict, Generator, List, Optional
+
+
+class SpanKind:
+    """
+    The kinds of spans, using the OTLP numbering.
+    """
+
+    INTERNAL = 1
+    CLIENT = 3
+
+
+class SpanStatus:
+    """
+    The status codes of spans, using the OTLP numbering.
+    """
+
+    UNSET = 0
+    OK = 1
+    ERROR = 2
+
+
+class Span:
+    """
+    A timed operation within a trace.
+
+    :ivar str name: The name of the operation.
+    :ivar str trace_id: The 32 hexadecimal digits identifying the trace.
+    :ivar str span_id: The 16 hexadecimal digits identifying the span.
+    :ivar Optional[str] parent_span_id: The identifier of the parent span, None for a root span.
+    :ivar int kind: One of the SpanKind values.
+    :ivar bool sampled: Whether the span is exported.
+    :ivar int start_time: The epoch time at which the span started, in nanoseconds.
+    :ivar Optional[int] end_time: The epoch time at which the span ended, in nanoseconds.
+    :ivar Dict[str, Any] attributes: The attributes describing the operation.
+    :ivar int status: One of the SpanStatus values.
+    :ivar Optional[str] status_message: The description of an error status.
+    """
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        trace_id: str,
+        parent_span_id: Optional[str],
+        kind: int,
+        sampled: bool,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self._tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.sampled = sampled
+        self.start_time = time_ns()
+        self.end_time: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = SpanStatus.UNSET
+        self.status_message: Optional[str] = None
+
+    @property
+    def traceparent(self) -> str:
+        """The W3C traceparent header value propagating this span."""
+        flags = "01" if self.sampled else "00"
+        return f"00-{self.trace_id}-{self.span_id}-{flags}"
+
+    def set_attribute(self, key: str, value: Any) -> "Span":
+        """
+        Set an attribute of the span.
+
+        :param str key: The attribute name.
+        :param Any value: The attribute value, a str, bool, int or float.
+        :return: The span, for chaining.
+        :rtype: Span
+        """
+        self.attributes[key] = value
+        return self
+
+    def set_status(self, status: int, message: Optional[str] = None) -> "Span":
+        """
+        Set the status of the span.
+
+        :param int status: One of the SpanStatus values.
+        :param Optional[str] message: The description of an error status.
+        :return: The span, for chaining.
+        :rtype: Span
+        """
+        self.status = status
+        self.status_message = message
+        return self
+
+    def end(self) -> None:
+        """
+        End the span and export it. Ending a span twice has no effect.
+        """
+        if self.end_time is not None:
+            return
+
+        self.end_time = time_ns()
+        if self.sampled:
+            self._tracer.exporter.export([self])
+
+    def __str__(self) -> str:
+        return (
+            f"Span(name={self.name}, trace_id={self.trace_id}, span_id={self.span_id})"
+        )
+
+
+class SpanExporter:
+    """
+    The destination of ended spans.
+    This class must be implemented by all span exporters.
+    """
+
+    def export(self, spans: List[Span]) -> None:
+        """
+        Export ended spans.
+
+        :param List[Span] spans: The spans.
+        """
+        raise NotImplementedError()
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar(
+    "salad_transcription_span", default=None
+)
+
+
+def current_span() -> Optional[Span]:
+    """
+    Get the span of the enclosing span scope.
+
+    :return: The active span, or None outside of a span scope.
+    :rtype: Optional[Span]
+    """
+    return _current_span.get()
+
+
+@contextmanager
+def use_span(span: Span) -> Generator[Span, None, None]:
+    """
+    Make a span the active span within the block, without ending it.
+
+    :param Span span: The span to activate.
+    :return: The span.
+    :rtype: Generator[Span, None, None]
+    """
+    token = _current_span.set(span)
+    try:
+        yield span
+    finally:
+        _current_span.reset(token)
+
+
+class Tracer:
+    """
+    Creates spans and hands them to an exporter once they end.
+    Spans started within another span scope, including in worker threads running
+    a copy of the context, become its children.
+
+    :ivar SpanExporter exporter: The exporter receiving the ended spans.
+    :ivar float sample_ratio: The share of new traces that are exported.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        sample_ratio: float = 1.0,
+    ):
+        """
+        Initialize a new instance of Tracer.
+
+        :param SpanExporter exporter: The exporter receiving the ended spans.
+        :param float sample_ratio: The share of new traces that are exported, between 0 and 1.
+        """
+        if not 0 <= sample_ratio <= 1:
+            raise ValueError("The sample ratio must be between 0 and 1.")
+
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+
+    def create_span(
+        self,
+        name: str,
+        kind: int = SpanKind.INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Span:
+        """
+        Create a span, child of the active span if any, without activating it.
+
+        :param str name: The name of the operation.
+        :param int kind: One of the SpanKind values.
+        :param Optional[Dict[str, Any]] attributes: The initial attributes.
+        :return: The started span. The caller must end it.
+        :rtype: Span
+        """
+        parent = _current_span.get()
+        if parent is not None:
+            return Span(
+                self,
+                name,
+                parent.trace_id,
+                parent.span_id,
+                kind,
+                parent.sampled,
+                attributes,
+            )
+
+        sampled = self.sample_ratio >= 1 or random.random() < self.sample_ratio
+        return Span(self, name, secrets.token_hex(16), None, kind, sampled, attributes)
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        kind: int = SpanKind.INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Generator[Span, None, None]:
+        """
+        Run the block within a new span, ended when the block exits.
+        An exception escaping the block sets the error status of the span.
+
+        :param str name: The name of the operation.
+        :param int kind: One of the SpanKind values.
+        :param Optional[Dict[str, Any]] attributes: The initial attributes.
+        :return: The active span.
+        :rtype: Generator[Span, None, None]
+        """
+        span = self.create_span(name, kind, attributes)
+        try:
+            with use_span(span):
+                yield span
+        except BaseException as e:
+            span.set_status(SpanStatus.ERROR, f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            span.end()
@@ -1 +1,21 @@
-from .request_error import RequestError
\ No newline at end of file
+from .request_error import RequestError, DeadlineExceededError
+from .deadline import Deadline, deadline_scope
+from .json_codec import (
+    JsonCodec,
+    OrjsonCodec,
+    StdlibJsonCodec,
+    get_json_codec,
+    set_json_codec,
+)
+from .transports import (
+    AsyncTransport,
+    HttpxAsyncTransport,
+    HttpxTransport,
+    RequestsTransport,
+    ThreadedAsyncTransport,
+    Transport,
+    Urllib3Transport,
+    create_async_transport,
+    create_transport,
+    register_transport,
+)
@@ -0,0 +1,27 @@
+import gzip
+
+from typing import Any, Optional
+from urllib3.util import make_headers
+from .json_codec import get_json_codec
+
+# urllib3 advertises br and zstd only when brotli / zstandard are installed, and
+# decodes every advertised encoding incrementally while the body is read
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+
+def compress_json(
+    data: Any, threshold: int, compression_level: int = 6
+) -> Optional[bytes]:
+    """
+    Serialize a JSON body and gzip it when it is large enough for compression to pay off.
+
+    :param Any data: The JSON-serializable body.
+    :param int threshold: The minimum size in bytes of the serialized body to compress it.
+    :param int compression_level: The gzip compression level, from 1 (fastest) to 9 (smallest).
+    :return: The compressed body, or None if the body is smaller than the threshold.
+    :rtype: Optional[bytes]
+    """
+    serialized = get_json_codec().dumps(data)
+    if len(serialized) < threshold:
+        return None
+    return gzip.compress(serialized, compresslevel=compression_level)
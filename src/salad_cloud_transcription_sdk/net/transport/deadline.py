@@ -0,0 +1,114 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic
+from typing import Generator, Optional, Union
+
+
+class Deadline:
+    """
+    A point in time after which a call must not do any more work.
+    The deadline travels with the request through the request chain, so retries,
+    backoff delays and socket timeouts never exceed the remaining budget.
+
+    :ivar float timeout_in_seconds: The budget the deadline was created with.
+    """
+
+    def __init__(self, timeout_in_seconds: float):
+        """
+        Initialize a new instance of Deadline that expires after the given amount of seconds.
+
+        :param float timeout_in_seconds: The time budget in seconds.
+        """
+        self.timeout_in_seconds = timeout_in_seconds
+        self._expires_at = monotonic() + timeout_in_seconds
+
+    def remaining(self) -> float:
+        """
+        Get the time left before the deadline.
+
+        :return: The remaining time in seconds, never negative.
+        :rtype: float
+        """
+        return max(0.0, self._expires_at - monotonic())
+
+    def expired(self) -> bool:
+        """
+        Check whether the deadline has passed.
+
+        :return: True if no time is left, False otherwise.
+        :rtype: bool
+        """
+        return self.remaining() <= 0
+
+    def cap(self, timeout_in_seconds: Optional[float]) -> float:
+        """
+        Limit a timeout to the remaining time.
+
+        :param Optional[float] timeout_in_seconds: The timeout to limit, None meaning unlimited.
+        :return: The smaller of the timeout and the remaining time in seconds.
+        :rtype: float
+        """
+        if timeout_in_seconds is None:
+            return self.remaining()
+        return min(timeout_in_seconds, self.remaining())
+
+    def earliest(self, other: Optional["Deadline"]) -> "Deadline":
+        """
+        Get whichever of two deadlines expires first.
+
+        :param Optional[Deadline] other: The deadline to compare with.
+        :return: The deadline expiring first.
+        :rtype: Deadline
+        """
+        if other is None or self._expires_at <= other._expires_at:
+            return self
+        return other
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the Deadline object.
+
+        :return: A string representation of the Deadline object.
+        :rtype: str
+        """
+        return f"Deadline(timeout_in_seconds={self.timeout_in_seconds}, remaining={self.remaining():.3f})"
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar(
+    "salad_transcription_deadline", default=None
+)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """
+    Get the deadline of the enclosing deadline scope.
+
+    :return: The active deadline, or None outside of a deadline scope.
+    :rtype: Optional[Deadline]
+    """
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(
+    deadline: Optional[Union[Deadline, float]],
+) -> Generator[Optional[Deadline], None, None]:
+    """
+    Apply a deadline to every request sent within the block.
+    Nested scopes never extend the enclosing deadline.
+
+    :param Optional[Union[Deadline, float]] deadline: The deadline, or a budget in seconds. None keeps the enclosing deadline.
+    :return: The deadline in effect inside the block.
+    :rtype: Generator[Optional[Deadline], None, None]
+    """
+    if deadline is not None and not isinstance(deadline, Deadline):
+        deadline = Deadline(deadline)
+
+    enclosing = _current_deadline.get()
+    effective = deadline.earliest(enclosing) if deadline is not None else enclosing
+
+    token = _current_deadline.set(effective)
+    try:
+        yield effective
+    finally:
+        _current_deadline.reset(token)
@@ -0,0 +1,57 @@
+import os
+
+from typing import Callable, Optional
+
+
+class FilePart:
+    """
+    A slice of a file sent as a request body. The slice is read from disk each time the
+    request is sent, so retried requests do not keep the data in memory between attempts.
+
+    :ivar str path: The path of the file.
+    :ivar int offset: The position of the slice in the file in bytes.
+    :ivar int length: The size of the slice in bytes.
+    :ivar Optional[Callable[[bytes], None]] on_read: A function called with the data each time it is read.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        offset: int,
+        length: int,
+        on_read: Optional[Callable[[bytes], None]] = None,
+    ):
+        """
+        Initialize a new instance of FilePart.
+
+        :param str path: The path of the file.
+        :param int offset: The position of the slice in the file in bytes.
+        :param int length: The size of the slice in bytes.
+        :param Optional[Callable[[bytes], None]] on_read: A function called with the data each time it is read, to process it in the same pass, e.g. to hash it.
+        """
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.on_read = on_read
+
+    def read(self) -> bytes:
+        """
+        Read the slice from the file.
+
+        :return: The data of the slice.
+        :rtype: bytes
+        :raises ValueError: If the file is shorter than the slice.
+        """
+        with open(self.path, "rb") as file:
+            file.seek(self.offset)
+            data = file.read(self.length)
+        if len(data) != self.length:
+            raise ValueError(
+                f"{self.path} changed during the upload, expected {self.length} bytes at offset {self.offset}"
+            )
+        if self.on_read is not None:
+            self.on_read(data)
+        return data
+
+    def __str__(self) -> str:
+        return f"FilePart(path={os.path.basename(self.path)}, offset={self.offset}, length={self.length})"
@@ -0,0 +1,87 @@
+import json
+
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class JsonCodec:
+    """
+    The JSON implementation used to parse response bodies and serialize request bodies.
+    This class must be implemented by all JSON codecs.
+    """
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Parse a JSON document.
+
+        :param Union[bytes, str] data: The document, preferably as UTF-8 bytes.
+        :return: The parsed value.
+        :rtype: Any
+        :raises ValueError: If the document is not valid JSON.
+        """
+        raise NotImplementedError()
+
+    def dumps(self, value: Any) -> bytes:
+        """
+        Serialize a value to compact JSON.
+
+        :param Any value: The JSON-serializable value.
+        :return: The UTF-8 encoded document.
+        :rtype: bytes
+        """
+        raise NotImplementedError()
+
+
+class StdlibJsonCodec(JsonCodec):
+    """
+    A codec using the json module of the standard library.
+    """
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    A codec using orjson, parsing directly from bytes several times faster than the standard library.
+    """
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is required to use the OrjsonCodec.")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+
+_json_codec: JsonCodec = OrjsonCodec() if orjson is not None else StdlibJsonCodec()
+
+
+def get_json_codec() -> JsonCodec:
+    """
+    Get the JSON codec of the process, orjson when it is installed.
+
+    :return: The JSON codec.
+    :rtype: JsonCodec
+    """
+    return _json_codec
+
+
+def set_json_codec(codec: JsonCodec) -> None:
+    """
+    Replace the JSON codec of the process.
+
+    :param JsonCodec codec: The JSON codec.
+    """
+    global _json_codec
+    _json_codec = codec
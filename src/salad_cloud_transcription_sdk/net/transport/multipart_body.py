@@ -0,0 +1,73 @@
+from typing import Any, Dict, Generator, List, Union
+
+from urllib3.fields import RequestField
+from urllib3.filepost import choose_boundary
+
+
+class MultipartBody:
+    """
+    A multipart/form-data body streamed from the data of its files.
+    Encoding the body at once would copy every file into it, doubling the memory an
+    upload needs, so the files are sent in chunks from their own data instead, framed
+    by the encoded form fields and part headers. The encoding matches the one of requests.
+
+    :ivar str content_type: The Content-Type of the body, with its boundary.
+    """
+
+    def __init__(self, fields: Dict[str, Any], files: Dict[str, bytes]):
+        """
+        Initialize a new instance of MultipartBody.
+
+        :param Dict[str, Any] fields: The form fields, sent as text before the files.
+        :param Dict[str, bytes] files: The files, by field name, also used as their filename.
+        """
+        boundary = choose_boundary()
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        self._segments: List[Union[bytes, memoryview]] = []
+
+        for name, value in fields.items():
+            if value is None:
+                continue
+            data = value if isinstance(value, bytes) else str(value).encode("utf-8")
+            self._add_part(boundary, RequestField(name, data), data)
+        for name, data in files.items():
+            self._add_part(
+                boundary, RequestField(name, data, filename=name), memoryview(data)
+            )
+        self._segments.append(f"--{boundary}--\r\n".encode("latin-1"))
+
+    def __len__(self) -> int:
+        return sum(len(segment) for segment in self._segments)
+
+    def __iter__(self) -> Generator[bytes, None, None]:
+        return self.chunks()
+
+    def chunks(self, chunk_size: int = 64 * 1024) -> Generator[bytes, None, None]:
+        """
+        Stream the body.
+
+        :param int chunk_size: The maximum size of the chunks in bytes.
+        :return: The chunks of the body.
+        :rtype: Generator[bytes, None, None]
+        """
+        for segment in self._segments:
+            for offset in range(0, len(segment), chunk_size):
+                yield bytes(segment[offset : offset + chunk_size])
+
+    def _add_part(
+        self, boundary: str, field: RequestField, data: Union[bytes, memoryview]
+    ) -> None:
+        """
+        Add a part, made of its boundary, its headers and its data.
+
+        :param str boundary: The boundary of the body.
+        :param RequestField field: The field, giving the headers of the part.
+        :param Union[bytes, memoryview] data: The data of the part, kept without copy.
+        """
+        field.make_multipart()
+        self._segments.append(
+            f"--{boundary}\r\n".encode("latin-1")
+            + field.render_headers().encode("utf-8")
+        )
+        self._segments.append(data)
+        self._segments.append(b"\r\n")
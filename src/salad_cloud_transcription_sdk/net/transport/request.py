@@ -1,5 +1,6 @@
-from typing import Any, BinaryIO, Optional, Set, Dict, Tuple
+from typing import Any, BinaryIO, Callable, Optional, Set, Dict, Tuple
 from .utils import extract_original_data
+from .deadline import Deadline
 import mimetypes
 
 FilesType = Dict[str, Tuple[Optional[str], BinaryIO, Optional[str]]]
@@ -28,6 +29,11 @@ class Request:
     :ivar str method: The HTTP method for the request.
     :ivar dict headers: Dictionary of headers to include in the request.
     :ivar Any body: Request body.
+    :ivar Optional[Deadline] deadline: The point in time after which the request must not be sent or retried.
+    :ivar Optional[str] endpoint_template: The URL template the request was built from, before path parameters were substituted.
+    :ivar int attempt: The number of the current attempt, starting at 1.
+    :ivar Optional[Callable[[int, int], None]] upload_progress: A function called with the bytes of the body sent and the size of the body, as an upload body is streamed.
+    :ivar dict errors: The error classes raised for the error responses, by status code.
     """
 
     def __init__(self):
@@ -37,6 +43,11 @@ def __init__(self):
         self.body = None
         self.scopes = None
         self.files = None
+        self.deadline = None
+        self.endpoint_template = None
+        self.attempt = 1
+        self.upload_progress = None
+        self.errors = {}
 
     def set_url(self, url: str) -> "Request":
         """
@@ -95,6 +106,79 @@ def set_scopes(self, scopes: Set[str]) -> "Request":
         self.scopes = scopes
         return self
 
+    def set_deadline(self, deadline: Optional[Deadline]) -> "Request":
+        """
+        Set the deadline for the request.
+
+        :param Optional[Deadline] deadline: The deadline, or None for no deadline.
+        :return: The updated Request object.
+        :rtype: Request
+        """
+        self.deadline = deadline
+        return self
+
+    def set_endpoint_template(self, endpoint_template: Optional[str]) -> "Request":
+        """
+        Set the URL template the request was built from.
+
+        :param Optional[str] endpoint_template: The URL template, e.g. .../organizations/{organization_name}/files/{filename}.
+        :return: The updated Request object.
+        :rtype: Request
+        """
+        self.endpoint_template = endpoint_template
+        return self
+
+    def set_attempt(self, attempt: int) -> "Request":
+        """
+        Set the number of the current attempt.
+
+        :param int attempt: The attempt number, starting at 1.
+        :return: The updated Request object.
+        :rtype: Request
+        """
+        self.attempt = attempt
+        return self
+
+    def set_upload_progress(
+        self, upload_progress: Optional[Callable[[int, int], None]]
+    ) -> "Request":
+        """
+        Set the function following the sending of the body of an upload.
+        Multipart and binary bodies are then streamed in chunks, the function being
+        called after each chunk with the bytes sent so far and the size of the body.
+
+        :param Optional[Callable[[int, int], None]] upload_progress: The function, or None to not follow the upload.
+        :return: The updated Request object.
+        :rtype: Request
+        """
+        self.upload_progress = upload_progress
+        return self
+
+    def copy(self) -> "Request":
+        """
+        Copy the request, so that an attempt sent concurrently can change its headers
+        and attempt number without affecting the others. The body is shared.
+
+        :return: The copy.
+        :rtype: Request
+        """
+        request = Request()
+        request.__dict__.update(self.__dict__)
+        if self.headers is not None:
+            request.headers = dict(self.headers)
+        return request
+
+    def set_errors(self, errors: Dict[int, type]) -> "Request":
+        """
+        Set the error classes raised for the error responses.
+
+        :param Dict[int, type] errors: The error classes, by status code.
+        :return: The updated Request object.
+        :rtype: Request
+        """
+        self.errors = errors
+        return self
+
     def set_files(self, files: FilesType) -> "Request":
         """
         Sets the files  for multipart/form-data requests.
@@ -51,3 +51,17 @@ def __str__(self):
             )
             current_error = current_error.stack
         return "\n".join(error_stack)
+
+
+class DeadlineExceededError(RequestError):
+    """
+    Class representing a request that was abandoned because its deadline passed.
+    """
+
+    def __init__(self, message: str = "Deadline exceeded"):
+        """
+        Initialize a new instance of DeadlineExceededError.
+
+        :param str message: The error message.
+        """
+        super().__init__(message)
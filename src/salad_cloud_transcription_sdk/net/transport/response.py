@@ -1,18 +1,75 @@
-import json
+import io
+import mmap
 import re
-from typing import Generator, Optional, Union
+import threading
+from typing import Any, BinaryIO, Generator, Optional, Union
 from requests import Response as RequestsResponse
 from urllib.parse import parse_qs
+from .json_codec import get_json_codec
+from .spool import read_body
+from .stream_decoder import ServerSentEvent, decode_stream
+
+_UNPARSED = object()
+
+
+class _MappedBodyReader(io.RawIOBase):
+    """
+    A reader over a memory-mapped body, with a position of its own, so readers of the
+    same spilled body do not move each other.
+    """
+
+    def __init__(self, view: memoryview) -> None:
+        """
+        Initializes a reader positioned at the start of the body.
+
+        :param memoryview view: The view of the mapped body.
+        """
+        super().__init__()
+        self._view = view
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = max(0, min(len(buffer), len(self._view) - self._position))
+        buffer[:size] = self._view[self._position : self._position + size]
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError("Negative seek position.")
+        self._position = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        self._view.release()
+        super().close()
 
 
 class Response:
     """
     A simple HTTP response wrapper class using the requests library.
+    The body is only decoded when it is first accessed, directly from the raw bytes.
+    Bodies larger than the spill threshold are kept in a temporary file, read through open() or memoryview().
 
     :ivar int status: The status code of the HTTP response.
     :ivar dict headers: The headers of the HTTP response.
-    :ivar str body: The body of the HTTP response.
-    :var str chunk: The chunk of the HTTP response.
+    :ivar float elapsed: The time between sending the request and receiving the response headers, in seconds.
+    :ivar int bytes_sent: The size of the request body.
+    :ivar int bytes_received: The size of the response body, or of the chunk.
+    :ivar Optional[ServerSentEvent] event: The server-sent event this response was decoded from, if any.
     """
 
     def __init__(
@@ -20,20 +77,193 @@ def __init__(
         response: RequestsResponse,
         chunk: Optional[str] = None,
         raw_chunk: Optional[bytes] = None,
+        body: Any = _UNPARSED,
+        event: Optional[ServerSentEvent] = None,
+        spill_threshold: Optional[int] = None,
     ) -> None:
         """
         Initializes a Response object.
 
         :param RequestsResponse response: The requests.Response object.
+        :param Optional[str] chunk: The decoded chunk of a streamed response to use as the body.
+        :param Optional[bytes] raw_chunk: The raw chunk of a streamed response.
+        :param Any body: An already decoded body, e.g. an item of a streamed response.
+        :param Optional[ServerSentEvent] event: The server-sent event the body was decoded from.
+        :param Optional[int] spill_threshold: The maximum size in bytes of a body kept in memory, for responses opened with stream=True.
         """
         self.status = response.status_code
         self.headers = response.headers
+        self.elapsed = response.elapsed.total_seconds()
+        self.bytes_sent = self._get_request_size(response)
+        self.event = event
 
-        self.body = self._parse_response_body(
-            content_type=response.headers.get("Content-Type", "").lower(),
-            body=chunk if chunk else response.text,
-            raw_body=raw_chunk if raw_chunk else response.content,
-        )
+        self._content_type = response.headers.get("Content-Type", "").lower()
+        self._encoding = response.encoding
+        self._text = chunk if chunk else None
+        self._parsed = body is not _UNPARSED
+        self._body = body if self._parsed else None
+        self._file: Optional[BinaryIO] = None
+        self._mmap: Optional[mmap.mmap] = None
+        # A response may be shared by the followers of a coalesced request and the hits of
+        # a cache, so reads of a spilled body and the parsing of the body are serialized
+        self._lock = threading.RLock()
+        if self._parsed or raw_chunk:
+            self._content = raw_chunk or b""
+        elif spill_threshold is not None:
+            content = read_body(response, spill_threshold)
+            if isinstance(content, bytes):
+                self._content = content
+            else:
+                self._content = None
+                self._file = content
+        else:
+            self._content = response.content or b""
+
+        if self._file is not None:
+            self.bytes_received = self._file.seek(0, io.SEEK_END)
+        else:
+            self.bytes_received = len(self._content)
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the body was spilled to a temporary file."""
+        return self._file is not None
+
+    @property
+    def content(self) -> bytes:
+        """The raw bytes of the body, read into memory from the temporary file if the body was spilled."""
+        if self._file is not None:
+            with self._lock:
+                self._file.seek(0)
+                return self._file.read()
+        return self._content
+
+    @property
+    def text(self) -> str:
+        """The body decoded with the charset of the response, UTF-8 by default."""
+        if self._text is None:
+            with self._lock:
+                if self._text is None:
+                    self._text = self.content.decode(
+                        self._encoding or "utf-8", errors="replace"
+                    )
+        return self._text
+
+    @property
+    def body(self) -> Union[str, dict, bytes, Any]:
+        """The body parsed according to the content type, decoded on first access."""
+        if not self._parsed:
+            with self._lock:
+                if not self._parsed:
+                    self._body = self._parse_response_body()
+                    self._parsed = True
+        return self._body
+
+    @body.setter
+    def body(self, body: Any) -> None:
+        with self._lock:
+            self._body = body
+            self._parsed = True
+
+    def open(self) -> BinaryIO:
+        """
+        Get a file-like object over the raw body, positioned at its start.
+        Each call returns an independent reader: a spilled body is read from its
+        memory mapping, without loading it into memory.
+
+        :return: The readable binary file.
+        :rtype: BinaryIO
+        """
+        if self._file is not None and self.bytes_received > 0:
+            return io.BufferedReader(_MappedBodyReader(self.memoryview()))
+        return io.BytesIO(self._content or b"")
+
+    def memoryview(self) -> memoryview:
+        """
+        Get a read-only view of the raw body without copying it.
+        A spilled body is memory-mapped, so it is paged in from disk on access.
+
+        :return: The view of the body.
+        :rtype: memoryview
+        """
+        if self._file is None:
+            return memoryview(self._content)
+        if self.bytes_received == 0:
+            return memoryview(b"")
+        with self._lock:
+            if self._mmap is None:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            return memoryview(self._mmap)
+
+    def close(self) -> None:
+        """
+        Release the temporary file of a spilled body. The body is no longer readable afterwards.
+        """
+        with self._lock:
+            if self._mmap is not None:
+                try:
+                    self._mmap.close()
+                    self._mmap = None
+                except BufferError:
+                    # A view of the mapping is still in use, it is released with the mapping
+                    pass
+            if self._file is not None:
+                self._file.close()
+
+    def __getstate__(self) -> dict:
+        """
+        Get the state to pickle, with a spilled body read back into memory.
+
+        :return: The state of the response.
+        :rtype: dict
+        """
+        state = self.__dict__.copy()
+        del state["_lock"]
+        if self._file is not None:
+            state["_content"] = self.content
+            state["_file"] = None
+            state["_mmap"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore a pickled response, with a lock of its own.
+
+        :param dict state: The state of the response.
+        """
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def from_stream(
+        response: RequestsResponse, chunk_size: int = 8192
+    ) -> Generator["Response", None, None]:
+        """
+        Create one Response object per item of a streamed body.
+        Items are decoded incrementally, so events and lines split between chunks are
+        reassembled: event streams yield one response per event, with the event data parsed
+        as JSON when possible, and NDJSON yields one response per line.
+
+        :param RequestsResponse response: The requests.Response object, opened with stream=True.
+        :param int chunk_size: The size of the chunks read from the connection.
+        :return: The responses.
+        :rtype: Generator[Response, None, None]
+        """
+        content_type = response.headers.get("Content-Type", "").lower()
+        for item in decode_stream(
+            content_type, response.iter_content(chunk_size=chunk_size)
+        ):
+            if isinstance(item, ServerSentEvent):
+                raw = item.data.encode("utf-8")
+                try:
+                    body = item.json()
+                except ValueError:
+                    body = item.data
+                yield Response(response, raw_chunk=raw, body=body, event=item)
+            elif isinstance(item, bytes):
+                yield Response(response, raw_chunk=item, body=item)
+            else:
+                yield Response(response, body=item)
 
     @staticmethod
     def from_chunk(
@@ -41,6 +271,7 @@ def from_chunk(
     ) -> Generator["Response", None, None]:
         """
         Create a Response object from a chunk of data.
+        The chunk is decoded on its own, prefer from_stream for streamed bodies.
 
         :param RequestsResponse response: The requests.Response object.
         :param bytes chunk: The chunk of data.
@@ -67,39 +298,58 @@ def __str__(self) -> str:
             f"Response(status={self.status}, headers={self.headers}, body={self.body})"
         )
 
-    def _parse_response_body(
-        self, content_type: str, body: str, raw_body: bytes
-    ) -> Union[str, dict, bytes]:
+    @staticmethod
+    def _get_request_size(response: RequestsResponse) -> int:
+        """
+        Get the size of the body of the request that produced a response.
+
+        :param RequestsResponse response: The requests.Response object.
+        :return: The size of the request body in bytes, 0 if unknown.
+        :rtype: int
+        """
+        request = response.request
+        if request is None:
+            return 0
+
+        body = request.body
+        if isinstance(body, (bytes, str)):
+            return len(body)
+        return int(request.headers.get("Content-Length", 0) or 0)
+
+    def _parse_response_body(self) -> Union[str, dict, bytes]:
         """
-        Extracts the response body from a given HTTP response.
+        Extracts the response body from the HTTP response.
 
         This method attempts to parse the response body based on its content type.
-        If the content type is JSON, it tries to parse the body as JSON.
-        If the content type is text or XML, it returns the raw text.
+        If the content type is JSON, it parses the raw bytes with the JSON codec of the process.
+        If the content type is text or XML, it returns the decoded text.
         If the content type is 'application/x-www-form-urlencoded', it parses the body as a query string.
         For all other content types, it returns the raw binary content.
 
-        :param RequestsResponse response: The HTTP response received from a request.
         :return: The parsed response body.
         :rtype: str or dict or bytes
         """
+        content_type = self._content_type
+        codec = get_json_codec()
         try:
             if re.search(r"application\/.*json", content_type):
-                return json.loads(body)
+                return codec.loads(
+                    self._text if self._text is not None else self.content
+                )
 
-            if "text/event-stream" in content_type and "data: " in body:
-                json_body = body[6:]
+            if "text/event-stream" in content_type and "data: " in self.text:
+                json_body = self.text[6:]
                 # Note: this assumes that the content of data is a valid JSON string
-                return json.loads(json_body)
+                return codec.loads(json_body)
 
             if "text/" in content_type or content_type == "application/xml":
-                return body
+                return self.text
 
             if content_type == "application/x-www-form-urlencoded":
-                parsed_response = parse_qs(body)
+                parsed_response = parse_qs(self.text)
                 return {k: v[0] for k, v in parsed_response.items()}
 
-            return raw_body
+            return self.content
 
-        except json.JSONDecodeError:
-            return raw_body
+        except ValueError:
+            return self.content
@@ -16,6 +16,7 @@ class Serializer:
     :ivar list[str] cookies: A list containing cookie strings for the request.
     :ivar dict[str, str] path: A dictionary containing path parameters for the request.
     :ivar list[str] query: A list containing query parameters for the request.
+    :ivar dict[int, type] errors: A dictionary containing the error classes of the error responses, by status code.
     """
 
     def __init__(self, url: str, default_headers: List[BaseHeader] = []):
@@ -30,6 +31,7 @@ def __init__(self, url: str, default_headers: List[BaseHeader] = []):
         self.cookies: list[str] = []
         self.path: dict[str, str] = {}
         self.query: list[str] = []
+        self.errors: dict[int, type] = {}
 
         for header in default_headers:
             for key, value in header.get_headers().items():
@@ -184,6 +186,21 @@ def add_query(
         self.query.append(query_param)
         return self
 
+    def add_error(self, status: int, error: type) -> "Serializer":
+        """
+        Adds the error class raised for an error response.
+
+        :param int status: The HTTP status code associated with the error.
+        :param type error: The exception class built from the body of the response.
+        :return: The Serializer instance for method chaining.
+        :rtype: Serializer
+        """
+        if not was_value_set(error):
+            return self
+
+        self.errors[status] = error
+        return self
+
     def serialize(self) -> Request:
         """
         Serializes the components and returns a Request object.
@@ -196,7 +213,13 @@ def serialize(self) -> Request:
         if len(self.cookies) > 0:
             self.headers["Cookie"] = ";".join(self.cookies)
 
-        return Request().set_url(final_url).set_headers(self.headers)
+        return (
+            Request()
+            .set_url(final_url)
+            .set_headers(self.headers)
+            .set_endpoint_template(self.url)
+            .set_errors(dict(self.errors))
+        )
 
     def _define_url(self) -> str:
         """
@@ -0,0 +1,54 @@
+import tempfile
+
+from typing import BinaryIO, Union
+from requests import Response as RequestsResponse
+
+SPOOL_CHUNK_SIZE = 64 * 1024
+
+
+def read_body(
+    response: RequestsResponse, spill_threshold: int
+) -> Union[bytes, BinaryIO]:
+    """
+    Read the body of a response opened with stream=True, spilling it to a temporary
+    file once it grows past the threshold instead of holding it in memory.
+
+    :param RequestsResponse response: The requests.Response object, opened with stream=True.
+    :param int spill_threshold: The maximum size in bytes of a body kept in memory.
+    :return: The body as bytes if it fits under the threshold, otherwise a temporary file positioned at its start.
+    :rtype: Union[bytes, BinaryIO]
+    """
+    content_length = response.headers.get("Content-Length", "")
+    if (
+        content_length.isdigit()
+        and int(content_length) <= spill_threshold
+        and "Content-Encoding" not in response.headers
+    ):
+        return response.content or b""
+
+    buffer = bytearray()
+    file = None
+    try:
+        for chunk in response.iter_content(chunk_size=SPOOL_CHUNK_SIZE):
+            if file is not None:
+                file.write(chunk)
+                continue
+
+            buffer += chunk
+            if len(buffer) > spill_threshold:
+                file = tempfile.TemporaryFile()
+                file.write(buffer)
+                buffer = None
+    except BaseException:
+        if file is not None:
+            file.close()
+        raise
+    finally:
+        response.close()
+
+    if file is None:
+        return bytes(buffer)
+
+    file.flush()
+    file.seek(0)
+    return file
@@ -0,0 +1,286 @@
+import codecs
+import re
+
+from typing import Any, Generator, Iterable, List, Optional
+from .json_codec import get_json_codec
+
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+
+class LineDecoder:
+    """
+    Splits a stream of bytes into text lines.
+    Multibyte UTF-8 characters and line breaks split between two chunks are
+    reassembled, and a partial line is only joined once it is complete, so the
+    cost stays linear in the size of the stream.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending: List[str] = []
+        self._skip_line_feed = False
+
+    def feed(self, chunk: bytes) -> List[str]:
+        """
+        Add a chunk of the stream.
+
+        :param bytes chunk: The chunk.
+        :return: The lines completed by the chunk, without their line break.
+        :rtype: List[str]
+        """
+        return self._split(self._decoder.decode(chunk))
+
+    def close(self) -> List[str]:
+        """
+        End the stream.
+
+        :return: The last line if the stream did not end with a line break.
+        :rtype: List[str]
+        """
+        lines = self._split(self._decoder.decode(b"", final=True))
+        if self._pending:
+            lines.append("".join(self._pending))
+            self._pending = []
+        return lines
+
+    def _split(self, text: str) -> List[str]:
+        """
+        Split decoded text into complete lines, keeping the trailing partial line.
+
+        :param str text: The decoded text.
+        :return: The completed lines.
+        :rtype: List[str]
+        """
+        if self._skip_line_feed and text:
+            if text.startswith("\n"):
+                # The \r ending the previous chunk was the first half of a \r\n
+                text = text[1:]
+            self._skip_line_feed = False
+
+        lines = []
+        start = 0
+        for match in _LINE_BREAK.finditer(text):
+            self._pending.append(text[start : match.start()])
+            lines.append("".join(self._pending))
+            self._pending = []
+            start = match.end()
+
+        if start < len(text):
+            self._pending.append(text[start:])
+        elif text.endswith("\r"):
+            self._skip_line_feed = True
+
+        return lines
+
+
+class ServerSentEvent:
+    """
+    An event received from a text/event-stream response.
+
+    :ivar str event: The event type, "message" when the server did not name it.
+    :ivar str data: The event data, with the lines of multi-line data joined by a line feed.
+    :ivar Optional[str] id: The last event ID sent by the server.
+    :ivar Optional[int] retry: The reconnection time in milliseconds requested by the server.
+    """
+
+    def __init__(
+        self,
+        event: str = "message",
+        data: str = "",
+        id: Optional[str] = None,
+        retry: Optional[int] = None,
+    ):
+        self.event = event
+        self.data = data
+        self.id = id
+        self.retry = retry
+
+    def json(self) -> Any:
+        """
+        Parse the data of the event as JSON.
+
+        :return: The parsed data.
+        :rtype: Any
+        :raises ValueError: If the data is not valid JSON.
+        """
+        return get_json_codec().loads(self.data)
+
+    def __str__(self) -> str:
+        return f"ServerSentEvent(event={self.event}, id={self.id}, data={self.data})"
+
+
+class SseDecoder:
+    """
+    An incremental decoder of text/event-stream responses, following the
+    event stream interpretation of the HTML specification: fields accumulate
+    until a blank line dispatches the event, and comments are ignored.
+    """
+
+    def __init__(self):
+        self._lines = LineDecoder()
+        self._event_type = ""
+        self._data: List[str] = []
+        self._has_data = False
+        self._last_event_id: Optional[str] = None
+        self._retry: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> List[ServerSentEvent]:
+        """
+        Add a chunk of the stream.
+
+        :param bytes chunk: The chunk.
+        :return: The events completed by the chunk.
+        :rtype: List[ServerSentEvent]
+        """
+        return self._process(self._lines.feed(chunk))
+
+    def close(self) -> List[ServerSentEvent]:
+        """
+        End the stream. An event not terminated by a blank line is still dispatched.
+
+        :return: The last events.
+        :rtype: List[ServerSentEvent]
+        """
+        events = self._process(self._lines.close())
+        event = self._dispatch()
+        if event is not None:
+            events.append(event)
+        return events
+
+    def _process(self, lines: List[str]) -> List[ServerSentEvent]:
+        """
+        Interpret complete lines.
+
+        :param List[str] lines: The lines.
+        :return: The dispatched events.
+        :rtype: List[ServerSentEvent]
+        """
+        events = []
+        for line in lines:
+            if not line:
+                event = self._dispatch()
+                if event is not None:
+                    events.append(event)
+                continue
+
+            if line.startswith(":"):
+                continue
+
+            field, _, value = line.partition(":")
+            if value.startswith(" "):
+                value = value[1:]
+
+            if field == "data":
+                self._data.append(value)
+                self._has_data = True
+            elif field == "event":
+                self._event_type = value
+            elif field == "id" and "\0" not in value:
+                self._last_event_id = value
+            elif field == "retry" and value.isdigit():
+                self._retry = int(value)
+        return events
+
+    def _dispatch(self) -> Optional[ServerSentEvent]:
+        """
+        Build the event from the buffered fields and reset them.
+
+        :return: The event, or None if no data was received since the last event.
+        :rtype: Optional[ServerSentEvent]
+        """
+        event = None
+        if self._has_data:
+            event = ServerSentEvent(
+                self._event_type or "message",
+                "\n".join(self._data),
+                self._last_event_id,
+                self._retry,
+            )
+        self._event_type = ""
+        self._data = []
+        self._has_data = False
+        return event
+
+
+class NdjsonDecoder:
+    """
+    An incremental decoder of newline-delimited JSON responses. Blank lines are skipped.
+    """
+
+    def __init__(self):
+        self._lines = LineDecoder()
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Add a chunk of the stream.
+
+        :param bytes chunk: The chunk.
+        :return: The values completed by the chunk.
+        :rtype: List[Any]
+        :raises ValueError: If a line is not valid JSON.
+        """
+        codec = get_json_codec()
+        return [codec.loads(line) for line in self._lines.feed(chunk) if line.strip()]
+
+    def close(self) -> List[Any]:
+        """
+        End the stream.
+
+        :return: The last value if the stream did not end with a line break.
+        :rtype: List[Any]
+        :raises ValueError: If a line is not valid JSON.
+        """
+        codec = get_json_codec()
+        return [codec.loads(line) for line in self._lines.close() if line.strip()]
+
+
+def is_ndjson(content_type: str) -> bool:
+    """
+    Check whether a content type denotes newline-delimited JSON.
+
+    :param str content_type: The lowercased content type.
+    :return: True for application/x-ndjson, application/jsonl and similar types.
+    :rtype: bool
+    """
+    return any(
+        media_type in content_type
+        for media_type in ("ndjson", "jsonl", "json-lines", "jsonlines")
+    )
+
+
+def decode_stream(
+    content_type: str, chunks: Iterable[bytes]
+) -> Generator[Any, None, None]:
+    """
+    Decode a streamed body into its items.
+
+    :param str content_type: The lowercased content type of the response.
+    :param Iterable[bytes] chunks: The chunks of the body.
+    :return: ServerSentEvent objects for event streams, parsed values for NDJSON and
+        the whole parsed document for JSON, decoded text for text types and raw bytes otherwise.
+    :rtype: Generator[Any, None, None]
+    """
+    if "text/event-stream" in content_type:
+        decoder = SseDecoder()
+    elif is_ndjson(content_type):
+        decoder = NdjsonDecoder()
+    elif re.search(r"application\/.*json", content_type):
+        yield get_json_codec().loads(b"".join(chunks) or b"null")
+        return
+    elif "text/" in content_type or content_type == "application/xml":
+        text_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        for chunk in chunks:
+            text = text_decoder.decode(chunk)
+            if text:
+                yield text
+        text = text_decoder.decode(b"", final=True)
+        if text:
+            yield text
+        return
+    else:
+        yield from chunks
+        return
+
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
@@ -0,0 +1,472 @@
+import asyncio
+import io
+import threading
+import time
+import weakref
+
+from datetime import timedelta
+from typing import AsyncIterator, Callable, Dict, Iterable, Optional, Tuple
+import requests
+import urllib3
+
+from requests import PreparedRequest, Response as RequestsResponse
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.exceptions import (
+    ConnectTimeoutError,
+    HTTPError as Urllib3HTTPError,
+    MaxRetryError,
+    ReadTimeoutError,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+class Transport:
+    """
+    The backend sending prepared HTTP requests for the HttpHandler.
+    This class must be implemented by all transports.
+
+    Transports raise requests.exceptions.Timeout when the connect or read timeout
+    expires and requests.exceptions.ConnectionError when the server cannot be reached,
+    so that handlers behave the same whatever the backend.
+    """
+
+    def send(
+        self,
+        request: PreparedRequest,
+        timeout: Tuple[float, float],
+        stream: bool = False,
+    ) -> RequestsResponse:
+        """
+        Send a request.
+
+        :param PreparedRequest request: The request, with its body already encoded.
+        :param Tuple[float, float] timeout: The connect and read timeouts in seconds.
+        :param bool stream: Whether to return as soon as the headers are received, leaving the body to be read.
+        :return: The response.
+        :rtype: RequestsResponse
+        """
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        """
+        Release the connections held by the transport.
+        """
+
+
+class AsyncTransport:
+    """
+    The backend sending prepared HTTP requests from a coroutine.
+    This class must be implemented by all async transports, which raise the same exceptions as transports.
+    """
+
+    async def send(
+        self, request: PreparedRequest, timeout: Tuple[float, float]
+    ) -> RequestsResponse:
+        """
+        Send a request and read its body.
+
+        :param PreparedRequest request: The request, with its body already encoded.
+        :param Tuple[float, float] timeout: The connect and read timeouts in seconds.
+        :return: The response.
+        :rtype: RequestsResponse
+        """
+        raise NotImplementedError()
+
+    async def close(self) -> None:
+        """
+        Release the connections held by the transport.
+        """
+
+
+class RequestsTransport(Transport):
+    """
+    A transport using a requests.Session, keeping connections alive between requests.
+    Proxies and certificates are taken from the environment like requests.request does.
+
+    :ivar requests.Session _session: The session.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Initialize a new instance of RequestsTransport.
+
+        :param Optional[requests.Session] session: The session to send requests with, a new one by default.
+        """
+        self._session = session if session is not None else requests.Session()
+
+    def send(
+        self,
+        request: PreparedRequest,
+        timeout: Tuple[float, float],
+        stream: bool = False,
+    ) -> RequestsResponse:
+        settings = self._session.merge_environment_settings(
+            request.url, {}, stream, None, None
+        )
+        return self._session.send(request, timeout=timeout, **settings)
+
+    def close(self) -> None:
+        self._session.close()
+
+
+class Urllib3Transport(Transport):
+    """
+    A transport sending requests directly through a urllib3 PoolManager, skipping the
+    session and adapter layers of requests for a lower overhead per call.
+    Redirects are not followed and proxies are not read from the environment.
+
+    :ivar urllib3.PoolManager _pool_manager: The connection pools.
+    """
+
+    def __init__(self, pool_manager: Optional[urllib3.PoolManager] = None):
+        """
+        Initialize a new instance of Urllib3Transport.
+
+        :param Optional[urllib3.PoolManager] pool_manager: The connection pools, a new PoolManager by default.
+        """
+        self._pool_manager = (
+            pool_manager if pool_manager is not None else urllib3.PoolManager()
+        )
+        self._adapter = HTTPAdapter()
+
+    def send(
+        self,
+        request: PreparedRequest,
+        timeout: Tuple[float, float],
+        stream: bool = False,
+    ) -> RequestsResponse:
+        start = time.perf_counter()
+        try:
+            result = self._pool_manager.urlopen(
+                request.method,
+                request.url,
+                body=request.body,
+                headers=dict(request.headers),
+                timeout=urllib3.Timeout(connect=timeout[0], read=timeout[1]),
+                retries=False,
+                redirect=False,
+                preload_content=False,
+                decode_content=True,
+            )
+        except (ConnectTimeoutError, ReadTimeoutError) as error:
+            raise requests.exceptions.Timeout(error, request=request)
+        except MaxRetryError as error:
+            if isinstance(error.reason, (ConnectTimeoutError, ReadTimeoutError)):
+                raise requests.exceptions.Timeout(error, request=request)
+            raise requests.exceptions.ConnectionError(error, request=request)
+        except Urllib3HTTPError as error:
+            raise requests.exceptions.ConnectionError(error, request=request)
+
+        response = self._adapter.build_response(request, result)
+        response.elapsed = timedelta(seconds=time.perf_counter() - start)
+        if not stream:
+            try:
+                response.content
+            except requests.exceptions.ConnectionError as error:
+                if isinstance(error.args[0], ReadTimeoutError):
+                    raise requests.exceptions.Timeout(error, request=request)
+                raise
+            finally:
+                result.release_conn()
+        return response
+
+    def close(self) -> None:
+        self._pool_manager.clear()
+
+
+class _IteratorReader(io.RawIOBase):
+    """
+    A readable file over an iterator of byte chunks, closing the source with the file.
+    """
+
+    def __init__(self, chunks, on_close: Callable[[], None]):
+        self._chunks = iter(chunks)
+        self._on_close = on_close
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            self._pending = next(self._chunks, None)
+            if self._pending is None:
+                self._pending = b""
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._on_close()
+        super().close()
+
+
+def _build_response(
+    request: PreparedRequest, result, elapsed: float
+) -> RequestsResponse:
+    """
+    Build a requests.Response from an httpx response.
+
+    :param PreparedRequest request: The request sent.
+    :param result: The httpx response.
+    :param float elapsed: The time until the headers were received, in seconds.
+    :return: The response, whose body is decoded by httpx.
+    :rtype: RequestsResponse
+    """
+    response = RequestsResponse()
+    response.status_code = result.status_code
+    response.reason = result.reason_phrase
+    response.headers = CaseInsensitiveDict(result.headers.items())
+    # httpx already removes the content encodings
+    response.headers.pop("Content-Encoding", None)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = str(result.url)
+    response.request = request
+    response.elapsed = timedelta(seconds=elapsed)
+    return response
+
+
+def _get_httpx_timeout(timeout: Tuple[float, float]):
+    return httpx.Timeout(timeout[1], connect=timeout[0])
+
+
+class HttpxTransport(Transport):
+    """
+    A transport using an httpx.Client, which supports HTTP/2 when the h2 package is installed.
+
+    :ivar httpx.Client _client: The client.
+    """
+
+    def __init__(self, client=None):
+        """
+        Initialize a new instance of HttpxTransport.
+
+        :param Optional[httpx.Client] client: The client to send requests with, a new one by default.
+        """
+        if httpx is None:
+            raise ImportError("httpx is required to use the HttpxTransport.")
+        self._client = client if client is not None else httpx.Client()
+
+    def send(
+        self,
+        request: PreparedRequest,
+        timeout: Tuple[float, float],
+        stream: bool = False,
+    ) -> RequestsResponse:
+        start = time.perf_counter()
+        try:
+            result = self._client.send(
+                self._client.build_request(
+                    request.method,
+                    request.url,
+                    headers=dict(request.headers),
+                    content=request.body,
+                    timeout=_get_httpx_timeout(timeout),
+                ),
+                stream=stream,
+            )
+        except httpx.TimeoutException as error:
+            raise requests.exceptions.Timeout(error, request=request)
+        except httpx.TransportError as error:
+            raise requests.exceptions.ConnectionError(error, request=request)
+
+        response = _build_response(request, result, time.perf_counter() - start)
+        if stream:
+            response.raw = _IteratorReader(result.iter_bytes(), result.close)
+        else:
+            response._content = result.content
+        return response
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class HttpxAsyncTransport(AsyncTransport):
+    """
+    An async transport using an httpx.AsyncClient.
+    The connections of a client belong to the event loop that opened them, so without a
+    given client, one is created for each event loop the transport is used from.
+
+    :ivar Optional[httpx.AsyncClient] _client: The given client, used from a single event loop.
+    """
+
+    def __init__(self, client=None):
+        """
+        Initialize a new instance of HttpxAsyncTransport.
+
+        :param Optional[httpx.AsyncClient] client: The client to send requests with, a new one per event loop by default.
+        """
+        if httpx is None:
+            raise ImportError("httpx is required to use the HttpxAsyncTransport.")
+        self._client = client
+        self._clients: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]"
+        ) = weakref.WeakKeyDictionary()
+
+    def _get_client(self):
+        """
+        Get the client for the running event loop.
+
+        :return: The client.
+        :rtype: httpx.AsyncClient
+        """
+        if self._client is not None:
+            return self._client
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = httpx.AsyncClient()
+        return client
+
+    async def send(
+        self, request: PreparedRequest, timeout: Tuple[float, float]
+    ) -> RequestsResponse:
+        client = self._get_client()
+        start = time.perf_counter()
+        try:
+            result = await client.send(
+                client.build_request(
+                    request.method,
+                    request.url,
+                    headers=dict(request.headers),
+                    content=_get_async_content(request.body),
+                    timeout=_get_httpx_timeout(timeout),
+                )
+            )
+        except httpx.TimeoutException as error:
+            raise requests.exceptions.Timeout(error, request=request)
+        except httpx.TransportError as error:
+            raise requests.exceptions.ConnectionError(error, request=request)
+
+        response = _build_response(request, result, time.perf_counter() - start)
+        response._content = result.content
+        # The body is read, so it can be spilled from memory like a streamed one
+        response._content_consumed = True
+        return response
+
+    async def close(self) -> None:
+        await self._get_client().aclose()
+        self._clients.pop(asyncio.get_running_loop(), None)
+
+
+async def _iterate_in_thread(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    """
+    Iterate chunks in worker threads, for bodies whose iteration blocks, such as throttled uploads.
+
+    :param Iterable[bytes] chunks: The chunks.
+    :return: The chunks.
+    :rtype: AsyncIterator[bytes]
+    """
+    iterator = iter(chunks)
+    while True:
+        chunk = await asyncio.to_thread(next, iterator, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def _get_async_content(body):
+    """
+    Get the content of a prepared request for an async client.
+
+    :param body: The body of the request: bytes, text, an iterator of chunks or None.
+    :return: The body, with iterators turned into async iterators.
+    """
+    if body is None or isinstance(body, (bytes, str)):
+        return body
+    return _iterate_in_thread(body)
+
+
+class ThreadedAsyncTransport(AsyncTransport):
+    """
+    An async transport running a transport in worker threads, used when httpx is not installed.
+
+    :ivar Transport _transport: The transport.
+    """
+
+    def __init__(self, transport: Transport):
+        """
+        Initialize a new instance of ThreadedAsyncTransport.
+
+        :param Transport transport: The transport sending the requests.
+        """
+        self._transport = transport
+
+    async def send(
+        self, request: PreparedRequest, timeout: Tuple[float, float]
+    ) -> RequestsResponse:
+        return await asyncio.to_thread(self._transport.send, request, timeout)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._transport.close)
+
+
+_transport_factories: Dict[str, Callable[[], Transport]] = {
+    "requests": RequestsTransport,
+    "urllib3": Urllib3Transport,
+    "httpx": HttpxTransport,
+}
+_transport_factories_lock = threading.Lock()
+
+
+def register_transport(name: str, factory: Callable[[], Transport]) -> None:
+    """
+    Register a transport, so that services can select it by name.
+
+    :param str name: The name of the transport, replacing any transport registered under it.
+    :param Callable[[], Transport] factory: The function creating an instance of the transport.
+    """
+    with _transport_factories_lock:
+        _transport_factories[name] = factory
+
+
+def create_transport(name: str) -> Transport:
+    """
+    Create an instance of a registered transport.
+
+    :param str name: The name of the transport: requests, urllib3, httpx or a registered name.
+    :return: The transport.
+    :rtype: Transport
+    :raises ValueError: If no transport is registered under the name.
+    """
+    with _transport_factories_lock:
+        factory = _transport_factories.get(name)
+    if factory is None:
+        raise ValueError(
+            f"Unknown transport: {name}, expected one of {', '.join(sorted(_transport_factories))}"
+        )
+    return factory()
+
+
+def create_async_transport(transport: Optional[Transport] = None) -> AsyncTransport:
+    """
+    Create the async transport of the process: httpx when it is installed, otherwise the
+    transport run in worker threads.
+
+    :param Optional[Transport] transport: The transport to run in worker threads, the default transport if None.
+    :return: The async transport.
+    :rtype: AsyncTransport
+    """
+    global _default_async_transport
+
+    if httpx is not None and transport is None:
+        with _transport_factories_lock:
+            if _default_async_transport is None:
+                _default_async_transport = HttpxAsyncTransport()
+            return _default_async_transport
+    return ThreadedAsyncTransport(
+        transport if transport is not None else default_transport
+    )
+
+
+default_transport: Transport = RequestsTransport()
+_default_async_transport: Optional[AsyncTransport] = None
@@ -0,0 +1,214 @@
+import threading
+import time
+
+from enum import Enum
+from time import monotonic
+from typing import Dict, Generator, Iterable, Optional, Union
+
+from .token_bucket import TokenBucket
+
+
+class BandwidthPriority(Enum):
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+
+
+class BandwidthLimiter:
+    """
+    Limits the bandwidth of upload bodies to a rate in bytes per second, shared by
+    priority classes.
+
+    Each priority class has a weight. The classes sending data share the rate in
+    proportion to their weights, and a class left idle for a while gives its share back,
+    so bulk uploads use the whole rate on their own but yield most of it as soon as
+    interactive uploads start. The rate and the weights can be changed at runtime,
+    uploads in progress adopt them from their next chunk.
+
+    :ivar Optional[float] rate: The total rate in bytes per second, None for no limit.
+    :ivar Optional[float] burst: The bytes a class may send at once after being idle, one second of its share if None.
+    :ivar Dict[BandwidthPriority, float] weights: The weight of each priority class.
+    :ivar int chunk_size: The size in bytes of the chunks bodies are streamed in.
+    :ivar float idle_after: The time in seconds after which a class that sent nothing is idle.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        weights: Optional[Dict[Union[BandwidthPriority, str], float]] = None,
+        chunk_size: int = 64 * 1024,
+        idle_after: float = 1.0,
+    ):
+        """
+        Initialize a new instance of BandwidthLimiter.
+
+        :param Optional[float] rate: The total rate in bytes per second, None for no limit.
+        :param Optional[float] burst: The bytes a class may send at once after being idle, one second of its share if None.
+        :param Optional[Dict[Union[BandwidthPriority, str], float]] weights: The weight of each priority class. Interactive uploads weigh 4 and bulk uploads 1 by default.
+        :param int chunk_size: The size in bytes of the chunks bodies are streamed in.
+        :param float idle_after: The time in seconds after which a class that sent nothing is idle.
+        """
+        if chunk_size <= 0:
+            raise ValueError("The chunk size must be greater than 0.")
+
+        self.rate: Optional[float] = None
+        self.burst: Optional[float] = None
+        self.weights: Dict[BandwidthPriority, float] = {
+            BandwidthPriority.INTERACTIVE: 4.0,
+            BandwidthPriority.BULK: 1.0,
+        }
+        self.chunk_size = chunk_size
+        self.idle_after = idle_after
+        self._buckets: Dict[BandwidthPriority, TokenBucket] = {}
+        self._last_sent: Dict[BandwidthPriority, float] = {}
+        self._shares: Dict[BandwidthPriority, float] = {}
+        self._lock = threading.Lock()
+
+        self.set_rate(rate, burst)
+        for priority, weight in (weights or {}).items():
+            self.set_weight(priority, weight)
+
+    @property
+    def limited(self) -> bool:
+        """Whether a rate is set."""
+        return self.rate is not None
+
+    def set_rate(self, rate: Optional[float], burst: Optional[float] = None) -> None:
+        """
+        Change the total rate at runtime.
+
+        :param Optional[float] rate: The total rate in bytes per second, None to remove the limit.
+        :param Optional[float] burst: The bytes a class may send at once after being idle, one second of its share if None.
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError("The bandwidth rate must be greater than 0.")
+        if burst is not None and burst <= 0:
+            raise ValueError("The bandwidth burst must be greater than 0.")
+
+        with self._lock:
+            self.rate = rate
+            self.burst = burst
+            self._shares = {}
+
+    def set_weight(
+        self, priority: Union[BandwidthPriority, str], weight: float
+    ) -> None:
+        """
+        Change the weight of a priority class at runtime.
+
+        :param Union[BandwidthPriority, str] priority: The priority class, or its name such as "bulk".
+        :param float weight: The weight of the class.
+        :raises ValueError: If the priority class is unknown or the weight is not positive.
+        """
+        if weight <= 0:
+            raise ValueError("The weight of a priority class must be greater than 0.")
+
+        with self._lock:
+            self.weights[BandwidthPriority(priority)] = weight
+            self._shares = {}
+
+    def share(self, priority: Union[BandwidthPriority, str]) -> Optional[float]:
+        """
+        Get the rate a priority class gets, given the classes currently sending data.
+
+        :param Union[BandwidthPriority, str] priority: The priority class, or its name.
+        :return: The rate in bytes per second, None if no rate is set.
+        :rtype: Optional[float]
+        """
+        priority = BandwidthPriority(priority)
+        with self._lock:
+            if self.rate is None:
+                return None
+            active = self._active_classes(monotonic()) | {priority}
+            weight = sum(self.weights[active_priority] for active_priority in active)
+            return self.rate * self.weights[priority] / weight
+
+    def acquire(
+        self,
+        amount: int,
+        priority: Union[BandwidthPriority, str] = BandwidthPriority.INTERACTIVE,
+    ) -> None:
+        """
+        Wait until the priority class may send the given amount of bytes.
+
+        :param int amount: The amount of bytes.
+        :param Union[BandwidthPriority, str] priority: The priority class, or its name.
+        """
+        priority = BandwidthPriority(priority)
+        with self._lock:
+            if self.rate is None:
+                return
+            now = monotonic()
+            self._last_sent[priority] = now
+            bucket = self._update_shares(now)[priority]
+            wait = bucket.reserve(amount)
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def throttle(
+        self,
+        data: Union[bytes, Iterable[bytes]],
+        priority: Union[BandwidthPriority, str] = BandwidthPriority.INTERACTIVE,
+    ) -> Generator[bytes, None, None]:
+        """
+        Stream data in chunks, each sent once the priority class may send it.
+
+        :param Union[bytes, Iterable[bytes]] data: The data, or its chunks.
+        :param Union[BandwidthPriority, str] priority: The priority class, or its name.
+        :return: The chunks of the data.
+        :rtype: Generator[bytes, None, None]
+        """
+        chunks = data
+        if isinstance(data, bytes):
+            chunks = (
+                data[offset : offset + self.chunk_size]
+                for offset in range(0, len(data), self.chunk_size)
+            )
+        for chunk in chunks:
+            self.acquire(len(chunk), priority)
+            yield chunk
+
+    def _active_classes(self, now: float) -> frozenset:
+        """
+        Get the priority classes that sent data recently. Must be called with the lock held.
+
+        :param float now: The current time in seconds.
+        :return: The active priority classes.
+        :rtype: FrozenSet[BandwidthPriority]
+        """
+        return frozenset(
+            priority
+            for priority, sent_at in self._last_sent.items()
+            if now - sent_at < self.idle_after
+        )
+
+    def _update_shares(self, now: float) -> Dict[BandwidthPriority, TokenBucket]:
+        """
+        Split the rate between the active classes, when they changed since the last split.
+        Must be called with the lock held.
+
+        :param float now: The current time in seconds.
+        :return: The buckets of the active classes.
+        :rtype: Dict[BandwidthPriority, TokenBucket]
+        """
+        active = self._active_classes(now)
+        weight = sum(self.weights[priority] for priority in active)
+        shares = {
+            priority: self.rate * self.weights[priority] / weight for priority in active
+        }
+        if shares == self._shares:
+            return self._buckets
+
+        for priority, share in shares.items():
+            capacity = self.burst * share / self.rate if self.burst else share
+            bucket = self._buckets.get(priority)
+            if bucket is None:
+                self._buckets[priority] = TokenBucket(share, capacity)
+            else:
+                bucket.set_rate(share, capacity)
+        self._shares = shares
+        return self._buckets
+
+
+default_bandwidth_limiter = BandwidthLimiter()
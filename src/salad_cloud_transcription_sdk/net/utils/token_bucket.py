@@ -0,0 +1,113 @@
+import threading
+
+from time import monotonic
+from typing import Tuple
+
+
+def refill(
+    tokens: float, updated_at: float, now: float, rate: float, capacity: float
+) -> float:
+    """
+    Compute the content of a token bucket after it refilled for a while.
+
+    :param float tokens: The tokens in the bucket at the last update. May be negative when tokens were reserved.
+    :param float updated_at: The time of the last update in seconds.
+    :param float now: The current time in seconds.
+    :param float rate: The amount of tokens added per second.
+    :param float capacity: The maximum amount of tokens in the bucket.
+    :return: The tokens in the bucket now.
+    :rtype: float
+    """
+    return min(capacity, tokens + max(0.0, now - updated_at) * rate)
+
+
+def reserve(tokens: float, amount: float, rate: float) -> Tuple[float, float]:
+    """
+    Take tokens from a bucket, letting it go into debt when it does not hold enough.
+
+    :param float tokens: The tokens currently in the bucket.
+    :param float amount: The amount of tokens to take.
+    :param float rate: The amount of tokens added per second.
+    :return: The tokens left in the bucket and the time in seconds the caller must wait before proceeding.
+    :rtype: Tuple[float, float]
+    """
+    tokens -= amount
+    wait = -tokens / rate if tokens < 0 and rate > 0 else 0.0
+    return tokens, wait
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket.
+    Callers reserve tokens and are told how long to wait until the reservation is covered,
+    so waiting callers are served in the order they arrived.
+
+    :ivar float rate: The amount of tokens added per second.
+    :ivar float capacity: The maximum amount of tokens, i.e. the allowed burst.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize a new instance of TokenBucket, initially full.
+
+        :param float rate: The amount of tokens added per second.
+        :param float capacity: The maximum amount of tokens, i.e. the allowed burst.
+        """
+        if rate <= 0:
+            raise ValueError("The token bucket rate must be greater than 0.")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float, capacity: float = None) -> None:
+        """
+        Change the rate, and optionally the capacity, of the bucket at runtime.
+
+        :param float rate: The amount of tokens added per second.
+        :param float capacity: The maximum amount of tokens. Defaults to the current capacity.
+        """
+        if rate <= 0:
+            raise ValueError("The token bucket rate must be greater than 0.")
+
+        with self._lock:
+            self._refill()
+            self.rate = rate
+            if capacity is not None:
+                self.capacity = capacity
+                self._tokens = min(self._tokens, capacity)
+
+    def reserve(self, amount: float = 1) -> float:
+        """
+        Take tokens from the bucket.
+
+        :param float amount: The amount of tokens to take.
+        :return: The time in seconds the caller must wait before using the tokens.
+        :rtype: float
+        """
+        with self._lock:
+            self._refill()
+            self._tokens, wait = reserve(self._tokens, amount, self.rate)
+            return wait
+
+    def refund(self, amount: float = 1) -> None:
+        """
+        Give back tokens that were reserved but not used.
+
+        :param float amount: The amount of tokens to give back.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def _refill(self) -> None:
+        """
+        Add the tokens accumulated since the last update. Must be called with the lock held.
+        """
+        now = monotonic()
+        self._tokens = refill(
+            self._tokens, self._updated_at, now, self.rate, self.capacity
+        )
+        self._updated_at = now
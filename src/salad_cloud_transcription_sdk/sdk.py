@@ -5,6 +5,7 @@
 from salad_cloud_sdk.models import InferenceEndpointJob, InferenceEndpointJobCollection
 
 from .net.environment import Environment
+from .net.transport.deadline import Deadline
 
 
 class SaladCloudTranscriptionSdk:
@@ -37,6 +38,8 @@ def transcribe(
         request: TranscriptionRequest,
         engine: TranscriptionEngine = TranscriptionEngine.Full,
         auto_poll: bool = False,
+        deadline: Optional[Deadline] = None,
+        timing_report: bool = False,
     ) -> InferenceEndpointJob:
         """Creates a new transcription job
 
@@ -50,6 +53,10 @@ def transcribe(
         :type engine: TranscriptionEngine, optional
         :param auto_poll: Whether to block until the transcription is complete, or return immediately
         :type auto_poll: bool, optional (default=False)
+        :param deadline: An upper bound for the whole call, including retries and polling
+        :type deadline: Optional[Deadline], optional (default=None)
+        :param timing_report: Whether to attach a TranscriptionTimingReport to the returned job, as its timing_report attribute
+        :type timing_report: bool, optional (default=False)
 
         :return: The transcription job details
         :rtype: InferenceEndpointJob
@@ -60,6 +67,8 @@ def transcribe(
             request=request,
             engine=engine,
             auto_poll=auto_poll,
+            deadline=deadline,
+            timing_report=timing_report,
         )
 
     def get_transcription_job(
@@ -146,3 +155,14 @@ def set_timeout(self, timeout: int):
         self.transcription.set_timeout(timeout)
 
         return self
+
+    def set_connect_timeout(self, connect_timeout: int):
+        """
+        Sets the connect timeout for the entire SDK, independently of the read timeout.
+
+        :param int connect_timeout: The connect timeout (ms) to be set.
+        :return: The SDK instance.
+        """
+        self.transcription.set_connect_timeout(connect_timeout)
+
+        return self
@@ -1,7 +1,9 @@
 from .simple_storage import SimpleStorageServiceAsync
 from .transcription import TranscriptionServiceAsync
+from .utils.upload_progress_stream import UploadProgressStream
 
 __all__ = [
     "SimpleStorageServiceAsync",
     "TranscriptionServiceAsync",
+    "UploadProgressStream",
 ]
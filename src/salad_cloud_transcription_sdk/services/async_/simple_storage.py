@@ -1,15 +1,39 @@
-from typing import Optional, Union, Any
-from enum import Enum
+import asyncio
+import os
+import time
+from contextlib import nullcontext
+from urllib.parse import urlparse
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Optional,
+    Set,
+    Union,
+)
 
 from ..simple_storage import SimpleStorageService, HttpMethod
-from ..utils.base_service import BaseService
+from ..utils.checksums import UploadChecksums
+from ..utils.upload_progress import UploadProgressCallback, UploadProgressTracker
+from ..utils.validator import Validator
 from ...net.environment.environment import Environment
+from ...net.transport.file_part import FilePart
+from ...net.transport.request_error import RequestError
+from ...models.utils.cast_models import cast_models
 from ...models.file_operation_response import FileOperationResponse
+from ...models.directory_upload_result import DirectoryUploadResult, FileUploadResult
 from .utils.to_async import to_async
 
 
 class SimpleStorageServiceAsync(SimpleStorageService):
-    """Asynchronous service for interacting with Salad Cloud Simple Storage Service"""
+    """Asynchronous service for interacting with Salad Cloud Simple Storage Service
+
+    File uploads run on the event loop: parts are read from disk by worker threads when
+    their requests are sent, and again if they are retried, the parts of a multipart
+    upload are sent by concurrent tasks, and cancelling an upload aborts its multipart
+    upload so no part is left in storage. Streams are still uploaded by a worker thread,
+    as they are read with blocking calls.
+    """
 
     def __init__(
         self,
@@ -27,6 +51,493 @@ def __init__(
         super().__init__(base_url=base_url, api_key=api_key)
 
         # Convert methods to async
-        self.upload_file = to_async(self.upload_file)
-        self.delete_file = to_async(self.delete_file)
-        self.sign_url = to_async(self.sign_url)
+        self.upload_stream = to_async(self.upload_stream)
+        self.sweep_multipart_uploads = to_async(self.sweep_multipart_uploads)
+
+    async def upload_file(
+        self,
+        organization_name: str,
+        local_file_path: str,
+        mime_type: Optional[str] = None,
+        sign: bool = True,
+        signature_exp: Optional[int] = SimpleStorageService.DEFAULT_SIGNATURE_EXP,
+        progress_callback: Optional[UploadProgressCallback] = None,
+    ) -> FileOperationResponse:
+        """Uploads a file to the Salad Cloud Storage Service
+
+        :param organization_name: Your organization name. This identifies the billing context for the API operation and represents a security boundary for SaladCloud resources. The organization must be created before using the API, and you must be a member of the organization.
+        :type organization_name: str
+        :param local_file_path: The local path to the file to be uploaded
+        :type local_file_path: str
+        :param mime_type: The MIME type of the file. If not provided, it will be determined automatically.
+        :type mime_type: Optional[str]
+        :param sign: Whether to sign the URL, defaults to True
+        :type sign: bool
+        :param signature_exp: The expiration time for the signature in seconds, defaults to 5 days (432000 seconds)
+        :type signature_exp: Optional[int]
+        :param progress_callback: A function called with the UploadProgress of the upload as it is sent, from the event loop or worker threads
+        :type progress_callback: Optional[UploadProgressCallback]
+
+        :raises RequestError: Raised when a request fails, with optional HTTP status code and details.
+        :raises ValueError: If the file doesn't exist.
+
+        :return: Response containing the URL where the file can be accessed
+        :rtype: FileOperationResponse
+        """
+        filename, mime_type, file_size = await asyncio.to_thread(
+            self._inspect_file, organization_name, local_file_path, mime_type
+        )
+        part_size = self._part_sizer.part_size(file_size, self._upload_concurrency)
+
+        checksums = self._create_checksums()
+        direct = file_size <= min(part_size, self.MAX_FILE_SIZE)
+        progress = self._create_progress(
+            filename,
+            progress_callback,
+            file_size,
+            1 if direct else self._part_sizer.part_count(file_size, part_size),
+        )
+
+        with progress or nullcontext():
+            # For files fitting in a single part, use regular upload
+            if direct:
+                start = time.perf_counter()
+                response = await self._upload_file_direct_async(
+                    organization_name,
+                    local_file_path,
+                    filename,
+                    file_size,
+                    sign,
+                    signature_exp,
+                    checksums,
+                    progress,
+                )
+                self._part_sizer.record(file_size, time.perf_counter() - start)
+            # For large files, use multipart upload
+            else:
+                response = await self._upload_file_in_parts_async(
+                    organization_name,
+                    local_file_path,
+                    filename,
+                    file_size,
+                    part_size,
+                    checksums,
+                    progress,
+                )
+                if sign:
+                    filename = os.path.basename(urlparse(response.url).path)
+                    sign_response, _, _ = await self.send_request_async(
+                        self._sign_url_request(
+                            organization_name, filename, HttpMethod.GET, signature_exp
+                        )
+                    )
+                    response = FileOperationResponse._unmap(sign_response)
+
+        return self._attach_checksums(response, checksums)
+
+    async def _upload_file_direct_async(
+        self,
+        organization_name: str,
+        local_file_path: str,
+        filename: str,
+        file_size: int,
+        sign: bool,
+        signature_exp: Optional[int],
+        checksums: Optional[UploadChecksums],
+        progress: Optional[UploadProgressTracker],
+    ) -> FileOperationResponse:
+        """Uploads a file fitting in a single part in a single request
+
+        :param organization_name: Organization name
+        :param local_file_path: Local file path
+        :param filename: Filename to use in storage
+        :param file_size: The size of the file in bytes
+        :param sign: Whether to sign the URL
+        :param signature_exp: Expiration time for signature
+        :param checksums: The checksums computed while the file is read
+        :param progress: The tracker of the upload progress
+        :return: Response containing the URL where the file can be accessed
+        :rtype: FileOperationResponse
+        """
+        # The file is read when the request is sent, and again if it is retried
+        file = FilePart(
+            local_file_path,
+            0,
+            file_size,
+            checksums.part_reader(1) if checksums is not None else None,
+        )
+        async with self._memory_budget.reserve_async(file_size):
+            response, _, _ = await self.send_request_async(
+                self._direct_upload_request(
+                    organization_name, filename, file, sign, signature_exp, progress
+                )
+            )
+
+        if progress is not None:
+            progress.complete_part(1, file_size)
+        return FileOperationResponse._unmap(response)
+
+    async def _upload_file_in_parts_async(
+        self,
+        organization_name: str,
+        local_file_path: str,
+        filename: str,
+        file_size: int,
+        part_size: int,
+        checksums: Optional[UploadChecksums],
+        progress: Optional[UploadProgressTracker],
+    ) -> FileOperationResponse:
+        """Uploads a large file in parts, sent by concurrent tasks
+
+        At most as many parts as the upload concurrency are read and sent at a time. If a
+        part fails or the upload is cancelled, the other parts are cancelled and the
+        multipart upload is aborted.
+
+        :param organization_name: Organization name
+        :param local_file_path: Local file path
+        :param filename: Filename to use in storage
+        :param file_size: The size of the file in bytes
+        :param part_size: The size of each part in bytes
+        :param checksums: The checksums computed from the parts
+        :param progress: The tracker of the upload progress
+        :return: Response containing the URL where the file can be accessed
+        :rtype: FileOperationResponse
+        """
+        unique_filename = self._unique_filename(filename)
+        create_response, _, _ = await self.send_request_async(
+            self._create_multipart_upload_request(organization_name, unique_filename)
+        )
+        upload_id = create_response["uploadId"]
+        self._multipart_registry.add(organization_name, unique_filename, upload_id)
+
+        semaphore = asyncio.Semaphore(max(1, self._upload_concurrency))
+        tasks = [
+            asyncio.create_task(
+                self._upload_part_async(
+                    organization_name,
+                    unique_filename,
+                    upload_id,
+                    part_number,
+                    local_file_path,
+                    offset,
+                    min(part_size, file_size - offset),
+                    semaphore,
+                    checksums,
+                    progress,
+                )
+            )
+            for part_number, offset in enumerate(
+                range(0, file_size, int(part_size)), start=1
+            )
+        ]
+        try:
+            try:
+                parts = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                # Wait for the cancelled parts, so none is sent after the abort
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+            complete_response, _, _ = await self.send_request_async(
+                self._complete_multipart_upload_request(
+                    organization_name, unique_filename, upload_id, list(parts)
+                )
+            )
+        except BaseException:
+            await self._abort_failed_upload_async(
+                organization_name, unique_filename, upload_id
+            )
+            raise
+
+        self._multipart_registry.remove(upload_id)
+        return self._parse_complete_response(complete_response)
+
+    async def _upload_part_async(
+        self,
+        organization_name: str,
+        unique_filename: str,
+        upload_id: str,
+        part_number: int,
+        local_file_path: str,
+        offset: int,
+        size: int,
+        semaphore: asyncio.Semaphore,
+        checksums: Optional[UploadChecksums],
+        progress: Optional[UploadProgressTracker],
+    ) -> Dict[str, Any]:
+        """Reads and uploads a part of a multipart upload
+
+        :param organization_name: Organization name
+        :param unique_filename: Filename in storage
+        :param upload_id: The ID of the upload
+        :param part_number: The number of the part, from 1
+        :param local_file_path: Local file path
+        :param offset: The position of the part in the file
+        :param size: The size of the part in bytes
+        :param semaphore: The semaphore limiting the parts sent at a time
+        :param checksums: The checksums computed while the part is read
+        :param progress: The tracker of the upload progress
+        :return: The part number and ETag of the part
+        :rtype: Dict[str, Any]
+        """
+        file_part = FilePart(
+            local_file_path,
+            offset,
+            size,
+            checksums.part_reader(part_number) if checksums is not None else None,
+        )
+        async with semaphore, self._memory_budget.reserve_async(size):
+            start = time.perf_counter()
+            try:
+                chunk_response, _, _ = await self.send_request_async(
+                    self._upload_part_request(
+                        organization_name,
+                        unique_filename,
+                        upload_id,
+                        part_number,
+                        file_part,
+                        progress,
+                    )
+                )
+            except Exception:
+                self._part_sizer.record(
+                    size, time.perf_counter() - start, success=False
+                )
+                raise
+            self._part_sizer.record(size, time.perf_counter() - start)
+
+        return self._complete_part(
+            part_number, size, chunk_response, checksums, progress
+        )
+
+    async def _abort_multipart_upload_async(
+        self, organization_name: str, unique_filename: str, upload_id: str
+    ) -> None:
+        """Aborts a multipart upload, deleting its uploaded parts
+
+        :param organization_name: Organization name
+        :param unique_filename: Filename in storage
+        :param upload_id: The ID of the upload
+        """
+        try:
+            await self.send_request_async(
+                self._abort_multipart_upload_request(
+                    organization_name, unique_filename, upload_id
+                )
+            )
+        except RequestError as error:
+            # The upload is already gone, completed, aborted or expired
+            if error.status != 404:
+                raise
+        self._multipart_registry.remove(upload_id)
+
+    async def _abort_failed_upload_async(
+        self, organization_name: str, unique_filename: str, upload_id: str
+    ) -> None:
+        """Aborts a multipart upload that failed or was cancelled
+
+        The abort is shielded from the cancellation of the upload, and its own failure is
+        ignored so the error of the upload is the one raised. An upload left unaborted
+        stays in the multipart registry, for sweep_multipart_uploads.
+
+        :param organization_name: Organization name
+        :param unique_filename: Filename in storage
+        :param upload_id: The ID of the upload
+        """
+        abort = asyncio.ensure_future(
+            self._abort_multipart_upload_async(
+                organization_name, unique_filename, upload_id
+            )
+        )
+        try:
+            await asyncio.shield(abort)
+        except asyncio.CancelledError:
+            # Cancelled again while aborting, let the abort finish in the background
+            abort.add_done_callback(self._ignore_result)
+            raise
+        except Exception:
+            pass
+
+    def _ignore_result(self, future: "asyncio.Future") -> None:
+        """Retrieves the outcome of a background request, so its error is not logged
+
+        :param future: The finished request
+        """
+        if not future.cancelled():
+            future.exception()
+
+    async def upload_directory(
+        self,
+        organization_name: str,
+        path_or_glob: str,
+        concurrency: int = 8,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        sign: bool = True,
+        signature_exp: Optional[int] = SimpleStorageService.DEFAULT_SIGNATURE_EXP,
+        progress_callback: Optional[UploadProgressCallback] = None,
+    ) -> DirectoryUploadResult:
+        """Uploads the files of a directory, or matching a glob pattern, to the Salad Cloud Storage Service
+
+        Files are found lazily by a worker thread and uploaded by concurrent tasks, each
+        through upload_file. A file that fails does not stop the others, its error is
+        reported in the result.
+
+        :param organization_name: Your organization name. This identifies the billing context for the API operation and represents a security boundary for SaladCloud resources. The organization must be created before using the API, and you must be a member of the organization.
+        :type organization_name: str
+        :param path_or_glob: The directory, walked recursively, or a glob pattern such as "audio/**/*.wav"
+        :type path_or_glob: str
+        :param concurrency: The amount of files uploaded at the same time, defaults to 8
+        :type concurrency: int
+        :param include: Patterns of the files to upload, matched against their path relative to the directory or their name. All files if not provided.
+        :type include: Optional[Iterable[str]]
+        :param exclude: Patterns of the files to skip, matched like include
+        :type exclude: Optional[Iterable[str]]
+        :param sign: Whether to sign the URLs, defaults to True
+        :type sign: bool
+        :param signature_exp: The expiration time for the signatures in seconds, defaults to 5 days (432000 seconds)
+        :type signature_exp: Optional[int]
+        :param progress_callback: A function called with the UploadProgress of each file as it is sent, told apart by their filename
+        :type progress_callback: Optional[UploadProgressCallback]
+
+        :raises ValueError: If the path does not exist and is not a glob pattern.
+
+        :return: The result of each file, with the throughput of the upload
+        :rtype: DirectoryUploadResult
+        """
+        Validator(str).min_length(2).max_length(63).pattern(
+            "^[a-z][a-z0-9-]{0,61}[a-z0-9]$"
+        ).validate(organization_name)
+        Validator(int).min(1).validate(concurrency)
+        files = await asyncio.to_thread(
+            self._find_files, path_or_glob, include, exclude
+        )
+
+        result = DirectoryUploadResult()
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(concurrency)
+        pending: Set[asyncio.Task] = set()
+        try:
+            while True:
+                # Keep the walk lazy, only a few files wait for a task slot
+                if len(pending) >= 2 * concurrency:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    result.files.extend(task.result() for task in done)
+
+                path = await asyncio.to_thread(next, files, None)
+                if path is None:
+                    break
+                pending.add(
+                    asyncio.create_task(
+                        self._upload_directory_file_async(
+                            organization_name,
+                            path,
+                            sign,
+                            signature_exp,
+                            semaphore,
+                            progress_callback,
+                        )
+                    )
+                )
+
+            if pending:
+                done, _ = await asyncio.wait(pending)
+                result.files.extend(task.result() for task in done)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            raise
+
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    async def _upload_directory_file_async(
+        self,
+        organization_name: str,
+        path: str,
+        sign: bool,
+        signature_exp: Optional[int],
+        semaphore: asyncio.Semaphore,
+        progress_callback: Optional[UploadProgressCallback] = None,
+    ) -> FileUploadResult:
+        """Uploads a file of a directory, reporting its error instead of raising it
+
+        :param organization_name: Organization name
+        :param path: The path of the file
+        :param sign: Whether to sign the URL
+        :param signature_exp: Expiration time for signature
+        :param semaphore: The semaphore limiting the files uploaded at a time
+        :param progress_callback: The function called with the progress of the upload
+        :return: The result of the upload
+        :rtype: FileUploadResult
+        """
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                size = await asyncio.to_thread(os.path.getsize, path)
+                response = await self.upload_file(
+                    organization_name,
+                    path,
+                    sign=sign,
+                    signature_exp=signature_exp,
+                    progress_callback=progress_callback,
+                )
+            except Exception as error:
+                return FileUploadResult(
+                    path, duration=time.perf_counter() - start, error=error
+                )
+            return FileUploadResult(
+                path, size, time.perf_counter() - start, response=response
+            )
+
+    async def delete_file(
+        self,
+        organization_name: str,
+        filename: str,
+    ) -> bool:
+        """Deletes a file from the Salad Cloud Storage Service
+
+        :param organization_name: Your organization name. This identifies the billing context for the API operation and represents a security boundary for SaladCloud resources. The organization must be created before using the API, and you must be a member of the organization.
+        :type organization_name: str
+        :param filename: The name of the file to delete
+        :type filename: str
+
+        :raises RequestError: Raised when a request fails, with optional HTTP status code and details.
+
+        :return: True if the file was successfully deleted
+        :rtype: bool
+        """
+        _, status_code, _ = await self.send_request_async(
+            self._delete_file_request(organization_name, filename)
+        )
+        return status_code == 204
+
+    @cast_models
+    async def sign_url(
+        self,
+        organization_name: str,
+        filename: str,
+        method: Union[HttpMethod, str],
+        exp: int,
+    ) -> FileOperationResponse:
+        """Signs an URL
+
+        :param organization_name: Your organization name. This identifies the billing context for the API operation and represents a security boundary for SaladCloud resources. The organization must be created before using the API, and you must be a member of the organization.
+        :type organization_name: str
+        :param filename: The filename
+        :type filename: str
+        :param method: The HTTP method to sign the URL for. Currently only supports GET
+        :type method: Union[HttpMethod, str]
+        :param exp: The expiration ttl of the signed URL in seconds
+        :type exp: int
+
+        """
+        response, _, _ = await self.send_request_async(
+            self._sign_url_request(organization_name, filename, method, exp)
+        )
+        return FileOperationResponse._unmap(response)
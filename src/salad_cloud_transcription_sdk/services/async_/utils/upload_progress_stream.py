@@ -0,0 +1,72 @@
+import asyncio
+
+from typing import AsyncIterator, Optional
+
+from ....models.upload_progress import UploadProgress
+
+
+class UploadProgressStream:
+    """
+    An upload progress callback that can be iterated asynchronously.
+
+    Pass the stream as the progress callback of an upload, such as upload_file or
+    transcribe, then iterate it on the event loop while the upload runs. The iteration
+    ends after the last progress of the upload, which is done. Progress reported while
+    the consumer is busy is dropped in favor of the latest one.
+
+    Example Usage:
+    ```python
+    progress = UploadProgressStream()
+    upload = asyncio.create_task(
+        storage.upload_file(organization_name, path, progress_callback=progress)
+    )
+    async for update in progress:
+        print(update.fraction, update.throughput, update.eta)
+    response = await upload
+    ```
+    """
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Initialize a new instance of UploadProgressStream.
+
+        :param Optional[asyncio.AbstractEventLoop] loop: The event loop the stream is iterated on, the running loop if None.
+        """
+        self._loop = loop if loop is not None else asyncio.get_running_loop()
+        self._latest: Optional[UploadProgress] = None
+        self._updated = asyncio.Event()
+        self._done = False
+
+    def __call__(self, progress: UploadProgress) -> None:
+        """
+        Report a progress, from any thread.
+
+        :param UploadProgress progress: The progress.
+        """
+        self._loop.call_soon_threadsafe(self._push, progress)
+
+    def __aiter__(self) -> AsyncIterator[UploadProgress]:
+        return self
+
+    async def __anext__(self) -> UploadProgress:
+        if self._done and self._latest is None:
+            raise StopAsyncIteration
+
+        while self._latest is None:
+            self._updated.clear()
+            await self._updated.wait()
+
+        progress, self._latest = self._latest, None
+        return progress
+
+    def _push(self, progress: UploadProgress) -> None:
+        """
+        Keep the latest progress for the consumer, on the event loop.
+
+        :param UploadProgress progress: The progress.
+        """
+        if self._done:
+            return
+        self._latest = progress
+        self._done = progress.done
+        self._updated.set()
@@ -1,18 +1,57 @@
+import contextvars
+import fnmatch
+import glob
+import itertools
 import os
 import json
+import time
 import uuid
+from contextlib import nullcontext
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from urllib.parse import urlparse
 import requests
 from pathlib import Path
 from enum import Enum
-from typing import Optional, BinaryIO, Union, IO, Dict, List, Any
+from typing import (
+    Optional,
+    BinaryIO,
+    Union,
+    IO,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Any,
+    Tuple,
+)
 
 from .utils.validator import Validator
 from .utils.base_service import BaseService
+from .utils.part_sizer import PartSizer, default_part_sizer
+from .utils.memory_budget import MemoryBudget, default_memory_budget
+from .utils.chunk_reader import ChunkReader, UploadSource
+from .utils.checksums import ChecksumAlgorithm, UploadChecksums, parse_algorithms
+from .utils.upload_progress import UploadProgressCallback, UploadProgressTracker
+from .utils.multipart_registry import (
+    MultipartUploadRegistry,
+    default_multipart_registry,
+)
+from ..net.transport.file_part import FilePart
+from ..net.transport.request import Request
+from ..net.transport.request_error import RequestError
 from ..net.transport.serializer import Serializer
 from ..models.utils.cast_models import cast_models
 from ..net.environment.environment import Environment
 from ..models.file_operation_response import FileOperationResponse
+from ..models.directory_upload_result import DirectoryUploadResult, FileUploadResult
+from ..models.multipart_upload import MultipartUpload
 
 
 class HttpMethod(Enum):
@@ -28,8 +67,11 @@ class HttpMethod(Enum):
 class SimpleStorageService(BaseService):
     MAX_FILE_SIZE = 100 * 1024 * 1024
     DEFAULT_CHUNK_SIZE = 80 * 1024 * 1024
+    DEFAULT_UPLOAD_CONCURRENCY = 4
     # Default signature expiration in seconds (5 days)
     DEFAULT_SIGNATURE_EXP = 432000
+    # Default age in seconds after which unfinished multipart uploads are swept (1 day)
+    DEFAULT_STALE_UPLOAD_AGE = 86400
 
     def __init__(
         self,
@@ -48,6 +90,105 @@ def __init__(
         super().__init__(_base_url)
         if api_key:
             self.set_api_key(api_key)
+        self._part_sizer = default_part_sizer
+        self._memory_budget = default_memory_budget
+        self._upload_concurrency = self.DEFAULT_UPLOAD_CONCURRENCY
+        self._checksum_algorithms = frozenset()
+        self._verify_etags = False
+        self._multipart_registry = default_multipart_registry
+
+    def set_part_sizer(self, part_sizer: PartSizer):
+        """
+        Sets the sizer choosing the part size of multipart uploads. Services share the
+        process-wide sizer by default, so that it tunes itself across their uploads.
+
+        :param PartSizer part_sizer: The part sizer.
+        :return: The service instance.
+        """
+        self._part_sizer = part_sizer
+
+        return self
+
+    def get_part_sizer(self) -> PartSizer:
+        """
+        Get the sizer choosing the part size of multipart uploads.
+
+        :return: The part sizer.
+        :rtype: PartSizer
+        """
+        return self._part_sizer
+
+    def set_memory_budget(self, memory_budget: MemoryBudget):
+        """
+        Sets the budget of bytes the uploads may hold in memory. Services share the
+        process-wide budget by default, so that it bounds the memory of all their uploads.
+
+        :param MemoryBudget memory_budget: The memory budget.
+        :return: The service instance.
+        """
+        self._memory_budget = memory_budget
+
+        return self
+
+    def set_upload_concurrency(self, concurrency: int):
+        """
+        Sets the amount of parts of a multipart upload sent at the same time.
+
+        :param int concurrency: The amount of parts.
+        :return: The service instance.
+        """
+        Validator(int).min(1).validate(concurrency)
+        self._upload_concurrency = concurrency
+
+        return self
+
+    def set_multipart_registry(self, multipart_registry: MultipartUploadRegistry):
+        """
+        Sets the registry recording the multipart uploads in progress, which
+        sweep_multipart_uploads aborts once they are stale. Services share the
+        process-wide registry, kept in memory, by default.
+
+        :param MultipartUploadRegistry multipart_registry: The multipart upload registry.
+        :return: The service instance.
+        """
+        self._multipart_registry = multipart_registry
+
+        return self
+
+    def get_multipart_registry(self) -> MultipartUploadRegistry:
+        """
+        Get the registry recording the multipart uploads in progress.
+
+        :return: The multipart upload registry.
+        :rtype: MultipartUploadRegistry
+        """
+        return self._multipart_registry
+
+    def set_checksums(
+        self,
+        algorithms: Iterable[Union[ChecksumAlgorithm, str]] = (
+            ChecksumAlgorithm.MD5,
+            ChecksumAlgorithm.SHA256,
+        ),
+        verify_etags: bool = False,
+    ):
+        """
+        Sets the checksums computed while uploads are read, attached to the upload responses
+        as `checksums`. No checksum is computed when no algorithm is given.
+
+        :param Iterable[Union[ChecksumAlgorithm, str]] algorithms: The algorithms: md5, sha256 or crc32c.
+        :param bool verify_etags: Whether to check the ETags returned for the parts of multipart uploads against their MD5 digest, which is then always computed.
+        :return: The service instance.
+        :raises ValueError: If an algorithm is not supported.
+        :raises ImportError: If crc32c is requested and the crc32c package is not installed.
+        """
+        algorithms = parse_algorithms(algorithms)
+        if verify_etags:
+            algorithms |= {ChecksumAlgorithm.MD5}
+        self._checksum_algorithms = algorithms
+        self._verify_etags = verify_etags
+
+        return self
 
     def upload_file(
         self,
@@ -56,6 +197,7 @@ def upload_file(
         mime_type: Optional[str] = None,
         sign: bool = True,
         signature_exp: Optional[int] = DEFAULT_SIGNATURE_EXP,
+        progress_callback: Optional[UploadProgressCallback] = None,
     ) -> FileOperationResponse:
         """Uploads a file to the Salad Cloud Storage Service
 
@@ -69,6 +211,8 @@ def upload_file(
         :type sign: bool
         :param signature_exp: The expiration time for the signature in seconds, defaults to 5 days (432000 seconds)
         :type signature_exp: Optional[int]
+        :param progress_callback: A function called with the UploadProgress of the upload as it is sent, from the threads sending it
+        :type progress_callback: Optional[UploadProgressCallback]
 
         :raises RequestError: Raised when a request fails, with optional HTTP status code and details.
         :raises ValueError: If the file doesn't exist.
@@ -76,9 +220,74 @@ def upload_file(
         :return: Response containing the URL where the file can be accessed
         :rtype: FileOperationResponse
         """
+        filename, mime_type, file_size = self._inspect_file(
+            organization_name, local_file_path, mime_type
+        )
+        part_size = self._part_sizer.part_size(file_size, self._upload_concurrency)
+
+        checksums = self._create_checksums()
+        direct = file_size <= min(part_size, self.MAX_FILE_SIZE)
+        progress = self._create_progress(
+            filename,
+            progress_callback,
+            file_size,
+            1 if direct else self._part_sizer.part_count(file_size, part_size),
+        )
 
-        print(local_file_path)
+        with progress or nullcontext():
+            # For files fitting in a single part, use regular upload
+            if direct:
+                start = time.perf_counter()
+                response = self._upload_file_direct(
+                    organization_name=organization_name,
+                    local_file_path=local_file_path,
+                    filename=filename,
+                    mime_type=mime_type,
+                    sign=sign,
+                    signature_exp=signature_exp,
+                    checksums=checksums,
+                    progress=progress,
+                )
+                self._part_sizer.record(file_size, time.perf_counter() - start)
+            # For large files, use multipart upload
+            else:
+                response = self._upload_file_in_parts(
+                    organization_name=organization_name,
+                    local_file_path=local_file_path,
+                    filename=filename,
+                    mime_type=mime_type,
+                    sign=sign,
+                    signature_exp=signature_exp,
+                    chunk_size=part_size,
+                    checksums=checksums,
+                    progress=progress,
+                )
+                if sign:
+                    filename = os.path.basename(urlparse(response.url).path)
+                    response = self._sign_url_internal(
+                        filename=filename,
+                        organization_name=organization_name,
+                        method=HttpMethod.GET,
+                        exp=signature_exp,
+                    )
+
+        return self._attach_checksums(response, checksums)
+
+    def _inspect_file(
+        self,
+        organization_name: str,
+        local_file_path: str,
+        mime_type: Optional[str],
+    ) -> Tuple[str, str, int]:
+        """Validates the arguments of a file upload and gets the name, MIME type and size of the file
 
+        :param organization_name: Organization name
+        :param local_file_path: Local file path
+        :param mime_type: The MIME type of the file, determined from its extension if None
+        :raises ValueError: If the file doesn't exist.
+        :return: The filename, the MIME type and the size of the file in bytes
+        :rtype: Tuple[str, str, int]
+        """
         Validator(str).min_length(2).max_length(63).pattern(
             "^[a-z][a-z0-9-]{0,61}[a-z0-9]$"
         ).validate(organization_name)
@@ -97,39 +306,424 @@ def upload_file(
         else:
             Validator(str).validate(mime_type)
 
-        # Get file size
-        file_size = Path(local_file_path).stat().st_size
+        return filename, mime_type, Path(local_file_path).stat().st_size
 
-        # For small files, use regular upload
-        if file_size <= self.MAX_FILE_SIZE:
-            return self._upload_file_direct(
-                organization_name=organization_name,
-                local_file_path=local_file_path,
-                filename=filename,
-                mime_type=mime_type,
-                sign=sign,
-                signature_exp=signature_exp,
-            )
-        # For large files, use multipart upload
+    def upload_stream(
+        self,
+        organization_name: str,
+        fileobj_or_iter: UploadSource,
+        filename: str,
+        size_hint: Optional[int] = None,
+        mime_type: Optional[str] = None,
+        sign: bool = True,
+        signature_exp: Optional[int] = DEFAULT_SIGNATURE_EXP,
+        progress_callback: Optional[UploadProgressCallback] = None,
+    ) -> FileOperationResponse:
+        """Uploads a stream to the Salad Cloud Storage Service without writing it to disk
+
+        The stream is read one part at a time. A stream ending within the first part is
+        uploaded in a single request, a longer one with a multipart upload, so its size
+        never needs to be known in advance.
+
+        :param organization_name: Your organization name. This identifies the billing context for the API operation and represents a security boundary for SaladCloud resources. The organization must be created before using the API, and you must be a member of the organization.
+        :type organization_name: str
+        :param fileobj_or_iter: A file-like object opened in binary mode, such as a pipe or an HTTP response, bytes or an iterator of bytes
+        :type fileobj_or_iter: UploadSource
+        :param filename: The name of the file in storage
+        :type filename: str
+        :param size_hint: The expected size of the stream in bytes, used to choose the part size
+        :type size_hint: Optional[int]
+        :param mime_type: The MIME type of the file. If not provided, it will be determined automatically.
+        :type mime_type: Optional[str]
+        :param sign: Whether to sign the URL, defaults to True
+        :type sign: bool
+        :param signature_exp: The expiration time for the signature in seconds, defaults to 5 days (432000 seconds)
+        :type signature_exp: Optional[int]
+        :param progress_callback: A function called with the UploadProgress of the upload as it is sent, its total is the size hint
+        :type progress_callback: Optional[UploadProgressCallback]
+
+        :raises RequestError: Raised when a request fails, with optional HTTP status code and details.
+        :raises TypeError: If the stream is not readable as bytes.
+
+        :return: Response containing the URL where the file can be accessed
+        :rtype: FileOperationResponse
+        """
+        Validator(str).min_length(2).max_length(63).pattern(
+            "^[a-z][a-z0-9-]{0,61}[a-z0-9]$"
+        ).validate(organization_name)
+        Validator(str).min_length(1).validate(filename)
+        if size_hint is not None:
+            Validator(int).min(0).validate(size_hint)
+
+        if mime_type is None:
+            mime_type = self._determine_mime_type(filename)
         else:
-            file_response = self._upload_file_in_parts(
-                organization_name=organization_name,
-                local_file_path=local_file_path,
+            Validator(str).validate(mime_type)
+
+        reader = ChunkReader(fileobj_or_iter)
+        part_size = self._part_sizer.part_size(
+            size_hint or self.MAX_FILE_SIZE, self._upload_concurrency
+        )
+        checksums = self._create_checksums()
+        progress = self._create_progress(
+            filename,
+            progress_callback,
+            size_hint,
+            (
+                self._part_sizer.part_count(size_hint, part_size)
+                if size_hint is not None
+                else None
+            ),
+        )
+
+        with progress or nullcontext():
+            response = self._upload_stream_parts(
+                organization_name,
+                reader,
+                filename,
+                part_size,
+                sign,
+                signature_exp,
+                checksums,
+                progress,
+            )
+
+        return self._attach_checksums(response, checksums)
+
+    def _upload_stream_parts(
+        self,
+        organization_name: str,
+        reader: ChunkReader,
+        filename: str,
+        part_size: int,
+        sign: bool,
+        signature_exp: Optional[int],
+        checksums: Optional[UploadChecksums],
+        progress: Optional[UploadProgressTracker],
+    ) -> FileOperationResponse:
+        """Uploads a stream read one part at a time, in a single request if it ends within the first part
+
+        :param organization_name: Organization name
+        :param reader: The reader of the stream
+        :param filename: Filename to use in storage
+        :param part_size: The size of the parts in bytes
+        :param sign: Whether to sign the URL
+        :param signature_exp: Expiration time for signature
+        :param checksums: The checksums computed from the parts
+        :param progress: The tracker of the upload progress
+        :return: Response containing the URL where the file can be accessed
+        :rtype: FileOperationResponse
+        """
+        first_part, reserved = self._read_stream_part(reader, part_size)
+
+        # For streams ending within the first part, use regular upload
+        if reader.at_end() and len(first_part) <= self.MAX_FILE_SIZE:
+            try:
+                start = time.perf_counter()
+                response = self._upload_direct(
+                    organization_name,
+                    filename,
+                    first_part,
+                    sign,
+                    signature_exp,
+                    checksums,
+                    progress,
+                )
+                self._part_sizer.record(len(first_part), time.perf_counter() - start)
+                return response
+            finally:
+                self._memory_budget.release(reserved)
+
+        # For longer streams, use multipart upload
+        unique_filename = self._unique_filename(filename)
+        try:
+            upload_id = self._create_multipart_upload(
+                organization_name, unique_filename
+            )
+        except BaseException:
+            self._memory_budget.release(reserved)
+            raise
+
+        def stream_parts():
+            yield 1, first_part, reserved
+            for part_number in itertools.count(2):
+                data, part_reserved = self._read_stream_part(reader, part_size)
+                if not data:
+                    self._memory_budget.release(part_reserved)
+                    return
+                yield part_number, data, part_reserved
+
+        try:
+            parts = self._upload_parts(
+                organization_name,
+                unique_filename,
+                upload_id,
+                stream_parts(),
+                checksums,
+                progress,
+            )
+            response = self._complete_multipart_upload(
+                organization_name, unique_filename, upload_id, parts
+            )
+        except BaseException:
+            self._abort_failed_upload(organization_name, unique_filename, upload_id)
+            raise
+        if sign:
+            filename = os.path.basename(urlparse(response.url).path)
+            response = self._sign_url_internal(
                 filename=filename,
-                mime_type=mime_type,
+                organization_name=organization_name,
+                method=HttpMethod.GET,
+                exp=signature_exp,
+            )
+
+        return response
+
+    def upload_directory(
+        self,
+        organization_name: str,
+        path_or_glob: str,
+        concurrency: int = 8,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        sign: bool = True,
+        signature_exp: Optional[int] = DEFAULT_SIGNATURE_EXP,
+        progress_callback: Optional[UploadProgressCallback] = None,
+    ) -> DirectoryUploadResult:
+        """Uploads the files of a directory, or matching a glob pattern, to the Salad Cloud Storage Service
+
+        Files are found lazily and uploaded by a pool of workers, each through upload_file,
+        so small files are sent in a single request and large ones in parts. A file that
+        fails does not stop the others, its error is reported in the result.
+
+        :param organization_name: Your organization name. This identifies the billing context for the API operation and represents a security boundary for SaladCloud resources. The organization must be created before using the API, and you must be a member of the organization.
+        :type organization_name: str
+        :param path_or_glob: The directory, walked recursively, or a glob pattern such as "audio/**/*.wav"
+        :type path_or_glob: str
+        :param concurrency: The amount of files uploaded at the same time, defaults to 8
+        :type concurrency: int
+        :param include: Patterns of the files to upload, matched against their path relative to the directory or their name. All files if not provided.
+        :type include: Optional[Iterable[str]]
+        :param exclude: Patterns of the files to skip, matched like include
+        :type exclude: Optional[Iterable[str]]
+        :param sign: Whether to sign the URLs, defaults to True
+        :type sign: bool
+        :param signature_exp: The expiration time for the signatures in seconds, defaults to 5 days (432000 seconds)
+        :type signature_exp: Optional[int]
+        :param progress_callback: A function called with the UploadProgress of each file as it is sent, told apart by their filename
+        :type progress_callback: Optional[UploadProgressCallback]
+
+        :raises ValueError: If the path does not exist and is not a glob pattern.
+
+        :return: The result of each file, with the throughput of the upload
+        :rtype: DirectoryUploadResult
+        """
+        Validator(str).min_length(2).max_length(63).pattern(
+            "^[a-z][a-z0-9-]{0,61}[a-z0-9]$"
+        ).validate(organization_name)
+        Validator(int).min(1).validate(concurrency)
+        files = self._find_files(path_or_glob, include, exclude)
+
+        result = DirectoryUploadResult()
+        start = time.perf_counter()
+        pending = set()
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="salad-directory-upload"
+        ) as executor:
+            try:
+                for path in files:
+                    # Keep the walk lazy, only a few files wait for a worker
+                    if len(pending) >= 2 * concurrency:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        result.files.extend(future.result() for future in done)
+
+                    pending.add(
+                        executor.submit(
+                            contextvars.copy_context().run,
+                            self._upload_directory_file,
+                            organization_name,
+                            path,
+                            sign,
+                            signature_exp,
+                            progress_callback,
+                        )
+                    )
+
+                result.files.extend(future.result() for future in as_completed(pending))
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def _find_files(
+        self,
+        path_or_glob: str,
+        include: Optional[Iterable[str]],
+        exclude: Optional[Iterable[str]],
+    ) -> Iterator[str]:
+        """Finds the files of a directory upload, lazily
+
+        :param path_or_glob: The directory or the glob pattern
+        :param include: Patterns of the files to upload, all files if None
+        :param exclude: Patterns of the files to skip
+        :raises ValueError: If the path does not exist and is not a glob pattern.
+        :return: The paths of the files
+        :rtype: Iterator[str]
+        """
+        Validator(str).min_length(1).validate(path_or_glob)
+
+        is_glob = any(character in path_or_glob for character in "*?[")
+        if not is_glob and not os.path.isdir(path_or_glob):
+            raise ValueError(f"Directory not found: {path_or_glob}")
+
+        include = list(include) if include is not None else None
+        exclude = list(exclude) if exclude is not None else []
+        return (
+            path
+            for path, relative_path in self._walk_files(path_or_glob, is_glob)
+            if (include is None or self._matches(relative_path, include))
+            and not self._matches(relative_path, exclude)
+        )
+
+    def _walk_files(
+        self, path_or_glob: str, is_glob: bool
+    ) -> Generator[Tuple[str, str], None, None]:
+        """Finds the files of a directory or matching a glob pattern, lazily and in a stable order
+
+        :param path_or_glob: The directory or the glob pattern
+        :param is_glob: Whether the path is a glob pattern
+        :return: The paths of the files, with their path relative to the directory
+        :rtype: Generator[Tuple[str, str], None, None]
+        """
+        if is_glob:
+            for path in glob.iglob(path_or_glob, recursive=True):
+                if os.path.isfile(path):
+                    yield path, path.replace(os.sep, "/")
+            return
+
+        for directory, directories, filenames in os.walk(path_or_glob):
+            directories.sort()
+            for filename in sorted(filenames):
+                path = os.path.join(directory, filename)
+                relative_path = os.path.relpath(path, path_or_glob)
+                yield path, relative_path.replace(os.sep, "/")
+
+    def _matches(self, relative_path: str, patterns: List[str]) -> bool:
+        """Checks whether a file matches any of the patterns, by its relative path or its name
+
+        :param relative_path: The path of the file relative to the uploaded directory
+        :param patterns: The patterns
+        :return: True if a pattern matches
+        :rtype: bool
+        """
+        filename = relative_path.rsplit("/", 1)[-1]
+        return any(
+            fnmatch.fnmatchcase(relative_path, pattern)
+            or fnmatch.fnmatchcase(filename, pattern)
+            for pattern in patterns
+        )
+
+    def _upload_directory_file(
+        self,
+        organization_name: str,
+        path: str,
+        sign: bool,
+        signature_exp: Optional[int],
+        progress_callback: Optional[UploadProgressCallback] = None,
+    ) -> FileUploadResult:
+        """Uploads a file of a directory, reporting its error instead of raising it
+
+        :param organization_name: Organization name
+        :param path: The path of the file
+        :param sign: Whether to sign the URL
+        :param signature_exp: Expiration time for signature
+        :param progress_callback: The function called with the progress of the upload
+        :return: The result of the upload
+        :rtype: FileUploadResult
+        """
+        start = time.perf_counter()
+        try:
+            size = os.path.getsize(path)
+            response = self.upload_file(
+                organization_name,
+                path,
                 sign=sign,
                 signature_exp=signature_exp,
+                progress_callback=progress_callback,
             )
-            if sign:
-                filename = os.path.basename(urlparse(file_response.url).path)
-                return self._sign_url_internal(
-                    filename=filename,
-                    organization_name=organization_name,
-                    method=HttpMethod.GET,
-                    exp=signature_exp,
-                )
-            else:
-                return file_response
+        except Exception as error:
+            return FileUploadResult(
+                path, duration=time.perf_counter() - start, error=error
+            )
+        return FileUploadResult(
+            path, size, time.perf_counter() - start, response=response
+        )
+
+    def _create_checksums(self) -> Optional[UploadChecksums]:
+        """Creates the checksums of an upload
+
+        :return: The checksums, None if no algorithm is set
+        :rtype: Optional[UploadChecksums]
+        """
+        if not self._checksum_algorithms:
+            return None
+        return UploadChecksums(self._checksum_algorithms)
+
+    def _attach_checksums(
+        self, response: FileOperationResponse, checksums: Optional[UploadChecksums]
+    ) -> FileOperationResponse:
+        """Attaches the checksums of an upload to its response
+
+        :param response: The response of the upload
+        :param checksums: The checksums of the upload
+        :return: The response
+        :rtype: FileOperationResponse
+        """
+        if checksums is not None:
+            response.checksums = checksums
+        return response
+
+    def _create_progress(
+        self,
+        filename: str,
+        progress_callback: Optional[UploadProgressCallback],
+        total_bytes: Optional[int],
+        total_parts: Optional[int],
+    ) -> Optional[UploadProgressTracker]:
+        """Creates the tracker of the progress of an upload
+
+        :param filename: The name of the uploaded file
+        :param progress_callback: The function called with the progress
+        :param total_bytes: The size of the file in bytes, None if unknown
+        :param total_parts: The amount of parts of the upload, None if unknown
+        :return: The tracker, None if no function is given
+        :rtype: Optional[UploadProgressTracker]
+        """
+        if progress_callback is None:
+            return None
+        return UploadProgressTracker(
+            filename, progress_callback, total_bytes, total_parts
+        )
+
+    def _read_stream_part(
+        self, reader: ChunkReader, part_size: int
+    ) -> Tuple[bytes, int]:
+        """Reads the next part of a stream, reserving its size in the memory budget first
+
+        :param reader: The reader of the stream
+        :param part_size: The size of the part in bytes
+        :return: The data of the part and the bytes reserved for it, to be released once it is sent
+        :rtype: Tuple[bytes, int]
+        """
+        self._memory_budget.acquire(part_size)
+        try:
+            return reader.read(part_size), part_size
+        except BaseException:
+            self._memory_budget.release(part_size)
+            raise
 
     def _upload_file_direct(
         self,
@@ -139,6 +733,8 @@ def _upload_file_direct(
         mime_type: str,
         sign: bool = True,
         signature_exp: Optional[int] = DEFAULT_SIGNATURE_EXP,
+        checksums: Optional[UploadChecksums] = None,
+        progress: Optional[UploadProgressTracker] = None,
     ) -> FileOperationResponse:
         """Directly uploads a file to Salad Cloud Storage (for files <= MAX_FILE_SIZE)
 
@@ -148,37 +744,126 @@ def _upload_file_direct(
         :param mime_type: MIME type
         :param sign: Whether to sign the URL
         :param signature_exp: Expiration time for signature
+        :param checksums: The checksums computed while the file is read
+        :param progress: The tracker of the upload progress
         :return: Response containing the URL where the file can be accessed
         :rtype: FileOperationResponse
         """
-        name_part, ext_part = os.path.splitext(filename)
-        unique_filename = f"{name_part}_{uuid.uuid4()}{ext_part}"
+        # The file is read when the request is sent, and again if it is retried
+        file_size = Path(local_file_path).stat().st_size
+        with self._memory_budget.reserve(file_size):
+            return self._upload_direct(
+                organization_name,
+                filename,
+                FilePart(
+                    local_file_path,
+                    0,
+                    file_size,
+                    checksums.part_reader(1) if checksums is not None else None,
+                ),
+                sign,
+                signature_exp,
+                progress=progress,
+            )
 
-        # Open the file for upload
-        with open(local_file_path, "rb") as file:
-            file_content = file.read()
+    def _upload_direct(
+        self,
+        organization_name: str,
+        filename: str,
+        file: Union[FilePart, bytes],
+        sign: bool = True,
+        signature_exp: Optional[int] = DEFAULT_SIGNATURE_EXP,
+        checksums: Optional[UploadChecksums] = None,
+        progress: Optional[UploadProgressTracker] = None,
+    ) -> FileOperationResponse:
+        """Uploads data in a single request
 
-            # Create multipart form data
-            body = {"file_name": unique_filename, "sign": sign, "file": file_content}
+        :param organization_name: Organization name
+        :param filename: Filename to use in storage
+        :param file: The data, or the part of a file read when the request is sent
+        :param sign: Whether to sign the URL
+        :param signature_exp: Expiration time for signature
+        :param checksums: The checksums computed from the data, by the file part itself if it is one
+        :param progress: The tracker of the upload progress
+        :return: Response containing the URL where the file can be accessed
+        :rtype: FileOperationResponse
+        """
+        if checksums is not None and isinstance(file, bytes):
+            checksums.add_part(1, file)
+        serialized_request = self._direct_upload_request(
+            organization_name, filename, file, sign, signature_exp, progress
+        )
 
-            if signature_exp is not None:
-                Validator(int).min(1).validate(signature_exp)
-                body["signatureExp"] = signature_exp
+        response, _, _ = self.send_request(serialized_request)
+        if progress is not None:
+            progress.complete_part(1, self._part_length(file))
+        return FileOperationResponse._unmap(response)
 
-            serialized_request = (
-                Serializer(
-                    f"{self.base_url}/organizations/{{organization_name}}/files/{{filename}}",
-                    [self.get_api_key()],
-                )
-                .add_path("organization_name", organization_name)
-                .add_path("filename", unique_filename)
-                .serialize()
-                .set_method("PUT")
-                .set_body(body, "multipart/form-data")
+    def _direct_upload_request(
+        self,
+        organization_name: str,
+        filename: str,
+        file: Union[FilePart, bytes],
+        sign: bool,
+        signature_exp: Optional[int],
+        progress: Optional[UploadProgressTracker] = None,
+    ) -> Request:
+        """Builds the request uploading data in a single request, under a unique name
+
+        :param organization_name: Organization name
+        :param filename: Filename to use in storage
+        :param file: The data, or the part of a file read when the request is sent
+        :param sign: Whether to sign the URL
+        :param signature_exp: Expiration time for signature
+        :param progress: The tracker of the upload progress
+        :return: The request
+        :rtype: Request
+        """
+        unique_filename = self._unique_filename(filename)
+
+        # Create multipart form data
+        body = {"file_name": unique_filename, "sign": sign, "file": file}
+
+        if signature_exp is not None:
+            Validator(int).min(1).validate(signature_exp)
+            body["signatureExp"] = signature_exp
+
+        serialized_request = (
+            Serializer(
+                f"{self.base_url}/organizations/{{organization_name}}/files/{{filename}}",
+                [self.get_api_key()],
+            )
+            .add_path("organization_name", organization_name)
+            .add_path("filename", unique_filename)
+            .serialize()
+            .set_method("PUT")
+            .set_body(body, "multipart/form-data")
+        )
+        if progress is not None:
+            serialized_request.set_upload_progress(
+                progress.part_reporter(1, self._part_length(file))
             )
 
-            response, _, _ = self.send_request(serialized_request)
-            return FileOperationResponse._unmap(response)
+        return serialized_request
+
+    def _unique_filename(self, filename: str) -> str:
+        """Makes the name of an upload unique in storage, keeping its extension
+
+        :param filename: The name of the file
+        :return: The unique name
+        :rtype: str
+        """
+        name_part, ext_part = os.path.splitext(filename)
+        return f"{name_part}_{uuid.uuid4()}{ext_part}"
+
+    def _part_length(self, file_part: Union[FilePart, bytes]) -> int:
+        """Gets the size of the data of a part
+
+        :param file_part: The data, or the part of a file
+        :return: The size in bytes
+        :rtype: int
+        """
+        return len(file_part) if isinstance(file_part, bytes) else file_part.length
 
     def _upload_file_in_parts(
         self,
@@ -188,7 +873,9 @@ def _upload_file_in_parts(
         mime_type: str,
         sign: bool = True,
         signature_exp: Optional[int] = DEFAULT_SIGNATURE_EXP,
-        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_size: Optional[int] = None,
+        checksums: Optional[UploadChecksums] = None,
+        progress: Optional[UploadProgressTracker] = None,
     ) -> FileOperationResponse:
         """Uploads a large file in parts (multipart upload)
 
@@ -198,16 +885,88 @@ def _upload_file_in_parts(
         :param mime_type: MIME type
         :param sign: Whether to sign the URL
         :param signature_exp: Expiration time for signature
-        :param chunk_size: Size of each chunk in bytes (default 80MB)
+        :param chunk_size: Size of each chunk in bytes, chosen by the part sizer if None
+        :param checksums: The checksums computed while the parts are read
+        :param progress: The tracker of the upload progress
         :return: Response containing the URL where the file can be accessed
         :rtype: FileOperationResponse
         """
 
-        name_part, ext_part = os.path.splitext(filename)
-        unique_filename = f"{name_part}_{uuid.uuid4()}{ext_part}"
+        unique_filename = self._unique_filename(filename)
+        if chunk_size is None:
+            chunk_size = self._part_sizer.part_size(
+                Path(local_file_path).stat().st_size, self._upload_concurrency
+            )
+
+        upload_id = self._create_multipart_upload(organization_name, unique_filename)
 
-        # Step 1: Create multipart upload
-        serialized_create_request = (
+        # Step 2: Upload parts, read from the file by the workers
+        file_size = Path(local_file_path).stat().st_size
+        file_parts = (
+            (
+                part_number,
+                FilePart(
+                    local_file_path,
+                    offset,
+                    min(chunk_size, file_size - offset),
+                    (
+                        checksums.part_reader(part_number)
+                        if checksums is not None
+                        else None
+                    ),
+                ),
+                0,
+            )
+            for part_number, offset in enumerate(
+                range(0, file_size, int(chunk_size)), start=1
+            )
+        )
+        try:
+            parts = self._upload_parts(
+                organization_name,
+                unique_filename,
+                upload_id,
+                file_parts,
+                checksums,
+                progress,
+            )
+
+            # Step 3: Complete multipart upload
+            return self._complete_multipart_upload(
+                organization_name, unique_filename, upload_id, parts
+            )
+        except BaseException:
+            self._abort_failed_upload(organization_name, unique_filename, upload_id)
+            raise
+
+    def _create_multipart_upload(
+        self, organization_name: str, unique_filename: str
+    ) -> str:
+        """Creates a multipart upload
+
+        :param organization_name: Organization name
+        :param unique_filename: Filename in storage
+        :return: The ID of the upload
+        :rtype: str
+        """
+        create_response, _, _ = self.send_request(
+            self._create_multipart_upload_request(organization_name, unique_filename)
+        )
+        upload_id = create_response["uploadId"]
+        self._multipart_registry.add(organization_name, unique_filename, upload_id)
+        return upload_id
+
+    def _create_multipart_upload_request(
+        self, organization_name: str, unique_filename: str
+    ) -> Request:
+        """Builds the request creating a multipart upload
+
+        :param organization_name: Organization name
+        :param unique_filename: Filename in storage
+        :return: The request
+        :rtype: Request
+        """
+        return (
             Serializer(
                 f"{self.base_url}/organizations/{{organization_name}}/files/{{filename}}",
                 [self.get_api_key()],
@@ -219,41 +978,238 @@ def _upload_file_in_parts(
             .set_method("PUT")
         )
 
-        create_response, _, _ = self.send_request(serialized_create_request)
-        upload_id = create_response["uploadId"]
+    def _upload_parts(
+        self,
+        organization_name: str,
+        unique_filename: str,
+        upload_id: str,
+        file_parts: Iterable[Tuple[int, Union[FilePart, bytes], int]],
+        checksums: Optional[UploadChecksums] = None,
+        progress: Optional[UploadProgressTracker] = None,
+    ) -> List[Dict[str, Any]]:
+        """Uploads the parts of a multipart upload concurrently
+
+        At most as many parts as the upload concurrency are submitted at a time, and
+        each part holds its size in the memory budget while it is sent.
 
-        # Step 2: Upload parts
+        :param organization_name: Organization name
+        :param unique_filename: Filename in storage
+        :param upload_id: The ID of the upload
+        :param file_parts: The part numbers, the parts and the bytes they already reserved in the memory budget, in order
+        :param checksums: The checksums computed from the parts
+        :param progress: The tracker of the upload progress
+        :return: The part numbers and ETags of the uploaded parts, in order
+        :rtype: List[Dict[str, Any]]
+        """
+        concurrency = max(1, self._upload_concurrency)
         parts = []
-        part_number = 1
-        print(chunk_size)
-        with open(local_file_path, "rb") as file:
-            while True:
-                chunk = file.read(int(chunk_size))
-                if not chunk:
-                    break
-
-                serialized_chunk_request = (
-                    Serializer(
-                        f"{self.base_url}/organizations/{{organization_name}}/file_parts/{{filename}}",
-                        [self.get_api_key()],
+        pending: Dict[Future, int] = {}
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="salad-upload"
+        ) as executor:
+            try:
+                unsubmitted = 0
+                for part_number, file_part, reserved in file_parts:
+                    unsubmitted = reserved
+                    if len(pending) >= concurrency:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            del pending[future]
+                            parts.append(future.result())
+
+                    # Workers run in a copy of the context, to keep the deadline and the current span
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        self._upload_part,
+                        organization_name,
+                        unique_filename,
+                        upload_id,
+                        part_number,
+                        file_part,
+                        reserved,
+                        checksums,
+                        progress,
                     )
-                    .add_path("organization_name", organization_name)
-                    .add_path("filename", unique_filename)
-                    .add_query("partNumber", part_number)
-                    .add_query("uploadId", upload_id)
-                    .serialize()
-                    .set_method("PUT")
-                    .set_body({"file": chunk}, "multipart/form-data")
-                )
+                    pending[future] = reserved
+                    unsubmitted = 0
+
+                parts.extend(future.result() for future in as_completed(pending))
+            except BaseException:
+                if unsubmitted:
+                    self._memory_budget.release(unsubmitted)
+                for future, reserved in pending.items():
+                    # Parts that never ran still hold the bytes reserved for them
+                    if future.cancel() and reserved:
+                        self._memory_budget.release(reserved)
+                raise
+
+        return sorted(parts, key=lambda part: part["partNumber"])
+
+    def _upload_part(
+        self,
+        organization_name: str,
+        unique_filename: str,
+        upload_id: str,
+        part_number: int,
+        file_part: Union[FilePart, bytes],
+        reserved: int = 0,
+        checksums: Optional[UploadChecksums] = None,
+        progress: Optional[UploadProgressTracker] = None,
+    ) -> Dict[str, Any]:
+        """Uploads a part of a multipart upload
+
+        :param organization_name: Organization name
+        :param unique_filename: Filename in storage
+        :param upload_id: The ID of the upload
+        :param part_number: The number of the part, from 1
+        :param file_part: The data of the part, or the part of a file read when the request is sent
+        :param reserved: The bytes the part already holds in the memory budget, released once it is sent. If 0, the size of the part is reserved
+        :param checksums: The checksums computed from the data, by the file part itself if it is one, and checked against the returned ETag
+        :param progress: The tracker of the upload progress
+        :return: The part number and ETag of the part
+        :rtype: Dict[str, Any]
+        """
+        size = self._part_length(file_part)
+        if not reserved:
+            reserved = size
+            self._memory_budget.acquire(reserved)
 
+        try:
+            if checksums is not None and isinstance(file_part, bytes):
+                checksums.add_part(part_number, file_part)
+
+            serialized_chunk_request = self._upload_part_request(
+                organization_name,
+                unique_filename,
+                upload_id,
+                part_number,
+                file_part,
+                progress,
+            )
+
+            start = time.perf_counter()
+            try:
                 chunk_response, _, _ = self.send_request(serialized_chunk_request)
-                parts.append(
-                    {"partNumber": part_number, "etag": chunk_response.get("etag", "")}
+            except Exception:
+                self._part_sizer.record(
+                    size, time.perf_counter() - start, success=False
                 )
-                part_number += 1
+                raise
+            self._part_sizer.record(size, time.perf_counter() - start)
+        finally:
+            self._memory_budget.release(reserved)
+
+        return self._complete_part(
+            part_number, size, chunk_response, checksums, progress
+        )
 
-        # Step 3: Complete multipart upload
-        serialized_complete_request = (
+    def _upload_part_request(
+        self,
+        organization_name: str,
+        unique_filename: str,
+        upload_id: str,
+        part_number: int,
+        file_part: Union[FilePart, bytes],
+        progress: Optional[UploadProgressTracker] = None,
+    ) -> Request:
+        """Builds the request uploading a part of a multipart upload
+
+        :param organization_name: Organization name
+        :param unique_filename: Filename in storage
+        :param upload_id: The ID of the upload
+        :param part_number: The number of the part, from 1
+        :param file_part: The data of the part, or the part of a file read when the request is sent
+        :param progress: The tracker of the upload progress
+        :return: The request
+        :rtype: Request
+        """
+        serialized_chunk_request = (
+            Serializer(
+                f"{self.base_url}/organizations/{{organization_name}}/file_parts/{{filename}}",
+                [self.get_api_key()],
+            )
+            .add_path("organization_name", organization_name)
+            .add_path("filename", unique_filename)
+            .add_query("partNumber", part_number)
+            .add_query("uploadId", upload_id)
+            .serialize()
+            .set_method("PUT")
+            .set_body({"file": file_part}, "multipart/form-data")
+        )
+        if progress is not None:
+            serialized_chunk_request.set_upload_progress(
+                progress.part_reporter(part_number, self._part_length(file_part))
+            )
+
+        return serialized_chunk_request
+
+    def _complete_part(
+        self,
+        part_number: int,
+        size: int,
+        chunk_response: Dict[str, Any],
+        checksums: Optional[UploadChecksums],
+        progress: Optional[UploadProgressTracker],
+    ) -> Dict[str, Any]:
+        """Checks the ETag of an uploaded part and records its completion
+
+        :param part_number: The number of the part, from 1
+        :param size: The size of the part in bytes
+        :param chunk_response: The response of the part upload
+        :param checksums: The checksums of the upload, checked against the returned ETag
+        :param progress: The tracker of the upload progress
+        :return: The part number and ETag of the part
+        :rtype: Dict[str, Any]
+        """
+        etag = chunk_response.get("etag", "")
+        if checksums is not None and self._verify_etags:
+            checksums.verify_etag(part_number, etag)
+        if progress is not None:
+            progress.complete_part(part_number, size)
+
+        return {"partNumber": part_number, "etag": etag}
+
+    def _complete_multipart_upload(
+        self,
+        organization_name: str,
+        unique_filename: str,
+        upload_id: str,
+        parts: List[Dict[str, Any]],
+    ) -> FileOperationResponse:
+        """Completes a multipart upload
+
+        :param organization_name: Organization name
+        :param unique_filename: Filename in storage
+        :param upload_id: The ID of the upload
+        :param parts: The part numbers and ETags of the uploaded parts, in order
+        :return: Response containing the URL where the file can be accessed
+        :rtype: FileOperationResponse
+        """
+        complete_response, _, _ = self.send_request(
+            self._complete_multipart_upload_request(
+                organization_name, unique_filename, upload_id, parts
+            )
+        )
+        self._multipart_registry.remove(upload_id)
+        return self._parse_complete_response(complete_response)
+
+    def _complete_multipart_upload_request(
+        self,
+        organization_name: str,
+        unique_filename: str,
+        upload_id: str,
+        parts: List[Dict[str, Any]],
+    ) -> Request:
+        """Builds the request completing a multipart upload
+
+        :param organization_name: Organization name
+        :param unique_filename: Filename in storage
+        :param upload_id: The ID of the upload
+        :param parts: The part numbers and ETags of the uploaded parts, in order
+        :return: The request
+        :rtype: Request
+        """
+        return (
             Serializer(
                 f"{self.base_url}/organizations/{{organization_name}}/files/{{filename}}",
                 [self.get_api_key()],
@@ -267,9 +1223,14 @@ def _upload_file_in_parts(
             .set_body({"parts": parts})
         )
 
-        complete_response, _, _ = self.send_request(serialized_complete_request)
-        print(complete_response)
+    def _parse_complete_response(self, complete_response: Any) -> FileOperationResponse:
+        """Parses the response completing a multipart upload
 
+        :param complete_response: The body of the response
+        :raises ValueError: If the body is a string that is not valid JSON.
+        :return: Response containing the URL where the file can be accessed
+        :rtype: FileOperationResponse
+        """
         # Parse the JSON string if the response is a string
         if isinstance(complete_response, str):
             try:
@@ -282,6 +1243,105 @@ def _upload_file_in_parts(
 
         return FileOperationResponse._unmap(complete_response)
 
+    def _abort_multipart_upload(
+        self, organization_name: str, unique_filename: str, upload_id: str
+    ) -> None:
+        """Aborts a multipart upload, deleting its uploaded parts
+
+        :param organization_name: Organization name
+        :param unique_filename: Filename in storage
+        :param upload_id: The ID of the upload
+        """
+        try:
+            self.send_request(
+                self._abort_multipart_upload_request(
+                    organization_name, unique_filename, upload_id
+                )
+            )
+        except RequestError as error:
+            # The upload is already gone, completed, aborted or expired
+            if error.status != 404:
+                raise
+        self._multipart_registry.remove(upload_id)
+
+    def _abort_failed_upload(
+        self, organization_name: str, unique_filename: str, upload_id: str
+    ) -> None:
+        """Aborts a multipart upload that failed, ignoring the failure of the abort so the
+        error of the upload is the one raised. An upload left unaborted stays in the
+        multipart registry, for sweep_multipart_uploads.
+
+        :param organization_name: Organization name
+        :param unique_filename: Filename in storage
+        :param upload_id: The ID of the upload
+        """
+        try:
+            self._abort_multipart_upload(organization_name, unique_filename, upload_id)
+        except Exception:
+            pass
+
+    def sweep_multipart_uploads(
+        self,
+        organization_name: Optional[str] = None,
+        older_than: float = DEFAULT_STALE_UPLOAD_AGE,
+    ) -> List[MultipartUpload]:
+        """Aborts the stale multipart uploads, created long ago and never completed or aborted
+
+        Uploads are left behind when their abort fails or their process dies, and their
+        parts keep using storage until they are aborted. Storage does not list them, so
+        the uploads are found in the multipart registry, see set_multipart_registry. An
+        upload whose abort fails stays in the registry for the next sweep.
+
+        :param organization_name: Only sweep the uploads of this organization, all if not provided
+        :type organization_name: Optional[str]
+        :param older_than: The age in seconds from which an upload is stale, defaults to 1 day. Uploads still in progress that are older are aborted too.
+        :type older_than: float
+
+        :return: The aborted uploads
+        :rtype: List[MultipartUpload]
+        """
+        if organization_name is not None:
+            Validator(str).min_length(2).max_length(63).pattern(
+                "^[a-z][a-z0-9-]{0,61}[a-z0-9]$"
+            ).validate(organization_name)
+        Validator(float).min(0).validate(older_than)
+
+        aborted = []
+        for upload in self._multipart_registry.list(organization_name, older_than):
+            try:
+                self._abort_multipart_upload(
+                    upload.organization_name, upload.filename, upload.upload_id
+                )
+            except Exception:
+                continue
+            aborted.append(upload)
+
+        return aborted
+
+    def _abort_multipart_upload_request(
+        self, organization_name: str, unique_filename: str, upload_id: str
+    ) -> Request:
+        """Builds the request aborting a multipart upload
+
+        :param organization_name: Organization name
+        :param unique_filename: Filename in storage
+        :param upload_id: The ID of the upload
+        :return: The request
+        :rtype: Request
+        """
+        return (
+            Serializer(
+                f"{self.base_url}/organizations/{{organization_name}}/files/{{filename}}",
+                [self.get_api_key()],
+            )
+            .add_path("organization_name", organization_name)
+            .add_path("filename", unique_filename)
+            .add_query("action", "mpu-abort")
+            .add_query("uploadId", upload_id)
+            .serialize()
+            .set_method("PUT")
+        )
+
     def delete_file(
         self,
         organization_name: str,
@@ -299,13 +1359,25 @@ def delete_file(
         :return: True if the file was successfully deleted
         :rtype: bool
         """
+        _, status_code, _ = self.send_request(
+            self._delete_file_request(organization_name, filename)
+        )
+        return status_code == 204
 
+    def _delete_file_request(self, organization_name: str, filename: str) -> Request:
+        """Validates the arguments of a file deletion and builds its request
+
+        :param organization_name: Organization name
+        :param filename: The name of the file to delete
+        :return: The request
+        :rtype: Request
+        """
         Validator(str).min_length(2).max_length(63).pattern(
             "^[a-z][a-z0-9-]{0,61}[a-z0-9]$"
         ).validate(organization_name)
         Validator(str).validate(filename)
 
-        serialized_request = (
+        return (
             Serializer(
                 f"{self.base_url}/organizations/{{organization_name}}/files/{{filename}}",
                 [self.get_api_key()],
@@ -316,9 +1388,6 @@ def delete_file(
             .set_method("DELETE")
         )
 
-        _, status_code, _ = self.send_request(serialized_request)
-        return status_code == 204
-
     @cast_models
     def sign_url(
         self,
@@ -381,6 +1450,28 @@ def _sign_url_internal(
         method: Union[HttpMethod, str],
         exp: int,
     ) -> FileOperationResponse:
+        response, _, _ = self.send_request(
+            self._sign_url_request(organization_name, filename, method, exp)
+        )
+        return FileOperationResponse._unmap(response)
+
+    def _sign_url_request(
+        self,
+        organization_name: str,
+        filename: str,
+        method: Union[HttpMethod, str],
+        exp: int,
+    ) -> Request:
+        """Validates the arguments of a URL signature and builds its request
+
+        :param organization_name: Organization name
+        :param filename: The filename
+        :param method: The HTTP method to sign the URL for
+        :param exp: The expiration ttl of the signed URL in seconds
+        :raises ValueError: If the method is not supported.
+        :return: The request
+        :rtype: Request
+        """
         Validator(str).min_length(2).max_length(63).pattern(
             "^[a-z][a-z0-9-]{0,61}[a-z0-9]$"
         ).validate(organization_name)
@@ -398,7 +1489,7 @@ def _sign_url_internal(
 
         request_body = {"method": method, "exp": exp}
 
-        serialized_request = (
+        return (
             Serializer(
                 f"{self.base_url}/organizations/{{organization_name}}/file_tokens/{{filename}}",
                 [self.get_api_key()],
@@ -409,6 +1500,3 @@ def _sign_url_internal(
             .set_method("POST")
             .set_body(request_body)
         )
-
-        response, _, _ = self.send_request(serialized_request)
-        return FileOperationResponse._unmap(response)
@@ -2,13 +2,17 @@
 import json
 import os
 import time
-from typing import Dict, Any, Union, Optional
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Generator, Iterable, List, Union, Optional
 from urllib.parse import urlparse
 
 from salad_cloud_sdk import SaladCloudSdk
 from salad_cloud_sdk.models import (
     InferenceEndpointJobPrototype,
     InferenceEndpointJob,
+    InferenceEndpointJobCollection,
+    ProblemDetails,
     Status,
 )
 from salad_cloud_transcription_sdk.models.transcription_webhook_payload import (
@@ -16,11 +20,30 @@
 )
 from .utils.validator import Validator
 from .utils.base_service import BaseService
+from .utils.part_sizer import PartSizer
+from .utils.memory_budget import MemoryBudget
+from .utils.checksums import ChecksumAlgorithm
+from .utils.multipart_registry import MultipartUploadRegistry
+from .utils.source_cleaner import (
+    KEEP_SOURCE_FOR_METADATA_KEY,
+    SOURCE_METADATA_KEY,
+    SourceCleaner,
+)
+from .utils.upload_progress import UploadProgressCallback
 from .utils.webhooks import Webhook, WebhookVerificationError
 from ..net.transport.serializer import Serializer
+from ..net.transport.deadline import Deadline, deadline_scope
+from ..net.transport.transports import Transport, create_transport
+from ..net.utils.bandwidth_limiter import BandwidthLimiter, BandwidthPriority
+from ..net.request_chain.handlers.retry_handler import RetryBudget, RetryPolicy
+from ..net.request_chain.handlers.rate_limit_handler import RateLimit, RateLimitBackend
+from ..net.request_chain.handlers.concurrency_handler import ConcurrencyLimiters
+from ..net.request_chain.handlers.instrumentation_handler import Instrumentation
+from ..net.tracing.tracer import Span, Tracer
 from ..models.transcription_request import TranscriptionRequest
 from ..models.transcription_job_output import TranscriptionJobOutput
 from ..models.transcription_job_file_output import TranscriptionJobFileOutput
+from ..models.transcription_timing_report import TranscriptionTimingReport
 from .simple_storage import SimpleStorageService
 from ..net.environment.environment import (
     Environment,
@@ -35,6 +58,12 @@ class TranscriptionService(BaseService):
 
     # Maximum polling duration in seconds (30 minutes)
     MAX_POLLING_DURATION = 1800
+    # Delay between two job status polls in seconds
+    POLLING_INTERVAL = 5
+    # Statuses of the jobs that ended
+    TERMINAL_STATUSES = frozenset(
+        (Status.SUCCEEDED.value, Status.FAILED.value, Status.CANCELLED.value)
+    )
 
     def __init__(
         self,
@@ -61,7 +90,243 @@ def __init__(
 
         self.set_api_key(api_key)
         self._storage_service = SimpleStorageService(api_key=api_key)
+        self._storage_service.set_retry_budget(self._retry_budget)
         self._salad_sdk = SaladCloudSdk(api_key=api_key, base_url=_base_url)
+        self._source_cleaner: Optional[SourceCleaner] = None
+        self._clean_up_sources_on_read = False
+
+    def set_retry_policy(self, retry_policy: RetryPolicy):
+        """
+        Sets the retry policy for the service and its storage service.
+
+        :param RetryPolicy retry_policy: The retry policy to be set.
+        :return: The service instance.
+        """
+        super().set_retry_policy(retry_policy)
+        self._storage_service.set_retry_policy(retry_policy)
+
+        return self
+
+    def set_retry_budget(self, retry_budget: RetryBudget):
+        """
+        Sets the retry budget for the service and its storage service.
+
+        :param RetryBudget retry_budget: The retry budget to be set.
+        :return: The service instance.
+        """
+        super().set_retry_budget(retry_budget)
+        self._storage_service.set_retry_budget(retry_budget)
+
+        return self
+
+    def set_request_compression(self, threshold: Optional[int] = 64 * 1024):
+        """
+        Sets the JSON request compression of the service and its storage service.
+
+        :param Optional[int] threshold: The minimum size in bytes of the serialized body to compress it, None to disable compression.
+        :return: The service instance.
+        """
+        super().set_request_compression(threshold)
+        self._storage_service.set_request_compression(threshold)
+
+        return self
+
+    def set_transport(self, transport: Union[Transport, str]):
+        """
+        Sets the transport of the service and its storage service.
+
+        :param Union[Transport, str] transport: The transport, or the name of a registered transport.
+        :return: The service instance.
+        """
+        if isinstance(transport, str):
+            transport = create_transport(transport)
+        super().set_transport(transport)
+        self._storage_service.set_transport(transport)
+
+        return self
+
+    def set_bandwidth_limiter(
+        self,
+        bandwidth_limiter: Optional[BandwidthLimiter],
+        priority: Union[BandwidthPriority, str] = BandwidthPriority.INTERACTIVE,
+    ):
+        """
+        Sets the limiter throttling the uploads of the service and its storage service.
+
+        :param Optional[BandwidthLimiter] bandwidth_limiter: The bandwidth limiter, None to disable throttling.
+        :param Union[BandwidthPriority, str] priority: The priority class of the uploads, such as "bulk".
+        :return: The service instance.
+        """
+        super().set_bandwidth_limiter(bandwidth_limiter, priority)
+        self._storage_service.set_bandwidth_limiter(bandwidth_limiter, priority)
+
+        return self
+
+    def set_part_sizer(self, part_sizer: PartSizer):
+        """
+        Sets the sizer choosing the part size of the multipart uploads of the storage service.
+
+        :param PartSizer part_sizer: The part sizer.
+        :return: The service instance.
+        """
+        self._storage_service.set_part_sizer(part_sizer)
+
+        return self
+
+    def set_memory_budget(self, memory_budget: MemoryBudget):
+        """
+        Sets the budget of bytes the uploads of the storage service may hold in memory.
+
+        :param MemoryBudget memory_budget: The memory budget.
+        :return: The service instance.
+        """
+        self._storage_service.set_memory_budget(memory_budget)
+
+        return self
+
+    def set_upload_concurrency(self, concurrency: int):
+        """
+        Sets the amount of parts of a multipart upload of the storage service sent at the same time.
+
+        :param int concurrency: The amount of parts.
+        :return: The service instance.
+        """
+        self._storage_service.set_upload_concurrency(concurrency)
+
+        return self
+
+    def set_multipart_registry(self, multipart_registry: MultipartUploadRegistry):
+        """
+        Sets the registry recording the multipart uploads of the storage service in progress.
+
+        :param MultipartUploadRegistry multipart_registry: The multipart upload registry.
+        :return: The service instance.
+        """
+        self._storage_service.set_multipart_registry(multipart_registry)
+
+        return self
+
+    def set_source_cleaner(self, source_cleaner: SourceCleaner):
+        """
+        Sets the cleaner deleting the sources uploaded for jobs once they ended, such as
+        a cleaner shared by services or sending larger batches.
+
+        :param SourceCleaner source_cleaner: The source cleaner.
+        :return: The service instance.
+        """
+        self._source_cleaner = source_cleaner
+
+        return self
+
+    def get_source_cleaner(self) -> SourceCleaner:
+        """
+        Get the cleaner deleting the sources uploaded for jobs once they ended, created
+        with the storage service of this service on first use.
+
+        :return: The source cleaner.
+        :rtype: SourceCleaner
+        """
+        if self._source_cleaner is None:
+            self._source_cleaner = SourceCleaner(self._storage_service.delete_file)
+        return self._source_cleaner
+
+    def set_clean_up_sources_on_read(self, enabled: bool = True):
+        """
+        Sets whether getting or listing jobs, or processing their webhooks, queues the
+        deletion of the sources uploaded for the ended ones created with cleanup_source.
+        Off by default, so reading jobs has no side effect on storage.
+
+        :param bool enabled: Whether reading ended jobs deletes their uploaded sources.
+        :return: The service instance.
+        """
+        self._clean_up_sources_on_read = enabled
+
+        return self
+
+    def set_checksums(
+        self,
+        algorithms: Iterable[Union[ChecksumAlgorithm, str]] = (
+            ChecksumAlgorithm.MD5,
+            ChecksumAlgorithm.SHA256,
+        ),
+        verify_etags: bool = False,
+    ):
+        """
+        Sets the checksums computed while the storage service reads uploads.
+
+        :param Iterable[Union[ChecksumAlgorithm, str]] algorithms: The algorithms: md5, sha256 or crc32c.
+        :param bool verify_etags: Whether to check the ETags returned for the parts of multipart uploads.
+        :return: The service instance.
+        """
+        self._storage_service.set_checksums(algorithms, verify_etags)
+
+        return self
+
+    def set_response_spill_threshold(self, threshold: Optional[int] = 1024 * 1024):
+        """
+        Sets the response spill threshold of the service and its storage service.
+
+        :param Optional[int] threshold: The maximum size in bytes of a response body kept in memory, None to keep every body in memory.
+        :return: The service instance.
+        """
+        super().set_response_spill_threshold(threshold)
+        self._storage_service.set_response_spill_threshold(threshold)
+
+        return self
+
+    def set_rate_limits(
+        self, rate_limits: List[RateLimit], backend: Optional[RateLimitBackend] = None
+    ):
+        """
+        Sets client-side request rate limits for the service and its storage service.
+
+        :param List[RateLimit] rate_limits: The limits to apply to every request.
+        :param Optional[RateLimitBackend] backend: The backend holding the token buckets. Defaults to an in-memory backend.
+        :return: The service instance.
+        """
+        super().set_rate_limits(rate_limits, backend)
+        self._storage_service.set_rate_limits(rate_limits, self._rate_limit_backend)
+
+        return self
+
+    def set_adaptive_concurrency(
+        self, concurrency_limiters: Optional[ConcurrencyLimiters]
+    ):
+        """
+        Sets the adaptive concurrency limiters of the service and its storage service.
+
+        :param Optional[ConcurrencyLimiters] concurrency_limiters: The limiters to use, or None to disable adaptive concurrency.
+        :return: The service instance.
+        """
+        super().set_adaptive_concurrency(concurrency_limiters)
+        self._storage_service.set_adaptive_concurrency(concurrency_limiters)
+
+        return self
+
+    def set_instrumentation(self, instrumentation: Instrumentation):
+        """
+        Sets the instrumentation of the service and its storage service.
+
+        :param Instrumentation instrumentation: The instrumentation to be set.
+        :return: The service instance.
+        """
+        super().set_instrumentation(instrumentation)
+        self._storage_service.set_instrumentation(instrumentation)
+
+        return self
+
+    def set_tracer(self, tracer: Optional[Tracer]):
+        """
+        Sets the tracer of the service and its storage service.
+        Each transcribe() stage is then recorded as a child span of a transcribe span.
+
+        :param Optional[Tracer] tracer: The tracer to be set, or None to disable tracing.
+        :return: The service instance.
+        """
+        super().set_tracer(tracer)
+        self._storage_service.set_tracer(tracer)
+
+        return self
 
     def transcribe(
         self,
@@ -71,6 +336,11 @@ def transcribe(
         engine: TranscriptionEngine = TranscriptionEngine.Full,
         auto_poll: bool = False,
         max_polling_duration: int = MAX_POLLING_DURATION,
+        deadline: Optional[Deadline] = None,
+        timing_report: bool = False,
+        upload_progress: Optional[UploadProgressCallback] = None,
+        cleanup_source: bool = False,
+        keep_source_for: float = 0,
     ) -> InferenceEndpointJob:
         """Creates a new transcription job
 
@@ -86,89 +356,231 @@ def transcribe(
         :type auto_poll: bool, optional (default=False)
         :param max_polling_duration: Maximum duration in seconds to poll for job completion
         :type max_polling_duration: int, optional (default=1800 meaning 30 minutes)
+        :param deadline: An upper bound for the whole call, shared by the upload, its retries and the polling
+        :type deadline: Optional[Deadline], optional (default=None)
+        :param timing_report: Whether to attach a TranscriptionTimingReport to the returned job, as its timing_report attribute
+        :type timing_report: bool, optional (default=False)
+        :param upload_progress: A function called with the UploadProgress of the upload of a local source file, from the threads sending it
+        :type upload_progress: Optional[UploadProgressCallback], optional (default=None)
+        :param cleanup_source: Whether to delete the uploaded local source file from storage once the job ended. The file is recorded in the job metadata and deleted in the background once this call sees the job ended, or later by any service with set_clean_up_sources_on_read enabled that gets or lists the job, or processes its webhook.
+        :type cleanup_source: bool, optional (default=False)
+        :param keep_source_for: Time in seconds to keep the uploaded source after the job ended, such as 24 * 3600 to keep it for a day
+        :type keep_source_for: float, optional (default=0)
 
         :raises RequestError: Raised when a request fails.
+        :raises DeadlineExceededError: Raised when a request cannot complete before the deadline.
         :raises ValueError: Raised when input parameters are invalid.
-        :raises TimeoutError: Raised when polling exceeds the maximum duration.
+        :raises TimeoutError: Raised when polling exceeds the maximum duration or the deadline.
 
         :return: The transcription job details
         :rtype: InferenceEndpointJob
         """
-        if source is None or not source.strip():
-            raise ValueError("The source file path or URL cannot be empty.")
-
-        if not isinstance(request, TranscriptionRequest):
-            raise ValueError("The request must be an instance of TranscriptionRequest.")
-
-        Validator(str).min_length(2).max_length(63).pattern(
-            "^[a-z][a-z0-9-]{0,61}[a-z0-9]$"
-        ).validate(organization_name)
+        report = TranscriptionTimingReport()
+        start_time = time.perf_counter()
+        with self._start_span(
+            "transcribe", organization=organization_name, engine=str(engine.value)
+        ):
+            with self._stage("validate", report, "validation_time"):
+                if source is None or not source.strip():
+                    raise ValueError("The source file path or URL cannot be empty.")
 
-        # Get the source file URL (also uploads the file to S4 if it's local)
-        file_url = self._process_source(source, organization_name)
+                if not isinstance(request, TranscriptionRequest):
+                    raise ValueError(
+                        "The request must be an instance of TranscriptionRequest."
+                    )
 
-        request_dict = request.to_dict()["input"]
-        request_dict["url"] = file_url
+                Validator(str).min_length(2).max_length(63).pattern(
+                    "^[a-z][a-z0-9-]{0,61}[a-z0-9]$"
+                ).validate(organization_name)
+                Validator(float).min(0).validate(keep_source_for)
 
-        if request.webhook is not None:
-            job_prototype = InferenceEndpointJobPrototype(
-                input=request_dict,
-                webhook=request.webhook or None,
-                webhook_url=request.webhook or None,
-            )
-        else:
-            job_prototype = InferenceEndpointJobPrototype(
-                input=request_dict,
-            )
+            with deadline_scope(deadline) as call_deadline:
+                # Get the source file URL (also uploads the file to S4 if it's local)
+                with self._stage("process_source", report, "upload_time"):
+                    file_url = self._process_source(
+                        source, organization_name, upload_progress
+                    )
+                    if file_url != source and timing_report:
+                        report.upload_bytes = os.path.getsize(source)
+
+                request_dict = request.to_dict()["input"]
+                request_dict["url"] = file_url
+
+                prototype_kwargs = {}
+                uploaded_source = None
+                if cleanup_source and file_url != source:
+                    uploaded_source = os.path.basename(urlparse(file_url).path)
+                    prototype_kwargs["metadata"] = {
+                        SOURCE_METADATA_KEY: uploaded_source,
+                        KEEP_SOURCE_FOR_METADATA_KEY: keep_source_for,
+                    }
+
+                if request.webhook is not None:
+                    job_prototype = InferenceEndpointJobPrototype(
+                        input=request_dict,
+                        webhook=request.webhook or None,
+                        webhook_url=request.webhook or None,
+                        **prototype_kwargs,
+                    )
+                else:
+                    job_prototype = InferenceEndpointJobPrototype(
+                        input=request_dict,
+                        **prototype_kwargs,
+                    )
 
-        # Choose the appropriate endpoint based on engine type
-        inference_endpoint_name = self._get_endpoint_name(engine)
+                # Choose the appropriate endpoint based on engine type
+                inference_endpoint_name = self._get_endpoint_name(engine)
+
+                with self._stage("create_job", report, "create_job_time") as span:
+                    try:
+                        response = self._create_transcription_job_internal(
+                            organization_name, inference_endpoint_name, job_prototype
+                        )
+                    except Exception:
+                        # No job will use the uploaded source
+                        if uploaded_source is not None:
+                            self.get_source_cleaner().schedule(
+                                organization_name, uploaded_source
+                            )
+                        raise
+                    if span is not None:
+                        span.set_attribute("job.id", response.id_)
+
+                job = response
+
+                # If auto_poll is enabled, let's wait for the transcription to complete
+                # Polls every 5 seconds, if enabled
+                if auto_poll:
+                    with self._stage("poll", report, "polling_time") as span:
+                        job = self._poll_transcription_job(
+                            organization_name,
+                            job,
+                            engine,
+                            max_polling_duration,
+                            call_deadline,
+                            report,
+                        )
+                        if span is not None:
+                            span.set_attribute("job.status", str(job.status))
+
+            # Convert job output to appropriate type if possible
+            with self._stage("convert_output", report, "decode_time"):
+                self._convert_job_output(job)
+            self._clean_up_source(job)
+
+        if timing_report:
+            report.total_time = time.perf_counter() - start_time
+            job.timing_report = report.set_job_timings(job)
 
-        # Use Salad SDK inference service to create the actual job
-        response = self._salad_sdk.inference_endpoints.create_inference_endpoint_job(
-            request_body=job_prototype,
-            organization_name=organization_name,
-            inference_endpoint_name=inference_endpoint_name,
-        )
+        return job
 
-        job = response
-        print(job.status)
-
-        # If auto_poll is enabled, let's wait for the transcription to complete
-        # Polls every 5 seconds, if enabled
-        if auto_poll:
-            job_id = response.id_
-            start_time = time.time()
-
-            while job.status not in [
-                Status.SUCCEEDED.value,
-                Status.FAILED.value,
-                Status.CANCELLED.value,
-            ]:
-                print(job.status)
-                # Check if we've exceeded the maximum polling duration
-                if time.time() - start_time > max_polling_duration:
-                    raise TimeoutError(
-                        f"Transcription polling exceeded maximum duration of {max_polling_duration/60} minutes"
-                    )
+    @contextmanager
+    def _stage(
+        self, name: str, report: TranscriptionTimingReport, field: str
+    ) -> Generator[Optional[Span], None, None]:
+        """Runs a stage of transcribe within its span and records its duration in the timing report
+
+        :param name: The name of the stage
+        :type name: str
+        :param report: The timing report
+        :type report: TranscriptionTimingReport
+        :param field: The report attribute receiving the duration
+        :type field: str
+        :return: The span of the stage, or None when tracing is disabled
+        :rtype: Generator[Optional[Span], None, None]
+        """
+        start_time = time.perf_counter()
+        try:
+            with self._start_span(f"transcribe.{name}") as span:
+                yield span
+        finally:
+            setattr(report, field, time.perf_counter() - start_time)
 
-                job = self._get_transcription_job_internal(
-                    organization_name, job_id, engine
+    def _poll_transcription_job(
+        self,
+        organization_name: str,
+        job: InferenceEndpointJob,
+        engine: TranscriptionEngine,
+        max_polling_duration: int,
+        call_deadline: Optional[Deadline],
+        report: TranscriptionTimingReport,
+    ) -> InferenceEndpointJob:
+        job_id = job.id_
+        start_time = time.time()
+
+        while job.status not in self.TERMINAL_STATUSES:
+            # Check if we've exceeded the maximum polling duration
+            if time.time() - start_time > max_polling_duration:
+                raise TimeoutError(
+                    f"Transcription polling exceeded maximum duration of {max_polling_duration/60} minutes"
+                )
+            if call_deadline is not None and call_deadline.expired():
+                raise TimeoutError(
+                    f"Transcription exceeded its deadline of {call_deadline.timeout_in_seconds} seconds"
                 )
-                time.sleep(5)
 
-        # Convert job output to appropriate type if possible
-        self._convert_job_output(job)
+            job = self._get_transcription_job_internal(
+                organization_name, job_id, engine
+            )
+            report.poll_count += 1
+            time.sleep(
+                self.POLLING_INTERVAL
+                if call_deadline is None
+                else call_deadline.cap(self.POLLING_INTERVAL)
+            )
 
         return job
 
-    def _process_source(self, source: str, organization_name: str) -> str:
+    def _create_transcription_job_internal(
+        self,
+        organization_name: str,
+        inference_endpoint_name: str,
+        job_prototype: InferenceEndpointJobPrototype,
+    ) -> InferenceEndpointJob:
+        Validator(str).min_length(2).max_length(63).pattern(
+            "^[a-z][a-z0-9-]{0,61}[a-z0-9]$"
+        ).validate(organization_name)
+        Validator(str).min_length(2).max_length(63).pattern(
+            "^[a-z][a-z0-9-]{0,61}[a-z0-9]$"
+        ).validate(inference_endpoint_name)
+        Validator(InferenceEndpointJobPrototype).validate(job_prototype)
+
+        # Job creation goes through this service's request chain, so it shares
+        # the adaptive concurrency limit of job creation with other callers
+        serialized_request = (
+            Serializer(
+                f"{self.base_url}/organizations/{{organization_name}}/inference-endpoints/{{inference_endpoint_name}}/jobs",
+                [self.get_api_key()],
+            )
+            .add_path("organization_name", organization_name)
+            .add_path("inference_endpoint_name", inference_endpoint_name)
+            .add_error(400, ProblemDetails)
+            .add_error(401, ProblemDetails)
+            .add_error(403, ProblemDetails)
+            .add_error(404, ProblemDetails)
+            .add_error(429, ProblemDetails)
+            .serialize()
+            .set_method("POST")
+            .set_body(job_prototype._map())
+        )
+
+        response, _, _ = self.send_request(serialized_request)
+        return InferenceEndpointJob._unmap(response)
+
+    def _process_source(
+        self,
+        source: str,
+        organization_name: str,
+        upload_progress: Optional[UploadProgressCallback] = None,
+    ) -> str:
         """Process the source to determine if it's a URL or local file and handle accordingly
 
         :param source: The file to transcribe - can be a URL or local file path
         :type source: str
         :param organization_name: The organization name
         :type organization_name: str
+        :param upload_progress: The function called with the progress of the upload of a local file
+        :type upload_progress: Optional[UploadProgressCallback]
 
         :raises ValueError: If the source is invalid (invalid URL)
         :return: A valid URL pointing to the content
@@ -181,7 +593,9 @@ def _process_source(self, source: str, organization_name: str) -> str:
         else:
             # It's a local file path - let the storage service handle file existence check and opening
             upload_response = self._storage_service.upload_file(
-                organization_name=organization_name, local_file_path=source
+                organization_name=organization_name,
+                local_file_path=source,
+                progress_callback=upload_progress,
             )
 
             return upload_response.url
@@ -220,7 +634,10 @@ def get_transcription_job(
         :return: The transcription job details
         :rtype: InferenceEndpointJob
         """
-        return self._get_transcription_job_internal(organization_name, job_id, engine)
+        job = self._get_transcription_job_internal(organization_name, job_id, engine)
+        if self._clean_up_sources_on_read:
+            self._clean_up_source(job)
+        return job
 
     def _get_transcription_job_internal(
         self,
@@ -229,12 +646,36 @@ def _get_transcription_job_internal(
         engine: TranscriptionEngine = TranscriptionEngine.Full,
     ) -> InferenceEndpointJob:
         inference_endpoint_name = self._get_endpoint_name(engine)
-        job = self._salad_sdk.inference_endpoints.get_inference_endpoint_job(
-            organization_name=organization_name,
-            inference_endpoint_name=inference_endpoint_name,
-            inference_endpoint_job_id=job_id,
+
+        Validator(str).min_length(2).max_length(63).pattern(
+            "^[a-z][a-z0-9-]{0,61}[a-z0-9]$"
+        ).validate(organization_name)
+        Validator(str).min_length(2).max_length(63).pattern(
+            "^[a-z][a-z0-9-]{0,61}[a-z0-9]$"
+        ).validate(inference_endpoint_name)
+        Validator(str).validate(job_id)
+
+        # Job reads go through this service's request chain, so they benefit from
+        # its retry policy and, when enabled, hedging
+        serialized_request = (
+            Serializer(
+                f"{self.base_url}/organizations/{{organization_name}}/inference-endpoints/{{inference_endpoint_name}}/jobs/{{inference_endpoint_job_id}}",
+                [self.get_api_key()],
+            )
+            .add_path("organization_name", organization_name)
+            .add_path("inference_endpoint_name", inference_endpoint_name)
+            .add_path("inference_endpoint_job_id", job_id)
+            .add_error(401, ProblemDetails)
+            .add_error(403, ProblemDetails)
+            .add_error(404, ProblemDetails)
+            .add_error(429, ProblemDetails)
+            .serialize()
+            .set_method("GET")
         )
 
+        response, _, _ = self.send_request(serialized_request)
+        job = InferenceEndpointJob._unmap(response)
+
         # Convert job output to appropriate type if possible
         self._convert_job_output(job)
         return job
@@ -245,7 +686,7 @@ def list_transcription_jobs(
         engine: TranscriptionEngine = TranscriptionEngine.Full,
         page: Optional[int] = None,
         page_size: Optional[int] = None,
-    ):
+    ) -> InferenceEndpointJobCollection:
         """Lists all transcription jobs for an organization
 
         :param organization_name: The organization name
@@ -261,13 +702,41 @@ def list_transcription_jobs(
         :rtype: InferenceEndpointJobCollection
         """
         inference_endpoint_name = self._get_endpoint_name(engine)
-        return self._salad_sdk.inference_endpoints.list_inference_endpoint_jobs(
-            organization_name=organization_name,
-            inference_endpoint_name=inference_endpoint_name,
-            page=page,
-            page_size=page_size,
+
+        Validator(str).min_length(2).max_length(63).pattern(
+            "^[a-z][a-z0-9-]{0,61}[a-z0-9]$"
+        ).validate(organization_name)
+        Validator(str).min_length(2).max_length(63).pattern(
+            "^[a-z][a-z0-9-]{0,61}[a-z0-9]$"
+        ).validate(inference_endpoint_name)
+        Validator(int).is_optional().min(1).max(2147483647).validate(page)
+        Validator(int).is_optional().min(1).max(100).validate(page_size)
+
+        serialized_request = (
+            Serializer(
+                f"{self.base_url}/organizations/{{organization_name}}/inference-endpoints/{{inference_endpoint_name}}/jobs",
+                [self.get_api_key()],
+            )
+            .add_path("organization_name", organization_name)
+            .add_path("inference_endpoint_name", inference_endpoint_name)
+            .add_query("page", page)
+            .add_query("page_size", page_size)
+            .add_error(400, ProblemDetails)
+            .add_error(401, ProblemDetails)
+            .add_error(403, ProblemDetails)
+            .add_error(404, ProblemDetails)
+            .add_error(429, ProblemDetails)
+            .serialize()
+            .set_method("GET")
         )
 
+        response, _, _ = self.send_request(serialized_request)
+        collection = InferenceEndpointJobCollection._unmap(response)
+        if self._clean_up_sources_on_read:
+            for job in collection.items or []:
+                self._clean_up_source(job)
+        return collection
+
     def delete_transcription_job(
         self,
         organization_name: str,
@@ -335,10 +804,41 @@ def process_webhook_request(
             deserialized_payload.data = self._convert_job_output(
                 deserialized_payload.data
             )
+            if self._clean_up_sources_on_read and deserialized_payload.data is not None:
+                self._clean_up_source(deserialized_payload.data)
             return deserialized_payload
 
         raise WebhookVerificationError("Signature validation failed.")
 
+    def _clean_up_source(self, job: InferenceEndpointJob) -> None:
+        """Queues the deletion of the uploaded source of a job that ended, if it was created with cleanup_source
+
+        :param job: The job
+        :type job: InferenceEndpointJob
+        """
+        metadata = getattr(job, "metadata", None)
+        if not isinstance(metadata, dict) or not metadata.get(SOURCE_METADATA_KEY):
+            return
+        if job.status not in self.TERMINAL_STATUSES:
+            return
+
+        update_time = job.update_time
+        if isinstance(update_time, str) and update_time.endswith("Z"):
+            # fromisoformat only reads the Z suffix from Python 3.11
+            update_time = update_time[:-1] + "+00:00"
+        try:
+            ended_at = datetime.fromisoformat(update_time).timestamp()
+        except (AttributeError, TypeError, ValueError):
+            ended_at = time.time()
+        try:
+            keep_for = float(metadata.get(KEEP_SOURCE_FOR_METADATA_KEY) or 0)
+        except (TypeError, ValueError):
+            keep_for = 0.0
+
+        self.get_source_cleaner().schedule(
+            job.organization_name, metadata[SOURCE_METADATA_KEY], ended_at + keep_for
+        )
+
     def _convert_job_output(self, job: InferenceEndpointJob) -> InferenceEndpointJob:
         """Converts job output to appropriate output model if possible
 
@@ -1,4 +1,5 @@
-from typing import Any, Dict, Tuple, Generator
+from contextlib import nullcontext
+from typing import Any, ContextManager, Dict, List, Optional, Tuple, Generator, Union
 from enum import Enum
 
 from .default_headers import DefaultHeaders, DefaultHeadersKeys
@@ -6,10 +7,52 @@
 from ...net.headers.base_header import BaseHeader
 
 from ...net.transport.request import Request
+from ...net.transport.deadline import current_deadline
+from ...net.transport.transports import (
+    AsyncTransport,
+    Transport,
+    create_transport,
+    default_transport,
+)
+from ...net.utils.bandwidth_limiter import (
+    BandwidthLimiter,
+    BandwidthPriority,
+    default_bandwidth_limiter,
+)
 from ...net.request_chain.request_chain import RequestChain
 from ...net.request_chain.handlers.http_handler import HttpHandler
+from ...net.request_chain.handlers.coalescing_handler import CoalescingHandler
+from ...net.request_chain.handlers.cache_handler import CacheHandler, CacheStore
+from ...net.request_chain.handlers.rate_limit_handler import (
+    MemoryRateLimitBackend,
+    RateLimit,
+    RateLimitBackend,
+    RateLimitHandler,
+)
+from ...net.request_chain.handlers.concurrency_handler import (
+    ConcurrencyHandler,
+    ConcurrencyLimiters,
+    default_concurrency_limiters,
+)
+from ...net.request_chain.handlers.instrumentation_handler import (
+    Instrumentation,
+    InstrumentationHandler,
+    default_instrumentation,
+)
+from ...net.request_chain.handlers.tracing_handler import TracingHandler
+from ...net.tracing.tracer import Span, Tracer
+from ...net.request_chain.handlers.hedging_handler import (
+    HedgingHandler,
+    HedgingPolicy,
+    LatencyTracker,
+)
 from ...net.headers.api_key_auth import ApiKeyAuth
-from ...net.request_chain.handlers.retry_handler import RetryHandler
+from ...net.request_chain.handlers.retry_handler import (
+    RetryBudget,
+    RetryHandler,
+    RetryMetrics,
+    RetryPolicy,
+)
 
 
 class BaseService:
@@ -29,6 +72,29 @@ def __init__(self, base_url: str) -> None:
         self.base_url = base_url
         self._default_headers = DefaultHeaders()
         self._timeout = 60000
+        self._connect_timeout = None
+        self._retry_policy = RetryPolicy()
+        self._retry_budget = RetryBudget()
+        self._retry_metrics = RetryMetrics()
+        self._hedging_policy: Optional[HedgingPolicy] = None
+        self._latency_tracker: Optional[LatencyTracker] = None
+        self._hedging_handler: Optional[HedgingHandler] = None
+        self._coalesce_requests = True
+        self._coalescing_result_ttl = 0
+        self._response_cache: Optional[CacheStore] = None
+        self._rate_limits: List[RateLimit] = []
+        self._rate_limit_backend: RateLimitBackend = MemoryRateLimitBackend()
+        self._concurrency_limiters: Optional[ConcurrencyLimiters] = (
+            default_concurrency_limiters
+        )
+        self._instrumentation = default_instrumentation
+        self._tracer: Optional[Tracer] = None
+        self._compression_threshold: Optional[int] = None
+        self._spill_threshold: Optional[int] = None
+        self._transport: Transport = default_transport
+        self._async_transport: Optional[AsyncTransport] = None
+        self._bandwidth_limiter: Optional[BandwidthLimiter] = default_bandwidth_limiter
+        self._bandwidth_priority = BandwidthPriority.INTERACTIVE
 
         self._update_request_handler()
 
@@ -63,6 +129,302 @@ def set_timeout(self, timeout: int):
 
         return self
 
+    def set_connect_timeout(self, connect_timeout: int):
+        """
+        Sets the connect timeout for the service, independently of the read timeout.
+
+        :param int connect_timeout: The connect timeout (ms) to be set.
+        :return: The service instance.
+        """
+        self._connect_timeout = connect_timeout
+        self._update_request_handler()
+
+        return self
+
+    def set_request_compression(self, threshold: Optional[int] = 64 * 1024):
+        """
+        Enables gzip compression of JSON request bodies of at least the given size, or disables it when None is given.
+        Responses are always negotiated with every encoding the installed decoders support.
+
+        :param Optional[int] threshold: The minimum size in bytes of the serialized body to compress it.
+        :return: The service instance.
+        """
+        self._compression_threshold = threshold
+        self._update_request_handler()
+
+        return self
+
+    def set_response_spill_threshold(self, threshold: Optional[int] = 1024 * 1024):
+        """
+        Spills response bodies larger than the given size to a temporary file instead of
+        holding them in memory, or keeps every body in memory when None is given.
+
+        :param Optional[int] threshold: The maximum size in bytes of a response body kept in memory.
+        :return: The service instance.
+        """
+        self._spill_threshold = threshold
+        self._update_request_handler()
+
+        return self
+
+    def set_transport(self, transport: Union[Transport, str]):
+        """
+        Sets the backend sending the HTTP requests of the service.
+
+        :param Union[Transport, str] transport: The transport, or the name of a registered transport such as requests, urllib3 or httpx.
+        :return: The service instance.
+        :raises ValueError: If no transport is registered under the name.
+        """
+        if isinstance(transport, str):
+            transport = create_transport(transport)
+        self._transport = transport
+        self._update_request_handler()
+
+        return self
+
+    def get_transport(self) -> Transport:
+        """
+        Get the backend sending the HTTP requests of the service.
+
+        :return: The transport.
+        :rtype: Transport
+        """
+        return self._transport
+
+    def set_async_transport(self, async_transport: Optional[AsyncTransport]):
+        """
+        Sets the backend sending the HTTP requests of the service from coroutines.
+
+        :param Optional[AsyncTransport] async_transport: The async transport, or None for httpx when it is installed and the transport is the default one, otherwise the transport run in worker threads.
+        :return: The service instance.
+        """
+        self._async_transport = async_transport
+        self._update_request_handler()
+
+        return self
+
+    def get_async_transport(self) -> Optional[AsyncTransport]:
+        """
+        Get the backend sending the HTTP requests of the service from coroutines.
+
+        :return: The async transport, None if the default one is used.
+        :rtype: Optional[AsyncTransport]
+        """
+        return self._async_transport
+
+    def set_bandwidth_limiter(
+        self,
+        bandwidth_limiter: Optional[BandwidthLimiter],
+        priority: Union[BandwidthPriority, str] = BandwidthPriority.INTERACTIVE,
+    ):
+        """
+        Sets the limiter throttling the upload bodies of the service, and the priority class
+        they are sent with. Services share the process-wide limiter by default, which does not
+        limit anything until a rate is set on it. None disables throttling for the service.
+
+        :param Optional[BandwidthLimiter] bandwidth_limiter: The bandwidth limiter.
+        :param Union[BandwidthPriority, str] priority: The priority class of the uploads, such as "bulk".
+        :return: The service instance.
+        :raises ValueError: If the priority class is unknown.
+        """
+        self._bandwidth_limiter = bandwidth_limiter
+        self._bandwidth_priority = BandwidthPriority(priority)
+        self._update_request_handler()
+
+        return self
+
+    def get_bandwidth_limiter(self) -> Optional[BandwidthLimiter]:
+        """
+        Get the limiter throttling the upload bodies of the service.
+
+        :return: The bandwidth limiter, None if throttling is disabled.
+        :rtype: Optional[BandwidthLimiter]
+        """
+        return self._bandwidth_limiter
+
+    def set_retry_policy(self, retry_policy: RetryPolicy):
+        """
+        Sets the retry policy for the service.
+
+        :param RetryPolicy retry_policy: The retry policy to be set.
+        :return: The service instance.
+        """
+        self._retry_policy = retry_policy
+        self._update_request_handler()
+
+        return self
+
+    def set_retry_budget(self, retry_budget: RetryBudget):
+        """
+        Sets the retry budget for the service.
+        Services sharing a budget share the same cap on retries.
+
+        :param RetryBudget retry_budget: The retry budget to be set.
+        :return: The service instance.
+        """
+        self._retry_budget = retry_budget
+        self._close_hedging_handler()
+        self._update_request_handler()
+
+        return self
+
+    def get_retry_budget(self) -> RetryBudget:
+        """
+        Get the retry budget.
+
+        :return: The retry budget.
+        :rtype: RetryBudget
+        """
+        return self._retry_budget
+
+    def get_retry_metrics(self) -> RetryMetrics:
+        """
+        Get the retry counts and delays recorded by the service.
+
+        :return: The retry metrics.
+        :rtype: RetryMetrics
+        """
+        return self._retry_metrics
+
+    def set_hedging_policy(self, hedging_policy: Optional[HedgingPolicy]):
+        """
+        Enables hedged requests for the service, or disables them when None is given.
+        Hedged attempts are withdrawn from the retry budget of the service.
+
+        :param Optional[HedgingPolicy] hedging_policy: The hedging policy to be set.
+        :return: The service instance.
+        """
+        self._hedging_policy = hedging_policy
+        self._latency_tracker = (
+            LatencyTracker(hedging_policy.window_size)
+            if hedging_policy is not None
+            else None
+        )
+        self._close_hedging_handler()
+        self._update_request_handler()
+
+        return self
+
+    def set_request_coalescing(self, enabled: bool, result_ttl: int = 0):
+        """
+        Enables or disables sharing one in-flight call between identical concurrent GET requests.
+        Coalescing is enabled by default, without reusing completed results.
+
+        :param bool enabled: Whether identical concurrent GET requests are coalesced.
+        :param int result_ttl: How long (ms) a completed result is reused by later identical requests.
+        :return: The service instance.
+        """
+        self._coalesce_requests = enabled
+        self._coalescing_result_ttl = result_ttl
+        self._update_request_handler()
+
+        return self
+
+    def set_response_cache(self, cache_store: Optional[CacheStore]):
+        """
+        Enables caching of GET responses in the given store, or disables it when None is given.
+        Finished inference jobs are cached without revalidation, other responses follow their
+        Cache-Control, ETag and Last-Modified headers.
+
+        :param Optional[CacheStore] cache_store: The store holding the cached responses, e.g. a MemoryCacheStore or a DiskCacheStore.
+        :return: The service instance.
+        """
+        self._response_cache = cache_store
+        self._update_request_handler()
+
+        return self
+
+    def set_rate_limits(
+        self, rate_limits: List[RateLimit], backend: Optional[RateLimitBackend] = None
+    ):
+        """
+        Sets client-side request rate limits for the service. An empty list disables rate limiting.
+        Use a FileRateLimitBackend to share the limits between the processes of a node.
+
+        :param List[RateLimit] rate_limits: The limits to apply to every request.
+        :param Optional[RateLimitBackend] backend: The backend holding the token buckets. Defaults to an in-memory backend.
+        :return: The service instance.
+        """
+        self._rate_limits = list(rate_limits)
+        self._rate_limit_backend = backend or MemoryRateLimitBackend()
+        self._update_request_handler()
+
+        return self
+
+    def set_adaptive_concurrency(
+        self, concurrency_limiters: Optional[ConcurrencyLimiters]
+    ):
+        """
+        Sets the limiters adapting the amount of concurrent calls per endpoint class
+        (S4 upload, S4 sign, job creation, job reads), or disables them when None is given.
+        By default all services of the process share the same limiters.
+
+        :param Optional[ConcurrencyLimiters] concurrency_limiters: The limiters to use.
+        :return: The service instance.
+        """
+        self._concurrency_limiters = concurrency_limiters
+        self._update_request_handler()
+
+        return self
+
+    def get_concurrency_limiters(self) -> Optional[ConcurrencyLimiters]:
+        """
+        Get the adaptive concurrency limiters.
+
+        :return: The limiters, or None if adaptive concurrency is disabled.
+        :rtype: Optional[ConcurrencyLimiters]
+        """
+        return self._concurrency_limiters
+
+    def set_instrumentation(self, instrumentation: Instrumentation):
+        """
+        Sets the instrumentation receiving a record of every request attempt.
+        By default all services of the process share the same instrumentation.
+
+        :param Instrumentation instrumentation: The instrumentation to be set.
+        :return: The service instance.
+        """
+        self._instrumentation = instrumentation
+        self._update_request_handler()
+
+        return self
+
+    def get_instrumentation(self) -> Instrumentation:
+        """
+        Get the instrumentation, to register sinks such as a CallbackSink, a HistogramSink or a PrometheusSink.
+
+        :return: The instrumentation.
+        :rtype: Instrumentation
+        """
+        return self._instrumentation
+
+    def set_tracer(self, tracer: Optional[Tracer]):
+        """
+        Enables tracing with the given tracer, or disables it when None is given.
+        Every attempt is recorded as a client span and propagated with a traceparent header.
+
+        :param Optional[Tracer] tracer: The tracer to be set.
+        :return: The service instance.
+        """
+        self._tracer = tracer
+        self._update_request_handler()
+
+        return self
+
+    def _start_span(
+        self, name: str, **attributes: Any
+    ) -> ContextManager[Optional[Span]]:
+        """
+        Run a block within a span of the service tracer, if tracing is enabled.
+
+        :param str name: The name of the operation.
+        :return: A context manager yielding the span, or None when tracing is disabled.
+        :rtype: ContextManager[Optional[Span]]
+        """
+        if self._tracer is None:
+            return nullcontext()
+        return self._tracer.start_span(name, attributes=attributes)
+
     def set_base_url(self, base_url: str):
         """
         Sets the base URL for the service.
@@ -81,6 +443,7 @@ def send_request(self, request: Request) -> Tuple[Dict, int, str]:
         :return: The response data.
         :rtype: Tuple[Dict, int, str]
         """
+        self._apply_deadline(request)
         response = self._request_handler.send(request)
         return (
             response.body,
@@ -88,6 +451,23 @@ def send_request(self, request: Request) -> Tuple[Dict, int, str]:
             response.headers.get("Content-Type", "").lower(),
         )
 
+    async def send_request_async(self, request: Request) -> Tuple[Dict, int, str]:
+        """
+        Sends the given request from a coroutine, without blocking the event loop while
+        the handlers that support it wait.
+
+        :param Request request: The request to be sent.
+        :return: The response data.
+        :rtype: Tuple[Dict, int, str]
+        """
+        self._apply_deadline(request)
+        response = await self._request_handler.send_async(request)
+        return (
+            response.body,
+            response.status,
+            response.headers.get("Content-Type", "").lower(),
+        )
+
     def stream_request(self, request: Request) -> Generator[Dict, None, None]:
         """
         Streams the given request.
@@ -96,6 +476,7 @@ def stream_request(self, request: Request) -> Generator[Dict, None, None]:
         :return: A generator of the response data.
         :rtype: Generator[Dict, None, None]
         """
+        self._apply_deadline(request)
         for response in self._request_handler.stream(request):
             yield (
                 response.body,
@@ -119,12 +500,70 @@ def _get_request_handler(self) -> RequestChain:
         :return: The request chain.
         :rtype: RequestChain
         """
-        return (
-            RequestChain()
-            .add_handler(RetryHandler())
-            .add_handler(HttpHandler(self._timeout))
+        request_chain = RequestChain()
+
+        if self._coalesce_requests:
+            request_chain.add_handler(CoalescingHandler(self._coalescing_result_ttl))
+
+        if self._response_cache is not None:
+            request_chain.add_handler(CacheHandler(self._response_cache))
+
+        request_chain.add_handler(
+            RetryHandler(self._retry_policy, self._retry_budget, self._retry_metrics)
         )
 
+        if self._hedging_policy is not None:
+            # Kept across chains, so the service holds a single thread pool for the attempts
+            if self._hedging_handler is None:
+                self._hedging_handler = HedgingHandler(
+                    self._hedging_policy, self._retry_budget, self._latency_tracker
+                )
+            request_chain.add_handler(self._hedging_handler)
+
+        if self._rate_limits:
+            request_chain.add_handler(
+                RateLimitHandler(self._rate_limits, self._rate_limit_backend)
+            )
+
+        if self._concurrency_limiters is not None:
+            request_chain.add_handler(ConcurrencyHandler(self._concurrency_limiters))
+
+        if self._tracer is not None:
+            request_chain.add_handler(TracingHandler(self._tracer))
+
+        request_chain.add_handler(InstrumentationHandler(self._instrumentation))
+
+        return request_chain.add_handler(
+            HttpHandler(
+                self._timeout,
+                self._connect_timeout,
+                self._compression_threshold,
+                self._spill_threshold,
+                self._transport,
+                self._bandwidth_limiter,
+                self._bandwidth_priority,
+                self._async_transport,
+            )
+        )
+
+    def _apply_deadline(self, request: Request) -> None:
+        """
+        Attach the deadline of the enclosing deadline scope to the request.
+
+        :param Request request: The request to be sent.
+        """
+        deadline = current_deadline()
+        if deadline is not None:
+            request.set_deadline(deadline.earliest(request.deadline))
+
+    def _close_hedging_handler(self) -> None:
+        """
+        Close the hedging handler, so the next chain gets one with the current settings.
+        """
+        if self._hedging_handler is not None:
+            self._hedging_handler.close()
+            self._hedging_handler = None
+
     def _update_request_handler(self) -> None:
         """
         Update the request handler.
@@ -0,0 +1,231 @@
+import hashlib
+import re
+import threading
+
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+try:
+    from crc32c import crc32c as _crc32c
+except ImportError:  # pragma: no cover - optional dependency
+    _crc32c = None
+
+
+class ChecksumAlgorithm(Enum):
+    MD5 = "md5"
+    SHA256 = "sha256"
+    CRC32C = "crc32c"
+
+
+class ChecksumMismatchError(ValueError):
+    """
+    Raised when the ETag returned for an uploaded part does not match the MD5 digest of the data sent.
+    """
+
+
+def crc32c(data: bytes, crc: int = 0) -> int:
+    """
+    Compute the CRC32C (Castagnoli) checksum of data with the crc32c package.
+
+    :param bytes data: The data.
+    :param int crc: The checksum of the preceding data, to continue it.
+    :return: The checksum.
+    :rtype: int
+    :raises ImportError: If the crc32c package is not installed.
+    """
+    _require_crc32c()
+    return _crc32c(data, crc)
+
+
+def _require_crc32c() -> None:
+    """
+    Check that the crc32c package is installed.
+
+    :raises ImportError: If it is not installed.
+    """
+    if _crc32c is None:
+        raise ImportError(
+            "crc32c is required to compute CRC32C checksums, install the crc32c extra:"
+            " pip install 'salad-cloud-transcription-sdk[crc32c]'."
+        )
+
+
+def digest(data: bytes, algorithm: ChecksumAlgorithm) -> str:
+    """
+    Compute the digest of data.
+
+    :param bytes data: The data.
+    :param ChecksumAlgorithm algorithm: The algorithm.
+    :return: The hexadecimal digest.
+    :rtype: str
+    """
+    if algorithm == ChecksumAlgorithm.MD5:
+        return hashlib.md5(data).hexdigest()
+    if algorithm == ChecksumAlgorithm.SHA256:
+        return hashlib.sha256(data).hexdigest()
+    return f"{crc32c(data):08x}"
+
+
+class _Crc32cHasher:
+    """
+    A running CRC32C checksum, with the interface of the hashlib objects.
+    """
+
+    def __init__(self):
+        self._crc = 0
+
+    def update(self, data: bytes) -> None:
+        self._crc = crc32c(data, self._crc)
+
+    def hexdigest(self) -> str:
+        return f"{self._crc:08x}"
+
+
+def _new_hasher(algorithm: ChecksumAlgorithm) -> Any:
+    """
+    Create a running digest.
+
+    :param ChecksumAlgorithm algorithm: The algorithm.
+    :return: An object with update and hexdigest methods.
+    :rtype: Any
+    """
+    if algorithm == ChecksumAlgorithm.MD5:
+        return hashlib.md5()
+    if algorithm == ChecksumAlgorithm.SHA256:
+        return hashlib.sha256()
+    return _Crc32cHasher()
+
+
+class UploadChecksums:
+    """
+    The checksums of an upload, computed while the data is read to be sent.
+
+    The digests of the whole content are the ones of a single pass over it, whatever the
+    part size, so they replace a checksum computed before the upload. Parts read
+    concurrently are hashed in offset order: a part read before the previous one is held
+    until that one is read, and parts read again for a retry are hashed once.
+
+    :ivar FrozenSet[ChecksumAlgorithm] algorithms: The algorithms computed.
+    :ivar Dict[int, Dict[str, str]] parts: The hexadecimal digests of each part, by part number and algorithm name.
+    """
+
+    def __init__(self, algorithms: Iterable[ChecksumAlgorithm]):
+        """
+        Initialize a new instance of UploadChecksums.
+
+        :param Iterable[ChecksumAlgorithm] algorithms: The algorithms to compute.
+        :raises ImportError: If CRC32C is requested and the crc32c package is not installed.
+        """
+        self.algorithms = frozenset(algorithms)
+        if ChecksumAlgorithm.CRC32C in self.algorithms:
+            _require_crc32c()
+        self.parts: Dict[int, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self._hashers = {
+            algorithm: _new_hasher(algorithm) for algorithm in self.algorithms
+        }
+        self._hashers_lock = threading.Lock()
+        self._next_part = 1
+        self._early_parts: Dict[int, bytes] = {}
+
+    def add_part(self, part_number: int, data: bytes) -> Dict[str, str]:
+        """
+        Compute the digests of a part. A part read again for a retry replaces its digests.
+
+        :param int part_number: The number of the part, from 1.
+        :param bytes data: The data of the part.
+        :return: The hexadecimal digests of the part by algorithm name.
+        :rtype: Dict[str, str]
+        """
+        digests = {
+            algorithm.value: digest(data, algorithm) for algorithm in self.algorithms
+        }
+        with self._lock:
+            self.parts[part_number] = digests
+        self._hash_in_order(part_number, data)
+        return digests
+
+    def _hash_in_order(self, part_number: int, data: bytes) -> None:
+        """
+        Add a part to the digests of the whole content, once every previous part is added.
+
+        :param int part_number: The number of the part, from 1.
+        :param bytes data: The data of the part.
+        """
+        with self._hashers_lock:
+            if part_number < self._next_part or part_number in self._early_parts:
+                return
+
+            self._early_parts[part_number] = data
+            while self._next_part in self._early_parts:
+                part = self._early_parts.pop(self._next_part)
+                for hasher in self._hashers.values():
+                    hasher.update(part)
+                self._next_part += 1
+
+    def part_reader(self, part_number: int) -> Callable[[bytes], None]:
+        """
+        Get a function computing the digests of a part from its data.
+
+        :param int part_number: The number of the part, from 1.
+        :return: The function, to be called with the data each time the part is read.
+        :rtype: Callable[[bytes], None]
+        """
+        return lambda data: self.add_part(part_number, data)
+
+    def verify_etag(self, part_number: int, etag: Optional[str]) -> None:
+        """
+        Check the ETag returned for a part against the MD5 digest of its data.
+        ETags that are not a plain MD5 digest, such as composite ones, are not checked.
+
+        :param int part_number: The number of the part, from 1.
+        :param Optional[str] etag: The ETag returned by the storage service.
+        :raises ChecksumMismatchError: If the ETag differs from the digest.
+        """
+        etag = (etag or "").strip().strip('"').lower()
+        with self._lock:
+            expected = self.parts.get(part_number, {}).get(ChecksumAlgorithm.MD5.value)
+        if expected is None or not re.fullmatch(r"[0-9a-f]{32}", etag):
+            return
+        if etag != expected:
+            raise ChecksumMismatchError(
+                f"The ETag of part {part_number} is {etag}, expected {expected}"
+            )
+
+    def to_dict(self) -> Dict[str, str]:
+        """
+        Get the checksums of the whole upload.
+
+        :return: The hexadecimal digests of the whole content by algorithm name.
+        :rtype: Dict[str, str]
+        """
+        with self._hashers_lock:
+            return {
+                algorithm.value: hasher.hexdigest()
+                for algorithm, hasher in self._hashers.items()
+            }
+
+
+def parse_algorithms(
+    algorithms: Iterable[Union[ChecksumAlgorithm, str]],
+) -> frozenset:
+    """
+    Convert algorithm names to algorithms.
+
+    :param Iterable[Union[ChecksumAlgorithm, str]] algorithms: The algorithms or their names, such as "sha256".
+    :return: The algorithms.
+    :rtype: FrozenSet[ChecksumAlgorithm]
+    :raises ValueError: If an algorithm is not supported.
+    :raises ImportError: If CRC32C is requested and the crc32c package is not installed.
+    """
+    algorithms = frozenset(
+        (
+            algorithm
+            if isinstance(algorithm, ChecksumAlgorithm)
+            else ChecksumAlgorithm(algorithm.lower())
+        )
+        for algorithm in algorithms
+    )
+    if ChecksumAlgorithm.CRC32C in algorithms:
+        _require_crc32c()
+    return algorithms
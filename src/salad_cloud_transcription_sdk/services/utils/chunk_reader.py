@@ -0,0 +1,82 @@
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
+
+UploadSource = Union[BinaryIO, bytes, bytearray, memoryview, Iterable[bytes]]
+
+
+class ChunkReader:
+    """
+    Reads chunks of an exact size from a file-like object, a bytes-like object or an
+    iterator of bytes, such as a pipe, an HTTP response or the output of a process.
+    Short reads of the source are completed, so every chunk but the last has the requested size.
+    """
+
+    def __init__(self, source: UploadSource):
+        """
+        Initialize a new instance of ChunkReader.
+
+        :param UploadSource source: The file-like object, opened in binary mode, the bytes or the iterator of bytes.
+        :raises TypeError: If the source is not readable as bytes.
+        """
+        self._file: Optional[BinaryIO] = None
+        self._chunks: Optional[Iterator[bytes]] = None
+        self._pending = b""
+
+        if hasattr(source, "read"):
+            self._file = source
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self._chunks = iter([bytes(source)])
+        elif isinstance(source, str):
+            raise TypeError("Streams must be read as bytes, not text.")
+        else:
+            self._chunks = iter(source)
+
+    def read(self, size: int) -> bytes:
+        """
+        Read the next chunk.
+
+        :param int size: The size of the chunk in bytes.
+        :return: The chunk, shorter than the size only at the end of the source, empty once it is exhausted.
+        :rtype: bytes
+        """
+        buffer = bytearray(self._pending[:size])
+        self._pending = self._pending[size:]
+
+        while len(buffer) < size:
+            data = self._read_source(size - len(buffer))
+            if not data:
+                break
+            if isinstance(data, str):
+                raise TypeError("Streams must be read as bytes, not text.")
+
+            missing = size - len(buffer)
+            buffer += data[:missing]
+            self._pending = bytes(data[missing:])
+
+        return bytes(buffer)
+
+    def at_end(self) -> bool:
+        """
+        Check whether the source is exhausted, reading ahead at most one chunk of the source.
+
+        :return: True if no data is left.
+        :rtype: bool
+        """
+        if not self._pending:
+            self._pending = bytes(self._read_source(1))
+        return not self._pending
+
+    def _read_source(self, size: int) -> bytes:
+        """
+        Read from the source, at most the given size for file-like objects.
+
+        :param int size: The amount of bytes still needed.
+        :return: The data read, empty at the end of the source.
+        :rtype: bytes
+        """
+        if self._file is not None:
+            return self._file.read(size)
+        # Iterators may yield empty chunks before their end
+        for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
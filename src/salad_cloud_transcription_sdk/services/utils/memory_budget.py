@@ -0,0 +1,183 @@
+import asyncio
+import threading
+
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Generator, Optional, Set
+from time import monotonic
+
+from .part_sizer import MIB
+
+# The range of intervals coroutines poll the budget at, in seconds
+ASYNC_POLL_INTERVAL = 0.005
+MAX_ASYNC_POLL_INTERVAL = 0.1
+
+
+class MemoryBudget:
+    """
+    A process-wide budget of bytes held in memory by uploads.
+    Workers acquire the size of a part before reading it and release it once the part
+    is sent, so the memory held by concurrent uploads stays under the capacity whatever
+    their amount. Waiters are served in arrival order, so large parts are not starved.
+
+    :ivar int capacity: The amount of bytes that may be held at the same time.
+    """
+
+    def __init__(self, capacity: int = 512 * MIB):
+        """
+        Initialize a new instance of MemoryBudget.
+
+        :param int capacity: The amount of bytes that may be held at the same time.
+        """
+        if capacity <= 0:
+            raise ValueError("The memory budget must be positive.")
+
+        self.capacity = capacity
+        self._in_use = 0
+        self._next_ticket = 0
+        self._serving = 0
+        self._abandoned: Set[int] = set()
+        self._condition = threading.Condition()
+
+    @property
+    def in_use(self) -> int:
+        """The amount of bytes currently acquired."""
+        with self._condition:
+            return self._in_use
+
+    def acquire(self, size: int, timeout: Optional[float] = None) -> bool:
+        """
+        Acquire bytes from the budget, waiting until they are available.
+        Sizes above the capacity are clamped to it, so that a single oversized part
+        can still proceed once it holds the whole budget.
+
+        :param int size: The amount of bytes.
+        :param Optional[float] timeout: The maximum time to wait in seconds, None to wait indefinitely.
+        :return: True if the bytes were acquired, False if the timeout expired.
+        :rtype: bool
+        """
+        size = min(max(size, 0), self.capacity)
+        end = None if timeout is None else monotonic() + timeout
+
+        with self._condition:
+            ticket = self._take_ticket()
+            try:
+                while not self._can_acquire(ticket, size):
+                    remaining = None if end is None else end - monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+
+                self._in_use += size
+                return True
+            finally:
+                self._leave(ticket)
+
+    async def acquire_async(self, size: int) -> None:
+        """
+        Acquire bytes from the budget from a coroutine, waiting until they are available
+        without blocking the event loop. The caller keeps its place in the arrival order
+        while it waits, and gives it up if it is cancelled.
+
+        :param int size: The amount of bytes, clamped to the capacity.
+        """
+        size = min(max(size, 0), self.capacity)
+        interval = ASYNC_POLL_INTERVAL
+
+        with self._condition:
+            ticket = self._take_ticket()
+        try:
+            while True:
+                with self._condition:
+                    if self._can_acquire(ticket, size):
+                        self._in_use += size
+                        return
+                await asyncio.sleep(interval)
+                interval = min(interval * 2, MAX_ASYNC_POLL_INTERVAL)
+        finally:
+            with self._condition:
+                self._leave(ticket)
+
+    def release(self, size: int) -> None:
+        """
+        Return bytes to the budget.
+
+        :param int size: The amount of bytes, as given to acquire.
+        """
+        size = min(max(size, 0), self.capacity)
+        with self._condition:
+            self._in_use = max(0, self._in_use - size)
+            self._condition.notify_all()
+
+    @contextmanager
+    def reserve(self, size: int) -> Generator[None, None, None]:
+        """
+        Hold bytes from the budget for the duration of the context.
+
+        :param int size: The amount of bytes.
+        """
+        self.acquire(size)
+        try:
+            yield
+        finally:
+            self.release(size)
+
+    @asynccontextmanager
+    async def reserve_async(self, size: int) -> AsyncIterator[None]:
+        """
+        Hold bytes from the budget for the duration of the context, from a coroutine.
+
+        :param int size: The amount of bytes.
+        """
+        await self.acquire_async(size)
+        try:
+            yield
+        finally:
+            self.release(size)
+
+    def _take_ticket(self) -> int:
+        """
+        Take the next place in the arrival order. Must be called with the lock held.
+
+        :return: The ticket.
+        :rtype: int
+        """
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        return ticket
+
+    def _can_acquire(self, ticket: int, size: int) -> bool:
+        """
+        Check whether it is the turn of a ticket and its bytes fit. Must be called with the lock held.
+
+        :param int ticket: The ticket of the waiter.
+        :param int size: The amount of bytes.
+        :return: True if the bytes may be acquired.
+        :rtype: bool
+        """
+        return ticket == self._serving and self._in_use + size <= self.capacity
+
+    def _leave(self, ticket: int) -> None:
+        """
+        Give the turn to the next waiter once a waiter acquired its bytes or gave up.
+        Must be called with the lock held.
+
+        :param int ticket: The ticket of the waiter.
+        """
+        if ticket == self._serving:
+            self._serving += 1
+        else:
+            # Skip the ticket of a waiter giving up once its turn comes
+            self._abandoned.add(ticket)
+        self._skip_abandoned()
+        self._condition.notify_all()
+
+    def _skip_abandoned(self) -> None:
+        """
+        Move the turn past the tickets of waiters that timed out.
+        """
+        while self._serving in self._abandoned:
+            self._abandoned.remove(self._serving)
+            self._serving += 1
+
+
+default_memory_budget = MemoryBudget()
@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+import time
+
+from typing import Dict, List, Optional
+
+from ...models.multipart_upload import MultipartUpload
+
+
+class MultipartUploadRegistry:
+    """
+    Records the multipart uploads in progress, so the ones left behind can be aborted.
+
+    Storage does not list the multipart uploads in progress, so the uploads are recorded
+    when they are created and forgotten once they are completed or aborted. An upload
+    whose abort failed, or whose process died, stays recorded until it is swept. With a
+    path, the records are kept in a JSON file rewritten on each change, so the next run
+    of a process sweeps the uploads of the previous one. A file must not be shared by
+    processes running at the same time.
+
+    :ivar Optional[str] path: The JSON file the uploads are kept in, None to keep them in memory.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize a new instance of MultipartUploadRegistry.
+
+        :param Optional[str] path: The JSON file the uploads are kept in, loaded if it exists, None to keep them in memory.
+        """
+        self.path = path
+        self._uploads: Dict[str, MultipartUpload] = {}
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                for upload in json.load(file):
+                    upload = MultipartUpload(**upload)
+                    self._uploads[upload.upload_id] = upload
+
+    def add(self, organization_name: str, filename: str, upload_id: str) -> None:
+        """
+        Record a created multipart upload.
+
+        :param str organization_name: The organization the file is uploaded to.
+        :param str filename: The name of the file in storage.
+        :param str upload_id: The ID of the upload.
+        """
+        with self._lock:
+            self._uploads[upload_id] = MultipartUpload(
+                organization_name, filename, upload_id, time.time()
+            )
+            self._save()
+
+    def remove(self, upload_id: str) -> None:
+        """
+        Forget a multipart upload that was completed or aborted.
+
+        :param str upload_id: The ID of the upload.
+        """
+        with self._lock:
+            if self._uploads.pop(upload_id, None) is not None:
+                self._save()
+
+    def list(
+        self,
+        organization_name: Optional[str] = None,
+        older_than: Optional[float] = None,
+    ) -> List[MultipartUpload]:
+        """
+        Get the recorded multipart uploads, oldest first.
+
+        :param Optional[str] organization_name: Only the uploads of this organization, all if None.
+        :param Optional[float] older_than: Only the uploads created more than this many seconds ago, all if None.
+        :return: The uploads.
+        :rtype: List[MultipartUpload]
+        """
+        now = time.time()
+        with self._lock:
+            uploads = [
+                upload
+                for upload in self._uploads.values()
+                if (
+                    organization_name is None
+                    or upload.organization_name == organization_name
+                )
+                and (older_than is None or now - upload.created_at > older_than)
+            ]
+        return sorted(uploads, key=lambda upload: upload.created_at)
+
+    def _save(self) -> None:
+        """
+        Write the uploads to the file, replacing it at once. Must be called with the lock held.
+        """
+        if self.path is None:
+            return
+
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump([upload.to_dict() for upload in self._uploads.values()], file)
+        os.replace(temporary_path, self.path)
+
+
+default_multipart_registry = MultipartUploadRegistry()
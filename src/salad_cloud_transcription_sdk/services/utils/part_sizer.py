@@ -0,0 +1,141 @@
+import math
+import threading
+
+from typing import Optional
+
+MIB = 1024 * 1024
+
+
+class PartSizer:
+    """
+    Chooses the size of multipart upload parts from the size of the file, the upload
+    throughput measured on previous parts and a memory budget.
+
+    Each part is sized to take about the target duration at the measured throughput,
+    so parts shrink on slow links, where a retry then resends less, and grow on fast
+    links, where fewer parts mean less per-request overhead. Failed parts shrink the
+    following ones further. The measurements are kept across uploads, so a sizer
+    shared by the uploads of a process keeps tuning itself.
+
+    :ivar int min_part_size: The smallest part size in bytes, every part but the last is at least this large.
+    :ivar int max_part_size: The largest part size in bytes.
+    :ivar int initial_part_size: The part size used before any throughput was measured.
+    :ivar float target_part_duration: The time in seconds each part upload should take.
+    :ivar int memory_budget: The bytes the parts uploaded concurrently may hold in memory.
+    :ivar int max_parts: The maximum amount of parts of an upload.
+    :ivar float smoothing: The weight of a new measurement in the moving averages, between 0 and 1.
+    """
+
+    def __init__(
+        self,
+        min_part_size: int = 5 * MIB,
+        max_part_size: int = 256 * MIB,
+        initial_part_size: int = 16 * MIB,
+        target_part_duration: float = 20.0,
+        memory_budget: int = 512 * MIB,
+        max_parts: int = 10000,
+        smoothing: float = 0.3,
+    ):
+        """
+        Initialize a new instance of PartSizer.
+
+        :param int min_part_size: The smallest part size in bytes, every part but the last is at least this large.
+        :param int max_part_size: The largest part size in bytes.
+        :param int initial_part_size: The part size used before any throughput was measured.
+        :param float target_part_duration: The time in seconds each part upload should take.
+        :param int memory_budget: The bytes the parts uploaded concurrently may hold in memory.
+        :param int max_parts: The maximum amount of parts of an upload.
+        :param float smoothing: The weight of a new measurement in the moving averages, between 0 and 1.
+        """
+        if not 0 < min_part_size <= max_part_size:
+            raise ValueError(
+                "The minimum part size must be positive and at most the maximum part size."
+            )
+        if not 0 < smoothing <= 1:
+            raise ValueError("The smoothing factor must be between 0 and 1.")
+
+        self.min_part_size = min_part_size
+        self.max_part_size = max_part_size
+        self.initial_part_size = initial_part_size
+        self.target_part_duration = target_part_duration
+        self.memory_budget = memory_budget
+        self.max_parts = max_parts
+        self.smoothing = smoothing
+        self._throughput: Optional[float] = None
+        self._failure_rate = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """The moving average of the upload throughput of a part in bytes per second, None before the first measurement."""
+        with self._lock:
+            return self._throughput
+
+    @property
+    def failure_rate(self) -> float:
+        """The moving average of the share of part uploads that failed."""
+        with self._lock:
+            return self._failure_rate
+
+    def record(self, size: int, duration: float, success: bool = True) -> None:
+        """
+        Record the upload of a part. The duration includes the retries of the part, so
+        lossy links also lower the measured throughput.
+
+        :param int size: The size of the part in bytes.
+        :param float duration: The time the upload took in seconds.
+        :param bool success: Whether the part was uploaded.
+        """
+        with self._lock:
+            self._failure_rate += self.smoothing * (
+                (0.0 if success else 1.0) - self._failure_rate
+            )
+            if not success or duration <= 0 or size <= 0:
+                return
+
+            throughput = size / duration
+            if self._throughput is None:
+                self._throughput = throughput
+            else:
+                self._throughput += self.smoothing * (throughput - self._throughput)
+
+    def part_size(self, file_size: int, concurrency: int = 1) -> int:
+        """
+        Choose the part size for a file.
+
+        :param int file_size: The size of the file in bytes.
+        :param int concurrency: The amount of parts uploaded at the same time.
+        :return: The part size in bytes, a multiple of 1 MiB unless the whole file fits in one part.
+        :rtype: int
+        """
+        with self._lock:
+            throughput = self._throughput
+            failure_rate = self._failure_rate
+
+        if throughput is None:
+            size = float(self.initial_part_size)
+        else:
+            size = throughput * self.target_part_duration
+        # Halve the parts when every other upload fails
+        size *= max(0.25, 1.0 - failure_rate)
+
+        size = min(size, self.memory_budget / max(1, concurrency), self.max_part_size)
+        # Parts never go under the minimum, nor above the maximum amount of parts
+        size = max(size, self.min_part_size, math.ceil(file_size / self.max_parts))
+        size = int(math.ceil(size / MIB)) * MIB
+
+        return max(1, min(size, file_size))
+
+    def part_count(self, file_size: int, part_size: int) -> int:
+        """
+        Get the amount of parts a file is split into.
+
+        :param int file_size: The size of the file in bytes.
+        :param int part_size: The part size in bytes.
+        :return: The amount of parts.
+        :rtype: int
+        """
+        return max(1, math.ceil(file_size / part_size))
+
+
+default_part_sizer = PartSizer()
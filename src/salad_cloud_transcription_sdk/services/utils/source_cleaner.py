@@ -0,0 +1,227 @@
+import atexit
+import heapq
+import threading
+import time
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+from ...net.transport.request_error import RequestError
+
+# Keys of the job metadata recording the uploaded source of a job and how long to keep it
+SOURCE_METADATA_KEY = "sdk_uploaded_source"
+KEEP_SOURCE_FOR_METADATA_KEY = "sdk_keep_source_for"
+
+
+class SourceCleaner:
+    """
+    Deletes the source files uploaded for transcription jobs, in the background.
+
+    Deletions are queued with the time they are due, and a worker thread sends the due
+    ones in batches of concurrent requests, so the calls queuing them never wait for
+    storage. A file is queued once, however many times the end of its job is observed.
+    Deletions are kept in memory: at exit, the process waits a while for the due ones,
+    and the ones kept for later are lost, queued again if a later process observes the
+    ended jobs.
+
+    :ivar int batch_size: The maximum amount of files deleted by a batch.
+    :ivar int concurrency: The amount of deletions of a batch sent at the same time.
+    :ivar Optional[float] exit_timeout: The maximum time in seconds the process waits at exit for the due deletions.
+    :ivar int deleted: The amount of files deleted.
+    :ivar int failed: The amount of deletions that failed.
+    """
+
+    def __init__(
+        self,
+        delete_file: Callable[[str, str], Any],
+        batch_size: int = 100,
+        concurrency: int = 4,
+        remembered: int = 10000,
+        exit_timeout: Optional[float] = 10,
+    ):
+        """
+        Initialize a new instance of SourceCleaner.
+
+        :param Callable[[str, str], Any] delete_file: The function deleting a file, given the organization name and the filename.
+        :param int batch_size: The maximum amount of files deleted by a batch.
+        :param int concurrency: The amount of deletions of a batch sent at the same time.
+        :param int remembered: The amount of queued or deleted files remembered, so they are not queued again.
+        :param Optional[float] exit_timeout: The maximum time in seconds the process waits at exit for the due deletions, 0 to not wait, None to wait until they are done.
+        """
+        if batch_size <= 0 or concurrency <= 0:
+            raise ValueError("The batch size and the concurrency must be positive.")
+
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.exit_timeout = exit_timeout
+        self.deleted = 0
+        self.failed = 0
+        self._delete_file = delete_file
+        self._remembered = remembered
+        self._queue: List[Tuple[float, str, str]] = []
+        self._known: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+        self._in_flight = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> int:
+        """The amount of files waiting to be deleted, or being deleted."""
+        with self._condition:
+            return len(self._queue) + self._in_flight
+
+    def schedule(
+        self,
+        organization_name: str,
+        filename: str,
+        delete_at: Optional[float] = None,
+    ) -> bool:
+        """
+        Queue the deletion of a file.
+
+        :param str organization_name: The organization the file belongs to.
+        :param str filename: The name of the file in storage.
+        :param Optional[float] delete_at: When to delete the file, in seconds since the epoch, as soon as possible if None.
+        :return: True if the file was queued, False if it was already queued or deleted.
+        :rtype: bool
+        """
+        key = (organization_name, filename)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The source cleaner is closed.")
+            if key in self._known:
+                return False
+
+            self._known[key] = None
+            while len(self._known) > self._remembered:
+                self._known.popitem(last=False)
+            heapq.heappush(
+                self._queue,
+                (
+                    delete_at if delete_at is not None else 0.0,
+                    organization_name,
+                    filename,
+                ),
+            )
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="salad-source-cleaner", daemon=True
+                )
+                self._worker.start()
+                atexit.register(self._flush_at_exit)
+            self._condition.notify_all()
+            return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the files that are due are deleted. Files kept for later are left queued.
+
+        :param Optional[float] timeout: The maximum time to wait in seconds, None to wait indefinitely.
+        :return: True if no due file is left, False if the timeout expired.
+        :rtype: bool
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._in_flight == 0 and not self._has_due(time.time()),
+                timeout,
+            )
+
+    def close(self) -> None:
+        """
+        Stop the worker once the due files are deleted. Files kept for later are dropped.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._worker is not None:
+            self._worker.join()
+            atexit.unregister(self._flush_at_exit)
+
+    def _flush_at_exit(self) -> None:
+        """
+        Wait for the due deletions when the process exits, up to the exit timeout.
+        """
+        if self.exit_timeout is None or self.exit_timeout > 0:
+            self.flush(self.exit_timeout)
+
+    def _has_due(self, now: float) -> bool:
+        """
+        Check whether a queued file is due. Must be called with the lock held.
+
+        :param float now: The current time in seconds since the epoch.
+        :return: True if the first queued file is due.
+        :rtype: bool
+        """
+        return bool(self._queue) and self._queue[0][0] <= now
+
+    def _run(self) -> None:
+        """
+        Delete the due files in batches, until the cleaner is closed.
+        """
+        while True:
+            with self._condition:
+                while not self._has_due(time.time()):
+                    if self._closed:
+                        return
+                    timeout = (
+                        min(self._queue[0][0] - time.time(), threading.TIMEOUT_MAX)
+                        if self._queue
+                        else None
+                    )
+                    self._condition.wait(timeout)
+
+                batch = []
+                while len(batch) < self.batch_size and self._has_due(time.time()):
+                    _, organization_name, filename = heapq.heappop(self._queue)
+                    batch.append((organization_name, filename))
+                self._in_flight = len(batch)
+
+            try:
+                self._delete_batch(batch)
+            finally:
+                with self._condition:
+                    self._in_flight = 0
+                    self._condition.notify_all()
+
+    def _delete_batch(self, batch: List[Tuple[str, str]]) -> None:
+        """
+        Delete a batch of files concurrently.
+
+        :param List[Tuple[str, str]] batch: The organization names and filenames.
+        """
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(self.concurrency, len(batch)),
+                thread_name_prefix="salad-source-cleaner",
+            ) as executor:
+                outcomes = list(executor.map(self._delete, batch))
+        except RuntimeError:
+            # The process is exiting and no longer starts threads, delete one at a time
+            outcomes = [self._delete(file) for file in batch]
+
+        with self._condition:
+            for (organization_name, filename), deleted in zip(batch, outcomes):
+                if deleted:
+                    self.deleted += 1
+                else:
+                    self.failed += 1
+                    # Let a later observation of the job queue the file again
+                    self._known.pop((organization_name, filename), None)
+
+    def _delete(self, file: Tuple[str, str]) -> bool:
+        """
+        Delete a file.
+
+        :param Tuple[str, str] file: The organization name and the filename.
+        :return: True if the file was deleted or was already gone.
+        :rtype: bool
+        """
+        try:
+            self._delete_file(*file)
+        except RequestError as error:
+            return error.status == 404
+        except Exception:
+            return False
+        return True
@@ -0,0 +1,187 @@
+import threading
+
+from collections import deque
+from time import monotonic
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from ...models.upload_progress import UploadProgress
+
+UploadProgressCallback = Callable[[UploadProgress], None]
+
+
+class UploadProgressTracker:
+    """
+    Tracks the bytes sent by an upload and reports its progress to a callback.
+
+    The bytes of a part in flight are counted as its body is streamed, and are dropped
+    when a retry sends the part again, so the progress may go back after a failure.
+    Progress is reported at most every interval as bytes are sent, on each completed
+    part, and as a heartbeat while the upload is in progress, so a stalled upload is
+    noticed from its throughput falling to 0.
+
+    :ivar str filename: The name of the uploaded file.
+    :ivar Optional[int] total_bytes: The size of the file in bytes, None if unknown.
+    :ivar Optional[int] total_parts: The amount of parts of the upload, None if unknown.
+    :ivar float interval: The minimum time in seconds between two reports, and the period of the heartbeat, which is disabled by 0.
+    :ivar float window: The time in seconds the instantaneous throughput is measured over.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        callback: UploadProgressCallback,
+        total_bytes: Optional[int] = None,
+        total_parts: Optional[int] = None,
+        interval: float = 0.5,
+        window: float = 5.0,
+    ):
+        """
+        Initialize a new instance of UploadProgressTracker.
+
+        :param str filename: The name of the uploaded file.
+        :param UploadProgressCallback callback: The function called with the progress, from the threads sending the upload.
+        :param Optional[int] total_bytes: The size of the file in bytes, None if unknown.
+        :param Optional[int] total_parts: The amount of parts of the upload, None if unknown.
+        :param float interval: The minimum time in seconds between two reports, and the period of the heartbeat.
+        :param float window: The time in seconds the instantaneous throughput is measured over.
+        """
+        self.filename = filename
+        self.total_bytes = total_bytes
+        self.total_parts = total_parts
+        self.interval = interval
+        self.window = window
+        self._callback = callback
+        self._completed_bytes = 0
+        self._parts_completed = 0
+        self._in_flight: Dict[int, int] = {}
+        self._samples: Deque[Tuple[float, int]] = deque()
+        self._started_at = monotonic()
+        self._reported_at = 0.0
+        self._lock = threading.Lock()
+        self._report_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "UploadProgressTracker":
+        self._started_at = monotonic()
+        if self.interval > 0:
+            self._heartbeat = threading.Thread(
+                target=self._beat, name="salad-upload-progress", daemon=True
+            )
+            self._heartbeat.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._stopped.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+        self._report(done=True, failed=exc_type is not None)
+
+    def part_reporter(self, part_number: int, size: int) -> Callable[[int, int], None]:
+        """
+        Get a function recording the bytes of a part sent so far, to be called as its body is streamed.
+
+        :param int part_number: The number of the part, from 1.
+        :param int size: The size of the data of the part in bytes.
+        :return: The function, called with the bytes of the body sent and the size of the body, which includes the encoding overhead.
+        :rtype: Callable[[int, int], None]
+        """
+
+        def report(sent: int, body_size: int) -> None:
+            with self._lock:
+                self._in_flight[part_number] = (
+                    size * sent // body_size if body_size else size
+                )
+            self._report()
+
+        return report
+
+    def complete_part(self, part_number: int, size: int) -> None:
+        """
+        Record an uploaded part.
+
+        :param int part_number: The number of the part, from 1.
+        :param int size: The size of the data of the part in bytes.
+        """
+        with self._lock:
+            self._in_flight.pop(part_number, None)
+            self._completed_bytes += size
+            self._parts_completed += 1
+        self._report(force=True)
+
+    def snapshot(self, done: bool = False, failed: bool = False) -> UploadProgress:
+        """
+        Get the current progress.
+
+        :param bool done: Whether the upload ended.
+        :param bool failed: Whether the upload ended with an error.
+        :return: The progress.
+        :rtype: UploadProgress
+        """
+        now = monotonic()
+        with self._lock:
+            bytes_sent = self._completed_bytes + sum(self._in_flight.values())
+            parts_completed = self._parts_completed
+            self._samples.append((now, bytes_sent))
+            while len(self._samples) > 2 and now - self._samples[1][0] >= self.window:
+                self._samples.popleft()
+            sampled_at, sampled_bytes = self._samples[0]
+
+        elapsed = now - self._started_at
+        throughput = (
+            max(0, bytes_sent - sampled_bytes) / (now - sampled_at)
+            if now > sampled_at
+            else None
+        )
+        average_throughput = bytes_sent / elapsed if elapsed > 0 else None
+
+        eta = None
+        if done:
+            eta = 0.0
+        elif self.total_bytes is not None:
+            rate = throughput or average_throughput
+            if rate:
+                eta = max(0, self.total_bytes - bytes_sent) / rate
+
+        return UploadProgress(
+            self.filename,
+            bytes_sent=bytes_sent,
+            total_bytes=self.total_bytes,
+            parts_completed=parts_completed,
+            total_parts=self.total_parts,
+            throughput=throughput,
+            average_throughput=average_throughput,
+            eta=eta,
+            elapsed=elapsed,
+            done=done,
+            failed=failed,
+        )
+
+    def _report(
+        self, force: bool = False, done: bool = False, failed: bool = False
+    ) -> None:
+        """
+        Report the progress to the callback, unless it was reported less than an interval ago.
+
+        :param bool force: Whether to report even if the last report is recent.
+        :param bool done: Whether the upload ended.
+        :param bool failed: Whether the upload ended with an error.
+        """
+        with self._report_lock:
+            now = monotonic()
+            if not (force or done) and now - self._reported_at < self.interval:
+                return
+            self._reported_at = now
+            # Reports are serialized, so the callback sees them in order
+            try:
+                self._callback(self.snapshot(done, failed))
+            except Exception:
+                # A failing callback must not fail the upload
+                pass
+
+    def _beat(self) -> None:
+        """
+        Report the progress every interval until the upload ends.
+        """
+        while not self._stopped.wait(self.interval):
+            self._report()
@@ -1,8 +1,14 @@
 import os
 import json
+import threading
+from urllib.parse import parse_qs, urlparse
+
 import pytest
 import pytest_asyncio
+from requests.models import Response as RequestsResponse
+from requests.structures import CaseInsensitiveDict
 from config import TestConfig
+from salad_cloud_transcription_sdk.net.transport.transports import Transport
 from salad_cloud_transcription_sdk.services.transcription import (
     TranscriptionService,
 )
@@ -15,6 +21,59 @@
 from salad_cloud_transcription_sdk.services.async_.simple_storage import (
     SimpleStorageServiceAsync,
 )
+from salad_cloud_transcription_sdk.services.utils.part_sizer import MIB, PartSizer
+
+
+class FakeStorageTransport(Transport):
+    """Answers multipart upload requests in-process, failing the first attempt of part 2."""
+
+    def __init__(self):
+        self.part_attempts = []
+        self.completed_parts = None
+        self._lock = threading.Lock()
+
+    def send(self, request, timeout, stream=False):
+        if not isinstance(request.body, (bytes, str, type(None))):
+            # Upload bodies are streamed, read them like a socket would
+            request.body = b"".join(request.body)
+        query = parse_qs(urlparse(request.url).query)
+        status, body = 200, '{"url": "https://storage.invalid/files/audio.wav"}'
+        if query.get("action") == ["mpu-create"]:
+            body = '{"uploadId": "upload"}'
+        elif query.get("action") == ["mpu-complete"]:
+            self.completed_parts = request.body
+        elif "partNumber" in query:
+            part_number = int(query["partNumber"][0])
+            with self._lock:
+                self.part_attempts.append((part_number, request.body))
+                first_attempt = (
+                    sum(number == part_number for number, _ in self.part_attempts) == 1
+                )
+            if part_number == 2 and first_attempt:
+                status = 503
+            body = f'{{"etag": "etag-{part_number}"}}'
+
+        response = RequestsResponse()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        response.request = request
+        response._content = body.encode()
+        return response
+
+
+class StreamingStorageTransport(FakeStorageTransport):
+    """Reads streamed bodies like a socket would, recording how they were sent."""
+
+    def __init__(self):
+        super().__init__()
+        self.chunked_bodies = 0
+
+    def send(self, request, timeout, stream=False):
+        if not isinstance(request.body, (bytes, str, type(None))):
+            self.chunked_bodies += 1
+            request.body = b"".join(request.body)
+            assert int(request.headers["Content-Length"]) == len(request.body)
+        return super().send(request, timeout, stream)
 
 
 @pytest.fixture(scope="session")
@@ -34,6 +93,20 @@ def simple_storage_service():
     )
 
 
+@pytest.fixture
+def fake_storage_service():
+    """Creates storage services sending their requests to a fake transport, in parts of 1 MiB."""
+
+    def create(transport, service_class=SimpleStorageService):
+        return (
+            service_class(base_url="http://storage.invalid", api_key="key")
+            .set_transport(transport)
+            .set_part_sizer(PartSizer(min_part_size=MIB, initial_part_size=MIB))
+        )
+
+    return create
+
+
 @pytest.fixture(scope="session")
 def transcription_service():
     return TranscriptionService(api_key=TestConfig.API_KEY, base_url=TestConfig.API_URL)
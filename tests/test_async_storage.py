@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+from salad_cloud_transcription_sdk.services.async_ import SimpleStorageServiceAsync
+from salad_cloud_transcription_sdk.services.utils.memory_budget import MemoryBudget
+from salad_cloud_transcription_sdk.services.utils.part_sizer import MIB
+
+from conftest import FakeStorageTransport
+
+
+class RecordingStorageTransport(FakeStorageTransport):
+    """Records the parts in flight and the aborted uploads, and can hold parts until released."""
+
+    def __init__(self, hold_parts=False):
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.aborted = []
+        self.signed = []
+        self.released = threading.Event()
+        if not hold_parts:
+            self.released.set()
+
+    def send(self, request, timeout, stream=False):
+        query = parse_qs(urlparse(request.url).query)
+        if query.get("action") == ["mpu-abort"]:
+            self.aborted.append(query["uploadId"][0])
+        if "/file_tokens/" in request.url:
+            self.signed.append(urlparse(request.url).path.rsplit("/", 1)[-1])
+        if "partNumber" not in query:
+            return super().send(request, timeout, stream)
+
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            self.released.wait(5)
+            time.sleep(0.02)
+            return super().send(request, timeout, stream)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_parts_are_uploaded_by_concurrent_tasks(tmp_path, fake_storage_service):
+    """Parts are read off the event loop, sent concurrently and retried, then signed."""
+    path = tmp_path / "audio.wav"
+    data = b"".join(bytes([i]) * MIB for i in range(3)) + b"\x03" * (MIB // 2)
+    path.write_bytes(data)
+    transport = RecordingStorageTransport()
+    budget = MemoryBudget(2 * MIB)
+    service = (
+        fake_storage_service(transport, SimpleStorageServiceAsync)
+        .set_upload_concurrency(3)
+        .set_memory_budget(budget)
+    )
+
+    response = asyncio.run(service.upload_file("org", str(path)))
+
+    assert response.url == "https://storage.invalid/files/audio.wav"
+    assert sorted(number for number, _ in transport.part_attempts) == [1, 2, 2, 3, 4]
+    for number, body in transport.part_attempts:
+        assert data[(number - 1) * MIB : number * MIB] in body
+    assert b'"partNumber": 2, "etag": "etag-2"' in transport.completed_parts
+    assert 1 < transport.max_in_flight <= 2
+    assert transport.signed == ["audio.wav"]
+    assert transport.aborted == []
+    assert budget.in_use == 0
+
+
+def test_parts_are_read_when_sent_and_hashed_once(tmp_path, fake_storage_service):
+    """Parts are read from disk by each attempt, and hashed into whole-file digests."""
+    path = tmp_path / "audio.wav"
+    data = bytes(range(256)) * (3 * MIB // 256) + b"tail"
+    path.write_bytes(data)
+    service = (
+        fake_storage_service(RecordingStorageTransport(), SimpleStorageServiceAsync)
+        .set_upload_concurrency(3)
+        .set_checksums(["sha256"])
+    )
+
+    response = asyncio.run(service.upload_file("org", str(path), sign=False))
+
+    assert response.checksums.to_dict() == {"sha256": hashlib.sha256(data).hexdigest()}
+    assert sorted(response.checksums.parts) == [1, 2, 3, 4]
+
+
+def test_cancelled_upload_aborts_the_multipart_upload(tmp_path, fake_storage_service):
+    """Cancelling an upload cancels its parts, aborts the upload and releases its memory."""
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"\x01" * (3 * MIB))
+    transport = RecordingStorageTransport(hold_parts=True)
+    budget = MemoryBudget(8 * MIB)
+    service = (
+        fake_storage_service(transport, SimpleStorageServiceAsync)
+        .set_upload_concurrency(3)
+        .set_memory_budget(budget)
+    )
+
+    async def upload_and_cancel():
+        task = asyncio.create_task(service.upload_file("org", str(path), sign=False))
+        while transport.in_flight < 3:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+        finally:
+            transport.released.set()
+        return False
+
+    assert asyncio.run(upload_and_cancel())
+    assert transport.aborted == ["upload"]
+    assert transport.completed_parts is None
+    assert budget.in_use == 0
@@ -0,0 +1,77 @@
+import time
+
+from salad_cloud_transcription_sdk.net.utils.bandwidth_limiter import (
+    BandwidthLimiter,
+    BandwidthPriority,
+)
+from salad_cloud_transcription_sdk.services.utils.part_sizer import MIB, PartSizer
+
+from conftest import StreamingStorageTransport
+
+
+def test_throttle_streams_data_at_the_rate():
+    """Chunks beyond the burst are sent at the rate, and runtime changes apply to the next chunk."""
+    limiter = BandwidthLimiter(rate=200_000, burst=10_000, chunk_size=10_000)
+    data = bytes(range(256)) * 200
+
+    start = time.monotonic()
+    assert b"".join(limiter.throttle(data)) == data
+    assert time.monotonic() - start >= 0.15
+
+    limiter.set_rate(None)
+    start = time.monotonic()
+    assert b"".join(limiter.throttle(data, "bulk")) == data
+    assert time.monotonic() - start < 0.05
+
+
+def test_active_classes_share_the_rate_by_weight():
+    """A class on its own gets the whole rate, and yields to heavier classes once they send."""
+    limiter = BandwidthLimiter(rate=1000, weights={"bulk": 1, "interactive": 3})
+
+    limiter.acquire(1, BandwidthPriority.BULK)
+    assert limiter.share("bulk") == 1000
+
+    limiter.acquire(1, BandwidthPriority.INTERACTIVE)
+    assert limiter.share("bulk") == 250
+    assert limiter.share("interactive") == 750
+
+    limiter.set_weight("bulk", 3)
+    assert limiter.share("bulk") == 500
+
+
+class CountingBandwidthLimiter(BandwidthLimiter):
+    """Counts the bytes sent through the limiter."""
+
+    def __init__(self):
+        super().__init__()
+        self.sent = 0
+
+    def acquire(self, amount, priority=BandwidthPriority.INTERACTIVE):
+        self.sent += amount
+        return super().acquire(amount, priority)
+
+
+def test_uploads_are_throttled_only_when_a_rate_is_set(tmp_path, fake_storage_service):
+    """Direct uploads and parts are streamed with their Content-Length, JSON requests are not."""
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"\x01" * (2 * MIB + 100))
+    transport = StreamingStorageTransport()
+    limiter = CountingBandwidthLimiter()
+    service = fake_storage_service(transport).set_bandwidth_limiter(limiter, "bulk")
+
+    service.upload_file("org", str(path), sign=False)
+    # The three parts and the retry of part 2, but neither the creation nor the
+    # completion of the upload
+    assert transport.chunked_bodies == 4
+    assert limiter.sent == 0
+
+    limiter.set_rate(1000 * MIB)
+    service.set_part_sizer(PartSizer(min_part_size=MIB, initial_part_size=MIB))
+    service.upload_file("org", str(path), sign=False)
+    assert transport.chunked_bodies == 7
+    assert limiter.sent > 2 * MIB + 100
+
+    small_path = tmp_path / "short.wav"
+    small_path.write_bytes(b"\x02" * 100)
+    service.upload_file("org", str(small_path), sign=False)
+    assert transport.chunked_bodies == 8
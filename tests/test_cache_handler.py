@@ -0,0 +1,138 @@
+import json
+import os
+import pickle
+from types import SimpleNamespace
+
+from requests.models import Response as RequestsResponse
+from requests.structures import CaseInsensitiveDict
+
+from salad_cloud_transcription_sdk.net.request_chain.handlers.base_handler import (
+    BaseHandler,
+)
+from salad_cloud_transcription_sdk.net.request_chain.handlers.cache_handler import (
+    CacheHandler,
+    DiskCacheStore,
+)
+from salad_cloud_transcription_sdk.net.transport.request import Request
+from salad_cloud_transcription_sdk.net.transport.response import Response
+
+
+class ScriptedHandler(BaseHandler):
+    """Returns the scripted responses in order and records the request headers."""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    def handle(self, request):
+        self.sent_headers.append(dict(request.headers))
+        return self.responses.pop(0), None
+
+
+def _response(status, body=None, headers=None):
+    return SimpleNamespace(status=status, body=body, headers=headers or {})
+
+
+def _http_response(status, body):
+    response = RequestsResponse()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(
+        {"Content-Type": "application/json; charset=utf-8"}
+    )
+    response._content = json.dumps(body).encode()
+    return Response(response)
+
+
+def _request():
+    return (
+        Request()
+        .set_url("https://example.com/jobs/1")
+        .set_method("GET")
+        .set_headers({"Salad-Api-Key": "key"})
+    )
+
+
+def test_terminal_jobs_are_pinned(tmp_path):
+    """A finished job is served from the cache without contacting the server."""
+    handler = CacheHandler(DiskCacheStore(str(tmp_path)))
+    next_handler = ScriptedHandler(
+        [_http_response(200, {"id": "1", "status": "succeeded"})]
+    )
+    handler.set_next(next_handler)
+
+    first, _ = handler.handle(_request())
+    second, _ = handler.handle(_request())
+
+    assert len(next_handler.sent_headers) == 1
+    assert second.body == first.body
+    assert second.headers["content-type"] == "application/json; charset=utf-8"
+
+
+class Payload:
+    """Records that it was unpickled."""
+
+    loaded = False
+
+    def __reduce__(self):
+        return (_mark_loaded, ())
+
+
+def _mark_loaded():
+    Payload.loaded = True
+
+
+def test_disk_cache_never_unpickles(tmp_path):
+    """Files planted in the cache directory are never executed, only ignored."""
+    handler = CacheHandler(DiskCacheStore(str(tmp_path)))
+    body = {"id": "1", "status": "succeeded"}
+    next_handler = ScriptedHandler([_http_response(200, body)] * 2)
+    handler.set_next(next_handler)
+    handler.handle(_request())
+    [path] = [entry.path for entry in os.scandir(tmp_path)]
+
+    with open(path, "rb") as file:
+        assert json.loads(file.readline())["pinned"] is True
+    with open(path, "wb") as file:
+        pickle.dump(Payload(), file)
+
+    response, _ = handler.handle(_request())
+    assert response.body == body
+    assert len(next_handler.sent_headers) == 2
+    assert not Payload.loaded
+
+
+def test_stale_responses_are_revalidated():
+    """Responses with an ETag are revalidated and a 304 serves the cached body."""
+    handler = CacheHandler()
+    next_handler = ScriptedHandler(
+        [
+            _response(200, {"id": "1", "status": "running"}, {"ETag": '"v1"'}),
+            _response(304),
+        ]
+    )
+    handler.set_next(next_handler)
+
+    first, _ = handler.handle(_request())
+    second, _ = handler.handle(_request())
+
+    assert next_handler.sent_headers[1]["If-None-Match"] == '"v1"'
+    assert second is first
+
+
+def test_no_store_is_honored():
+    """Responses marked no-store are never cached, even when finished."""
+    handler = CacheHandler()
+    body = {"id": "1", "status": "failed"}
+    next_handler = ScriptedHandler(
+        [
+            _response(200, body, {"Cache-Control": "no-store"}),
+            _response(200, body, {"Cache-Control": "no-store"}),
+        ]
+    )
+    handler.set_next(next_handler)
+
+    handler.handle(_request())
+    handler.handle(_request())
+
+    assert len(next_handler.sent_headers) == 2
@@ -0,0 +1,111 @@
+import hashlib
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from salad_cloud_transcription_sdk.services.utils.checksums import (
+    ChecksumAlgorithm,
+    ChecksumMismatchError,
+    UploadChecksums,
+    crc32c,
+)
+from salad_cloud_transcription_sdk.services.utils.part_sizer import MIB
+
+from conftest import FakeStorageTransport
+
+
+class Md5EtagTransport(FakeStorageTransport):
+    """Returns the MD5 digest of the expected part as its ETag, or a wrong one."""
+
+    def __init__(self, data, corrupt=False):
+        super().__init__()
+        self._data = data
+        self._corrupt = corrupt
+
+    def send(self, request, timeout, stream=False):
+        response = super().send(request, timeout, stream)
+        query = parse_qs(urlparse(request.url).query)
+        if "partNumber" in query and response.status_code == 200:
+            number = int(query["partNumber"][0])
+            part = self._data[(number - 1) * MIB : number * MIB]
+            etag = "0" * 32 if self._corrupt else hashlib.md5(part).hexdigest()
+            response._content = f'{{"etag": "\\"{etag}\\""}}'.encode()
+        return response
+
+
+def test_crc32c_matches_the_reference_value():
+    """The crc32c package computes the Castagnoli checksum."""
+    pytest.importorskip("crc32c")
+
+    assert crc32c(b"123456789") == 0xE3069283
+    assert crc32c(b"56789", crc32c(b"1234")) == 0xE3069283
+
+
+def test_crc32c_requires_the_crc32c_extra(fake_storage_service):
+    """Requesting CRC32C without the crc32c package fails instead of hashing slowly."""
+    try:
+        import crc32c as _  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        pytest.skip("the crc32c package is installed")
+
+    with pytest.raises(ImportError, match=r"\[crc32c\]"):
+        fake_storage_service(FakeStorageTransport()).set_checksums(["crc32c"])
+    with pytest.raises(ImportError):
+        crc32c(b"123456789")
+
+
+def test_single_request_uploads_get_plain_digests(fake_storage_service):
+    """Data uploaded in one request is hashed in the pass that sends it."""
+    data = b"RIFF" * 1000
+    response = (
+        fake_storage_service(FakeStorageTransport())
+        .set_checksums(["sha256", "md5"])
+        .upload_stream("org", data, "audio.wav", sign=False)
+    )
+
+    assert response.checksums.to_dict() == {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "md5": hashlib.md5(data).hexdigest(),
+    }
+
+
+def test_multipart_uploads_get_whole_file_digests_and_verified_etags(
+    tmp_path, fake_storage_service
+):
+    """Parts are hashed as the workers read them, and their ETags are checked."""
+    data = bytes(range(256)) * (MIB // 128) + b"tail"
+    path = tmp_path / "audio.wav"
+    path.write_bytes(data)
+    parts = [data[:MIB], data[MIB : 2 * MIB], data[2 * MIB :]]
+
+    response = (
+        fake_storage_service(Md5EtagTransport(data))
+        .set_checksums(["md5"], verify_etags=True)
+        .upload_file("org", str(path), sign=False)
+    )
+
+    assert response.checksums.to_dict() == {"md5": hashlib.md5(data).hexdigest()}
+    assert response.checksums.parts[3] == {"md5": hashlib.md5(parts[2]).hexdigest()}
+
+    with pytest.raises(ChecksumMismatchError):
+        fake_storage_service(Md5EtagTransport(data, corrupt=True)).set_checksums(
+            verify_etags=True
+        ).upload_file("org", str(path), sign=False)
+
+
+def test_parts_read_out_of_order_are_hashed_in_offset_order():
+    """The digests of the whole content do not depend on the order parts are read in."""
+    parts = [b"first", b"second", b"third"]
+    checksums = UploadChecksums([ChecksumAlgorithm.SHA256])
+
+    checksums.add_part(3, parts[2])
+    checksums.add_part(2, parts[1])
+    checksums.add_part(2, parts[1])
+    checksums.add_part(1, parts[0])
+    checksums.add_part(3, parts[2])
+
+    assert checksums.to_dict() == {
+        "sha256": hashlib.sha256(b"".join(parts)).hexdigest()
+    }
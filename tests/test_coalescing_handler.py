@@ -0,0 +1,95 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from salad_cloud_transcription_sdk.net.request_chain.handlers.base_handler import (
+    BaseHandler,
+)
+from salad_cloud_transcription_sdk.net.request_chain.handlers.coalescing_handler import (
+    CoalescingHandler,
+)
+from salad_cloud_transcription_sdk.net.transport.deadline import Deadline
+from salad_cloud_transcription_sdk.net.transport.request import Request
+from salad_cloud_transcription_sdk.net.transport.request_error import (
+    DeadlineExceededError,
+)
+
+
+class CountingHandler(BaseHandler):
+    """Counts the calls that reach the transport."""
+
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def handle(self, request):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return SimpleNamespace(status=200, body={"id": "job"}), None
+
+
+class DeadlineHandler(CountingHandler):
+    """Answers after a delay, or gives up once the deadline of the request passed."""
+
+    def handle(self, request):
+        response, error = super().handle(request)
+        if request.deadline is not None and request.deadline.expired():
+            return None, DeadlineExceededError()
+        return response, error
+
+
+def _request(api_key="key"):
+    return (
+        Request()
+        .set_url("https://example.com/jobs/1")
+        .set_method("GET")
+        .set_headers({"Salad-Api-Key": api_key})
+    )
+
+
+def test_concurrent_identical_gets_share_one_call():
+    """Concurrent identical GETs result in a single upstream call."""
+    handler = CoalescingHandler()
+    next_handler = CountingHandler(delay=0.2)
+    handler.set_next(next_handler)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: handler.handle(_request()), range(8)))
+
+    assert next_handler.calls == 1
+    assert all(response is results[0][0] for response, _ in results)
+
+
+def test_different_credentials_are_not_coalesced():
+    """Requests sent with different API keys never share a result."""
+    handler = CoalescingHandler(result_ttl_in_milliseconds=10000)
+    next_handler = CountingHandler()
+    handler.set_next(next_handler)
+
+    handler.handle(_request("first"))
+    handler.handle(_request("first"))
+    handler.handle(_request("second"))
+
+    assert next_handler.calls == 2
+
+
+def test_followers_send_again_when_the_leader_deadline_passed():
+    """A follower with time left sends its own request when the leader ran out of time."""
+    handler = CoalescingHandler()
+    next_handler = DeadlineHandler(delay=0.2)
+    handler.set_next(next_handler)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(handler.handle, _request().set_deadline(Deadline(0.1)))
+        time.sleep(0.05)
+        follower = executor.submit(handler.handle, _request().set_deadline(Deadline(5)))
+
+        assert isinstance(leader.result()[1], DeadlineExceededError)
+        response, error = follower.result()
+
+    assert error is None and response.status == 200
+    assert next_handler.calls == 2
@@ -0,0 +1,88 @@
+from salad_cloud_transcription_sdk.net.request_chain.handlers.concurrency_handler import (
+    AimdLimiter,
+    EndpointClass,
+    classify_request,
+    create_default_limiter,
+)
+from salad_cloud_transcription_sdk.net.transport.request import Request
+
+BASE_URL = "https://api.salad.com/api/public/organizations/acme"
+
+
+def _request(method, url):
+    return Request().set_url(url).set_method(method)
+
+
+def test_requests_are_classified_by_endpoint():
+    """Uploads, signing, job creation and job reads are limited independently."""
+    assert (
+        classify_request(_request("PUT", f"{BASE_URL}/file_parts/a.mp3"))
+        == EndpointClass.S4_UPLOAD
+    )
+    assert (
+        classify_request(_request("POST", f"{BASE_URL}/file_tokens/a.mp3"))
+        == EndpointClass.S4_SIGN
+    )
+    jobs_url = f"{BASE_URL}/inference-endpoints/transcribe/jobs"
+    assert classify_request(_request("POST", jobs_url)) == EndpointClass.JOB_CREATE
+    assert (
+        classify_request(_request("GET", f"{jobs_url}/job-id"))
+        == EndpointClass.JOB_READ
+    )
+    assert classify_request(_request("DELETE", f"{BASE_URL}/files/a.mp3")) == (
+        EndpointClass.OTHER
+    )
+
+
+def test_limit_grows_additively_and_shrinks_multiplicatively():
+    """Successes add one slot per window, congestion halves the limit."""
+    limiter = AimdLimiter(initial_limit=4, latency_tolerance=None)
+
+    for _ in range(4):
+        assert limiter.acquire(0)
+        limiter.release(0.01, False)
+    grown_limit = limiter.limit
+    assert 4.8 < grown_limit < 5
+
+    assert limiter.acquire(0)
+    limiter.release(0, True)
+    assert limiter.limit == grown_limit / 2
+
+
+def test_acquire_blocks_above_the_limit():
+    """Callers beyond the limit wait for a slot to be released."""
+    limiter = AimdLimiter(initial_limit=1)
+
+    assert limiter.acquire(0)
+    assert not limiter.acquire(0.01)
+    limiter.release(0.01, None)
+    assert limiter.acquire(0)
+    assert limiter.in_flight == 1
+
+
+def _release_calls(limiter, latencies):
+    for latency in latencies:
+        assert limiter.acquire(0)
+        limiter.release(latency, False)
+
+
+def test_one_fast_reply_does_not_collapse_the_limit():
+    """A single fast reply followed by healthy ones never counts as congestion."""
+    limiter = create_default_limiter(EndpointClass.JOB_READ)
+    assert limiter.limit == 16
+    _release_calls(limiter, [0.02] + [0.08] * 50)
+    assert limiter.limit >= 16
+
+    limiter = AimdLimiter(initial_limit=16)
+    _release_calls(limiter, [0.02] + [0.08] * 50)
+    assert limiter.limit >= 16
+
+
+def test_lasting_slowdowns_shrink_the_limit():
+    """Recent calls much slower than the base latency count as congestion."""
+    limiter = AimdLimiter(initial_limit=16)
+    _release_calls(limiter, [0.02] * 20)
+    grown_limit = limiter.limit
+
+    _release_calls(limiter, [0.08] * 10)
+    assert limiter.limit < grown_limit
@@ -0,0 +1,191 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from salad_cloud_transcription_sdk.net.request_chain.handlers.base_handler import (
+    BaseHandler,
+)
+from salad_cloud_transcription_sdk.net.request_chain.handlers.hedging_handler import (
+    HedgingHandler,
+    HedgingPolicy,
+    LatencyTracker,
+)
+from salad_cloud_transcription_sdk.net.request_chain.handlers.retry_handler import (
+    RetryBudget,
+)
+from salad_cloud_transcription_sdk.net.transport.request import Request
+from salad_cloud_transcription_sdk.net.transport.request_error import RequestError
+
+
+class SlowFirstHandler(BaseHandler):
+    """The first call stalls, every later call answers immediately."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def handle(self, request):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            time.sleep(0.5)
+        return SimpleNamespace(status=200, call=call), None
+
+
+def _build(budget):
+    tracker = LatencyTracker()
+    for _ in range(5):
+        tracker.record(0.01)
+    handler = HedgingHandler(
+        HedgingPolicy(min_samples=5, min_delay_in_milliseconds=1), budget, tracker
+    )
+    next_handler = SlowFirstHandler()
+    handler.set_next(next_handler)
+    return handler, next_handler
+
+
+def test_slow_read_is_hedged():
+    """A GET slower than the observed percentile is answered by the hedged attempt."""
+    handler, next_handler = _build(RetryBudget())
+    request = Request().set_url("https://example.com").set_method("GET")
+
+    response, error = handler.handle(request)
+
+    assert error is None
+    assert response.call == 2
+
+
+def test_hedging_obeys_retry_budget():
+    """No hedged attempt is sent when the retry budget is exhausted."""
+    handler, next_handler = _build(RetryBudget(max_tokens=0))
+    request = Request().set_url("https://example.com").set_method("GET")
+
+    response, _ = handler.handle(request)
+
+    assert response.call == 1
+    assert next_handler.calls == 1
+
+
+class HeaderRecordingHandler(BaseHandler):
+    """Stalls the first call, and records the request object of every call."""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def handle(self, request):
+        with self._lock:
+            self.requests.append(request)
+            call = len(self.requests)
+        request.set_headers({**request.headers, "traceparent": f"attempt-{call}"})
+        if call == 1:
+            time.sleep(0.2)
+        return SimpleNamespace(status=200, call=call), None
+
+
+def test_attempts_send_their_own_copy_of_the_request():
+    """Concurrent attempts do not share headers, nor touch the caller's request."""
+    tracker = LatencyTracker()
+    for _ in range(5):
+        tracker.record(0.01)
+    handler = HedgingHandler(
+        HedgingPolicy(min_samples=5, min_delay_in_milliseconds=1),
+        RetryBudget(),
+        tracker,
+    )
+    next_handler = HeaderRecordingHandler()
+    handler.set_next(next_handler)
+    request = Request().set_url("https://example.com").set_method("GET").set_headers({})
+
+    response, _ = handler.handle(request)
+
+    first, second = next_handler.requests
+    assert response.call == 2
+    assert first is not second and request not in (first, second)
+    assert first.headers["traceparent"] == "attempt-1"
+    assert second.headers["traceparent"] == "attempt-2"
+    assert request.headers == {}
+
+
+def test_saturated_pool_sends_without_hedging():
+    """Requests beyond the pool run on the caller thread, and are never hedged."""
+    tracker = LatencyTracker()
+    for _ in range(5):
+        tracker.record(0.01)
+    handler = HedgingHandler(
+        HedgingPolicy(min_samples=5, min_delay_in_milliseconds=1, max_workers=1),
+        RetryBudget(),
+        tracker,
+    )
+    next_handler = SlowFirstHandler()
+    handler.set_next(next_handler)
+    request = Request().set_url("https://example.com").set_method("GET")
+
+    # The only worker runs the first attempt, so no hedge can be sent for it
+    response, _ = handler.handle(request)
+
+    assert response.call == 1
+    assert next_handler.calls == 1
+
+
+class FailingFirstHandler(BaseHandler):
+    """The first call fails after a while, the second one succeeds a bit later."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def handle(self, request):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            time.sleep(0.1)
+            return None, RequestError("503 error", status=503)
+        time.sleep(0.2)
+        return SimpleNamespace(status=200, call=call), None
+
+
+class SettlingHedgingHandler(HedgingHandler):
+    """Lets the hedged attempt end before waiting, as when both attempts answer at once."""
+
+    def _submit(self, executor, request, started=None):
+        future = super()._submit(executor, request, started)
+        if started is None:
+            future.result()
+        return future
+
+
+def test_success_wins_over_an_error_when_both_attempts_are_done():
+    """A failed first attempt does not hide the hedged attempt that succeeded."""
+    tracker = LatencyTracker()
+    for _ in range(5):
+        tracker.record(0.01)
+    handler = SettlingHedgingHandler(
+        HedgingPolicy(min_samples=5, min_delay_in_milliseconds=1),
+        RetryBudget(),
+        tracker,
+    )
+    handler.set_next(FailingFirstHandler())
+    request = Request().set_url("https://example.com").set_method("GET")
+
+    response, error = handler.handle(request)
+
+    assert error is None
+    assert response.call == 2
+
+
+def test_closed_handler_sends_without_hedging():
+    """Once closed, the handler releases its pool and sends requests directly."""
+    handler, next_handler = _build(RetryBudget())
+    handler.close()
+    request = Request().set_url("https://example.com").set_method("GET")
+
+    response, _ = handler.handle(request)
+
+    assert response.call == 1
+    assert next_handler.calls == 1
@@ -0,0 +1,77 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from salad_cloud_transcription_sdk.net.request_chain.handlers.http_handler import (
+    HttpHandler,
+)
+from salad_cloud_transcription_sdk.net.transport.request import Request
+
+
+class EchoServer(BaseHTTPRequestHandler):
+    """Answers with a gzip-compressed description of the request it received."""
+
+    def do_PUT(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+
+        payload = gzip.compress(
+            json.dumps(
+                {
+                    "accept_encoding": self.headers.get("Accept-Encoding"),
+                    "content_encoding": self.headers.get("Content-Encoding"),
+                    "body": json.loads(body),
+                }
+            ).encode()
+        )
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = HTTPServer(("127.0.0.1", 0), EchoServer)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def _send(handler, url, body):
+    request = Request().set_url(url).set_method("PUT").set_headers({}).set_body(body)
+    response, error = handler.handle(request)
+    assert error is None
+    return response.body
+
+
+def test_large_json_bodies_are_gzipped(server_url):
+    """Bodies above the threshold are compressed, responses are decoded transparently."""
+    parts = [{"partNumber": i, "etag": f"etag-{i}"} for i in range(1000)]
+
+    echoed = _send(
+        HttpHandler(compression_threshold=1024), server_url, {"parts": parts}
+    )
+
+    assert echoed["content_encoding"] == "gzip"
+    assert echoed["body"] == {"parts": parts}
+    assert "gzip" in echoed["accept_encoding"]
+
+
+def test_small_json_bodies_are_sent_as_is(server_url):
+    """Compression is skipped below the threshold and when disabled."""
+    small = _send(HttpHandler(compression_threshold=1024), server_url, {"a": 1})
+    disabled = _send(HttpHandler(), server_url, {"a": "x" * 4096})
+
+    assert small["content_encoding"] is None
+    assert disabled["content_encoding"] is None
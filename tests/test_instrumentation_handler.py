@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+from salad_cloud_transcription_sdk.net.request_chain.handlers.base_handler import (
+    BaseHandler,
+)
+from salad_cloud_transcription_sdk.net.request_chain.handlers.instrumentation_handler import (
+    CallbackSink,
+    Instrumentation,
+    InstrumentationHandler,
+    PrometheusSink,
+)
+from salad_cloud_transcription_sdk.net.request_chain.handlers.retry_handler import (
+    RetryHandler,
+    RetryPolicy,
+)
+from salad_cloud_transcription_sdk.net.request_chain.request_chain import RequestChain
+from salad_cloud_transcription_sdk.net.transport.request_error import RequestError
+from salad_cloud_transcription_sdk.net.transport.serializer import Serializer
+
+
+class FakeHttpHandler(BaseHandler):
+    """Answers with the given statuses in order."""
+
+    def __init__(self, statuses):
+        super().__init__()
+        self.statuses = list(statuses)
+
+    def handle(self, request):
+        status = self.statuses.pop(0)
+        response = SimpleNamespace(
+            status=status, headers={}, bytes_sent=10, bytes_received=20, elapsed=0.01
+        )
+        if status >= 400:
+            return None, RequestError("error", status, response)
+        return response, None
+
+
+def _request():
+    return (
+        Serializer("https://api.salad.com/organizations/{organization_name}/files")
+        .add_path("organization_name", "acme")
+        .serialize()
+        .set_method("GET")
+    )
+
+
+def test_every_attempt_is_recorded_with_its_endpoint_template():
+    """Retries produce one record per attempt, labelled with the URL template."""
+    records = []
+    instrumentation = Instrumentation([CallbackSink(records.append)])
+    chain = (
+        RequestChain()
+        .add_handler(RetryHandler(RetryPolicy(delay_in_milliseconds=1)))
+        .add_handler(InstrumentationHandler(instrumentation))
+        .add_handler(FakeHttpHandler([503, 200]))
+    )
+
+    chain.send(_request())
+
+    assert [(r.status, r.attempt) for r in records] == [(503, 1), (200, 2)]
+    assert records[0].endpoint == "/organizations/{organization_name}/files"
+    assert records[1].bytes_sent == 10 and records[1].bytes_received == 20
+    assert records[1].time_to_first_byte == 0.01
+
+
+def test_prometheus_sink_renders_histograms_and_counters():
+    """The exposition holds duration buckets and byte counters per endpoint."""
+    sink = PrometheusSink(buckets=(0.1, 1.0))
+    handler = InstrumentationHandler(Instrumentation([sink]))
+    handler.set_next(FakeHttpHandler([200]))
+
+    handler.handle(_request())
+    text = sink.render()
+
+    labels = (
+        'endpoint="/organizations/{organization_name}/files",method="GET",status="200"'
+    )
+    bucket = f'salad_sdk_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1'
+    assert bucket in text
+    assert f"salad_sdk_http_request_bytes_sent_total{{{labels}}} 10" in text
+    assert sink.snapshot()[0]["count"] == 1
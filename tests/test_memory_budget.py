@@ -0,0 +1,67 @@
+import asyncio
+
+from salad_cloud_transcription_sdk.services.utils.memory_budget import MemoryBudget
+from salad_cloud_transcription_sdk.services.utils.part_sizer import MIB
+
+from conftest import FakeStorageTransport
+
+
+def test_budget_blocks_until_bytes_are_released():
+    """Acquiring past the capacity waits, oversized requests are clamped."""
+    budget = MemoryBudget(10)
+
+    assert budget.acquire(8)
+    assert not budget.acquire(4, timeout=0.05)
+
+    budget.release(8)
+    assert budget.acquire(100, timeout=0.05)
+    assert budget.in_use == 10
+
+
+def test_coroutines_keep_their_place_while_waiting():
+    """Coroutines wait in arrival order without blocking the loop, and leave when cancelled."""
+    budget = MemoryBudget(10)
+    assert budget.acquire(8)
+
+    async def wait_in_line():
+        first = asyncio.create_task(budget.acquire_async(6))
+        await asyncio.sleep(0.05)
+        # Bytes that would fit wait behind the coroutine that came first
+        assert not await asyncio.to_thread(budget.acquire, 2, 0.05)
+
+        cancelled = asyncio.create_task(budget.acquire_async(4))
+        await asyncio.sleep(0.05)
+        cancelled.cancel()
+        budget.release(8)
+        await first
+        async with budget.reserve_async(4):
+            assert budget.in_use == 10
+        return cancelled.cancelled()
+
+    assert asyncio.run(wait_in_line())
+    assert budget.in_use == 6
+
+
+def test_parts_are_uploaded_concurrently_and_reread_on_retry(
+    tmp_path, fake_storage_service
+):
+    """Parts are read from their offset by the workers, again when they are retried."""
+    path = tmp_path / "audio.wav"
+    data = b"".join(bytes([i]) * MIB for i in range(3)) + b"\x03" * (MIB // 2)
+    path.write_bytes(data)
+    transport = FakeStorageTransport()
+    budget = MemoryBudget(2 * MIB)
+    service = (
+        fake_storage_service(transport)
+        .set_memory_budget(budget)
+        .set_upload_concurrency(3)
+    )
+
+    response = service.upload_file("org", str(path), sign=False)
+
+    assert response.url == "https://storage.invalid/files/audio.wav"
+    assert sorted(number for number, _ in transport.part_attempts) == [1, 2, 2, 3, 4]
+    for number, body in transport.part_attempts:
+        assert data[(number - 1) * MIB : number * MIB] in body
+    assert b'"partNumber": 2, "etag": "etag-2"' in transport.completed_parts
+    assert budget.in_use == 0
@@ -0,0 +1,86 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from requests.models import Response as RequestsResponse
+from requests.structures import CaseInsensitiveDict
+
+from salad_cloud_transcription_sdk.net.transport.request_error import RequestError
+from salad_cloud_transcription_sdk.services.utils.multipart_registry import (
+    MultipartUploadRegistry,
+)
+from salad_cloud_transcription_sdk.services.utils.part_sizer import MIB
+
+from conftest import FakeStorageTransport
+
+
+class FailingStorageTransport(FakeStorageTransport):
+    """Rejects part 3 for good, and fails the aborts until they are allowed."""
+
+    def __init__(self, abort_status=200):
+        super().__init__()
+        self.abort_status = abort_status
+        self.aborted = []
+
+    def send(self, request, timeout, stream=False):
+        query = parse_qs(urlparse(request.url).query)
+        if query.get("action") == ["mpu-abort"]:
+            self.aborted.append(query["uploadId"][0])
+            return self._respond(request, self.abort_status)
+        if query.get("partNumber") == ["3"]:
+            return self._respond(request, 400)
+        return super().send(request, timeout, stream)
+
+    def _respond(self, request, status):
+        response = RequestsResponse()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        response.request = request
+        response._content = b"{}"
+        return response
+
+
+def test_failed_upload_is_aborted(tmp_path, fake_storage_service):
+    """A part failing for good aborts the multipart upload, which is then forgotten."""
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"\x01" * (3 * MIB))
+    transport = FailingStorageTransport()
+    registry = MultipartUploadRegistry()
+    service = fake_storage_service(transport).set_multipart_registry(registry)
+
+    with pytest.raises(RequestError):
+        service.upload_file("org", str(path), sign=False)
+
+    assert transport.aborted == ["upload"]
+    assert transport.completed_parts is None
+    assert registry.list() == []
+
+
+def test_sweep_aborts_uploads_left_by_a_failed_abort(tmp_path, fake_storage_service):
+    """Uploads whose abort failed survive in the registry file until they are swept."""
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"\x01" * (3 * MIB))
+    registry_path = str(tmp_path / "uploads.json")
+    transport = FailingStorageTransport(abort_status=400)
+    service = fake_storage_service(transport).set_multipart_registry(
+        MultipartUploadRegistry(registry_path)
+    )
+
+    with pytest.raises(RequestError):
+        service.upload_file("org", str(path), sign=False)
+
+    # The next run loads the uploads left behind, and sweeps the stale ones
+    registry = MultipartUploadRegistry(registry_path)
+    [upload] = registry.list()
+    assert (upload.organization_name, upload.upload_id) == ("org", "upload")
+    assert upload.filename.startswith("audio_")
+
+    service.set_multipart_registry(registry)
+    assert service.sweep_multipart_uploads(older_than=3600) == []
+    assert service.sweep_multipart_uploads("other-org", older_than=0) == []
+    assert service.sweep_multipart_uploads(older_than=0) == []
+    assert len(registry.list()) == 1
+
+    transport.abort_status = 404
+    assert service.sweep_multipart_uploads(older_than=0) == [upload]
+    assert transport.aborted == ["upload"] * 3
+    assert MultipartUploadRegistry(registry_path).list() == []
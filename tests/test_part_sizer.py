@@ -0,0 +1,37 @@
+from salad_cloud_transcription_sdk.services.utils.part_sizer import MIB, PartSizer
+
+
+def test_parts_follow_the_measured_throughput():
+    """Parts are sized to the target duration, larger on fast links and smaller on slow ones."""
+    sizer = PartSizer(target_part_duration=10.0, smoothing=1.0)
+    assert sizer.part_size(1024 * MIB) == 16 * MIB
+
+    sizer.record(10 * MIB, 1.0)
+    assert sizer.part_size(1024 * MIB) == 100 * MIB
+
+    sizer.record(1 * MIB, 1.0)
+    assert sizer.part_size(1024 * MIB) == 10 * MIB
+
+
+def test_failures_shrink_the_parts():
+    """Failed parts halve the following parts when every other upload fails."""
+    sizer = PartSizer(target_part_duration=10.0, smoothing=0.5)
+    sizer.record(10 * MIB, 1.0)
+    sizer.record(10 * MIB, 1.0)
+    sizer.record(10 * MIB, 1.0, success=False)
+
+    assert sizer.failure_rate == 0.5
+    assert sizer.part_size(1024 * MIB) == 50 * MIB
+
+
+def test_parts_respect_the_bounds():
+    """The memory budget, the minimum size and the maximum part count bound the parts."""
+    sizer = PartSizer(memory_budget=64 * MIB, max_parts=100, smoothing=1.0)
+    sizer.record(1000 * MIB, 1.0)
+
+    assert sizer.part_size(512 * MIB, concurrency=8) == 8 * MIB
+    assert sizer.part_size(10 * 1024 * MIB, concurrency=8) == 103 * MIB
+    assert sizer.part_size(3 * MIB) == 3 * MIB
+
+    sizer.record(1, 1.0)
+    assert sizer.part_size(256 * MIB) == 5 * MIB
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+from requests.models import Response as RequestsResponse
+from requests.structures import CaseInsensitiveDict
+from salad_cloud_sdk.models import ProblemDetails
+
+from salad_cloud_transcription_sdk.models.transcription_job_input import (
+    TranscriptionJobInput,
+)
+from salad_cloud_transcription_sdk.models.transcription_request import (
+    TranscriptionRequest,
+)
+from salad_cloud_transcription_sdk.net.transport.request_error import RequestError
+from salad_cloud_transcription_sdk.net.transport.transports import Transport
+from salad_cloud_transcription_sdk.services.transcription import TranscriptionService
+
+
+def create_request():
+    return TranscriptionRequest(
+        options=TranscriptionJobInput(
+            language_code="en",
+            return_as_file=False,
+            translate="",
+            sentence_level_timestamps=False,
+            word_level_timestamps=False,
+            diarization=False,
+            sentence_diarization=False,
+            srt=False,
+            summarize=0,
+            custom_vocabulary="",
+            llm_translation=[],
+            srt_translation=[],
+        )
+    )
+
+
+class ProblemTransport(Transport):
+    """Answers every request with a problem of the given status."""
+
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body
+        self.calls = 0
+
+    def send(self, request, timeout, stream=False):
+        self.calls += 1
+        response = RequestsResponse()
+        response.status_code = self.status
+        response.headers = CaseInsensitiveDict(
+            {"Content-Type": "application/problem+json"}
+        )
+        response.request = request
+        response._content = json.dumps(self.body).encode()
+        return response
+
+
+def test_job_reads_raise_problem_details():
+    """Job reads raise the problem details of the error responses they declare."""
+    transport = ProblemTransport(
+        404, {"type": "about:blank", "title": "Not Found", "status": 404}
+    )
+    service = TranscriptionService(api_key="key").set_transport(transport)
+
+    with pytest.raises(ProblemDetails) as raised:
+        service.get_transcription_job("org", "job")
+    assert raised.value.status == 404
+    assert raised.value.title == "Not Found"
+    assert raised.value.response.status == 404
+
+    with pytest.raises(ProblemDetails):
+        service.list_transcription_jobs("org", page=1, page_size=10)
+
+
+def test_undeclared_errors_stay_request_errors():
+    """Error responses without a declared error, or without a JSON body, raise a RequestError."""
+    service = TranscriptionService(api_key="key").set_transport(
+        ProblemTransport(409, {"title": "Conflict"})
+    )
+    with pytest.raises(RequestError):
+        service.get_transcription_job("org", "job")
+
+    service = TranscriptionService(api_key="key").set_transport(
+        ProblemTransport(404, ["not", "a", "problem"])
+    )
+    with pytest.raises(RequestError):
+        service.get_transcription_job("org", "job")
+
+
+def test_job_creation_raises_problem_details():
+    """Job creation raises the problem details of a rejected job."""
+    transport = ProblemTransport(
+        400, {"type": "about:blank", "title": "Bad Request", "status": 400}
+    )
+    service = TranscriptionService(api_key="key").set_transport(transport)
+
+    with pytest.raises(ProblemDetails) as raised:
+        service.transcribe("https://example.invalid/audio.wav", "org", create_request())
+    assert raised.value.status == 400
+    assert transport.calls == 1
@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import pytest
+
+from salad_cloud_transcription_sdk.net.request_chain.handlers.base_handler import (
+    BaseHandler,
+)
+from salad_cloud_transcription_sdk.net.request_chain.handlers.rate_limit_handler import (
+    FileRateLimitBackend,
+    MemoryRateLimitBackend,
+    RateLimit,
+    RateLimitHandler,
+)
+from salad_cloud_transcription_sdk.net.transport.deadline import Deadline
+from salad_cloud_transcription_sdk.net.transport.request import Request
+from salad_cloud_transcription_sdk.net.transport.request_error import (
+    DeadlineExceededError,
+)
+
+
+class OkHandler(BaseHandler):
+    """Answers every request successfully."""
+
+    def handle(self, request):
+        return SimpleNamespace(status=200), None
+
+
+def _request(url):
+    return Request().set_url(url).set_method("GET")
+
+
+def test_organization_limits_are_keyed_per_organization():
+    """Organization limits apply per organization and host, and skip other URLs."""
+    limit = RateLimit(10, scope=RateLimit.ORGANIZATION)
+
+    assert (
+        limit.get_key(_request("https://api.salad.com/organizations/acme/files"))
+        == "organization:api.salad.com:acme"
+    )
+    assert limit.get_key(_request("https://api.salad.com/health")) is None
+
+
+def test_memory_backend_delays_requests_above_the_burst():
+    """Requests beyond the burst must wait for the bucket to refill."""
+    backend = MemoryRateLimitBackend()
+    reservations = [("host:example.com", RateLimit(10, burst=2))]
+
+    assert backend.reserve(reservations) == 0
+    assert backend.reserve(reservations) == 0
+    assert backend.reserve(reservations) > 0
+
+
+def test_file_backend_is_shared_between_instances(tmp_path):
+    """Backends using the same file, e.g. in different processes, share one bucket."""
+    path = str(tmp_path / "rate_limits.json")
+    reservations = [("host:example.com", RateLimit(1, burst=1))]
+
+    assert FileRateLimitBackend(path).reserve(reservations) == 0
+    assert FileRateLimitBackend(path).reserve(reservations) > 0.5
+
+
+@pytest.mark.parametrize("backend_type", ["memory", "file"])
+def test_rejected_requests_leave_the_bucket_unchanged(tmp_path, backend_type):
+    """Requests rejected because the wait outlasts their deadline give their token back."""
+    if backend_type == "memory":
+        backend = MemoryRateLimitBackend()
+    else:
+        backend = FileRateLimitBackend(str(tmp_path / "rate_limits.json"))
+    handler = RateLimitHandler([RateLimit(1, burst=1)], backend)
+    handler.set_next(OkHandler())
+    reservations = [("host:example.com", RateLimit(1, burst=1))]
+
+    assert handler.handle(_request("https://example.com/jobs"))[1] is None
+    for _ in range(3):
+        request = _request("https://example.com/jobs").set_deadline(Deadline(0.1))
+        _, error = handler.handle(request)
+        assert isinstance(error, DeadlineExceededError)
+
+    # Only the request that was sent is waited for
+    assert backend.reserve(reservations) <= 1.0
@@ -0,0 +1,127 @@
+import io
+import pickle
+import threading
+
+from requests.models import Response as RequestsResponse
+from requests.structures import CaseInsensitiveDict
+
+from salad_cloud_transcription_sdk.net.transport.json_codec import (
+    StdlibJsonCodec,
+    get_json_codec,
+    set_json_codec,
+)
+from salad_cloud_transcription_sdk.net.transport.response import Response
+
+
+class CountingCodec(StdlibJsonCodec):
+    """Records the documents it parses."""
+
+    def __init__(self):
+        self.parsed = []
+
+    def loads(self, data):
+        self.parsed.append(data)
+        return super().loads(data)
+
+
+def _streamed_response(content, content_type="application/octet-stream"):
+    response = RequestsResponse()
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict({"Content-Type": content_type})
+    response.raw = io.BytesIO(content)
+    return response
+
+
+def _response(content, content_type="application/json"):
+    response = RequestsResponse()
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict({"Content-Type": content_type})
+    response._content = content
+    return response
+
+
+def test_body_is_parsed_once_on_first_access():
+    """The body is decoded lazily, from the raw bytes, by the configured codec."""
+    codec = CountingCodec()
+    previous = get_json_codec()
+    set_json_codec(codec)
+    try:
+        response = Response(_response('{"text": "café"}'.encode("utf-8")))
+        assert codec.parsed == []
+
+        assert response.body == {"text": "café"}
+        assert response.body == {"text": "café"}
+        assert codec.parsed == ['{"text": "café"}'.encode("utf-8")]
+    finally:
+        set_json_codec(previous)
+
+
+def test_raw_bytes_are_available_without_decoding():
+    """Binary bodies and invalid JSON are kept as bytes."""
+    audio = Response(_response(b"\xff\xfe\x00", "audio/mpeg"))
+    invalid = Response(_response(b"not json"))
+
+    assert audio.content == b"\xff\xfe\x00"
+    assert audio.body == b"\xff\xfe\x00"
+    assert invalid.body == b"not json"
+    assert audio.bytes_received == 3
+
+
+def test_responses_survive_pickling():
+    """Responses keep no reference to the connection, so they can be cached on disk."""
+    response = Response(_response(b'{"status": "succeeded"}'))
+
+    restored = pickle.loads(pickle.dumps(response))
+
+    assert restored.body == {"status": "succeeded"}
+    assert restored.text == '{"status": "succeeded"}'
+
+
+def test_large_bodies_are_spilled_to_disk():
+    """Bodies above the threshold live in a temporary file, read through views."""
+    payload = bytes(range(256)) * 1024
+    response = Response(_streamed_response(payload), spill_threshold=64 * 1024)
+
+    assert response.spilled
+    assert response.bytes_received == len(payload)
+    assert response.memoryview()[:256] == bytes(range(256))
+    assert response.open().read() == payload
+    assert response.body == payload
+    assert pickle.loads(pickle.dumps(response)).content == payload
+
+
+def test_spilled_bodies_are_read_whole_by_concurrent_readers():
+    """Readers sharing a spilled response, such as cache hits, each read the whole body."""
+    payload = bytes(range(256)) * 4096
+    response = Response(_streamed_response(payload), spill_threshold=64 * 1024)
+    first, second = response.open(), response.open()
+    assert first.read(10) == payload[:10]
+    assert second.read() == payload
+    assert first.read() == payload[10:]
+
+    reads = []
+
+    def read():
+        for _ in range(10):
+            reads.append(response.content == payload)
+            with response.open() as file:
+                reads.append(file.read() == payload)
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(reads) == 160 and all(reads)
+
+
+def test_small_bodies_stay_in_memory():
+    """Bodies under the threshold are parsed as usual."""
+    response = Response(
+        _streamed_response(b'{"etag": "abc"}', "application/json"),
+        spill_threshold=64 * 1024,
+    )
+
+    assert not response.spilled
+    assert response.body == {"etag": "abc"}
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+from salad_cloud_transcription_sdk.net.request_chain.handlers.base_handler import (
+    BaseHandler,
+)
+from salad_cloud_transcription_sdk.net.request_chain.handlers.retry_handler import (
+    RetryBudget,
+    RetryHandler,
+    RetryPolicy,
+)
+from salad_cloud_transcription_sdk.net.transport.deadline import Deadline
+from salad_cloud_transcription_sdk.net.transport.request import Request
+from salad_cloud_transcription_sdk.net.transport.request_error import RequestError
+
+
+class ScriptedHandler(BaseHandler):
+    """Returns the scripted statuses in order, then succeeds."""
+
+    def __init__(self, statuses, headers=None):
+        super().__init__()
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+        self.calls = 0
+
+    def handle(self, request):
+        self.calls += 1
+        if self.statuses:
+            status = self.statuses.pop(0)
+            response = SimpleNamespace(status=status, headers=self.headers)
+            return None, RequestError("failed", status=status, response=response)
+        return SimpleNamespace(status=200, headers={}), None
+
+
+def _build(method, statuses, headers=None, budget=None, **policy):
+    next_handler = ScriptedHandler(statuses, headers)
+    handler = RetryHandler(
+        RetryPolicy(delay_in_milliseconds=0, **policy), budget or RetryBudget()
+    )
+    handler.set_next(next_handler)
+    request = Request().set_url("https://example.com").set_method(method)
+    return handler, next_handler, request
+
+
+def test_retries_throttled_requests_and_records_metrics():
+    """429 responses are retried, even for non-idempotent methods."""
+    handler, next_handler, request = _build("POST", [429, 429])
+
+    response, error = handler.handle(request)
+
+    assert error is None
+    assert response.status == 200
+    assert next_handler.calls == 3
+    assert handler.metrics.snapshot()["retries_by_status"] == {429: 2}
+
+
+def test_does_not_retry_non_idempotent_server_errors():
+    """A 500 on a POST is returned without retrying."""
+    handler, next_handler, request = _build("POST", [500])
+
+    _, error = handler.handle(request)
+
+    assert error.status == 500
+    assert next_handler.calls == 1
+
+
+def test_retry_after_above_limit_is_not_waited_for():
+    """A Retry-After longer than the configured limit fails fast."""
+    handler, next_handler, request = _build(
+        "GET", [503], {"Retry-After": "120"}, max_retry_after_in_milliseconds=1000
+    )
+
+    _, error = handler.handle(request)
+
+    assert error.status == 503
+    assert next_handler.calls == 1
+
+
+def test_retry_budget_caps_retries():
+    """Once the shared budget is empty, failures are no longer retried."""
+    budget = RetryBudget(max_tokens=1)
+    handler, next_handler, request = _build("GET", [502, 502, 502], budget=budget)
+
+    _, error = handler.handle(request)
+
+    assert error.status == 502
+    assert next_handler.calls == 2
+    assert handler.metrics.snapshot()["budget_exhausted"] == 1
+
+
+def test_retry_is_skipped_when_deadline_is_too_close():
+    """A retry whose backoff would outlast the deadline is not attempted."""
+    handler, next_handler, request = _build("GET", [503], {"Retry-After": "5"})
+    request.set_deadline(Deadline(1))
+
+    _, error = handler.handle(request)
+
+    assert error.status == 503
+    assert next_handler.calls == 1
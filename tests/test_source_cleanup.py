@@ -0,0 +1,206 @@
+import json
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+from requests.models import Response as RequestsResponse
+from requests.structures import CaseInsensitiveDict
+
+from salad_cloud_transcription_sdk.models.transcription_job_input import (
+    TranscriptionJobInput,
+)
+from salad_cloud_transcription_sdk.models.transcription_request import (
+    TranscriptionRequest,
+)
+from salad_cloud_transcription_sdk.net.transport.request_error import RequestError
+from salad_cloud_transcription_sdk.net.transport.transports import Transport
+from salad_cloud_transcription_sdk.services.transcription import TranscriptionService
+from salad_cloud_transcription_sdk.services.utils.source_cleaner import SourceCleaner
+
+JOB_ID = "6b1a0d5e-1b8f-4a4e-9f3e-0c6c1b8f4a4e"
+
+
+def create_request():
+    return TranscriptionRequest(
+        options=TranscriptionJobInput(
+            language_code="en",
+            return_as_file=False,
+            translate="",
+            sentence_level_timestamps=False,
+            word_level_timestamps=False,
+            diarization=False,
+            sentence_diarization=False,
+            srt=False,
+            summarize=0,
+            custom_vocabulary="",
+            llm_translation=[],
+            srt_translation=[],
+        )
+    )
+
+
+class FakeApiTransport(Transport):
+    """Answers uploads, signatures, job creation and job reads, and records deletions."""
+
+    def __init__(self):
+        self.metadata = None
+        self.status = "pending"
+        self.update_time = "2024-01-01T00:00:00Z"
+        self.deleted = []
+
+    def send(self, request, timeout, stream=False):
+        path = urlparse(request.url).path
+        status, body = 200, {}
+        if request.method == "DELETE":
+            self.deleted.append(path.rsplit("/", 1)[-1])
+            status = 204
+        elif "/file_tokens/" in path:
+            body = {"url": f"https://storage.invalid{path}?token=signed"}
+        elif "/files/" in path:
+            body = {"url": f"https://storage.invalid{path}"}
+        elif path.endswith("/jobs") and request.method == "POST":
+            self.metadata = json.loads(request.body).get("metadata")
+            body = self._job()
+        elif f"/jobs/{JOB_ID}" in path:
+            body = self._job()
+
+        response = RequestsResponse()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        response.request = request
+        response._content = json.dumps(body).encode()
+        return response
+
+    def _job(self):
+        job = {
+            "create_time": "2024-01-01T00:00:00Z",
+            "events": [],
+            "id": JOB_ID,
+            "inference_endpoint_name": "transcribe",
+            "input": {},
+            "organization_name": "org",
+            "status": self.status,
+            "update_time": self.update_time,
+        }
+        if self.metadata is not None:
+            job["metadata"] = self.metadata
+        return job
+
+
+def test_cleaner_deletes_due_files_in_batches_once():
+    """Due files are deleted in batches, later ones wait, failures may be queued again."""
+    calls = []
+    lock = threading.Lock()
+
+    def delete_file(organization_name, filename):
+        with lock:
+            calls.append(filename)
+        if filename == "gone.wav":
+            raise RequestError("404 error", status=404)
+        if filename == "broken.wav":
+            raise RequestError("500 error", status=500)
+        return True
+
+    cleaner = SourceCleaner(delete_file, batch_size=2)
+    for index in range(3):
+        assert cleaner.schedule("org", f"audio-{index}.wav")
+    assert not cleaner.schedule("org", "audio-0.wav")
+    cleaner.schedule("org", "gone.wav")
+    cleaner.schedule("org", "broken.wav")
+    cleaner.schedule("org", "later.wav", time.time() + 3600)
+
+    assert cleaner.flush(5)
+    assert sorted(calls) == [
+        "audio-0.wav",
+        "audio-1.wav",
+        "audio-2.wav",
+        "broken.wav",
+        "gone.wav",
+    ]
+    assert (cleaner.deleted, cleaner.failed, cleaner.pending) == (4, 1, 1)
+    assert cleaner.schedule("org", "broken.wav")
+    assert not cleaner.schedule("org", "gone.wav")
+    cleaner.close()
+
+
+def test_transcribe_deletes_the_uploaded_source_once_the_job_ended(tmp_path):
+    """The uploaded source is recorded in the job and deleted once a reading service opted in sees the job ended."""
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"\x01" * 1000)
+    transport = FakeApiTransport()
+    service = TranscriptionService(api_key="key").set_transport(transport)
+
+    job = service.transcribe(
+        str(path),
+        "org",
+        create_request(),
+        cleanup_source=True,
+    )
+    uploaded = transport.metadata["sdk_uploaded_source"]
+    assert uploaded.startswith("audio_") and uploaded.endswith(".wav")
+    assert job.status == "pending"
+
+    transport.status = "succeeded"
+    service.get_transcription_job("org", JOB_ID)
+    assert service.get_source_cleaner().pending == 0
+
+    service.set_clean_up_sources_on_read()
+    service.get_transcription_job("org", JOB_ID)
+    service.get_transcription_job("org", JOB_ID)
+
+    assert service.get_source_cleaner().flush(5)
+    assert transport.deleted == [uploaded]
+
+
+def test_kept_sources_wait_after_the_end_of_the_job(tmp_path):
+    """Sources kept for a while are deleted that long after the job was last updated."""
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"\x01" * 1000)
+    transport = FakeApiTransport()
+    transport.status = "failed"
+    transport.update_time = (
+        datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    )
+    service = TranscriptionService(api_key="key").set_transport(transport)
+
+    service.transcribe(
+        str(path),
+        "org",
+        create_request(),
+        cleanup_source=True,
+        keep_source_for=3600,
+    )
+
+    assert transport.metadata["sdk_keep_source_for"] == 3600
+    assert service.get_source_cleaner().flush(1)
+    assert service.get_source_cleaner().pending == 1
+    assert transport.deleted == []
+
+
+def test_due_deletions_are_flushed_at_exit(tmp_path):
+    """A process exiting right after queuing deletions waits for the due ones."""
+    log = tmp_path / "deleted.txt"
+    script = f"""
+import time
+from salad_cloud_transcription_sdk.services.utils.source_cleaner import SourceCleaner
+
+def delete_file(organization_name, filename):
+    time.sleep(0.2)
+    with open({str(log)!r}, "a") as log:
+        log.write(filename + "\\n")
+
+cleaner = SourceCleaner(delete_file, batch_size=2)
+for index in range(3):
+    cleaner.schedule("org", f"audio-{{index}}.wav")
+cleaner.schedule("org", "later.wav", time.time() + 3600)
+"""
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=30)
+
+    assert sorted(log.read_text().split()) == [
+        "audio-0.wav",
+        "audio-1.wav",
+        "audio-2.wav",
+    ]
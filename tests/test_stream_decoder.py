@@ -0,0 +1,58 @@
+from salad_cloud_transcription_sdk.net.transport.stream_decoder import (
+    LineDecoder,
+    NdjsonDecoder,
+    SseDecoder,
+    decode_stream,
+)
+
+
+def _feed_bytewise(decoder, payload):
+    items = []
+    for i in range(len(payload)):
+        items.extend(decoder.feed(payload[i : i + 1]))
+    return items + decoder.close()
+
+
+def test_events_split_across_chunks_are_reassembled():
+    """Events, CRLF line breaks and multibyte characters survive any chunking."""
+    payload = (
+        ": keep-alive\r\n"
+        "event: progress\r\n"
+        'data: {"text": "café ✓"}\r\n'
+        "\r\n"
+        "id: 7\r\n"
+        "data: first line\r\n"
+        "data: second line\r\n"
+        "\r\n"
+    ).encode("utf-8")
+
+    events = _feed_bytewise(SseDecoder(), payload)
+
+    assert [e.event for e in events] == ["progress", "message"]
+    assert events[0].json() == {"text": "café ✓"}
+    assert events[1].data == "first line\nsecond line"
+    assert events[1].id == "7"
+
+
+def test_ndjson_lines_are_parsed_incrementally():
+    """NDJSON values are yielded once their line is complete, blank lines skipped."""
+    payload = '{"a": 1}\n\n{"b": "ü"}'.encode("utf-8")
+
+    assert _feed_bytewise(NdjsonDecoder(), payload) == [{"a": 1}, {"b": "ü"}]
+
+
+def test_binary_streams_are_passed_through():
+    """Unknown content types keep their raw chunks."""
+    chunks = [b"\xff\xfe", b"\x00"]
+
+    assert list(decode_stream("audio/mpeg", chunks)) == chunks
+
+
+def test_line_feed_after_a_split_crlf_ends_a_blank_line():
+    """Only the line feed completing a \\r\\n split between chunks is skipped."""
+    decoder = LineDecoder()
+    lines = []
+    for chunk in [b"a\r", b"\n", b"\n", b"b\n"]:
+        lines.extend(decoder.feed(chunk))
+
+    assert lines + decoder.close() == ["a", "", "b"]
@@ -0,0 +1,69 @@
+import json
+from types import SimpleNamespace
+
+from salad_cloud_transcription_sdk.net.request_chain.handlers.base_handler import (
+    BaseHandler,
+)
+from salad_cloud_transcription_sdk.net.request_chain.handlers.tracing_handler import (
+    TracingHandler,
+)
+from salad_cloud_transcription_sdk.net.tracing import (
+    FileSpanExporter,
+    SpanExporter,
+    SpanStatus,
+    Tracer,
+)
+from salad_cloud_transcription_sdk.net.transport.request import Request
+
+
+class ListExporter(SpanExporter):
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+class EchoHandler(BaseHandler):
+    """Answers 200 and remembers the headers it was sent."""
+
+    def handle(self, request):
+        self.headers = request.headers
+        return SimpleNamespace(status=200), None
+
+
+def test_attempt_spans_are_children_of_the_active_span():
+    """Each attempt is a client span under the stage span, propagated with traceparent."""
+    exporter = ListExporter()
+    tracer = Tracer(exporter)
+    echo = EchoHandler()
+    handler = TracingHandler(tracer)
+    handler.set_next(echo)
+    request = Request().set_url("https://api.salad.com/jobs").set_method("GET")
+
+    with tracer.start_span("transcribe") as root:
+        handler.handle(request.set_headers({}))
+
+    attempt, stage = exporter.spans
+    assert stage is root
+    assert attempt.parent_span_id == root.span_id
+    assert attempt.attributes["http.response.status_code"] == 200
+    assert echo.headers["traceparent"] == f"00-{root.trace_id}-{attempt.span_id}-01"
+
+
+def test_file_exporter_writes_otlp_json(tmp_path):
+    """Spans are appended as OTLP JSON export requests, errors included."""
+    path = tmp_path / "spans.jsonl"
+    tracer = Tracer(FileSpanExporter(str(path)))
+
+    try:
+        with tracer.start_span("transcribe.create_job", attributes={"attempts": 2}):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+
+    exported = json.loads(path.read_text().splitlines()[0])
+    span = exported["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert span["name"] == "transcribe.create_job"
+    assert span["status"]["code"] == SpanStatus.ERROR
+    assert span["attributes"] == [{"key": "attempts", "value": {"intValue": "2"}}]
@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+from salad_cloud_transcription_sdk.models import TranscriptionTimingReport
+
+
+def _event(action, time):
+    return SimpleNamespace(action=action, time=time)
+
+
+def test_queue_and_execution_times_come_from_job_events():
+    """Queue wait and execution time are derived from the job event timestamps."""
+    job = SimpleNamespace(
+        create_time="2024-05-01T12:00:00Z",
+        events=[
+            _event("created", "2024-05-01T12:00:00.5Z"),
+            _event("started", "2024-05-01T12:00:10.5Z"),
+            _event("succeeded", "2024-05-01T12:01:00.5Z"),
+        ],
+        output=SimpleNamespace(processing_time=42.0),
+    )
+
+    report = TranscriptionTimingReport(upload_bytes=1000, upload_time=2.0)
+    report.set_job_timings(job)
+
+    assert report.queue_time == 10.0
+    assert report.execution_time == 50.0
+    assert report.processing_time == 42.0
+    assert report.to_dict()["upload_throughput"] == 500.0
+
+
+def test_missing_timestamps_leave_times_unknown():
+    """A job that has not started yet has no queue or execution time."""
+    job = SimpleNamespace(
+        create_time="2024-05-01T12:00:00Z",
+        events=[_event("created", "2024-05-01T12:00:00Z")],
+        output=None,
+    )
+
+    report = TranscriptionTimingReport().set_job_timings(job)
+
+    assert report.queue_time is None
+    assert report.execution_time is None
+    assert report.upload_throughput is None
@@ -0,0 +1,220 @@
+import asyncio
+import email
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from requests.models import Response as RequestsResponse
+from requests.structures import CaseInsensitiveDict
+
+from salad_cloud_transcription_sdk.net.request_chain.handlers.http_handler import (
+    HttpHandler,
+)
+from salad_cloud_transcription_sdk.net.transport.deadline import Deadline
+from salad_cloud_transcription_sdk.net.transport.file_part import FilePart
+from salad_cloud_transcription_sdk.net.transport.request import Request
+from salad_cloud_transcription_sdk.net.transport.request_error import (
+    DeadlineExceededError,
+)
+from salad_cloud_transcription_sdk.net.transport.transports import (
+    RequestsTransport,
+    Transport,
+    Urllib3Transport,
+    create_transport,
+    register_transport,
+)
+
+
+class JsonServer(BaseHTTPRequestHandler):
+    """Answers with a gzip-compressed description of the request it received."""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        payload = gzip.compress(
+            json.dumps(
+                {
+                    "user_agent": self.headers.get("User-Agent"),
+                    "body": json.loads(body),
+                }
+            ).encode()
+        )
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_PUT(self):
+        # Multipart uploads are described, the fields parsed from the body
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        message = email.message_from_bytes(
+            f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+        )
+        payload = json.dumps(
+            {
+                part.get_param("name", header="content-disposition"): part.get_payload(
+                    decode=True
+                ).decode()
+                for part in message.get_payload()
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = HTTPServer(("127.0.0.1", 0), JsonServer)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+class FakeTransport(Transport):
+    """Answers every request in-process."""
+
+    def __init__(self):
+        self.requests = []
+
+    def send(self, request, timeout, stream=False):
+        self.requests.append(request)
+        response = RequestsResponse()
+        response.status_code = 201
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        response.request = request
+        response._content = b'{"id": "job"}'
+        return response
+
+
+def _post(handler, url, body):
+    request = Request().set_url(url).set_method("POST").set_headers({}).set_body(body)
+    return handler.handle(request)
+
+
+@pytest.mark.parametrize("transport", [RequestsTransport, Urllib3Transport])
+def test_built_in_transports_are_interchangeable(server_url, transport):
+    """Every backend encodes the request and decodes the response the same way."""
+    response, error = _post(HttpHandler(transport=transport()), server_url, {"a": 1})
+
+    assert error is None
+    assert response.body["body"] == {"a": 1}
+    assert response.body["user_agent"].startswith("python-requests")
+    assert response.elapsed > 0
+
+
+@pytest.mark.parametrize("transport", [RequestsTransport, Urllib3Transport])
+def test_streamed_bodies_are_spilled_by_any_transport(server_url, transport):
+    """Transports return the body unread when the handler streams it."""
+    handler = HttpHandler(spill_threshold=16, transport=transport())
+
+    response, error = _post(handler, server_url, {"text": "x" * 64})
+
+    assert error is None
+    assert response.spilled
+    assert response.body["body"] == {"text": "x" * 64}
+
+
+@pytest.mark.parametrize("transport", [RequestsTransport, Urllib3Transport])
+def test_multipart_uploads_are_streamed_from_the_file(server_url, transport, tmp_path):
+    """Multipart bodies are streamed from the part read, with their Content-Length."""
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"0123456789" * 10000)
+    request = (
+        Request()
+        .set_url(server_url)
+        .set_method("PUT")
+        .set_headers({})
+        .set_body(
+            {
+                "file_name": "audio.wav",
+                "sign": True,
+                "file": FilePart(str(path), 10, 20),
+            },
+            "multipart/form-data",
+        )
+    )
+
+    response, error = HttpHandler(transport=transport()).handle(request)
+
+    assert error is None
+    assert response.body == {
+        "file_name": "audio.wav",
+        "sign": "True",
+        "file": "01234567890123456789",
+    }
+
+
+def test_bodies_of_coroutines_are_spilled(server_url):
+    """Requests sent from coroutines spill their large bodies like the others."""
+    handler = HttpHandler(spill_threshold=16, transport=RequestsTransport())
+    request = (
+        Request()
+        .set_url(server_url)
+        .set_method("POST")
+        .set_headers({})
+        .set_body({"text": "x" * 64})
+    )
+
+    response, error = asyncio.run(handler.handle_async(request))
+
+    assert error is None
+    assert response.spilled
+    assert response.body["body"] == {"text": "x" * 64}
+
+
+class SlowPreparingHttpHandler(HttpHandler):
+    """Takes longer to encode the request than the deadline allows."""
+
+    def _prepare(self, request):
+        time.sleep(0.1)
+        return super()._prepare(request)
+
+
+@pytest.mark.parametrize("transport", [RequestsTransport, Urllib3Transport])
+def test_deadlines_expiring_while_preparing_are_exceeded(server_url, transport):
+    """A deadline running out while the body is read is reported, not sent as a zero timeout."""
+    handler = SlowPreparingHttpHandler(transport=transport())
+
+    def request():
+        return (
+            Request()
+            .set_url(server_url)
+            .set_method("POST")
+            .set_headers({})
+            .set_body({"a": 1})
+            .set_deadline(Deadline(0.05))
+        )
+
+    _, error = handler.handle(request())
+    assert isinstance(error, DeadlineExceededError)
+    _, error = asyncio.run(handler.handle_async(request()))
+    assert isinstance(error, DeadlineExceededError)
+    [(_, error)] = list(handler.stream(request()))
+    assert isinstance(error, DeadlineExceededError)
+
+
+def test_registered_transports_can_be_selected_by_name():
+    """Custom transports are registered once and created by name."""
+    register_transport("fake", FakeTransport)
+    transport = create_transport("fake")
+
+    response, error = _post(
+        HttpHandler(transport=transport), "http://jobs.invalid/jobs", {"a": 1}
+    )
+
+    assert error is None
+    assert response.body == {"id": "job"}
+    assert transport.requests[0].body == b'{"a": 1}'
+    with pytest.raises(ValueError):
+        create_transport("unknown")
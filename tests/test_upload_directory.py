@@ -0,0 +1,49 @@
+from conftest import FakeStorageTransport
+
+
+class RejectingTransport(FakeStorageTransport):
+    """Rejects the files whose name starts with "bad"."""
+
+    def send(self, request, timeout, stream=False):
+        response = super().send(request, timeout, stream)
+        if "/files/bad" in request.url:
+            response.status_code = 400
+        return response
+
+
+def _tree(tmp_path):
+    for name in ["a.wav", "b.mp3", "notes.txt", "nested/c.wav", "nested/bad.wav"]:
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(b"x" * 100)
+    return tmp_path
+
+
+def test_directories_are_filtered_and_failures_reported(tmp_path, fake_storage_service):
+    """Files are filtered by path or name, and a failing file does not stop the others."""
+    result = fake_storage_service(RejectingTransport()).upload_directory(
+        "org",
+        str(_tree(tmp_path)),
+        concurrency=2,
+        include=["*.wav", "*.mp3"],
+        exclude=["b.*"],
+        sign=False,
+    )
+
+    uploaded = sorted(r.path[len(str(tmp_path)) + 1 :] for r in result.succeeded)
+    assert uploaded == ["a.wav", "nested/c.wav"]
+    assert [r.path.endswith("bad.wav") for r in result.failed] == [True]
+    assert result.uploaded_bytes == 200
+    assert result.throughput > 0
+
+
+def test_glob_patterns_select_the_files(tmp_path, fake_storage_service):
+    """Glob patterns are expanded lazily, recursively with **."""
+    _tree(tmp_path)
+
+    result = fake_storage_service(RejectingTransport()).upload_directory(
+        "org", str(tmp_path / "**" / "c.wav"), sign=False
+    )
+
+    assert [r.path.endswith("c.wav") for r in result.files] == [True]
+    assert result.files[0].response.url == "https://storage.invalid/files/audio.wav"
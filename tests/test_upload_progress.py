@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+from salad_cloud_transcription_sdk.services.async_ import (
+    SimpleStorageServiceAsync,
+    UploadProgressStream,
+)
+from salad_cloud_transcription_sdk.services.utils.part_sizer import MIB
+from salad_cloud_transcription_sdk.services.utils.upload_progress import (
+    UploadProgressTracker,
+)
+
+from conftest import StreamingStorageTransport
+
+
+def test_tracker_reports_throughput_and_eta():
+    """Bytes in flight count towards the progress, the ETA follows the throughput."""
+    reports = []
+    tracker = UploadProgressTracker("audio.wav", reports.append, 1000, 2, interval=0)
+
+    reporter = tracker.part_reporter(1, 500)
+    reporter(260, 520)
+    time.sleep(0.05)
+    reporter(520, 520)
+    tracker.complete_part(1, 500)
+
+    progress = tracker.snapshot()
+    assert progress.bytes_sent == 500
+    assert progress.parts_completed == 1
+    assert progress.fraction == 0.5
+    assert progress.throughput > 0
+    assert progress.eta == 500 / progress.throughput
+    assert [report.bytes_sent for report in reports] == [250, 500, 500]
+    assert tracker.snapshot(done=True).eta == 0
+
+
+def test_multipart_upload_reports_each_part(tmp_path, fake_storage_service):
+    """A multipart upload reports its parts, the retry of part 2 and its end."""
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"\x01" * (3 * MIB))
+    transport = StreamingStorageTransport()
+    service = fake_storage_service(transport).set_upload_concurrency(1)
+    reports = []
+
+    service.upload_file("org", str(path), sign=False, progress_callback=reports.append)
+
+    assert transport.chunked_bodies == 4
+    assert [report.parts_completed for report in reports if report.done] == [3]
+    assert reports[-1].bytes_sent == reports[-1].total_bytes == 3 * MIB
+    assert reports[-1].total_parts == 3
+    assert all(report.filename == "audio.wav" for report in reports)
+
+
+def test_progress_stream_iterates_until_the_upload_ends(tmp_path, fake_storage_service):
+    """The stream yields progress on the event loop and stops after the last one."""
+    path = tmp_path / "short.wav"
+    path.write_bytes(b"\x02" * 1000)
+    service = fake_storage_service(
+        StreamingStorageTransport(), SimpleStorageServiceAsync
+    )
+
+    async def upload():
+        progress = UploadProgressStream()
+        task = asyncio.create_task(
+            service.upload_file(
+                "org", str(path), sign=False, progress_callback=progress
+            )
+        )
+        updates = [update async for update in progress]
+        return updates, await task
+
+    updates, response = asyncio.run(upload())
+
+    assert response.url == "https://storage.invalid/files/audio.wav"
+    assert updates[-1].done
+    assert updates[-1].bytes_sent == 1000
@@ -0,0 +1,70 @@
+import io
+
+from salad_cloud_transcription_sdk.services.utils.chunk_reader import ChunkReader
+from salad_cloud_transcription_sdk.services.utils.memory_budget import MemoryBudget
+from salad_cloud_transcription_sdk.services.utils.part_sizer import MIB
+
+from conftest import FakeStorageTransport
+
+
+class Pipe(io.RawIOBase):
+    """A pipe returning at most 1000 bytes per read, like a socket or a process output."""
+
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._data.read(min(len(buffer), 1000))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def test_chunks_have_the_requested_size_whatever_the_source():
+    """Short reads and uneven iterator chunks are reassembled into exact chunks."""
+    iterator = ChunkReader(iter([b"ab", b"", b"cde", b"f"]))
+    pipe = ChunkReader(Pipe(b"x" * 2500))
+
+    assert [iterator.read(4), iterator.read(4), iterator.read(4)] == [
+        b"abcd",
+        b"ef",
+        b"",
+    ]
+    assert len(pipe.read(2048)) == 2048
+    assert not pipe.at_end()
+    assert len(pipe.read(2048)) == 452
+    assert pipe.at_end()
+
+
+def test_short_streams_are_uploaded_directly(fake_storage_service):
+    """Streams ending within the first part are sent in a single request."""
+    transport = FakeStorageTransport()
+    budget = MemoryBudget(4 * MIB)
+
+    fake_storage_service(transport).set_memory_budget(budget).upload_stream(
+        "org", iter([b"RIFF", b"data"]), "audio.wav", sign=False
+    )
+
+    assert transport.part_attempts == []
+    assert budget.in_use == 0
+
+
+def test_long_streams_are_uploaded_in_parts(fake_storage_service):
+    """Streams longer than a part switch to a multipart upload without a known size."""
+    data = b"".join(bytes([i]) * MIB for i in range(3)) + b"\x03" * 100
+    transport = FakeStorageTransport()
+    budget = MemoryBudget(4 * MIB)
+
+    response = (
+        fake_storage_service(transport)
+        .set_memory_budget(budget)
+        .upload_stream("org", Pipe(data), "audio.wav", sign=False)
+    )
+
+    assert response.url == "https://storage.invalid/files/audio.wav"
+    assert sorted(number for number, _ in transport.part_attempts) == [1, 2, 2, 3, 4]
+    for number, body in transport.part_attempts:
+        assert data[(number - 1) * MIB : number * MIB] in body
+    assert budget.in_use == 0